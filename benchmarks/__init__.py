@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+"""
+Performance benchmarks for WuffChat V2.
+
+Benchmarks run against stub backends (see benchmarks.stubs) so that they
+measure the framework itself, not OpenAI/Weaviate round trips.
+"""
@@ -0,0 +1,164 @@
+# benchmarks/bench_api_serialization.py
+"""
+CPU per request spent converting and encoding the conversation responses.
+
+Measures the API layer of /flow_intro and /flow_step with a realistic
+diagnosis payload (two long German messages with metadata):
+
+- convert: agent messages -> session history + response dicts
+           (V2Orchestrator._record_messages; AgentMessage.model_construct
+           for comparison, which is slower than validation in pydantic 2)
+- encode:  one ASGI request through a FastAPI route that returns the
+           payload (dict through response_model=IntroResponse vs.
+           FastJSONResponse with orjson)
+- turn:    complete /flow_step requests against the stub-backed app
+           (benchmarks.stub_app), for the share of the whole turn
+
+All numbers are process CPU time (time.process_time) per request.
+
+Usage:
+    python -m benchmarks.bench_api_serialization [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from fastapi import FastAPI
+
+from src.agents.base_agent import V2AgentMessage
+from src.models.flow_models import AgentMessage
+from src.models.session_state import SessionState
+
+MESSAGES = [
+    V2AgentMessage(
+        sender="dog",
+        text=(
+            "Wuff! Wenn es an der Tür klingelt, spüre ich sofort: Da kommt jemand in unser Revier. "
+            "Ich belle, weil ich Dich und unser Zuhause beschützen möchte - das ist mein territorialer "
+            "Instinkt. Für mich fühlt es sich an wie eine wichtige Aufgabe, die ich ganz allein erledigen muss. "
+        ) * 2,
+        message_type="response",
+        metadata={"instinct": "territorial", "distance": 0.31, "experiment": "prompt_v2"},
+    ),
+    V2AgentMessage(
+        sender="dog",
+        text="Magst Du mir erzählen, in welchen Situationen das besonders häufig passiert?",
+        message_type="question",
+        metadata={"question_type": "context"},
+    ),
+]
+
+
+def _report(name: str, cpu: float, count: int) -> None:
+    print(f"{name:<18} {cpu / count * 1e6:>8.1f} us/request")
+
+
+def _convert_unvalidated(session: SessionState) -> List[Dict[str, Any]]:
+    """History entries built with model_construct (skips validation)"""
+    response_messages = []
+    for v2_msg in MESSAGES:
+        session.messages.append(AgentMessage.model_construct(sender=v2_msg.sender, text=v2_msg.text))
+        response_messages.append(v2_msg.to_dict())
+    return response_messages
+
+
+def bench_convert(requests: int) -> None:
+    from src.core.orchestrator import V2Orchestrator
+
+    record = V2Orchestrator._record_messages
+    for name, convert in (
+        ("convert", lambda session: record(None, session, MESSAGES)),
+        ("convert construct", _convert_unvalidated),
+    ):
+        session = SessionState()
+        start = time.process_time()
+        for i in range(requests):
+            if i % 50 == 0:
+                session.messages.clear()
+            convert(session)
+        _report(name, time.process_time() - start, requests)
+
+
+async def _asgi_post(app: Any, path: str, body: bytes) -> bytes:
+    """One POST request straight through the ASGI app (no HTTP client)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    chunks = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def _measure(name: str, requests: int, call: Callable[[int], Awaitable[bytes]]) -> bytes:
+    await call(-1)  # warm up
+    start = time.process_time()
+    for i in range(requests):
+        body = await call(i)
+    _report(name, time.process_time() - start, requests)
+    return body
+
+
+async def bench_encode(requests: int) -> None:
+    from src.main import FastJSONResponse, IntroResponse
+
+    payload = {"session_id": "3f2a9c1e-1b7d-4c55-9d61-0c8f3b2e7a10", "messages": [m.to_dict() for m in MESSAGES]}
+    app = FastAPI()
+
+    @app.post("/model", response_model=IntroResponse)
+    async def through_response_model():
+        return payload
+
+    @app.post("/fast", response_class=FastJSONResponse)
+    async def fast_response():
+        return FastJSONResponse(payload)
+
+    old = await _measure("encode model", requests, lambda i: _asgi_post(app, "/model", b""))
+    new = await _measure("encode fast", requests, lambda i: _asgi_post(app, "/fast", b""))
+    assert json.loads(old) == json.loads(new)
+
+
+async def bench_turn(requests: int) -> None:
+    os.environ.setdefault("SESSION_SNAPSHOT_PATH", "")
+    os.environ.setdefault("TRACING_ENABLED", "false")
+    import benchmarks.stub_app  # noqa: F401 - installs the stub services
+    import src.main as main_module
+
+    app = main_module.app
+    async with app.router.lifespan_context(app):
+        await _measure("turn /flow_step", requests, lambda i: _asgi_post(
+            app, "/flow_step",
+            json.dumps({"session_id": f"bench-{i}", "message": "Mein Hund bellt, wenn es klingelt"}).encode()
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    bench_convert(args.requests)
+    asyncio.run(bench_encode(args.requests))
+    asyncio.run(bench_turn(min(args.requests, 2000)))
+
+
+if __name__ == "__main__":
+    main()
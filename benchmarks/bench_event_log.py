@@ -0,0 +1,117 @@
+# benchmarks/bench_event_log.py
+"""
+Throughput of the conversation event log.
+
+Generates synthetic conversations (the main path of bench_flow_engine plus
+a "symptom not found" retry and a restart), writes them as segment files
+and measures:
+
+- record:  EventLog.record() per transition (hot path, no I/O)
+- write:   encoding and appending batches to segment files
+- read:    decoding segment files
+- replay:  decode + FlowReplayer against the bundled flow definition
+- rebuild: decode + rebuild_sessions()
+
+Usage:
+    python -m benchmarks.bench_event_log [--events 1000000]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from typing import List, Tuple
+
+from src.core.event_log import ConversationEvent, EventLog, EventLogConfig, hash_input, read_segments
+from src.core.event_replay import FlowReplayer, rebuild_sessions
+from src.core.flow_definition import load_flow_definition
+from src.core.flow_engine import FlowEvent
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState
+
+# (from_state, event, to_state) of one conversation
+CONVERSATION: List[Tuple[FlowStep, FlowEvent, FlowStep]] = [
+    (FlowStep.GREETING, FlowEvent.START_SESSION, FlowStep.WAIT_FOR_SYMPTOM),
+    (FlowStep.WAIT_FOR_SYMPTOM, FlowEvent.USER_INPUT, FlowStep.WAIT_FOR_SYMPTOM),
+    (FlowStep.WAIT_FOR_SYMPTOM, FlowEvent.USER_INPUT, FlowStep.WAIT_FOR_CONFIRMATION),
+    (FlowStep.WAIT_FOR_CONFIRMATION, FlowEvent.USER_INPUT, FlowStep.WAIT_FOR_CONTEXT),
+    (FlowStep.WAIT_FOR_CONTEXT, FlowEvent.USER_INPUT, FlowStep.ASK_FOR_EXERCISE),
+    (FlowStep.ASK_FOR_EXERCISE, FlowEvent.YES_RESPONSE, FlowStep.END_OR_RESTART),
+    (FlowStep.END_OR_RESTART, FlowEvent.RESTART_COMMAND, FlowStep.WAIT_FOR_SYMPTOM),
+    (FlowStep.WAIT_FOR_SYMPTOM, FlowEvent.USER_INPUT, FlowStep.WAIT_FOR_CONFIRMATION),
+    (FlowStep.WAIT_FOR_CONFIRMATION, FlowEvent.USER_INPUT, FlowStep.WAIT_FOR_CONTEXT),
+    (FlowStep.WAIT_FOR_CONTEXT, FlowEvent.USER_INPUT, FlowStep.ASK_FOR_EXERCISE),
+    (FlowStep.ASK_FOR_EXERCISE, FlowEvent.NO_RESPONSE, FlowStep.FEEDBACK_Q1),
+    (FlowStep.FEEDBACK_Q1, FlowEvent.FEEDBACK_ANSWER, FlowStep.FEEDBACK_Q2),
+    (FlowStep.FEEDBACK_Q2, FlowEvent.FEEDBACK_ANSWER, FlowStep.FEEDBACK_Q3),
+    (FlowStep.FEEDBACK_Q3, FlowEvent.FEEDBACK_ANSWER, FlowStep.FEEDBACK_Q4),
+    (FlowStep.FEEDBACK_Q4, FlowEvent.FEEDBACK_ANSWER, FlowStep.FEEDBACK_Q5),
+    (FlowStep.FEEDBACK_Q5, FlowEvent.FEEDBACK_COMPLETE, FlowStep.GREETING),
+]
+
+
+def _report(name: str, elapsed: float, events: int) -> None:
+    print(f"{name:<10} {events / elapsed:>12,.0f} events/s  {elapsed / events * 1e9:>8.0f} ns/event")
+
+
+def bench_record(iterations: int) -> None:
+    event_log = EventLog(EventLogConfig(backend="file", directory=tempfile.mkdtemp(), max_buffered=10 ** 9))
+    session = SessionState()
+    start = time.perf_counter()
+    for _ in range(iterations // len(CONVERSATION)):
+        for from_state, event, to_state in CONVERSATION:
+            event_log.record(session, from_state, event, "mein Hund bellt", to_state, 0.0, 0.0)
+    _report("record", time.perf_counter() - start, event_log.pending_count)
+
+
+def generate(count: int) -> List[ConversationEvent]:
+    events = []
+    input_hash = hash_input("mein Hund bellt")
+    for conversation in range(count // len(CONVERSATION)):
+        session_id = f"bench-{conversation:08d}"
+        for seq, (from_state, event, to_state) in enumerate(CONVERSATION, 1):
+            events.append(ConversationEvent(
+                session_id, seq, from_state.value, event.value, input_hash, to_state.value, 1.7e9, 1.0
+            ))
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=1000000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    bench_record(min(args.events, 200000))
+
+    events = generate(args.events)
+    with tempfile.TemporaryDirectory() as directory:
+        event_log = EventLog(EventLogConfig(backend="file", directory=directory))
+        start = time.perf_counter()
+        for offset in range(0, len(events), 10000):
+            event_log._segments.write(events[offset:offset + 10000])
+        event_log._segments.close()
+        _report("write", time.perf_counter() - start, len(events))
+
+        start = time.perf_counter()
+        count = sum(1 for _ in read_segments(directory))
+        _report("read", time.perf_counter() - start, count)
+
+        replayer = FlowReplayer(load_flow_definition())
+        start = time.perf_counter()
+        report = replayer.replay(read_segments(directory))
+        _report("replay", time.perf_counter() - start, report.events)
+
+        start = time.perf_counter()
+        sessions = rebuild_sessions(read_segments(directory))
+        _report("rebuild", time.perf_counter() - start, count)
+
+    print(
+        f"\n{report.events:,} events, {report.sessions:,} sessions -> {len(sessions):,} rebuilt; "
+        f"matched {report.matched:,}, stayed {report.stayed:,}, invalid {report.invalid}, gaps {report.gaps}"
+    )
+
+
+if __name__ == "__main__":
+    main()
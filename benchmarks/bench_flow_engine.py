@@ -0,0 +1,89 @@
+# benchmarks/bench_flow_engine.py
+"""
+Dispatch overhead of FlowEngine.process_event.
+
+All handlers are no-op coroutines, so the numbers are the cost of the FSM
+itself: transition lookup, condition check, handler call and state update.
+Also times the lookups used by session info and health checks.
+
+Usage:
+    python -m benchmarks.bench_flow_engine [--iterations 200000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Callable, List, Tuple
+
+from src.core.flow_engine import FlowEngine, FlowEvent
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState
+
+
+class _NoOpHandlers:
+    """Stands in for FlowHandlers; every handler returns no messages"""
+
+    def __getattr__(self, name: str) -> Callable:
+        async def handler(*args: Any, **kwargs: Any) -> list:
+            return []
+        return handler
+
+
+# One pass through the main conversation path
+CONVERSATION: List[Tuple[FlowStep, FlowEvent]] = [
+    (FlowStep.GREETING, FlowEvent.START_SESSION),
+    (FlowStep.WAIT_FOR_SYMPTOM, FlowEvent.USER_INPUT),
+    (FlowStep.WAIT_FOR_CONFIRMATION, FlowEvent.USER_INPUT),
+    (FlowStep.WAIT_FOR_CONTEXT, FlowEvent.USER_INPUT),
+    (FlowStep.ASK_FOR_EXERCISE, FlowEvent.NO_RESPONSE),
+    (FlowStep.FEEDBACK_Q1, FlowEvent.FEEDBACK_ANSWER),
+    (FlowStep.FEEDBACK_Q2, FlowEvent.FEEDBACK_ANSWER),
+    (FlowStep.FEEDBACK_Q3, FlowEvent.FEEDBACK_ANSWER),
+    (FlowStep.FEEDBACK_Q4, FlowEvent.FEEDBACK_ANSWER),
+    (FlowStep.FEEDBACK_Q5, FlowEvent.FEEDBACK_COMPLETE),
+]
+
+
+def _report(name: str, elapsed: float, operations: int) -> None:
+    print(f"{name:<28} {elapsed / operations * 1e9:>10.0f} ns/op")
+
+
+async def bench_process_event(engine: FlowEngine, iterations: int) -> None:
+    session = SessionState()
+    rounds = max(1, iterations // len(CONVERSATION))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for state, event in CONVERSATION:
+            session.current_step = state
+            await engine.process_event(session, event, "", {})
+    _report("process_event", time.perf_counter() - start, rounds * len(CONVERSATION))
+
+
+def bench_sync(name: str, func: Callable[[], Any], iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    _report(name, time.perf_counter() - start, iterations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    # Keep logging I/O out of the measurement
+    logging.disable(logging.CRITICAL)
+
+    engine = FlowEngine(_NoOpHandlers())
+    asyncio.run(bench_process_event(engine, args.iterations))
+    bench_sync("get_valid_transitions", lambda: engine.get_valid_transitions(FlowStep.FEEDBACK_Q3), args.iterations)
+    bench_sync("can_transition (invalid)", lambda: engine.can_transition(
+        FlowStep.FEEDBACK_Q3, FlowEvent.YES_RESPONSE, None), args.iterations)
+    bench_sync("get_flow_summary", engine.get_flow_summary, args.iterations)
+    bench_sync("validate_fsm", engine.validate_fsm, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_intent_classifier.py
+"""
+Accuracy and throughput of the compiled intent classifier.
+
+Compares IntentClassifier against the substring checks it replaced
+(FlowEngine restart list + "ja"/"nein" substrings, ValidationService
+"ja"/"yes"/"nein"/"no" substrings) on a labelled corpus of German replies
+(benchmarks/data/german_replies.tsv), then measures throughput on the
+corpus repeated to --size replies.
+
+Usage:
+    python -m benchmarks.bench_intent_classifier [--size 200000] [--corpus PATH] [--show-errors]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from src.core.intent_classifier import IntentClassifier
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "german_replies.tsv"
+
+
+def load_corpus(path: Path) -> List[Tuple[str, str]]:
+    """Read (label, reply) pairs; lines starting with # are comments"""
+    corpus = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        label, reply = line.split("\t", 1)
+        corpus.append((label, reply))
+    return corpus
+
+
+def legacy_classify(text: str) -> str:
+    """The previous substring-based checks, combined"""
+    normalized = text.strip().lower()
+    if normalized in ["neu", "restart", "von vorne"]:
+        return "restart"
+    if "ja" in normalized or "yes" in normalized:
+        return "yes"
+    if "nein" in normalized or "no" in normalized:
+        return "no"
+    return "none"
+
+
+def accuracy(classify: Callable[[str], str], corpus: List[Tuple[str, str]]) -> Tuple[float, List[Tuple[str, str, str]]]:
+    errors = []
+    for label, reply in corpus:
+        predicted = classify(reply)
+        if predicted != label:
+            errors.append((reply, label, predicted))
+    return 1 - len(errors) / len(corpus), errors
+
+
+def throughput(classify: Callable[[str], str], replies: List[str]) -> float:
+    start = time.perf_counter()
+    for reply in replies:
+        classify(reply)
+    return len(replies) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--size", type=int, default=200000)
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    replies = [reply for _, reply in corpus]
+    replies = (replies * (args.size // len(replies) + 1))[:args.size]
+
+    start = time.perf_counter()
+    classifier = IntentClassifier()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    candidates: Dict[str, Callable[[str], str]] = {
+        "legacy substrings": legacy_classify,
+        "compiled classifier": lambda text: classifier.classify(text).value,
+    }
+
+    print(f"Corpus: {len(corpus)} labelled replies, throughput on {len(replies)} replies")
+    print(f"Classifier compile time: {compile_ms:.2f} ms\n")
+    print(f"{'classifier':<22} {'accuracy':>9} {'errors':>7} {'replies/s':>12}")
+    for name, classify in candidates.items():
+        acc, errors = accuracy(classify, corpus)
+        rate = throughput(classify, replies)
+        print(f"{name:<22} {acc:>8.1%} {len(errors):>7} {rate:>12,.0f}")
+        if args.show_errors:
+            for reply, label, predicted in errors:
+                print(f"    {reply!r}: expected {label}, got {predicted}")
+
+
+if __name__ == "__main__":
+    main()
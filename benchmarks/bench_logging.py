@@ -0,0 +1,152 @@
+# benchmarks/bench_logging.py
+"""
+Logging overhead per conversation turn on the event loop thread.
+
+Replays the log calls of one /flow_step turn (info lines of main.py and the
+flow handlers, debug lines of FlowHandlers/DogAgent with their arguments)
+against:
+
+- sync:   console + RotatingFileHandler on the calling thread (previous setup)
+- queue:  LazyQueueHandler; text formatting and file I/O in a QueueListener
+- json:   queue with LOG_FORMAT=json
+- sample: queue with LOG_DEBUG_SAMPLE_RATE=0.1
+
+"caller" is the time the request path spends in logging, "drain" the time
+until the listener has written everything after the last call, and "cpu"
+the process CPU time of both threads together. The listener shares the GIL
+with the event loop, so under load "cpu" is what logging really costs per
+turn; the queue only moves the file I/O and the waiting off the request path.
+
+Reference runs (20000 turns, Python 3.11), us per turn:
+
+              DEBUG           INFO
+            caller  cpu     caller  cpu
+    sync     490    490      157    155
+    queue    270    610-680   84    206
+    json     260    575-700   78    186
+    sample   160    230-330   70    168
+
+Formatting one record costs ~4.3 us as text and ~4.7 us as JSON (~10.6 us
+with the previous json.dumps/datetime formatter).
+
+Usage:
+    python -m benchmarks.bench_logging [--turns 20000] [--level DEBUG]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, List, Tuple
+
+from src.core.logging_config import JsonFormatter, LazyQueueHandler, _QueueListener
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+ANALYSIS = {
+    "primary_instinct": "territorial",
+    "primary_description": "Ich beschütze mein Revier und melde jeden, der sich nähert.",
+    "all_instincts": {"jagd": "...", "rudel": "...", "territorial": "...", "sexual": "..."},
+}
+TEXT = "Wuff! Wenn ich belle, dann weil ich mein Zuhause beschützen möchte. " * 3
+
+# (level, message, args) of one turn
+TURN: List[Tuple[int, str, Tuple[Any, ...]]] = [
+    (logging.INFO, "[V2] Verarbeite Nachricht - Session ID: %s, Step: %s", ("3f2a9c1e", "wait_for_context")),
+    (logging.DEBUG, "[V2] Benutzer-Nachricht: %s", ("Er bellt immer, wenn es klingelt",)),
+    (logging.INFO, "Processing event %s in state %s", ("user_input", "wait_for_context")),
+    (logging.DEBUG, "Analysis data: %s", (ANALYSIS,)),
+    (logging.DEBUG, "_generate_diagnosis: metadata=%s", ({"analysis_data": ANALYSIS},)),
+    (logging.DEBUG, "primary_instinct=%s, primary_description=%s", ("territorial", ANALYSIS["primary_description"])),
+    (logging.DEBUG, "Generated diagnosis text: %.50s...", (TEXT,)),
+    (logging.DEBUG, "Diagnosis messages: %d", (1,)),
+    (logging.DEBUG, "Message %d: type=%s, text=%.50s...", (0, "response", TEXT)),
+    (logging.DEBUG, "Exercise messages: %d", (1,)),
+    (logging.DEBUG, "Exercise msg %d: type=%s, text=%.50s...", (0, "question", TEXT)),
+    (logging.INFO, "Transition %s -> %s", ("wait_for_context", "ask_for_exercise")),
+    (logging.INFO, "[V2] Nachricht verarbeitet - Session ID: %s, neuer Step: %s", ("3f2a9c1e", "ask_for_exercise")),
+    (logging.DEBUG, "[V2] Antwort-Nachrichten: %d messages", (2,)),
+]
+
+
+def _handlers(directory: str, formatter: logging.Formatter) -> List[logging.Handler]:
+    console = logging.StreamHandler(open(os.devnull, "w"))
+    log_file = RotatingFileHandler(
+        os.path.join(directory, "wuffchat.log"), maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8"
+    )
+    for handler in (console, log_file):
+        handler.setFormatter(formatter)
+    return [console, log_file]
+
+
+def _logger(level: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger("bench.logging")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def _run(logger: logging.Logger, turns: int) -> float:
+    start = time.perf_counter()
+    for _ in range(turns):
+        for level, message, args in TURN:
+            if logger.isEnabledFor(level):
+                logger._log(level, message, args)
+    return time.perf_counter() - start
+
+
+def _report(name: str, caller: float, drain: float, cpu: float, turns: int) -> None:
+    print(
+        f"{name:<7} caller {caller / turns * 1e6:>7.1f} us/turn   "
+        f"drain {drain:>6.2f}s   cpu {cpu / turns * 1e6:>7.1f} us/turn"
+    )
+
+
+def bench_sync(level: str, turns: int, directory: str) -> None:
+    handlers = _handlers(directory, logging.Formatter(TEXT_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
+    logger = _logger(level, handlers[0])
+    logger.addHandler(handlers[1])
+    cpu = time.process_time()
+    caller = _run(logger, turns)
+    _report("sync", caller, 0.0, time.process_time() - cpu, turns)
+    for handler in handlers:
+        handler.close()
+
+
+def bench_queue(
+    name: str, level: str, turns: int, directory: str, sample_rate: float, formatter: logging.Formatter
+) -> None:
+    handler = LazyQueueHandler(queue.Queue(maxsize=0), debug_sample_rate=sample_rate)
+    handlers = _handlers(directory, formatter)
+    listener = _QueueListener(handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    cpu = time.process_time()
+    caller = _run(_logger(level, handler), turns)
+    start = time.perf_counter()
+    listener.stop()
+    _report(name, caller, time.perf_counter() - start, time.process_time() - cpu, turns)
+    for h in handlers:
+        h.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=20000)
+    parser.add_argument("--level", default="DEBUG", choices=["DEBUG", "INFO"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{len(TURN)} log calls per turn, level {args.level}\n")
+        text = logging.Formatter(TEXT_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+        bench_sync(args.level, args.turns, directory)
+        bench_queue("queue", args.level, args.turns, directory, 1.0, text)
+        bench_queue("json", args.level, args.turns, directory, 1.0, JsonFormatter())
+        bench_queue("sample", args.level, args.turns, directory, 0.1, text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_prompt_rendering.py
+"""
+Rendering throughput of every PromptType.
+
+Compares PromptManager.get_prompt (compiled renderers) with the previous
+per-call path: enum key resolution, a set difference of the variables and
+str.format over the template.
+
+Usage:
+    python -m benchmarks.bench_prompt_rendering [--iterations 100000]
+"""
+
+import argparse
+import logging
+import time
+
+from src.core.prompt_manager import PromptManager, PromptType
+
+
+def legacy_get_prompt(manager: PromptManager, prompt_type, **kwargs) -> str:
+    """get_prompt as it worked before templates were compiled"""
+    key = prompt_type.value if hasattr(prompt_type, 'value') else str(prompt_type)
+    prompt = manager.prompts[key]
+    if not prompt.variables and not kwargs:
+        return prompt.template
+    missing = set(prompt.variables) - set(kwargs.keys())
+    if missing:
+        raise KeyError(missing)
+    return prompt.template.format(**kwargs)
+
+
+def _ns_per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    manager = PromptManager()
+    manager.load_prompts()
+    print(f"load_prompts (incl. compile): {(time.perf_counter() - start) * 1000:.2f} ms "
+          f"for {len(manager.prompts)} prompts\n")
+
+    print(f"{'prompt type':<36} {'vars':>4} {'chars':>6} {'get_prompt ns':>14} {'legacy ns':>14} {'speedup':>8}")
+    total_compiled = total_format = 0.0
+    for prompt_type in PromptType:
+        prompt = manager.prompts.get(prompt_type.value)
+        if prompt is None:
+            print(f"{prompt_type.name:<36} {'(no prompt registered)':>50}")
+            continue
+
+        renderer = prompt.compile()
+        kwargs = {name: f"Wert für {name}" for name in renderer.required}
+        template = prompt.template
+        assert manager.get_prompt(prompt_type, **kwargs) == legacy_get_prompt(manager, prompt_type, **kwargs)
+
+        compiled_ns = _ns_per_call(lambda: manager.get_prompt(prompt_type, **kwargs), args.iterations)
+        format_ns = _ns_per_call(lambda: legacy_get_prompt(manager, prompt_type, **kwargs), args.iterations)
+        total_compiled += compiled_ns
+        total_format += format_ns
+        print(
+            f"{prompt_type.name:<36} {len(renderer.required):>4} {len(template):>6} "
+            f"{compiled_ns:>14.0f} {format_ns:>14.0f} {format_ns / compiled_ns:>7.1f}x"
+        )
+
+    print(f"\n{'all prompt types':<48} {total_compiled:>14.0f} {total_format:>14.0f} "
+          f"{total_format / total_compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_redis_codec.py
+"""
+Encode/decode throughput and stored size of the RedisService codecs.
+
+Payloads are what the application stores as Redis values:
+
+- session:  a SessionState after a full consultation (model_dump(mode="json"))
+- feedback: a feedback record as written by the feedback pipeline
+
+Every codec that can be created here is measured (orjson, msgpack and
+zstd are optional), each without compression and - if zstandard is
+installed - with REDIS_COMPRESS_THRESHOLD=1024. Decoding starts from what
+the Redis client returns (str, decoded with surrogateescape).
+
+Usage:
+    python -m benchmarks.bench_redis_codec [--iterations 20000]
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from src.core.exceptions import V2ConfigurationError
+from src.models.flow_models import AgentMessage, FlowStep
+from src.models.session_state import SessionState, SymptomState
+from src.services.redis_codec import CODECS, RedisCodec
+
+COMPRESS_THRESHOLD = 1024
+
+
+def session_payload() -> Dict[str, Any]:
+    session = SessionState(session_id="bench-session-0001", current_step=FlowStep.FEEDBACK_Q5)
+    session.active_symptom = "Mein Hund bellt jeden Besucher an der Haustür an"
+    session.symptoms[session.active_symptom] = SymptomState(
+        name=session.active_symptom,
+        asked_instincts={"jagd": True, "rudel": True, "territorial": True, "sexual": False},
+        instinct_answers={"territorial": ["Er steht dabei steif im Flur und knurrt."]},
+        diagnosis="Territorialverhalten",
+        diagnosis_set=True
+    )
+    session.feedback = ["Ja", "Sehr hilfreich", "Die Übung", "9", "kein Kommentar"]
+    for turn in range(12):
+        session.messages.append(AgentMessage(sender="user", text=f"Antwort {turn}: er bellt, sobald es klingelt."))
+        session.messages.append(AgentMessage(
+            sender="dog",
+            text="Wuff! Wenn es an der Tür klingelt, spüre ich sofort: Da kommt jemand in unser Revier. "
+                 "Ich stelle mich in den Flur und melde laut, damit ihr Bescheid wisst. " * 2
+        ))
+    return session.model_dump(mode="json")
+
+
+def feedback_payload() -> Dict[str, Any]:
+    return {
+        "session_id": "bench-session-0001",
+        "symptom": "Mein Hund bellt jeden Besucher an der Haustür an",
+        "responses": ["Ja", "Sehr hilfreich", "Die Übung", "9", "kein Kommentar"],
+        "timestamp": datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc).isoformat(),
+    }
+
+
+def available_codecs() -> List[Tuple[str, RedisCodec]]:
+    codecs = []
+    for name in CODECS:
+        for threshold in ((0, COMPRESS_THRESHOLD) if name != "json" else (0,)):
+            try:
+                codec = RedisCodec(name, threshold)
+            except V2ConfigurationError as e:
+                print(f"skipped {name}{'+zstd' if threshold else ''}: {e}")
+                continue
+            codecs.append((f"{name}+zstd" if threshold else name, codec))
+    return codecs
+
+
+def _stored_bytes(stored: Any) -> bytes:
+    return stored.encode("utf-8") if isinstance(stored, str) else stored
+
+
+def bench(codec: RedisCodec, payload: Dict[str, Any], iterations: int) -> Tuple[float, float, int]:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        stored = codec.encode(payload)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    stored = _stored_bytes(stored)
+    as_read = stored.decode("utf-8", "surrogateescape")
+    assert codec.decode(as_read) == payload
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(as_read)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+    return encode_us, decode_us, len(stored)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    codecs = available_codecs()
+
+    for label, payload in (("session", session_payload()), ("feedback", feedback_payload())):
+        print(f"\n{label} payload, {args.iterations:,} iterations")
+        print(f"{'codec':<14} {'encode µs':>10} {'decode µs':>10} {'bytes':>8} {'vs json':>8}")
+        baseline = None
+        for name, codec in codecs:
+            encode_us, decode_us, size = bench(codec, payload, args.iterations)
+            baseline = baseline or size
+            print(f"{name:<14} {encode_us:>10.2f} {decode_us:>10.2f} {size:>8,} {size / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# benchmarks/bench_worker_scaling.py
+"""
+Throughput scaling of the multi-worker serving mode.
+
+Starts the stub-backed app (benchmarks.stub_app) under gunicorn with an
+increasing number of workers and drives ``/flow_step`` at a fixed
+concurrency. Every request uses a fresh session id, so each one is a full
+symptom turn and the result does not depend on session affinity.
+
+Usage:
+    python -m benchmarks.bench_worker_scaling --workers 1 2 4 --requests 2000
+
+With REDIS_URL set, the workers share sessions through Redis
+(SESSION_STORE=redis); otherwise each worker keeps its own in-memory store.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+SYMPTOM = "Mein Hund bellt immer an der Tür, wenn es klingelt"
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    """Start gunicorn with the stub app"""
+    env = dict(os.environ)
+    env.update({
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "SESSION_SNAPSHOT_PATH": "",
+        "LOG_LEVEL": env.get("LOG_LEVEL", "WARNING"),
+    })
+    if workers > 1 and not any(env.get(v) for v in ("REDIS_URL", "REDIS_DIRECT_URI", "REDIS_DIRECT_URL")):
+        # Fresh session ids make every turn self-contained, so per-worker
+        # in-memory stores are fine for the stub app
+        env["SESSION_STORE"] = "memory"
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "benchmarks.stub_app:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def drive(base_url: str, total: int, concurrency: int) -> Dict[str, float]:
+    """Send `total` symptom turns with `concurrency` parallel clients"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            payload = {"session_id": str(uuid.uuid4()), "message": SYMPTOM}
+            start = time.perf_counter()
+            response = await client.post(f"{base_url}/flow_step", json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        # Warm up every worker (lazy service initialisation)
+        await asyncio.gather(*(
+            client.post(f"{base_url}/flow_step", json={"session_id": str(uuid.uuid4()), "message": SYMPTOM})
+            for _ in range(concurrency)
+        ))
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def run(worker_counts: List[int], total: int, concurrency: int, port: int) -> List[Dict[str, float]]:
+    results = []
+    for workers in worker_counts:
+        server = start_server(workers, port)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_until_ready(base_url))
+            result = asyncio.run(drive(base_url, total, concurrency))
+            result["workers"] = workers
+            results.append(result)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}  requests: {args.requests}  concurrency: {args.concurrency}")
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+
+    baseline = None
+    for result in run(args.workers, args.requests, args.concurrency, args.port):
+        baseline = baseline or result["rps"]
+        print(
+            f"{result['workers']:>7} {result['rps']:>9.1f} {result['rps'] / baseline:>7.2f}x "
+            f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
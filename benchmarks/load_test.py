@@ -0,0 +1,330 @@
+# benchmarks/load_test.py
+"""
+Conversation load test with stub backends.
+
+Replays scripted or recorded conversations at a configurable concurrency
+and reports turns/sec and latency percentiles per FlowStep (the state a
+turn starts in). OpenAI, Weaviate and Redis are replaced by the stubs from
+benchmarks.stubs with injectable latency distributions.
+
+Modes:
+    inprocess   V2Orchestrator called directly (no HTTP)
+    asgi        the FastAPI app over HTTP through httpx.ASGITransport
+    http        a running server, e.g. ``gunicorn benchmarks.stub_app:app``;
+                the FlowStep of each turn is read from /v2/session/{id}
+                before the turn (not included in the turn latency)
+
+Conversations come from a JSON script file (see
+benchmarks/data/conversations.json), from JSON lines of exported
+SessionState objects, or from a session snapshot file (.bin); for recorded
+sessions the user messages are replayed in order.
+
+Usage:
+    python -m benchmarks.load_test --conversations 500 --concurrency 50 \\
+        --gpt-latency lognormal:0.8,0.4 --weaviate-latency uniform:0.02,0.06
+    python -m benchmarks.load_test --mode http --url http://127.0.0.1:8000 --json result.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.bench_worker_scaling import _percentile
+from src.models.flow_models import FlowStep
+
+DEFAULT_SCRIPTS = Path(__file__).parent / "data" / "conversations.json"
+
+# Report steps in flow order
+_STEP_ORDER = {step.value: i for i, step in enumerate(FlowStep)}
+
+
+@dataclass
+class Conversation:
+    """User turns of one conversation, replayed after /flow_intro"""
+    name: str
+    turns: List[str]
+    weight: int = 1
+
+
+def load_conversations(path: Path) -> List[Conversation]:
+    """Load scripted (.json), exported (.jsonl) or snapshotted (.bin) conversations"""
+    path = Path(path)
+    if path.suffix == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [
+            Conversation(c.get("name", f"script-{i}"), list(c["turns"]), int(c.get("weight", 1)))
+            for i, c in enumerate(data["conversations"])
+        ]
+
+    from src.models.session_state import SessionState
+
+    if path.suffix == ".bin":
+        from src.core.session_snapshot import SessionSnapshot
+        snapshot = SessionSnapshot(path)
+        try:
+            records = [data for _, data, _ in snapshot.unconsumed()]
+        finally:
+            snapshot.close()
+    else:
+        records = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    conversations = []
+    for record in records:
+        session = SessionState.model_validate_json(record)
+        turns = [m.text for m in session.messages if m.sender == "user"]
+        if turns:
+            conversations.append(Conversation(session.session_id, turns))
+    return conversations
+
+
+# ===========================================
+# DRIVERS
+# ===========================================
+
+class InProcessDriver:
+    """Drives V2Orchestrator directly"""
+
+    def __init__(self, orchestrator: Any, session_store: Any):
+        self.orchestrator = orchestrator
+        self.session_store = session_store
+
+    async def start(self) -> str:
+        session = self.session_store.create_session()
+        await self.orchestrator.start_conversation(session.session_id)
+        return session.session_id
+
+    async def step(self, session_id: str) -> str:
+        return self.session_store.sessions[session_id].current_step.value
+
+    async def send(self, session_id: str, text: str) -> bool:
+        await self.orchestrator.handle_message(session_id, text)
+        return True
+
+
+class HttpDriver:
+    """Drives the API over HTTP (in-process ASGI app or a running server)"""
+
+    def __init__(self, client: httpx.AsyncClient, session_store: Any = None):
+        self.client = client
+        self.session_store = session_store
+
+    async def start(self) -> str:
+        response = await self.client.post("/flow_intro")
+        response.raise_for_status()
+        return response.json()["session_id"]
+
+    async def step(self, session_id: str) -> str:
+        if self.session_store is not None:
+            return self.session_store.sessions[session_id].current_step.value
+        response = await self.client.get(f"/v2/session/{session_id}")
+        return response.json().get("current_step", "unknown")
+
+    async def send(self, session_id: str, text: str) -> bool:
+        response = await self.client.post("/flow_step", json={"session_id": session_id, "message": text})
+        return response.status_code == 200
+
+
+# ===========================================
+# LOAD GENERATION
+# ===========================================
+
+@dataclass
+class LoadResult:
+    """Latencies of all turns, grouped by the FlowStep they started in"""
+    mode: str
+    concurrency: int
+    conversations: int = 0
+    turns: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    by_step: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    starts: List[float] = field(default_factory=list)
+
+    @property
+    def turns_per_second(self) -> float:
+        return self.turns / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        def stats(values: List[float]) -> Dict[str, float]:
+            return {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 50) * 1000, 2),
+                "p90_ms": round(_percentile(values, 90) * 1000, 2),
+                "p99_ms": round(_percentile(values, 99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2),
+            }
+
+        all_turns = [latency for values in self.by_step.values() for latency in values]
+        return {
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "conversations": self.conversations,
+            "turns": self.turns,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed, 3),
+            "turns_per_second": round(self.turns_per_second, 1),
+            "turn": stats(all_turns) if all_turns else {},
+            "start": stats(self.starts) if self.starts else {},
+            "steps": {
+                step: stats(self.by_step[step])
+                for step in sorted(self.by_step, key=lambda step: _STEP_ORDER.get(step, len(_STEP_ORDER)))
+            },
+        }
+
+
+async def run_load(
+    driver: Any,
+    conversations: List[Conversation],
+    total: int,
+    concurrency: int,
+    mode: str = "inprocess",
+    seed: int = 42
+) -> LoadResult:
+    """
+    Run `total` conversations with `concurrency` simulated users.
+
+    Conversations are drawn by weight; every user runs its conversations
+    one after another, turns strictly sequential like a real client.
+    """
+    rng = random.Random(seed)
+    plan = rng.choices(conversations, weights=[c.weight for c in conversations], k=total)
+    result = LoadResult(mode=mode, concurrency=concurrency)
+    queue = iter(plan)
+
+    async def user() -> None:
+        for conversation in queue:
+            start = time.perf_counter()
+            try:
+                session_id = await driver.start()
+            except Exception:
+                result.errors += 1
+                continue
+            result.starts.append(time.perf_counter() - start)
+
+            for text in conversation.turns:
+                step = await driver.step(session_id)
+                start = time.perf_counter()
+                try:
+                    ok = await driver.send(session_id, text)
+                except Exception:
+                    ok = False
+                result.by_step[step].append(time.perf_counter() - start)
+                result.turns += 1
+                if not ok:
+                    result.errors += 1
+            result.conversations += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run_inprocess(conversations: List[Conversation], total: int, concurrency: int) -> LoadResult:
+    from src.core.orchestrator import V2Orchestrator
+    from src.models.session_state import SessionStore
+
+    store = SessionStore()
+    orchestrator = V2Orchestrator(session_store=store)
+    driver = InProcessDriver(orchestrator, store)
+    # Initialise services outside of the measurement
+    await run_load(driver, conversations[:1], 1, 1)
+    return await run_load(driver, conversations, total, concurrency, "inprocess")
+
+
+async def run_asgi(conversations: List[Conversation], total: int, concurrency: int) -> LoadResult:
+    import src.main as main_module
+
+    app = main_module.app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60.0) as client:
+            driver = HttpDriver(client, main_module.session_store)
+            await run_load(driver, conversations[:1], 1, 1)
+            return await run_load(driver, conversations, total, concurrency, "asgi")
+
+
+async def run_http(url: str, conversations: List[Conversation], total: int, concurrency: int) -> LoadResult:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        driver = HttpDriver(client)
+        await run_load(driver, conversations[:1], 1, 1)
+        return await run_load(driver, conversations, total, concurrency, "http")
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    print(
+        f"{summary['mode']}: {summary['conversations']} conversations, {summary['turns']} turns, "
+        f"{summary['errors']} errors in {summary['elapsed_s']}s (concurrency {summary['concurrency']})"
+    )
+    print(f"turns/sec: {summary['turns_per_second']}\n")
+    print(f"{'flow step':<24} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = [("(flow_intro)", summary["start"]), *summary["steps"].items(), ("all turns", summary["turn"])]
+    for name, stats in rows:
+        if stats:
+            print(
+                f"{name:<24} {stats['count']:>7} {stats['p50_ms']:>9.2f} {stats['p90_ms']:>9.2f} "
+                f"{stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["inprocess", "asgi", "http"], default="inprocess")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server URL for --mode http")
+    parser.add_argument("--scripts", type=Path, default=DEFAULT_SCRIPTS,
+                        help="Conversations: scripts (.json), exported sessions (.jsonl) or snapshot (.bin)")
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--gpt-latency", default=None, help="e.g. 0.5, uniform:0.3,0.9, lognormal:0.8,0.4")
+    parser.add_argument("--weaviate-latency", default=None)
+    parser.add_argument("--redis-latency", default=None)
+    parser.add_argument("--json", type=Path, help="Write the summary as JSON")
+    parser.add_argument("--max-p99-ms", type=float, help="Exit with status 1 if the p99 turn latency is higher")
+    args = parser.parse_args()
+
+    conversations = load_conversations(args.scripts)
+    if not conversations:
+        parser.error(f"No conversations found in {args.scripts}")
+
+    if args.mode != "http":
+        # Stubs must be installed before the orchestrator creates its services
+        os.environ.setdefault("SESSION_SNAPSHOT_PATH", "")
+        os.environ.setdefault("TRACING_ENABLED", "false")
+        from benchmarks.stub_app import install_stubs
+        install_stubs(args.gpt_latency, args.weaviate_latency, args.redis_latency)
+
+    logging.disable(logging.CRITICAL)
+    # Keep debug prints of the handlers out of the report and the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if args.mode == "inprocess":
+            result = asyncio.run(run_inprocess(conversations, args.conversations, args.concurrency))
+        elif args.mode == "asgi":
+            result = asyncio.run(run_asgi(conversations, args.conversations, args.concurrency))
+        else:
+            result = asyncio.run(run_http(args.url, conversations, args.conversations, args.concurrency))
+
+    summary = result.summary()
+    print_report(summary)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    if args.max_p99_ms is not None and summary["turn"].get("p99_ms", 0) > args.max_p99_ms:
+        print(f"\np99 {summary['turn']['p99_ms']} ms exceeds limit of {args.max_p99_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/stub_app.py
+"""
+The WuffChat ASGI app wired to stub backends.
+
+Serve it like the production app, e.g.
+
+    gunicorn -c gunicorn.conf.py benchmarks.stub_app:app
+
+Unknown session ids start directly at WAIT_FOR_SYMPTOM, so every
+``/flow_step`` with a fresh session id is a complete symptom turn
+(validation, FSM transition, search, agent response) no matter which
+worker serves it.
+"""
+
+from functools import partial
+
+import src.core.orchestrator as orchestrator_module
+import src.main as main_module
+from src.core.session_persistence import RedisSessionStore
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState, SessionStore
+
+from benchmarks.stubs import LatencySpec, StubGPTService, StubWeaviateService, StubRedisService
+
+
+class _StartAtSymptomMixin:
+    """Create unknown sessions at the symptom question instead of the greeting"""
+
+    def get_or_create(self, session_id: str) -> SessionState:
+        known = session_id in self.sessions
+        session = super().get_or_create(session_id)
+        if not known and session.current_step == FlowStep.GREETING:
+            session.current_step = FlowStep.WAIT_FOR_SYMPTOM
+        return session
+
+
+class BenchmarkSessionStore(_StartAtSymptomMixin, SessionStore):
+    """In-memory store for benchmarks"""
+
+
+class BenchmarkRedisSessionStore(_StartAtSymptomMixin, RedisSessionStore):
+    """Shared Redis store for benchmarks"""
+
+
+def install_stubs(
+    gpt_latency: LatencySpec = None,
+    weaviate_latency: LatencySpec = None,
+    redis_latency: LatencySpec = None
+) -> None:
+    """
+    Replace the external services of the orchestrator with stubs.
+
+    Latencies default to the STUB_*_LATENCY environment variables.
+    """
+    orchestrator_module.GPTService = partial(StubGPTService, latency=gpt_latency)
+    orchestrator_module.WeaviateService = partial(StubWeaviateService, latency=weaviate_latency)
+    orchestrator_module.RedisService = partial(StubRedisService, latency=redis_latency)
+
+    main_module.session_store = BenchmarkSessionStore()
+    main_module.RedisSessionStore = BenchmarkRedisSessionStore
+
+
+install_stubs()
+app = main_module.app
@@ -0,0 +1,364 @@
+# benchmarks/stubs.py
+"""
+Stub backends for benchmarks.
+
+Drop-in replacements for GPTService, WeaviateService and RedisService with
+the same async interface and an injectable latency distribution, so
+benchmarks do not need network access or API keys.
+
+Latencies are given in seconds as a number (fixed) or a spec string:
+
+    0.05                   fixed 50 ms
+    uniform:0.02,0.08      uniform between 20 and 80 ms
+    normal:0.5,0.1         mean 500 ms, standard deviation 100 ms
+    lognormal:0.8,0.4      median 800 ms, sigma 0.4 (long tail, like GPT)
+"""
+
+import asyncio
+import math
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from src.core.experiments import record_generation
+from src.services.redis_codec import RedisCodec
+from src.services.redis_service import RedisConfig, RedisPipeline
+
+
+class Latency:
+    """Latency distribution sampled once per stub call"""
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(self, kind: str = "fixed", a: float = 0.0, b: float = 0.0, seed: Optional[int] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{kind}' (expected one of {self.KINDS})")
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self._random = random.Random(seed)
+
+    @classmethod
+    def parse(cls, spec: Union[str, float, "Latency", None], seed: Optional[int] = None) -> "Latency":
+        """Create a distribution from a number, a spec string or an existing Latency"""
+        if isinstance(spec, Latency):
+            return spec
+        if spec is None or spec == "":
+            return cls()
+        if isinstance(spec, (int, float)):
+            return cls("fixed", float(spec))
+        kind, _, params = str(spec).partition(":")
+        if not params:
+            return cls("fixed", float(kind))
+        values = [float(v) for v in params.split(",")]
+        return cls(kind.strip(), values[0], values[1] if len(values) > 1 else 0.0, seed)
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.a
+        if self.kind == "uniform":
+            return self._random.uniform(self.a, self.b)
+        if self.kind == "normal":
+            return max(0.0, self._random.gauss(self.a, self.b))
+        return self._random.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return f"Latency({self.kind}, {self.a}, {self.b})"
+
+
+LatencySpec = Union[str, float, Latency, None]
+
+
+def _latency(env_var: str, default: float) -> Latency:
+    return Latency.parse(os.getenv(env_var, str(default)))
+
+
+class _StubService:
+    """Common no-op lifecycle of all stubs"""
+
+    def __init__(self, config: Any = None, latency: LatencySpec = 0.0):
+        self.config = config
+        self.latency = Latency.parse(latency)
+        self.calls = 0
+        self._initialized = False
+
+    async def initialize(self) -> None:
+        self._initialized = True
+
+    async def shutdown(self) -> None:
+        self._initialized = False
+
+    async def health_check(self) -> Dict[str, Any]:
+        return {"healthy": True, "status": "stub", "details": {}}
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def _wait(self) -> None:
+        self.calls += 1
+        delay = self.latency.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class StubGPTService(_StubService):
+    """GPTService returning a canned completion"""
+
+    RESPONSE = (
+        "Als Hund spüre ich in dieser Situation vor allem meinen Rudelinstinkt. "
+        "Ich möchte wissen, wo mein Platz ist und ob du die Lage im Griff hast."
+    )
+
+    def __init__(self, config: Any = None, latency: LatencySpec = None):
+        super().__init__(config, _latency("STUB_GPT_LATENCY", 0.0) if latency is None else latency)
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        started = time.perf_counter()
+        await self._wait()
+        # Rough token estimate so prompt experiments see the cost of a variant
+        record_generation((time.perf_counter() - started) * 1000, len(prompt) // 4, len(self.RESPONSE) // 4)
+        return self.RESPONSE
+
+    async def complete_structured(self, prompt: str, response_format: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._wait()
+        return {}
+
+
+class StubWeaviateService(_StubService):
+    """WeaviateService returning one good match for every query"""
+
+    PROPERTIES = {
+        "symptom_name": "Bellen an der Tür",
+        "schnelldiagnose": "Dein Hund meldet Besucher und möchte sein Territorium schützen.",
+        "text": "Der territoriale Instinkt sorgt dafür, dass der Hund sein Revier verteidigt.",
+        "anleitung": "Übe täglich ein Ruhesignal an der Tür und belohne ruhiges Verhalten.",
+    }
+
+    def __init__(self, config: Any = None, latency: LatencySpec = None):
+        super().__init__(config, _latency("STUB_WEAVIATE_LATENCY", 0.0) if latency is None else latency)
+
+    async def search(
+        self,
+        collection: str,
+        query: str,
+        limit: int = 5,
+        properties: Optional[List[str]] = None,
+        where_filter: Optional[Dict[str, Any]] = None,
+        return_metadata: bool = False,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        await self._wait()
+        result = {"properties": dict(self.PROPERTIES)}
+        if return_metadata:
+            result["metadata"] = {"distance": 0.3}
+        return [result]
+
+    async def vector_search(self, query: str, collection_name: Optional[str] = None, limit: int = 3, **kwargs):
+        return await self.search(collection_name or "Symptome", query, limit, return_metadata=True)
+
+
+class StubRedisClient:
+    """
+    In-memory stand-in for the redis-py client (decode_responses=True).
+
+    Implements the raw commands RedisPipeline queues and event_log.read_stream
+    calls, so the production pipeline code (encoding, result decoding) runs
+    unchanged on top of it. Values are stored as strings like in Redis.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._stream_ids = 0
+
+    def _alive(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        if expires is not None and expires < time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _container(self, key: str, factory: Callable[[], Any]) -> Any:
+        if not self._alive(key):
+            self._data[key] = factory()
+        return self._data[key]
+
+    # Raw commands (synchronous; the pipeline and the async wrappers call them)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._data[key] if self._alive(key) else None
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        self._data[key] = value
+        self._expires.pop(key, None)
+        if ex:
+            self._expires[key] = time.monotonic() + ex
+        return True
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self.get(key) for key in keys]
+
+    def mset(self, mapping: Dict[str, Any]) -> bool:
+        for key, value in mapping.items():
+            self.set(key, value)
+        return True
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        value = int(self.get(key) or 0) + amount
+        self._data[key] = str(value)
+        return value
+
+    def delete(self, *keys: str) -> int:
+        removed = sum(1 for key in keys if self._alive(key))
+        for key in keys:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return removed
+
+    unlink = delete
+
+    def exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if self._alive(key))
+
+    def expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + seconds
+        return True
+
+    def ttl(self, key: str) -> int:
+        if not self._alive(key):
+            return -2
+        expires = self._expires.get(key)
+        return -1 if expires is None else int(expires - time.monotonic())
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> int:
+        fields = self._container(key, dict)
+        added = sum(1 for field in mapping if field not in fields)
+        fields.update(mapping)
+        return added
+
+    def hgetall(self, key: str) -> Dict[str, Any]:
+        return dict(self._data[key]) if self._alive(key) else {}
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        fields = self._container(key, dict)
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+        return int(fields[field])
+
+    def pfadd(self, key: str, *values: str) -> int:
+        members = self._container(key, set)
+        before = len(members)
+        members.update(values)
+        return int(len(members) != before)
+
+    def pfcount(self, *keys: str) -> int:
+        members = set()
+        for key in keys:
+            if self._alive(key):
+                members.update(self._data[key])
+        return len(members)
+
+    def rpush(self, key: str, *values: Any) -> int:
+        items = self._container(key, list)
+        items.extend(values)
+        return len(items)
+
+    def lrange(self, key: str, start: int = 0, end: int = -1) -> List[Any]:
+        if not self._alive(key):
+            return []
+        items = self._data[key]
+        return items[start:len(items) if end == -1 else end + 1]
+
+    def xadd(self, stream: str, fields: Dict[str, Any], maxlen: Optional[int] = None, approximate: bool = True) -> str:
+        entries = self._container(stream, list)
+        self._stream_ids += 1
+        entry_id = f"{int(time.time() * 1000)}-{self._stream_ids}"
+        entries.append((entry_id, {name: str(value) for name, value in fields.items()}))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[:len(entries) - maxlen]
+        return entry_id
+
+    async def xrange(self, stream: str, min: str = "-", max: str = "+", count: Optional[int] = None) -> List[Any]:
+        entries = self._data.get(stream, []) if self._alive(stream) else []
+        if min.startswith("("):
+            ids = [entry_id for entry_id, _ in entries]
+            entries = entries[ids.index(min[1:]) + 1:] if min[1:] in ids else entries
+        return entries[:count] if count else list(entries)
+
+    def pipeline(self, transaction: bool = False) -> "_StubClientPipeline":
+        return _StubClientPipeline(self)
+
+
+class _StubClientPipeline:
+    """Queues raw commands and applies them in order on execute()"""
+
+    def __init__(self, client: StubRedisClient):
+        self._client = client
+        self._commands: List[Any] = []
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        command = getattr(self._client, name)
+
+        def queue(*args, **kwargs) -> None:
+            self._commands.append((command, args, kwargs))
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        # Applied without awaiting in between, i.e. atomically like MULTI/EXEC
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class StubRedisService(_StubService):
+    """
+    In-memory RedisService (process-local, TTLs are honoured on read).
+
+    ``client`` and ``pipeline()``/``transaction()`` behave like the real
+    service (values encoded by the production RedisPipeline), so the stub
+    can back RedisSessionStore, the event log, feedback and analytics. The
+    plain get/set methods store values as given. One stub round trip costs
+    one latency sample, like one Redis round trip.
+    """
+
+    def __init__(self, config: Any = None, latency: LatencySpec = None):
+        super().__init__(
+            config or RedisConfig(url="redis://stub"),
+            _latency("STUB_REDIS_LATENCY", 0.0) if latency is None else latency
+        )
+        self.client = StubRedisClient()
+        self.codec = RedisCodec("json")
+
+    def is_enabled(self) -> bool:
+        return True
+
+    async def get(self, key: str, default: Any = None, **kwargs) -> Any:
+        await self._wait()
+        value = self.client.get(key)
+        return default if value is None else value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, **kwargs) -> bool:
+        await self._wait()
+        return self.client.set(key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> int:
+        await self._wait()
+        return self.client.delete(*keys)
+
+    async def exists(self, *keys: str) -> int:
+        return self.client.exists(*keys)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[RedisPipeline]:
+        pipe = RedisPipeline(self.client.pipeline(transaction), transaction, self.codec)
+        yield pipe
+        await self._wait()
+        await pipe.execute()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[RedisPipeline]:
+        async with self.pipeline(transaction=True) as pipe:
+            yield pipe
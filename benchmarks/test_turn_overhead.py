@@ -0,0 +1,186 @@
+# benchmarks/test_turn_overhead.py
+"""
+Per-turn framework overhead of every FlowStep transition.
+
+Each benchmark drives one transition through V2Orchestrator.handle_message
+with zero-latency stub services, so the measured time is the framework
+alone: classification, validation, FSM dispatch, handlers and agents,
+prompt rendering, message conversion, tracing, logging and session
+handling. Backend calls per turn and the median time per trace span
+(classify, transition, handler, agent.respond, ...) are stored in
+``extra_info``.
+
+Usage:
+    python -m benchmarks.turn_baseline save       # store benchmarks/baselines/turn_overhead.json
+    python -m benchmarks.turn_baseline compare    # fail on regressions against it
+    pytest benchmarks/test_turn_overhead.py --benchmark-only
+"""
+
+import asyncio
+import statistics
+from collections import defaultdict
+from typing import Dict, List
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.stubs import StubGPTService, StubWeaviateService, StubRedisService
+from src.core.flow_engine import FlowEngine
+from src.core.flow_handlers import FlowHandlers
+from src.core.orchestrator import V2Orchestrator
+from src.core.prompt_manager import PromptManager
+from src.core.tracing import TurnTrace, get_tracer
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState, SessionStore
+
+SYMPTOM = "Mein Hund bellt immer an der Tür, wenn es klingelt"
+CONTEXT = "Es passiert vor allem abends, wenn Besuch kommt und er allein im Flur ist"
+
+# Main path used to reach every state: (state the input is sent in, input)
+PATH = [
+    (FlowStep.WAIT_FOR_SYMPTOM, SYMPTOM),
+    (FlowStep.WAIT_FOR_CONFIRMATION, "ja"),
+    (FlowStep.WAIT_FOR_CONTEXT, CONTEXT),
+    (FlowStep.ASK_FOR_EXERCISE, "ja"),
+    (FlowStep.END_OR_RESTART, "nein"),
+    (FlowStep.FEEDBACK_Q1, "Ja, die Beratung hat mir geholfen"),
+    (FlowStep.FEEDBACK_Q2, "Sehr spannend"),
+    (FlowStep.FEEDBACK_Q3, "Die Übung probiere ich aus"),
+    (FlowStep.FEEDBACK_Q4, "9"),
+    (FlowStep.FEEDBACK_Q5, ""),
+]
+
+# (benchmark id, state, input, expected state after the turn)
+TRANSITIONS = [
+    ("symptom", FlowStep.WAIT_FOR_SYMPTOM, SYMPTOM, FlowStep.WAIT_FOR_CONFIRMATION),
+    ("symptom_too_short", FlowStep.WAIT_FOR_SYMPTOM, "Hund", FlowStep.WAIT_FOR_SYMPTOM),
+    ("confirmation_yes", FlowStep.WAIT_FOR_CONFIRMATION, "ja", FlowStep.WAIT_FOR_CONTEXT),
+    ("confirmation_no", FlowStep.WAIT_FOR_CONFIRMATION, "nein", FlowStep.WAIT_FOR_SYMPTOM),
+    ("confirmation_unclear", FlowStep.WAIT_FOR_CONFIRMATION, "vielleicht", FlowStep.WAIT_FOR_CONFIRMATION),
+    ("context", FlowStep.WAIT_FOR_CONTEXT, CONTEXT, FlowStep.ASK_FOR_EXERCISE),
+    ("exercise_yes", FlowStep.ASK_FOR_EXERCISE, "ja", FlowStep.END_OR_RESTART),
+    ("exercise_no", FlowStep.ASK_FOR_EXERCISE, "nein", FlowStep.FEEDBACK_Q1),
+    ("restart_yes", FlowStep.END_OR_RESTART, "ja", FlowStep.WAIT_FOR_SYMPTOM),
+    ("restart_no", FlowStep.END_OR_RESTART, "nein", FlowStep.FEEDBACK_Q1),
+    ("feedback_q1", FlowStep.FEEDBACK_Q1, "Ja, die Beratung hat mir geholfen", FlowStep.FEEDBACK_Q2),
+    ("feedback_q2", FlowStep.FEEDBACK_Q2, "Sehr spannend", FlowStep.FEEDBACK_Q3),
+    ("feedback_q3", FlowStep.FEEDBACK_Q3, "Die Übung probiere ich aus", FlowStep.FEEDBACK_Q4),
+    ("feedback_q4", FlowStep.FEEDBACK_Q4, "9", FlowStep.FEEDBACK_Q5),
+    ("feedback_complete", FlowStep.FEEDBACK_Q5, "", FlowStep.GREETING),
+    ("restart_command", FlowStep.WAIT_FOR_CONTEXT, "neu", FlowStep.WAIT_FOR_SYMPTOM),
+]
+
+SESSION_ID = "bench-turn"
+
+
+class TurnBench:
+    """Orchestrator with stub services and one prepared session per state"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.store = SessionStore()
+        self.stubs = {
+            "gpt": StubGPTService(latency=0),
+            "weaviate": StubWeaviateService(latency=0),
+            "redis": StubRedisService(latency=0),
+        }
+        handlers = FlowHandlers(
+            prompt_manager=PromptManager(),
+            gpt_service=self.stubs["gpt"],
+            weaviate_service=self.stubs["weaviate"],
+            redis_service=self.stubs["redis"]
+        )
+        self.orchestrator = V2Orchestrator(session_store=self.store, flow_engine=FlowEngine(handlers))
+        self.sessions: Dict[FlowStep, SessionState] = self._prepare_sessions()
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def _prepare_sessions(self) -> Dict[FlowStep, SessionState]:
+        """Walk the main path once and keep a copy of the session in every state"""
+        session = self.store.create_session()
+        self.run(self.orchestrator.start_conversation(session.session_id))
+        sessions = {}
+        for state, text in PATH:
+            assert session.current_step == state, f"expected {state}, got {session.current_step}"
+            sessions[state] = session.model_copy(deep=True)
+            self.run(self.orchestrator.handle_message(session.session_id, text))
+        return sessions
+
+    def reset(self, state: FlowStep) -> None:
+        """Put a fresh copy of the prepared session for `state` into the store"""
+        session = self.sessions[state].model_copy(deep=True)
+        session.session_id = SESSION_ID
+        self.store.sessions[SESSION_ID] = session
+
+    def backend_calls(self) -> Dict[str, int]:
+        return {name: stub.calls for name, stub in self.stubs.items()}
+
+    def close(self) -> None:
+        self.loop.close()
+
+
+def _phase_medians(traces: List[TurnTrace]) -> Dict[str, float]:
+    """Median time per span name (µs), summed within each turn"""
+    per_phase: Dict[str, List[float]] = defaultdict(list)
+    for trace in traces:
+        totals: Dict[str, float] = defaultdict(float)
+        for span in trace.root.walk():
+            if span is not trace.root:
+                totals[span.name] += span.duration_ms * 1000
+        for name, total in totals.items():
+            per_phase[name].append(total)
+    return {name: round(statistics.median(values), 1) for name, values in sorted(per_phase.items())}
+
+
+@pytest.fixture(scope="module")
+def bench():
+    turn_bench = TurnBench()
+    yield turn_bench
+    turn_bench.close()
+
+
+@pytest.fixture
+def traces():
+    """Collect the traces of all turns recorded during one benchmark"""
+    collected: List[TurnTrace] = []
+    tracer = get_tracer()
+    tracer.add_hook(collected.append)
+    yield collected
+    tracer.remove_hook(collected.append)
+
+
+def test_start_conversation(benchmark, bench, traces):
+    def setup():
+        bench.store.sessions[SESSION_ID] = SessionState(session_id=SESSION_ID)
+
+    benchmark.pedantic(
+        lambda: bench.run(bench.orchestrator.start_conversation(SESSION_ID)),
+        setup=setup, rounds=200, warmup_rounds=5
+    )
+
+    assert bench.store.sessions[SESSION_ID].current_step == FlowStep.WAIT_FOR_SYMPTOM
+    benchmark.extra_info["phases_us"] = _phase_medians(traces)
+
+
+@pytest.mark.parametrize(
+    "state,text,expected",
+    [pytest.param(state, text, expected, id=name) for name, state, text, expected in TRANSITIONS]
+)
+def test_turn(benchmark, bench, traces, state, text, expected):
+    calls_before = bench.backend_calls()
+    bench.reset(state)
+    bench.run(bench.orchestrator.handle_message(SESSION_ID, text))
+    benchmark.extra_info["backend_calls"] = {
+        name: count - calls_before[name] for name, count in bench.backend_calls().items()
+    }
+    assert bench.store.sessions[SESSION_ID].current_step == expected
+    traces.clear()
+
+    benchmark.pedantic(
+        lambda: bench.run(bench.orchestrator.handle_message(SESSION_ID, text)),
+        setup=lambda: bench.reset(state), rounds=200, warmup_rounds=5
+    )
+
+    benchmark.extra_info["phases_us"] = _phase_medians(traces)
@@ -0,0 +1,116 @@
+# benchmarks/turn_baseline.py
+"""
+Store and compare JSON baselines of the per-turn overhead benchmarks.
+
+Runs benchmarks/test_turn_overhead.py through pytest-benchmark and keeps a
+compact baseline (median, mean, stddev and extra_info per benchmark) in
+benchmarks/baselines/turn_overhead.json. ``compare`` fails with exit code 1
+if any median is slower than the baseline by more than the threshold.
+
+Usage:
+    python -m benchmarks.turn_baseline save
+    python -m benchmarks.turn_baseline compare [--threshold 25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+BENCHMARK_FILE = Path(__file__).parent / "test_turn_overhead.py"
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "turn_overhead.json"
+
+
+def run_benchmarks(pytest_args: list) -> Dict[str, Any]:
+    """Run the benchmark suite and return the compact results"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / "benchmark.json"
+        env = dict(os.environ, TRACING_ENABLED="true", EVENT_LOG_BACKEND="none", SESSION_SNAPSHOT_PATH="")
+        command = [
+            sys.executable, "-m", "pytest", str(BENCHMARK_FILE),
+            "--benchmark-only", f"--benchmark-json={output}",
+            "-p", "no:cacheprovider", "--no-cov", "-q", *pytest_args
+        ]
+        completed = subprocess.run(command, env=env)
+        if completed.returncode != 0 or not output.exists():
+            raise SystemExit(completed.returncode or 1)
+        raw = json.loads(output.read_text(encoding="utf-8"))
+
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": {
+            bench["name"]: {
+                "median_us": round(bench["stats"]["median"] * 1e6, 2),
+                "mean_us": round(bench["stats"]["mean"] * 1e6, 2),
+                "stddev_us": round(bench["stats"]["stddev"] * 1e6, 2),
+                "rounds": bench["stats"]["rounds"],
+                "extra_info": bench.get("extra_info", {}),
+            }
+            for bench in raw["benchmarks"]
+        },
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> int:
+    """Print a comparison table; return the number of regressions"""
+    regressions = 0
+    print(f"\n{'benchmark':<36} {'baseline us':>12} {'current us':>12} {'change':>9}")
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            print(f"{name:<36} {'-':>12} {result['median_us']:>12.1f} {'new':>9}")
+            continue
+        change = (result["median_us"] / reference["median_us"] - 1) * 100
+        marker = ""
+        if change > threshold:
+            regressions += 1
+            marker = "  REGRESSION"
+        print(f"{name:<36} {reference['median_us']:>12.1f} {result['median_us']:>12.1f} {change:>+8.1f}%{marker}")
+
+    missing = sorted(set(baseline["benchmarks"]) - set(current["benchmarks"]))
+    for name in missing:
+        print(f"{name:<36} {baseline['benchmarks'][name]['median_us']:>12.1f} {'-':>12} {'missing':>9}")
+
+    if baseline.get("machine") != current.get("machine"):
+        print(f"\nNote: baseline was recorded on {baseline.get('machine')}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["save", "compare"])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="Allowed slowdown of the median in percent (default 25)")
+    parser.add_argument("pytest_args", nargs="*", help="Extra pytest arguments, e.g. -k feedback")
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.pytest_args)
+
+    if args.command == "save":
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nBaseline with {len(current['benchmarks'])} benchmarks written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        parser.error(f"No baseline at {args.baseline}, run 'save' first")
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{regressions} benchmark(s) slower than the baseline by more than {args.threshold}%")
+        sys.exit(1)
+    print(f"\nNo regressions above {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
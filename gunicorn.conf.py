@@ -0,0 +1,65 @@
+# gunicorn.conf.py
+"""
+Gunicorn configuration for multi-worker serving.
+
+Usage:
+    gunicorn -c gunicorn.conf.py src.main:app
+
+Environment:
+    PORT             Port to bind (default: 8000)
+    WEB_CONCURRENCY  Number of worker processes (default: 1)
+    SESSION_STORE    "memory" or "redis" (default: "redis" with >1 worker)
+
+Sessions live in process memory unless they are shared through Redis, so
+more than one worker is only started when a Redis URL is configured (or
+SESSION_STORE=memory explicitly accepts per-worker sessions).
+"""
+
+import os
+import logging
+
+from src.core.worker_lifecycle import warm_shared_state, reset_after_fork
+
+logger = logging.getLogger("gunicorn.error")
+
+REDIS_URL_ENV_VARS = (
+    "REDIS_DIRECT_URI",
+    "REDIS_DIRECT_URL",
+    "REDIS_URL",
+    "REDIS_CLI_DIRECT_URI",
+    "REDIS_CLI_URL",
+)
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Import the app once in the master; workers share it copy-on-write
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+if workers > 1:
+    if os.getenv("SESSION_STORE", "").lower() == "memory":
+        # Explicit opt-out, e.g. behind a load balancer with sticky sessions
+        logger.warning(f"{workers} workers with in-memory sessions - sessions are not shared")
+    elif not any(os.getenv(var) for var in REDIS_URL_ENV_VARS):
+        logger.warning(
+            f"WEB_CONCURRENCY={workers} requires Redis for shared sessions - "
+            "starting a single worker"
+        )
+        workers = 1
+        os.environ["WEB_CONCURRENCY"] = "1"
+    else:
+        os.environ.setdefault("SESSION_STORE", "redis")
+
+def on_starting(server):
+    """Build read-only state once before forking the workers"""
+    warm_shared_state()
+
+
+def post_fork(server, worker):
+    """Drop per-process state inherited from the master"""
+    reset_after_fork()
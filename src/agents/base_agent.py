@@ -15,7 +15,8 @@ from typing import List, Dict, Optional, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
-from src.core.prompt_manager import PromptManager, PromptType
+from src.core.prompt_manager import PromptManager, PromptType, get_prompt_manager
+from src.core.token_budget import get_token_budget
 from src.core.exceptions import V2AgentError, V2ValidationError
 from src.services.gpt_service import GPTService
 from src.services.weaviate_service import WeaviateService
@@ -29,6 +30,15 @@ class V2AgentMessage:
     text: str
     message_type: str = "response"
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API response format of /flow_intro and /flow_step (metadata is copied)"""
+        return {
+            "sender": self.sender,
+            "text": self.text,
+            "message_type": self.message_type,
+            "metadata": dict(self.metadata)
+        }
 
 
 class MessageType(str, Enum):
@@ -90,7 +100,7 @@ class BaseAgent(ABC):
         self.role = role
         
         # Services - injected for testability
-        self.prompt_manager = prompt_manager or PromptManager()
+        self.prompt_manager = prompt_manager or get_prompt_manager()
         self.gpt_service = gpt_service
         self.weaviate_service = weaviate_service
         self.redis_service = redis_service
@@ -240,8 +250,11 @@ class BaseAgent(ABC):
             raise V2AgentError(f"GPT service not available for agent {self.name}")
         
         try:
-            # Get prompt from manager
+            # Get prompt from manager, within the token budgets
+            budget = get_token_budget()
+            prompt_params = budget.fit(prompt_type, prompt_params)
             prompt = self.prompt_manager.get_prompt(prompt_type, **prompt_params)
+            prompt = budget.finish(prompt_type, prompt, prompt_params)
             
             # Generate text
             result = await self.gpt_service.complete(
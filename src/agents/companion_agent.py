@@ -9,6 +9,7 @@ All business logic (saving feedback, GDPR compliance, etc.) is handled by servic
 from typing import List, Dict, Optional, Any
 from src.agents.base_agent import BaseAgent, AgentContext, MessageType, V2AgentMessage
 from src.core.prompt_manager import PromptType
+from src.core.tracing import traced
 from src.core.exceptions import V2AgentError, V2ValidationError
 
 
@@ -50,6 +51,10 @@ class CompanionAgent(BaseAgent):
             MessageType.ERROR
         ]
     
+    @traced("agent.respond", lambda self, context: {
+        "agent": self.name,
+        "message_type": getattr(context.message_type, "value", context.message_type)
+    })
     async def respond(self, context: AgentContext) -> List[V2AgentMessage]:
         """
         Generate companion messages based on context.
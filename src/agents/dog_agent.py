@@ -6,11 +6,15 @@ This agent handles ONLY message formatting for dog-perspective responses.
 All business logic (RAG analysis, symptom checking, etc.) is handled by services.
 """
 
+import logging
 from typing import List, Dict, Optional, Any
 from src.agents.base_agent import BaseAgent, AgentContext, MessageType, V2AgentMessage
+from src.core.tracing import traced
 from src.core.exceptions import V2AgentError, V2ValidationError
 from src.core.prompt_manager import PromptType, PromptCategory
 
+logger = logging.getLogger(__name__)
+
 
 class DogAgent(BaseAgent):
     """
@@ -48,6 +52,10 @@ class DogAgent(BaseAgent):
             MessageType.INSTRUCTION
         ]
     
+    @traced("agent.respond", lambda self, context: {
+        "agent": self.name,
+        "message_type": getattr(context.message_type, "value", context.message_type)
+    })
     async def respond(self, context: AgentContext) -> List[V2AgentMessage]:
         """
         Generate dog perspective messages based on context.
@@ -98,25 +106,38 @@ class DogAgent(BaseAgent):
         Args:
             context: Agent context
             
+        Returns:
+            List of greeting messages
+        """
+        return self.greeting_messages()
+    
+    def greeting_messages(self) -> List[V2AgentMessage]:
+        """
+        Greeting and follow-up question (static prompts, no service calls).
+        
+        The orchestrator precomputes these for /flow_intro, see
+        V2Orchestrator.prepare_greeting().
+        
         Returns:
             List of greeting messages
         """
         try:
             # Debug: List available prompts
-            print(f"DEBUG: Available dog prompts: {self.prompt_manager.list_prompts(PromptCategory.DOG)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available dog prompts: %s", self.prompt_manager.list_prompts(PromptCategory.DOG))
             
             # Try to get greeting prompts with fallbacks
             try:
                 greeting_text = self.prompt_manager.get_prompt(PromptType.DOG_GREETING)
             except Exception as e:
-                print(f"DEBUG: Failed to get DOG_GREETING: {e}")
+                logger.debug("Failed to get DOG_GREETING: %s", e)
                 # Fallback greeting
                 greeting_text = "Wuff! Schön, dass Du da bist. Bitte nenne mir ein Verhalten und ich schildere dir, wie ich es erlebe."
             
             try:
                 follow_up_text = self.prompt_manager.get_prompt(PromptType.DOG_GREETING_FOLLOWUP)
             except Exception as e:
-                print(f"DEBUG: Failed to get DOG_GREETING_FOLLOWUP: {e}")
+                logger.debug("Failed to get DOG_GREETING_FOLLOWUP: %s", e)
                 # Fallback follow-up
                 follow_up_text = "Beschreib mir bitte, was du beobachtet hast."
             
@@ -126,9 +147,7 @@ class DogAgent(BaseAgent):
             ]
             
         except Exception as e:
-            print(f"ERROR in _handle_greeting: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error building greeting: %s", e, exc_info=True)
             # Return fallback messages instead of raising
             return [
                 self.create_message(
@@ -171,7 +190,6 @@ class DogAgent(BaseAgent):
             raise V2AgentError(f"Unknown response mode: {response_mode}")
     
     async def _handle_question(self, context: AgentContext) -> List[V2AgentMessage]:
-        print(f"DEBUG: Entering _handle_question")
         """
         Generate question messages from dog perspective.
         
@@ -183,16 +201,15 @@ class DogAgent(BaseAgent):
         """
         question_type = context.metadata.get('question_type', 'confirmation')
         
-        print(f"DEBUG _handle_question: question_type={question_type}")
+        logger.debug("_handle_question: question_type=%s", question_type)
         
         if question_type == 'confirmation':
             text = self.prompt_manager.get_prompt(PromptType.DOG_CONFIRMATION_QUESTION)
         elif question_type == 'context':
             text = self.prompt_manager.get_prompt(PromptType.DOG_CONTEXT_QUESTION)
         elif question_type == 'exercise':
-            print(f"DEBUG: Getting exercise question")
             text = self.prompt_manager.get_prompt(PromptType.DOG_EXERCISE_QUESTION)
-            print(f"DEBUG: Exercise question text: {text}")
+            logger.debug("Exercise question text: %s", text)
         elif question_type == 'restart':
             text = self.prompt_manager.get_prompt(PromptType.DOG_CONTINUE_OR_RESTART)
         elif question_type == 'ask_for_more':
@@ -308,13 +325,13 @@ class DogAgent(BaseAgent):
             List with diagnosis message
         """
        
-        print(f"DEBUG _generate_diagnosis: metadata={context.metadata}")
+        logger.debug("_generate_diagnosis: metadata=%s", context.metadata)
        
         analysis_data = context.metadata.get('analysis_data', {})
         primary_instinct = analysis_data.get('primary_instinct', 'unbekannter Instinkt')
         primary_description = analysis_data.get('primary_description', 'Keine Beschreibung verfügbar')
         
-        print(f"DEBUG: primary_instinct={primary_instinct}, primary_description={primary_description}")
+        logger.debug("primary_instinct=%s, primary_description=%s", primary_instinct, primary_description)
 
         try:
             # Format diagnosis from dog perspective
@@ -325,14 +342,12 @@ class DogAgent(BaseAgent):
                 temperature=self._default_temperature
             )
 
-            print(f"DEBUG: Generated diagnosis text: {diagnosis_text[:50]}...")
+            logger.debug("Generated diagnosis text: %.50s...", diagnosis_text)
             
             return [self.create_message(diagnosis_text, MessageType.RESPONSE)]
         
         except Exception as e:
-            print(f"DEBUG: Error generating diagnosis: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error generating diagnosis: %s", e, exc_info=True)
             # Return error message
             return [self.create_message(self.prompt_manager.get_prompt(PromptType.DOG_TECHNICAL_ERROR), MessageType.ERROR)]
 
@@ -0,0 +1,419 @@
+# src/v2/core/analytics.py
+"""
+Real-time traffic counters for WuffChat V2.
+
+Replaces grepping the "Symptom search" / "Match confirmation" log lines:
+handlers record what happened (no I/O), a background task adds the counts
+to per-minute buckets in Redis, and /v2/stats aggregates a time window.
+
+Per minute, in one MULTI/EXEC per flush:
+
+- ``stats:{minute}``           hash of counters, incremented with HINCRBY:
+  ``step:{flow_step}`` entries per FlowStep, ``search:match`` /
+  ``search:no_match``, ``confirm:yes`` / ``confirm:no`` and the distance
+  histograms ``search_distance:{bucket}`` / ``confirm_distance:{bucket}``
+- ``stats:sessions:{minute}``  HyperLogLog of the session ids seen
+
+Counts are aggregated in process between flushes, so a turn costs a few
+dict updates. Both keys expire after the retention period. While a
+configured Redis is unreachable the counts stay pending and are written
+once it is back. Without Redis the buckets stay in process memory, and
+/v2/stats reports this worker only (as it does while reading from Redis
+fails). Counts held in process memory, pending or local, are kept for a
+shorter period and with a bounded number of session ids per minute.
+
+Configuration:
+    STATS_ENABLED             0 disables recording (default 1)
+    STATS_FLUSH_INTERVAL      seconds between writes (default 1.0)
+    STATS_RETENTION           seconds a minute bucket is kept (default 2 days)
+    STATS_LOCAL_RETENTION     seconds a bucket is kept in process memory (default 1 hour)
+    STATS_LOCAL_MAX_SESSIONS  session ids per minute kept in process memory (default 10000)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from src.core.exceptions import RedisServiceError
+
+logger = logging.getLogger(__name__)
+
+# Distance histogram: buckets of 0.1 up to 1.0, everything above in "1.0+"
+DISTANCE_BUCKET_WIDTH = 0.1
+DISTANCE_BUCKET_COUNT = 10
+
+
+def distance_bucket(distance: float) -> str:
+    """Histogram bucket label of a Weaviate distance, e.g. "0.3-0.4" """
+    index = int(max(distance, 0.0) / DISTANCE_BUCKET_WIDTH + 1e-9)
+    if index >= DISTANCE_BUCKET_COUNT:
+        return f"{DISTANCE_BUCKET_COUNT * DISTANCE_BUCKET_WIDTH:.1f}+"
+    return f"{index * DISTANCE_BUCKET_WIDTH:.1f}-{(index + 1) * DISTANCE_BUCKET_WIDTH:.1f}"
+
+
+@dataclass
+class AnalyticsConfig:
+    """Configuration for the analytics counters"""
+    enabled: bool = True
+    flush_interval: float = 1.0
+    retention: int = 172800  # 2 days
+    key_prefix: str = "stats"
+    local_retention: int = 3600  # in process memory (no Redis, or unreachable)
+    local_max_sessions: int = 10000  # per minute; unique counts saturate beyond
+
+
+class _Bucket:
+    """Counters and session ids of one minute"""
+    __slots__ = ("counts", "sessions")
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.sessions: Set[str] = set()
+
+    def merge(self, other: "_Bucket") -> None:
+        self.counts.update(other.counts)
+        self.sessions.update(other.sessions)
+
+
+class AnalyticsCounters:
+    """
+    Per-minute counters with a background Redis writer.
+
+    Usage:
+        analytics = get_analytics()
+        analytics.record_step(session_id, FlowStep.WAIT_FOR_SYMPTOM)   # no I/O
+        analytics.record_search(distance=0.42, matched=True)
+        ...
+        await analytics.get_stats(minutes=60)
+    """
+
+    def __init__(self, redis_service: Any = None, config: Optional[AnalyticsConfig] = None):
+        """
+        Initialize the counters.
+
+        Args:
+            redis_service: Initialized RedisService. Without a configured
+                Redis the buckets are kept in process memory.
+            config: Analytics configuration. If not provided, uses environment variables.
+        """
+        if config is None:
+            config = AnalyticsConfig(
+                enabled=os.getenv("STATS_ENABLED", "1").lower() not in ("0", "false", "no"),
+                flush_interval=float(os.getenv("STATS_FLUSH_INTERVAL", "1.0")),
+                retention=int(os.getenv("STATS_RETENTION", "172800")),
+                local_retention=int(os.getenv("STATS_LOCAL_RETENTION", "3600")),
+                local_max_sessions=int(os.getenv("STATS_LOCAL_MAX_SESSIONS", "10000"))
+            )
+
+        self.config = config
+        self.redis_service = redis_service
+
+        self._pending: Dict[int, _Bucket] = {}
+        self._local: Dict[int, _Bucket] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self._flushes = 0
+        self._failed_flushes = 0
+
+    # ===========================================
+    # RECORDING (hot path, no I/O)
+    # ===========================================
+
+    def _bucket(self) -> Optional[_Bucket]:
+        if not self.config.enabled:
+            return None
+        minute = int(time.time() // 60)
+        bucket = self._pending.get(minute)
+        if bucket is None:
+            bucket = self._pending[minute] = _Bucket()
+        return bucket
+
+    def record_step(self, session_id: str, step: Any) -> None:
+        """Count the entry of a session into a FlowStep"""
+        bucket = self._bucket()
+        if bucket is not None:
+            bucket.counts[f"step:{getattr(step, 'value', step)}"] += 1
+            bucket.sessions.add(session_id)
+
+    def record_search(self, distance: Optional[float], matched: bool) -> None:
+        """Count a symptom search and the distance of its best result"""
+        bucket = self._bucket()
+        if bucket is not None:
+            bucket.counts["search:match" if matched else "search:no_match"] += 1
+            if isinstance(distance, (int, float)):
+                bucket.counts[f"search_distance:{distance_bucket(distance)}"] += 1
+
+    def record_confirmation(self, confirmed: bool, distance: Optional[float] = None) -> None:
+        """Count the user's answer to a proposed match"""
+        bucket = self._bucket()
+        if bucket is not None:
+            bucket.counts["confirm:yes" if confirmed else "confirm:no"] += 1
+            if isinstance(distance, (int, float)):
+                bucket.counts[f"confirm_distance:{distance_bucket(distance)}"] += 1
+
+    # ===========================================
+    # WRITER
+    # ===========================================
+
+    def key(self, minute: int) -> str:
+        return f"{self.config.key_prefix}:{minute}"
+
+    def sessions_key(self, minute: int) -> str:
+        return f"{self.config.key_prefix}:sessions:{minute}"
+
+    async def start(self) -> None:
+        """Start the background writer"""
+        if self._task is not None or not self.config.enabled:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Analytics counters started ({'Redis' if self._redis_available() else 'in-process'})")
+
+    async def stop(self) -> None:
+        """Stop the background writer and write the pending counts"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write the pending counts.
+
+        Returns:
+            Number of minute buckets written
+        """
+        async with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+
+            if not self._redis_configured():
+                self._keep_local(pending)
+                return len(pending)
+
+            if not self.redis_service.is_connected():
+                # Redis is down or the circuit is open: write once it is back
+                self._retry_later(pending)
+                return 0
+
+            try:
+                await self._write(pending)
+            except Exception as e:
+                # Counts are additive: retry them with the next flush
+                self._failed_flushes += 1
+                logger.warning(f"Writing analytics counters failed, retrying: {e}")
+                self._retry_later(pending)
+                return 0
+
+            self._flushes += 1
+            return len(pending)
+
+    async def _write(self, pending: Dict[int, _Bucket]) -> None:
+        """Add the counts of all pending minutes in one MULTI/EXEC (all or nothing)"""
+        ttl = self.config.retention
+        async with self.redis_service.transaction() as pipe:
+            for minute, bucket in pending.items():
+                key = self.key(minute)
+                for field, count in bucket.counts.items():
+                    pipe.hincrby(key, field, count)
+                pipe.expire(key, ttl)
+                if bucket.sessions:
+                    sessions_key = self.sessions_key(minute)
+                    pipe.pfadd(sessions_key, *bucket.sessions)
+                    pipe.expire(sessions_key, ttl)
+
+    def _retry_later(self, pending: Dict[int, _Bucket]) -> None:
+        """Put unwritten counts back in front of the next flush"""
+        self._merge_bounded(self._pending, pending)
+
+    def _keep_local(self, pending: Dict[int, _Bucket]) -> None:
+        """Keep counts in process memory (no Redis configured)"""
+        self._merge_bounded(self._local, pending)
+
+    def _merge_bounded(self, buckets: Dict[int, _Bucket], pending: Dict[int, _Bucket]) -> None:
+        """Merge counts into in-process buckets, bounded by local_retention and local_max_sessions"""
+        limit = self.config.local_max_sessions
+        oldest = self._oldest_minute(self.config.local_retention)
+        for minute, bucket in pending.items():
+            if minute < oldest:
+                continue
+            target = buckets.setdefault(minute, _Bucket())
+            target.counts.update(bucket.counts)
+            room = limit - len(target.sessions)
+            if room >= len(bucket.sessions):
+                target.sessions.update(bucket.sessions)
+            elif room > 0:
+                target.sessions.update(list(bucket.sessions)[:room])
+        for minute in [m for m in buckets if m < oldest]:
+            del buckets[minute]
+
+    @staticmethod
+    def _oldest_minute(retention: int) -> int:
+        return int(time.time() // 60) - retention // 60
+
+    def _redis_configured(self) -> bool:
+        return self.redis_service is not None and self.redis_service.is_enabled()
+
+    def _redis_available(self) -> bool:
+        return self._redis_configured() and self.redis_service.is_connected()
+
+    async def _run(self) -> None:
+        """Background loop writing at the configured interval"""
+        while True:
+            await asyncio.sleep(self.config.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Unexpected error in analytics writer loop: {e}")
+
+    # ===========================================
+    # AGGREGATION
+    # ===========================================
+
+    async def get_stats(self, minutes: int = 60) -> Dict[str, Any]:
+        """
+        Aggregate the last `minutes` minute buckets (including the current one).
+
+        Reads all buckets with one Redis pipeline (HGETALL per minute, one
+        PFCOUNT over the window). Counts not yet flushed are included; with
+        Redis, unique sessions are as of the last flush (an estimate anyway).
+        If Redis cannot be read, the counts of this worker are reported
+        (source "local").
+        """
+        minutes = max(1, min(minutes, self.config.retention // 60))
+        now = int(time.time() // 60)
+        window = list(range(now - minutes + 1, now + 1))
+
+        per_minute: Optional[List[Counter]] = None
+        if self._redis_available():
+            try:
+                async with self.redis_service.pipeline() as pipe:
+                    hashes = [pipe.hgetall(self.key(minute), deserialize_json=False) for minute in window]
+                    unique = pipe.pfcount(*(self.sessions_key(minute) for minute in window))
+            except RedisServiceError as e:
+                logger.warning(f"Reading analytics counters failed, reporting local counts: {e}")
+            else:
+                source = "redis"
+                per_minute = [Counter({f: int(c) for f, c in pipe.results[i].items()}) for i in hashes]
+                unique_sessions = pipe.results[unique]
+
+        if per_minute is None:
+            source = "local"
+            per_minute = [Counter(self._local[m].counts) if m in self._local else Counter() for m in window]
+            sessions: Set[str] = set()
+            for minute in window:
+                for buckets in (self._local, self._pending):
+                    if minute in buckets:
+                        sessions.update(buckets[minute].sessions)
+            unique_sessions = len(sessions)
+
+        for counts, minute in zip(per_minute, window):
+            if minute in self._pending:
+                counts.update(self._pending[minute].counts)
+
+        return self._summarize(window, per_minute, unique_sessions, source)
+
+    @staticmethod
+    def _summarize(
+        window: List[int],
+        per_minute: List[Counter],
+        unique_sessions: int,
+        source: str
+    ) -> Dict[str, Any]:
+        total: Counter = Counter()
+        for counts in per_minute:
+            total.update(counts)
+
+        def section(prefix: str) -> Dict[str, int]:
+            return {
+                field[len(prefix):]: count for field, count in sorted(total.items()) if field.startswith(prefix)
+            }
+
+        matches, no_matches = total["search:match"], total["search:no_match"]
+        confirmed, rejected = total["confirm:yes"], total["confirm:no"]
+
+        def rate(part: int, whole: int) -> Optional[float]:
+            return round(part / whole, 4) if whole else None
+
+        return {
+            "source": source,
+            "window": {
+                "minutes": len(window),
+                "from": datetime.fromtimestamp(window[0] * 60, timezone.utc).isoformat(),
+                "to": datetime.fromtimestamp((window[-1] + 1) * 60, timezone.utc).isoformat(),
+            },
+            "unique_sessions": unique_sessions,
+            "steps": section("step:"),
+            "symptom_search": {
+                "searches": matches + no_matches,
+                "matches": matches,
+                "no_matches": no_matches,
+                "match_rate": rate(matches, matches + no_matches),
+                "distance_histogram": section("search_distance:"),
+            },
+            "confirmation": {
+                "yes": confirmed,
+                "no": rejected,
+                "confirm_rate": rate(confirmed, confirmed + rejected),
+                "distance_histogram": section("confirm_distance:"),
+            },
+            "per_minute": [
+                {
+                    "minute": datetime.fromtimestamp(minute * 60, timezone.utc).isoformat(),
+                    "step_entries": sum(c for f, c in counts.items() if f.startswith("step:")),
+                    "searches": counts["search:match"] + counts["search:no_match"],
+                    "matches": counts["search:match"],
+                }
+                for minute, counts in zip(window, per_minute)
+            ],
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Writer metrics for monitoring"""
+        return {
+            "enabled": self.config.enabled,
+            "pending_minutes": len(self._pending),
+            "local_minutes": len(self._local),
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "redis": self._redis_available(),
+        }
+
+
+# Global instance for easy access
+_analytics: Optional[AnalyticsCounters] = None
+
+
+def get_analytics() -> AnalyticsCounters:
+    """Get the global AnalyticsCounters (in-process until init_analytics)"""
+    global _analytics
+    if _analytics is None:
+        _analytics = AnalyticsCounters()
+    return _analytics
+
+
+def init_analytics(
+    redis_service: Any = None,
+    config: Optional[AnalyticsConfig] = None
+) -> AnalyticsCounters:
+    """Replace the global AnalyticsCounters, e.g. once a Redis connection is available"""
+    global _analytics
+    previous = _analytics
+    _analytics = AnalyticsCounters(redis_service, config)
+    if previous is not None:
+        # Counts recorded before startup move to the configured instance
+        for buckets in (previous._local, previous._pending):
+            for minute, bucket in buckets.items():
+                _analytics._pending.setdefault(minute, _Bucket()).merge(bucket)
+    return _analytics
@@ -0,0 +1,151 @@
+# src/v2/core/circuit_breaker.py
+"""
+Circuit breaker for calls to an external dependency.
+
+- closed:    calls go through; consecutive connection failures are counted
+- open:      after ``failure_threshold`` consecutive failures calls are
+             rejected immediately (fail fast instead of waiting for the
+             socket timeout) for ``reset_timeout`` seconds
+- half_open: afterwards ``half_open_max_calls`` trial calls go through;
+             a success closes the circuit, a failure opens it again with
+             twice the timeout (up to ``max_reset_timeout``)
+
+The breaker does no I/O itself; the owner reports outcomes with
+record_success() / record_failure() and may probe the dependency while the
+circuit is open (see RedisService).
+"""
+
+import time
+import logging
+from enum import Enum
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open state machine with exponential reset backoff.
+
+    Usage:
+        breaker = CircuitBreaker("redis")
+        if not breaker.allow():
+            return default              # fail fast
+        try:
+            result = await call()
+        except ConnectionError as e:
+            breaker.record_failure(e)
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 60.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._open_until = 0.0
+        self._current_timeout = reset_timeout
+        self._half_open_calls = 0
+        self._last_error: Optional[str] = None
+        self._changed_at = time.time()
+
+        # Metrics
+        self._opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() >= self._open_until:
+            self._set_state(CircuitState.HALF_OPEN)
+            self._half_open_calls = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be made now (counts a trial call when half-open)"""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        self._rejected += 1
+        return False
+
+    def release(self) -> None:
+        """Return a trial call that allow() granted but that was never made"""
+        if self._state is CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a trial call through"""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        if self._state is CircuitState.CLOSED:
+            self._failures = 0
+            return
+        self._failures = 0
+        self._current_timeout = self.reset_timeout
+        self._set_state(CircuitState.CLOSED)
+        logger.info(f"Circuit '{self.name}' closed - dependency reachable again")
+
+    def record_failure(self, error: Any = None) -> None:
+        self._failures += 1
+        self._last_error = str(error) if error is not None else None
+        state = self.state
+        if state is CircuitState.HALF_OPEN:
+            self._current_timeout = min(self._current_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif state is CircuitState.CLOSED and self._failures >= self.failure_threshold:
+            self._open()
+
+    def trip(self, error: Any = None) -> None:
+        """Open the circuit immediately (e.g. the first connection attempt failed)"""
+        self._last_error = str(error) if error is not None else None
+        if self._state is not CircuitState.OPEN:
+            self._open()
+
+    def _open(self) -> None:
+        self._open_until = time.monotonic() + self._current_timeout
+        self._opened += 1
+        self._set_state(CircuitState.OPEN)
+        logger.warning(
+            f"Circuit '{self.name}' opened after {self._failures} failure(s), "
+            f"retrying in {self._current_timeout:.1f}s: {self._last_error}"
+        )
+
+    def _set_state(self, state: CircuitState) -> None:
+        self._state = state
+        self._changed_at = time.time()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Breaker state for health checks and monitoring"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "opened": self._opened,
+            "rejected_calls": self._rejected,
+            "retry_in": round(self.retry_in(), 2),
+            "last_error": self._last_error,
+            "state_since": self._changed_at,
+        }
@@ -0,0 +1,491 @@
+# src/v2/core/event_log.py
+"""
+Append-only conversation event log for WuffChat V2.
+
+Every successful FlowEngine transition is recorded as one event:
+
+    (session_id, seq, from_state, event, input_hash, to_state, timestamp, duration_ms)
+
+The user input itself is never stored, only a 64-bit BLAKE2b hash of it.
+``seq`` is a per-session counter kept in ``SessionState.event_seq``, so it
+stays consistent when consecutive turns are served by different workers.
+
+Events are buffered in memory and written in batches by a background task
+(like the session write-behind flusher), either to
+
+- local segment files (``EVENT_LOG_BACKEND=file``), one writer per process,
+  rotated at ``EVENT_LOG_SEGMENT_BYTES``; encoding and file writes run in a
+  worker thread, never on the event loop, or
+- a Redis Stream (``EVENT_LOG_BACKEND=redis``) via pipelined XADD.
+
+Segment layout (little endian):
+
+    header   magic(8) | version(u16) | table_length(u32) | table (JSON)
+             The table lists the state and event names; records refer to
+             them by position, so enum changes never break old segments.
+    records  session_id_length(u16) | seq(u64) | from(u8) | event(u8) | to(u8)
+             | input_hash(8) | timestamp(f64) | duration_ms(f32) | session_id
+
+See src.core.event_replay for rebuilding sessions and replaying the log
+against a flow definition.
+"""
+
+import os
+import json
+import time
+import struct
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.models.flow_models import FlowStep
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"WCEVLOG\x00"
+SEGMENT_VERSION = 1
+SEGMENT_SUFFIX = ".seg"
+
+_SEGMENT_HEADER = struct.Struct("<8sHI")
+_RECORD = struct.Struct("<HQBBB8sdf")
+
+
+class ConversationEvent(NamedTuple):
+    """One recorded FSM transition"""
+    session_id: str
+    seq: int
+    from_state: str
+    event: str
+    input_hash: bytes
+    to_state: str
+    timestamp: float  # Unix epoch seconds
+    duration_ms: float
+
+    def to_fields(self) -> Dict[str, str]:
+        """Flat string fields for a Redis Stream entry"""
+        return {
+            "sid": self.session_id,
+            "seq": str(self.seq),
+            "from": self.from_state,
+            "event": self.event,
+            "input": self.input_hash.hex(),
+            "to": self.to_state,
+            "ts": repr(self.timestamp),
+            "ms": repr(self.duration_ms),
+        }
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, str]) -> "ConversationEvent":
+        return cls(
+            session_id=fields["sid"],
+            seq=int(fields["seq"]),
+            from_state=fields["from"],
+            event=fields["event"],
+            input_hash=bytes.fromhex(fields["input"]),
+            to_state=fields["to"],
+            timestamp=float(fields["ts"]),
+            duration_ms=float(fields["ms"]),
+        )
+
+
+def hash_input(user_input: str) -> bytes:
+    """64-bit hash identifying an input without storing it"""
+    return hashlib.blake2b(user_input.encode("utf-8"), digest_size=8).digest()
+
+
+@dataclass
+class EventLogConfig:
+    """Configuration for the conversation event log"""
+    backend: str = "none"  # none | file | redis
+    directory: str = "data/event_log"
+    segment_bytes: int = 64 * 1024 * 1024
+    stream: str = "wuffchat:events"
+    stream_maxlen: Optional[int] = 1_000_000  # approximate trimming
+    flush_interval: float = 1.0
+    max_buffered: int = 10000  # flush early when this many events are pending
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend in ("file", "redis")
+
+
+# ===========================================
+# SEGMENT FILES
+# ===========================================
+
+class SegmentWriter:
+    """
+    Appends events to rotating segment files of this process.
+
+    File names contain the process id and a start timestamp, so several
+    workers can write into the same directory.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_bytes: int = 64 * 1024 * 1024,
+        events: Tuple[str, ...] = ()
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Name tables written into every segment header
+        self.states: List[str] = [state.value for state in FlowStep]
+        self.events: List[str] = list(events)
+        self._state_codes: Dict[str, int] = {name: i for i, name in enumerate(self.states)}
+        self._event_codes: Dict[str, int] = {name: i for i, name in enumerate(self.events)}
+
+        self._file = None
+        self._size = 0
+        self._segment_index = 0
+        self.path: Optional[Path] = None
+
+    def _event_code(self, event: str) -> int:
+        code = self._event_codes.get(event)
+        if code is None:
+            # Unknown names need a new table - start a new segment
+            self.events.append(event)
+            code = self._event_codes[event] = len(self.events) - 1
+            self._close_segment()
+        return code
+
+    def _open_segment(self) -> None:
+        self._segment_index += 1
+        self.path = self.directory / (
+            f"events-{int(time.time() * 1000):013d}-{os.getpid()}-{self._segment_index:04d}{SEGMENT_SUFFIX}"
+        )
+        table = json.dumps({"states": self.states, "events": self.events}).encode("utf-8")
+        self._file = open(self.path, "ab")
+        self._file.write(_SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, len(table)) + table)
+        self._size = _SEGMENT_HEADER.size + len(table)
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def encode(self, event: ConversationEvent) -> bytes:
+        session_id = event.session_id.encode("utf-8")
+        return _RECORD.pack(
+            len(session_id),
+            event.seq,
+            self._state_codes[event.from_state],
+            self._event_code(event.event),
+            self._state_codes[event.to_state],
+            event.input_hash,
+            event.timestamp,
+            event.duration_ms,
+        ) + session_id
+
+    def write(self, events: List[ConversationEvent]) -> int:
+        """Write a batch of events; returns the number of bytes written"""
+        records = [self.encode(event) for event in events]
+        written = 0
+        for record in records:
+            if self._file is None or self._size >= self.segment_bytes:
+                self._close_segment()
+                self._open_segment()
+            self._file.write(record)
+            self._size += len(record)
+            written += len(record)
+        if self._file is not None:
+            self._file.flush()
+        return written
+
+    def close(self) -> None:
+        self._close_segment()
+
+
+def list_segments(directory: Union[str, Path]) -> List[Path]:
+    """Segment files of a directory in write order"""
+    return sorted(Path(directory).glob(f"*{SEGMENT_SUFFIX}"))
+
+
+def read_segment(path: Union[str, Path]) -> Iterator[ConversationEvent]:
+    """
+    Decode all events of one segment file.
+
+    A truncated last record (process killed while writing) is ignored.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _SEGMENT_HEADER.size:
+        return
+    magic, version, table_length = _SEGMENT_HEADER.unpack_from(data, 0)
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+        logger.warning(f"Skipping invalid event segment {path}")
+        return
+
+    offset = _SEGMENT_HEADER.size
+    table = json.loads(data[offset:offset + table_length])
+    states, events = table["states"], table["events"]
+    offset += table_length
+
+    unpack = _RECORD.unpack_from
+    record_size = _RECORD.size
+    end = len(data)
+    while offset + record_size <= end:
+        sid_length, seq, from_code, event_code, to_code, input_hash, timestamp, duration = unpack(data, offset)
+        offset += record_size
+        if offset + sid_length > end:
+            break
+        session_id = data[offset:offset + sid_length].decode("utf-8")
+        offset += sid_length
+        yield ConversationEvent(
+            session_id, seq, states[from_code], events[event_code], input_hash,
+            states[to_code], timestamp, duration
+        )
+    if offset != end:
+        logger.warning(f"Event segment {path} has a truncated record at offset {offset}")
+
+
+def read_segments(source: Union[str, Path, List[Path]]) -> Iterator[ConversationEvent]:
+    """Decode the events of a segment file, a list of files or a directory"""
+    if isinstance(source, (str, Path)):
+        source = Path(source)
+        paths = list_segments(source) if source.is_dir() else [source]
+    else:
+        paths = source
+    for path in paths:
+        yield from read_segment(path)
+
+
+# ===========================================
+# REDIS STREAM
+# ===========================================
+
+async def read_stream(
+    redis_service: Any,
+    stream: str = "wuffchat:events",
+    batch_size: int = 1000
+) -> AsyncIterator[List[ConversationEvent]]:
+    """
+    Iterate over the events of a Redis Stream, one list per XRANGE call.
+
+    Only one batch is held in memory at a time, so a long stream can be
+    replayed without loading it as a whole.
+
+    Args:
+        redis_service: Initialized RedisService
+        stream: Stream key
+        batch_size: Entries per XRANGE call
+
+    Yields:
+        Events in stream order, up to batch_size at a time
+    """
+    client = redis_service.client
+    start = "-"
+    while True:
+        entries = await client.xrange(stream, min=start, max="+", count=batch_size)
+        if entries:
+            yield [ConversationEvent.from_fields(fields) for _, fields in entries]
+        if len(entries) < batch_size:
+            return
+        start = f"({entries[-1][0]}"
+
+
+# ===========================================
+# EVENT LOG
+# ===========================================
+
+class EventLog:
+    """
+    Buffered, append-only log of conversation events.
+
+    Usage:
+        event_log = get_event_log()
+        await event_log.start()
+        ...
+        event_log.record(session, from_state, event, user_input, to_state, started, duration_ms)
+        ...
+        await event_log.stop()     # final flush on shutdown
+    """
+
+    def __init__(self, config: Optional[EventLogConfig] = None, redis_service: Any = None):
+        """
+        Initialize the event log.
+
+        Args:
+            config: Event log configuration. If not provided, uses environment variables.
+            redis_service: Initialized RedisService (required for the redis backend)
+        """
+        if config is None:
+            maxlen = int(os.getenv("EVENT_LOG_STREAM_MAXLEN", "1000000"))
+            config = EventLogConfig(
+                backend=os.getenv("EVENT_LOG_BACKEND", "none").lower(),
+                directory=os.getenv("EVENT_LOG_DIR", "data/event_log"),
+                segment_bytes=int(os.getenv("EVENT_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024))),
+                stream=os.getenv("EVENT_LOG_STREAM", "wuffchat:events"),
+                stream_maxlen=maxlen or None,
+                flush_interval=float(os.getenv("EVENT_LOG_FLUSH_INTERVAL", "1.0"))
+            )
+
+        if config.backend == "redis" and (redis_service is None or not redis_service.is_enabled()):
+            logger.warning("Event log backend 'redis' without Redis connection - event log disabled")
+            config.backend = "none"
+
+        self.config = config
+        self.enabled = config.enabled
+        self.redis_service = redis_service
+        self._segments = None
+        if config.backend == "file":
+            from src.core.flow_engine import FlowEvent
+            self._segments = SegmentWriter(
+                config.directory, config.segment_bytes, tuple(event.value for event in FlowEvent)
+            )
+
+        self._buffer: List[ConversationEvent] = []
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        # One batch at a time: the segment writer is not thread-safe
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self._recorded = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed_flushes = 0
+
+    def record(
+        self,
+        session: Any,
+        from_state: FlowStep,
+        event: Any,
+        user_input: str,
+        to_state: FlowStep,
+        timestamp: float,
+        duration_ms: float
+    ) -> None:
+        """
+        Append a transition to the log (no I/O; written by the next flush).
+
+        Increments ``session.event_seq``.
+        """
+        if not self.enabled:
+            return
+        seq = session.event_seq + 1
+        session.event_seq = seq
+        self._buffer.append(ConversationEvent(
+            session.session_id, seq, from_state.value, event.value,
+            hash_input(user_input), to_state.value, timestamp, duration_ms
+        ))
+        self._recorded += 1
+
+        if len(self._buffer) >= self.config.max_buffered and self._flushing is None:
+            try:
+                self._flushing = asyncio.get_running_loop().create_task(self._flush_early())
+            except RuntimeError:
+                pass  # No running loop - flushed by stop()/flush()
+
+    async def _flush_early(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            self._flushing = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._buffer)
+
+    async def start(self) -> None:
+        """Start the background flush loop"""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Event log started (backend: {self.config.backend})")
+
+    async def stop(self) -> None:
+        """Stop the background loop and write all buffered events"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._segments is not None:
+            async with self._lock:
+                await asyncio.to_thread(self._segments.close)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered events.
+
+        Returns:
+            Number of events written
+        """
+        async with self._lock:
+            return await self._flush()
+
+    async def _flush(self) -> int:
+        if not self._buffer:
+            return 0
+        events, self._buffer = self._buffer, []
+
+        try:
+            if self._segments is not None:
+                await asyncio.to_thread(self._segments.write, events)
+            else:
+                await self._write_stream(events)
+        except Exception as e:
+            self._failed_flushes += 1
+            logger.error(f"Event log flush failed for {len(events)} events: {e}")
+            # Keep the events for the next attempt, but never grow without bound
+            self._buffer = events + self._buffer
+            overflow = len(self._buffer) - 10 * self.config.max_buffered
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self._dropped += overflow
+            return 0
+
+        self._written += len(events)
+        return len(events)
+
+    async def _write_stream(self, events: List[ConversationEvent]) -> None:
+        async with self.redis_service.pipeline() as pipe:
+            for event in events:
+                pipe.xadd(self.config.stream, event.to_fields(), maxlen=self.config.stream_maxlen)
+
+    async def _run(self) -> None:
+        """Background loop flushing at the configured interval"""
+        while True:
+            await asyncio.sleep(self.config.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Unexpected error in event log flush loop: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get event log metrics for monitoring"""
+        return {
+            "backend": self.config.backend,
+            "recorded": self._recorded,
+            "written": self._written,
+            "pending": len(self._buffer),
+            "dropped": self._dropped,
+            "failed_flushes": self._failed_flushes,
+        }
+
+
+# Global instance for easy access
+_event_log: Optional[EventLog] = None
+
+
+def get_event_log() -> EventLog:
+    """Get the global EventLog instance (configured from environment variables)"""
+    global _event_log
+    if _event_log is None:
+        _event_log = EventLog()
+    return _event_log
+
+
+def init_event_log(redis_service: Any = None, config: Optional[EventLogConfig] = None) -> EventLog:
+    """Replace the global EventLog, e.g. once a Redis connection is available"""
+    global _event_log
+    _event_log = EventLog(config, redis_service=redis_service)
+    return _event_log
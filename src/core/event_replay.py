@@ -0,0 +1,205 @@
+# src/v2/core/event_replay.py
+"""
+Replay of the conversation event log (see src.core.event_log).
+
+- rebuild_session()/rebuild_sessions() restore the flow state of sessions
+  from their recorded events
+- FlowReplayer checks recorded events against a flow definition, e.g. to
+  test a new FSM version offline against millions of real transitions
+  before deploying it
+
+Replay only needs the definition, no handlers or services: for every event
+the recorded target must be the transition target, one of its declared
+redirects, or the source state (handlers may keep the current state).
+
+Usage:
+    python -m src.core.event_replay data/event_log --definition new_flow.json
+"""
+
+import time
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState
+from src.core.flow_definition import FlowDefinition, load_flow_definition
+from src.core.event_log import ConversationEvent, read_segments
+
+
+def rebuild_session(events: Iterable[ConversationEvent], session_id: str) -> Optional[SessionState]:
+    """
+    Rebuild the flow state of one session from the log.
+
+    Returns:
+        SessionState with current_step and event_seq of the latest event,
+        or None if the session has no events
+    """
+    latest: Optional[ConversationEvent] = None
+    for event in events:
+        if event.session_id == session_id and (latest is None or event.seq > latest.seq):
+            latest = event
+    return _session_from(latest) if latest else None
+
+
+def rebuild_sessions(events: Iterable[ConversationEvent]) -> Dict[str, SessionState]:
+    """Rebuild the flow state of all sessions in the log (single pass)"""
+    latest: Dict[str, ConversationEvent] = {}
+    for event in events:
+        current = latest.get(event.session_id)
+        if current is None or event.seq > current.seq:
+            latest[event.session_id] = event
+    return {session_id: _session_from(event) for session_id, event in latest.items()}
+
+
+def _session_from(event: ConversationEvent) -> SessionState:
+    session = SessionState(
+        session_id=event.session_id,
+        current_step=FlowStep(event.to_state),
+        event_seq=event.seq
+    )
+    session.take_dirty_fields()
+    return session
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of replaying events against a flow definition"""
+    events: int = 0
+    sessions: int = 0
+    matched: int = 0      # recorded target == transition target
+    stayed: int = 0       # handler kept the source state
+    redirected: int = 0   # handler switched to a declared redirect
+    invalid: int = 0      # transition missing or target not allowed
+    gaps: int = 0         # missing seq numbers or state discontinuities
+    elapsed: float = 0.0
+    samples: List[str] = field(default_factory=list)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def compatible(self) -> bool:
+        """True if every recorded transition is valid in the definition"""
+        return self.invalid == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "sessions": self.sessions,
+            "matched": self.matched,
+            "stayed": self.stayed,
+            "redirected": self.redirected,
+            "invalid": self.invalid,
+            "gaps": self.gaps,
+            "elapsed_s": round(self.elapsed, 3),
+            "events_per_second": round(self.events_per_second),
+            "samples": self.samples,
+        }
+
+
+class FlowReplayer:
+    """
+    Replays logged events against a flow definition.
+
+    The definition is reduced to a dict {(from_state, event): (to_state,
+    allowed_targets)} of plain strings, so the inner loop does no enum
+    conversion and no allocation per event.
+    """
+
+    def __init__(self, definition: FlowDefinition):
+        self.definition = definition
+        self._targets: Dict[Tuple[str, str], Tuple[str, FrozenSet[str]]] = {
+            (spec.from_state.value, spec.event): (
+                spec.to_state.value,
+                frozenset(s.value for s in spec.redirects)
+            )
+            for spec in definition.transitions
+        }
+
+    def replay(self, events: Iterable[ConversationEvent], max_samples: int = 20) -> ReplayReport:
+        """
+        Check all events; events of one session must be in seq order.
+
+        Args:
+            events: Logged events (e.g. read_segments(directory))
+            max_samples: Number of invalid transitions described in the report
+
+        Returns:
+            ReplayReport
+        """
+        report = ReplayReport()
+        samples = report.samples
+        targets = self._targets
+        last: Dict[str, Tuple[int, str]] = {}
+        matched = stayed = redirected = invalid = gaps = count = 0
+
+        start = time.perf_counter()
+        for session_id, seq, from_state, event, _, to_state, _, _ in events:
+            count += 1
+
+            previous = last.get(session_id)
+            if previous is not None and (previous[0] + 1 != seq or previous[1] != from_state):
+                gaps += 1
+            last[session_id] = (seq, to_state)
+
+            target = targets.get((from_state, event))
+            if target is None:
+                invalid += 1
+                if len(samples) < max_samples:
+                    samples.append(f"{session_id}#{seq}: no transition {from_state} + {event}")
+            elif to_state == target[0]:
+                matched += 1
+            elif to_state == from_state:
+                stayed += 1
+            elif to_state in target[1]:
+                redirected += 1
+            else:
+                invalid += 1
+                if len(samples) < max_samples:
+                    samples.append(
+                        f"{session_id}#{seq}: {from_state} + {event} -> {to_state} "
+                        f"(definition: {target[0]})"
+                    )
+
+        report.elapsed = time.perf_counter() - start
+        report.events = count
+        report.sessions = len(last)
+        report.matched, report.stayed, report.redirected = matched, stayed, redirected
+        report.invalid, report.gaps = invalid, gaps
+        return report
+
+
+def replay_log(
+    source: Union[str, Path],
+    definition_path: Optional[Union[str, Path]] = None
+) -> ReplayReport:
+    """Replay segment files (file or directory) against a flow definition"""
+    return FlowReplayer(load_flow_definition(definition_path)).replay(read_segments(source))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay the conversation event log against a flow definition")
+    parser.add_argument("source", help="Segment file or directory")
+    parser.add_argument("--definition", help="Flow definition to test (default: FLOW_DEFINITION_PATH)")
+    parser.add_argument("--session", help="Only rebuild and print the state of this session")
+    args = parser.parse_args()
+
+    if args.session:
+        session = rebuild_session(read_segments(args.source), args.session)
+        print(session.model_dump_json(include={"session_id", "current_step", "event_seq"}) if session else "not found")
+        return
+
+    report = replay_log(args.source, args.definition)
+    for key, value in report.to_dict().items():
+        if key != "samples":
+            print(f"{key:<18} {value}")
+    for sample in report.samples:
+        print(f"  ! {sample}")
+    raise SystemExit(0 if report.compatible else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -310,6 +310,10 @@ class SessionError(V2BaseException):
             self.details['session_id'] = session_id
 
 
+class SessionUnavailableError(SessionError):
+    """Session store cannot be reached - the session state is unknown, not missing"""
+
+
 class MessageError(V2BaseException):
     """Errors in message processing and formatting"""
     
@@ -0,0 +1,372 @@
+# src/v2/core/experiments.py
+"""
+A/B experiments over prompt variants.
+
+A prompt variant is registered under ``<key>@<variant>`` (see
+src/prompts/variant_prompts.py); the prompt under ``<key>`` itself is the
+"control". An experiment assigns every session deterministically to one
+variant of a prompt by hashing the session id, so the assignment is sticky
+across turns and workers without storing it anywhere.
+
+Experiments are configured with PROMPT_EXPERIMENTS (JSON, variant weights
+per prompt key), e.g.
+
+    PROMPT_EXPERIMENTS='{"generation.dog_perspective": {"control": 50, "short": 50}}'
+
+Per variant the engine counts exposed sessions, completed sessions
+(consultation reached the exercise question's answer), and latency and
+token usage of GPT calls. A GPT call is attributed to the variants rendered
+earlier in the same turn.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, Mapping, Optional, Tuple
+
+from src.core.exceptions import V2ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+CONTROL = "control"
+VARIANT_SEPARATOR = "@"
+_BUCKETS = 10000
+
+# A consultation is complete once the exercise question has been answered
+# (FlowStep values, kept as strings to avoid importing the models here)
+COMPLETION_STATES = frozenset({"end_or_restart", "feedback_q1"})
+
+
+def split_variant(key: str) -> Tuple[str, Optional[str]]:
+    """Split ``dog.greeting@short`` into (``dog.greeting``, ``short``)"""
+    base, _, variant = key.partition(VARIANT_SEPARATOR)
+    return base, variant or None
+
+
+@dataclass
+class Experiment:
+    """Variant weights of one prompt"""
+    key: str
+    weights: Dict[str, int]
+    salt: str = ""  # change to reshuffle sessions into new buckets
+
+    def __post_init__(self):
+        total = sum(self.weights.values())
+        if total <= 0 or any(weight < 0 for weight in self.weights.values()):
+            raise V2ConfigurationError(
+                f"Invalid variant weights for experiment {self.key}",
+                component="experiments",
+                details={"weights": self.weights}
+            )
+        # Cumulative bucket boundaries, e.g. control < 5000 <= short
+        self._bounds = []
+        upper = 0
+        for variant, weight in self.weights.items():
+            upper += weight
+            self._bounds.append((upper * _BUCKETS // total, variant))
+
+    def bucket(self, session_id: str) -> int:
+        digest = hashlib.blake2b(f"{self.salt or self.key}:{session_id}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % _BUCKETS
+
+    def assign(self, session_id: str) -> str:
+        """Variant of a session (deterministic)"""
+        bucket = self.bucket(session_id)
+        for bound, variant in self._bounds:
+            if bucket < bound:
+                return variant
+        return self._bounds[-1][1]
+
+
+def parse_experiments(spec: str) -> Dict[str, Experiment]:
+    """
+    Parse the PROMPT_EXPERIMENTS JSON.
+
+    Raises:
+        V2ConfigurationError: If the specification is invalid
+    """
+    if not spec.strip():
+        return {}
+    try:
+        data = json.loads(spec)
+        return {
+            key: Experiment(
+                key=key,
+                weights={variant: int(weight) for variant, weight in config.items() if variant != "salt"},
+                salt=str(config.get("salt", ""))
+            )
+            for key, config in data.items()
+        }
+    except (ValueError, AttributeError, TypeError) as e:
+        raise V2ConfigurationError(
+            f"Invalid PROMPT_EXPERIMENTS: {e}",
+            component="experiments",
+            details={"error": str(e)}
+        )
+
+
+@dataclass
+class VariantStats:
+    """Counters of one variant"""
+    sessions: int = 0
+    completions: int = 0
+    renders: int = 0
+    generations: int = 0
+    latency_ms_total: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=2048))
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(pct: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))], 1)
+
+        per_generation = max(self.generations, 1)
+        return {
+            "sessions": self.sessions,
+            "completions": self.completions,
+            "completion_rate": round(self.completions / self.sessions, 4) if self.sessions else None,
+            "renders": self.renders,
+            "generations": self.generations,
+            "latency_ms_avg": round(self.latency_ms_total / per_generation, 1) if self.generations else None,
+            "latency_ms_p50": percentile(50),
+            "latency_ms_p95": percentile(95),
+            "prompt_tokens_avg": round(self.prompt_tokens / per_generation, 1) if self.generations else None,
+            "completion_tokens_avg": round(self.completion_tokens / per_generation, 1) if self.generations else None,
+        }
+
+
+# Session of the current turn and the (key, variant) pairs rendered in it
+_current_session: ContextVar[Optional[str]] = ContextVar("wuffchat_experiment_session", default=None)
+_turn_variants: ContextVar[Tuple[Tuple[str, str], ...]] = ContextVar("wuffchat_turn_variants", default=())
+
+
+class ExperimentEngine:
+    """
+    Assigns sessions to prompt variants and collects per-variant metrics.
+
+    Usage:
+        engine = get_experiments()
+        with engine.turn(session_id):
+            prompt = prompt_manager.get_prompt(...)   # picks the session's variant
+            await gpt_service.complete(prompt)         # latency/tokens recorded
+        engine.observe_state(session_id, new_state)   # completion counter
+    """
+
+    def __init__(self, experiments: Optional[Dict[str, Experiment]] = None, max_sessions: Optional[int] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            experiments: Experiments by prompt key. If not provided, uses PROMPT_EXPERIMENTS.
+            max_sessions: Sessions whose assignments are remembered for completion counting
+        """
+        if experiments is None:
+            experiments = parse_experiments(os.getenv("PROMPT_EXPERIMENTS", ""))
+        if max_sessions is None:
+            max_sessions = int(os.getenv("EXPERIMENT_MAX_SESSIONS", "100000"))
+
+        self.experiments = experiments
+        self.max_sessions = max_sessions
+        self.stats: Dict[str, Dict[str, VariantStats]] = {
+            key: {variant: VariantStats() for variant in experiment.weights}
+            for key, experiment in experiments.items()
+        }
+        # session_id -> {prompt key: variant}; completed sessions are dropped
+        self._sessions: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.experiments)
+
+    @contextmanager
+    def turn(self, session_id: str) -> Iterator[None]:
+        """Make `session_id` the session of the current turn"""
+        session_token = _current_session.set(session_id)
+        variants_token = _turn_variants.set(())
+        try:
+            yield
+        finally:
+            _turn_variants.reset(variants_token)
+            _current_session.reset(session_token)
+
+    def choose(self, key: str, experiment: Optional[Experiment] = None) -> str:
+        """
+        Variant of `key` for the session of the current turn (control outside of a turn).
+
+        `experiment` overrides the configured weights, e.g. with the variants
+        a prompt registry actually provides.
+        """
+        session_id = _current_session.get()
+        if experiment is None:
+            experiment = self.experiments.get(key)
+        if session_id is None or experiment is None:
+            return CONTROL
+
+        variant = experiment.assign(session_id)
+        stats = self.stats[key][variant]
+        stats.renders += 1
+
+        assignments = self._sessions.get(session_id)
+        if assignments is None:
+            assignments = self._sessions[session_id] = {}
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        if key not in assignments:
+            assignments[key] = variant
+            stats.sessions += 1
+
+        rendered = _turn_variants.get()
+        if (key, variant) not in rendered:
+            _turn_variants.set(rendered + ((key, variant),))
+        return variant
+
+    def record_generation(self, latency_ms: float, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        """Attribute a GPT call to the variants rendered in the current turn"""
+        for key, variant in _turn_variants.get():
+            stats = self.stats[key][variant]
+            stats.generations += 1
+            stats.latency_ms_total += latency_ms
+            stats.latencies.append(latency_ms)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+
+    def record_completion(self, session_id: str) -> None:
+        """Count a completed consultation for every variant the session saw"""
+        assignments = self._sessions.pop(session_id, None)
+        if not assignments:
+            return
+        for key, variant in assignments.items():
+            self.stats[key][variant].completions += 1
+
+    def observe_state(self, session_id: str, state: Any) -> None:
+        """Record completion when a session reaches the end of a consultation"""
+        if self.enabled and getattr(state, "value", state) in COMPLETION_STATES:
+            self.record_completion(session_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            key: {
+                "weights": experiment.weights,
+                "variants": {variant: stats.summary() for variant, stats in self.stats[key].items()},
+            }
+            for key, experiment in self.experiments.items()
+        }
+
+
+class VariantRenderer:
+    """Renders the variant of a prompt assigned to the current session"""
+
+    __slots__ = ("key", "renderers", "engine", "experiment", "required", "template")
+
+    def __init__(self, key: str, renderers: Dict[str, Any], engine: ExperimentEngine, experiment: Experiment):
+        self.key = key
+        self.renderers = renderers
+        self.engine = engine
+        self.experiment = experiment  # configured experiment, limited to the registered variants
+        control = renderers[CONTROL]
+        self.required = control.required
+        self.template = control.template
+
+    def render(self, kwargs: Dict[str, Any]) -> str:
+        return self.renderers[self.engine.choose(self.key, self.experiment)].render(kwargs)
+
+
+class _VariantOverlay(Mapping):
+    """Renderer table with variant renderers in front of the registry's renderers"""
+
+    def __init__(self, base: Mapping, overlay: Dict[Any, VariantRenderer]):
+        self._base = base
+        self._overlay = overlay
+
+    def get(self, key, default=None):
+        renderer = self._overlay.get(key)
+        if renderer is None:
+            return self._base.get(key, default)
+        return renderer
+
+    def __getitem__(self, key):
+        renderer = self._overlay.get(key)
+        return renderer if renderer is not None else self._base[key]
+
+    def __iter__(self):
+        return iter(self._base)
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+
+def with_variants(registry: Any, engine: ExperimentEngine) -> Mapping:
+    """
+    Renderer table of a prompt registry with the experiments of `engine` applied.
+
+    Variants named in an experiment but not registered are ignored (their
+    weight goes to the remaining variants). The effective weights belong to
+    this registry only; the engine's configuration is left untouched, so a
+    later registry that provides the variants runs the full experiment.
+    """
+    from src.core.prompt_manager import PromptType
+
+    overlay: Dict[Any, VariantRenderer] = {}
+    for key, experiment in engine.experiments.items():
+        prompts = registry.variants.get(key)
+        control = registry.renderers.get(key)
+        if not prompts or control is None:
+            logger.warning(f"Experiment for unknown prompt {key} ignored")
+            continue
+
+        renderers = {CONTROL: control}
+        for prompt in prompts:
+            _, variant = split_variant(prompt.key)
+            if variant in experiment.weights:
+                renderers[variant] = prompt.compile()
+
+        missing = [variant for variant in experiment.weights if variant not in renderers]
+        if missing:
+            logger.warning(f"Experiment {key}: variants {missing} not registered, ignored")
+            weights = {variant: weight for variant, weight in experiment.weights.items() if variant in renderers}
+            if not any(weights.values()):
+                continue
+            experiment = Experiment(key, weights, experiment.salt)
+
+        renderer = VariantRenderer(key, renderers, engine, experiment)
+        overlay[key] = renderer
+        try:
+            overlay[PromptType(key)] = renderer
+        except ValueError:
+            pass
+
+    return _VariantOverlay(registry.renderers, overlay) if overlay else registry.renderers
+
+
+# Global instance for easy access
+_experiments: Optional[ExperimentEngine] = None
+
+
+def get_experiments() -> ExperimentEngine:
+    """Get the process-wide experiment engine"""
+    global _experiments
+    if _experiments is None:
+        try:
+            _experiments = ExperimentEngine()
+        except V2ConfigurationError as e:
+            logger.error(f"Prompt experiments disabled: {e}")
+            _experiments = ExperimentEngine({})
+        if _experiments.enabled:
+            logger.info(f"Prompt experiments active: {', '.join(_experiments.experiments)}")
+    return _experiments
+
+
+def record_generation(latency_ms: float, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+    """Attribute a GPT call to the current turn's variants (cheap no-op without experiments)"""
+    if _turn_variants.get() and _experiments is not None:
+        _experiments.record_generation(latency_ms, prompt_tokens, completion_tokens)
@@ -0,0 +1,364 @@
+# src/v2/core/feedback_pipeline.py
+"""
+Asynchronous feedback ingestion for WuffChat V2.
+
+The last feedback answer of a consultation must never wait on storage, so
+FlowHandlers only hands the feedback record to this pipeline (no I/O) and a
+background task writes it:
+
+- Records are buffered in a bounded in-process queue and written in
+  batches, one Redis pipeline per batch (``SET feedback:{session_id}`` with
+  the configured TTL, so a repeated write of a record is harmless). Records
+  are serialized with the RedisService codec (REDIS_CODEC).
+- Backpressure: when the queue is full, new records are handed to a
+  background task that appends them to the spill file, instead of growing
+  the queue or blocking the request.
+- When Redis is unavailable or a batch fails, the batch is appended to a
+  local append-only spill file (JSON lines). Spilled records are replayed
+  into Redis once it is reachable again, and on startup. The file is
+  written in a worker thread (asyncio.to_thread), never on the event loop.
+
+Configuration:
+    FEEDBACK_TTL             seconds until stored feedback expires (default 90 days, 0 = never)
+    FEEDBACK_BATCH_SIZE      records per Redis pipeline (default 100)
+    FEEDBACK_FLUSH_INTERVAL  seconds between writes (default 0.5)
+    FEEDBACK_MAX_PENDING     queue bound (default 10000)
+    FEEDBACK_SPILL_PATH      spill file (default data/feedback_spill.jsonl)
+"""
+
+import os
+import json
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FeedbackPipelineConfig:
+    """Configuration for the feedback ingestion pipeline"""
+    ttl: Optional[int] = 7776000  # 90 days
+    batch_size: int = 100
+    flush_interval: float = 0.5
+    max_pending: int = 10000
+    spill_path: str = "data/feedback_spill.jsonl"
+    key_prefix: str = "feedback"
+
+
+class FeedbackPipeline:
+    """
+    Bounded queue plus background batch writer for feedback records.
+
+    Usage:
+        pipeline = get_feedback_pipeline()
+        await pipeline.start()
+        ...
+        pipeline.submit(record)    # in the request, no I/O
+        ...
+        await pipeline.stop()      # writes (or spills) everything left
+    """
+
+    def __init__(self, redis_service: Any = None, config: Optional[FeedbackPipelineConfig] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            redis_service: Initialized RedisService. Without a connection every
+                record is kept in the spill file.
+            config: Pipeline configuration. If not provided, uses environment variables.
+        """
+        if config is None:
+            config = FeedbackPipelineConfig(
+                ttl=int(os.getenv("FEEDBACK_TTL", "7776000")) or None,
+                batch_size=int(os.getenv("FEEDBACK_BATCH_SIZE", "100")),
+                flush_interval=float(os.getenv("FEEDBACK_FLUSH_INTERVAL", "0.5")),
+                max_pending=int(os.getenv("FEEDBACK_MAX_PENDING", "10000")),
+                spill_path=os.getenv("FEEDBACK_SPILL_PATH", "data/feedback_spill.jsonl")
+            )
+
+        self.config = config
+        self.redis_service = redis_service
+        self.spill_path = Path(config.spill_path)
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._overflow: List[Dict[str, Any]] = []  # waiting for the spill file
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._spilling: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Serializes appends to the spill file with its rename in replay_spill()
+        self._spill_lock = asyncio.Lock()
+
+        # Metrics
+        self._submitted = 0
+        self._written = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._rejected = 0
+        self._failed_batches = 0
+
+    # ===========================================
+    # PUBLIC API
+    # ===========================================
+
+    def key(self, session_id: str) -> str:
+        """Redis key of the feedback of a session"""
+        return f"{self.config.key_prefix}:{session_id}"
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Accept a feedback record for storage (never performs I/O).
+
+        Args:
+            record: Feedback with at least a ``session_id``
+
+        Returns:
+            True once the record is accepted (queued, or waiting for the spill file)
+        """
+        self._submitted += 1
+
+        if len(self._queue) >= self.config.max_pending:
+            # Backpressure: the writer is behind - park the record on disk
+            if not self._overflow:
+                logger.warning(f"Feedback queue full ({len(self._queue)} records), spilling to {self.spill_path}")
+            self._overflow.append(record)
+            if self._spilling is None:
+                self._spilling = self._start_task(self._spill_overflow())
+            return True
+
+        self._queue.append(record)
+        if len(self._queue) >= self.config.batch_size and self._flushing is None:
+            self._flushing = self._start_task(self._flush_early())
+        return True
+
+    @property
+    def pending_count(self) -> int:
+        """Records waiting in the queue"""
+        return len(self._queue)
+
+    async def start(self) -> None:
+        """Replay spilled records and start the background writer"""
+        if self._task is not None:
+            return
+        await self.replay_spill()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Feedback pipeline started (batch size: {self.config.batch_size})")
+
+    async def stop(self) -> None:
+        """Stop the background writer and write (or spill) all queued records"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._queue:
+            if not await self.flush():
+                break
+        if self._queue:
+            await self._spill(list(self._queue))
+            self._queue.clear()
+        if self._spilling is not None:
+            await self._spilling
+        await self._spill_overflow()
+        logger.info(f"Feedback pipeline stopped ({self._written} written, {self._spilled} spilled)")
+
+    async def flush(self) -> int:
+        """
+        Write up to one batch of queued records.
+
+        Returns:
+            Number of records taken from the queue (written or spilled)
+        """
+        async with self._lock:
+            if not self._queue:
+                return 0
+            count = min(len(self._queue), self.config.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+
+            if not self._redis_available():
+                await self._spill(batch)
+                return count
+
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self._failed_batches += 1
+                logger.error(f"Feedback batch of {count} records failed, spilling: {e}")
+                await self._spill(batch)
+                return count
+
+            self._written += count
+            return count
+
+    async def replay_spill(self) -> int:
+        """
+        Move spilled records into Redis.
+
+        The spill file is renamed before it is read, so records spilled in
+        the meantime go to a new file. On failure the renamed file is kept
+        and retried later; records are keyed by session, so writing one
+        twice (also by two workers sharing the file) is harmless.
+
+        Returns:
+            Number of records replayed
+        """
+        replay_path = self._replay_path()
+        async with self._lock:
+            if not self._redis_available():
+                return 0
+            try:
+                async with self._spill_lock:
+                    records = await asyncio.to_thread(self._take_spill, replay_path)
+            except FileNotFoundError:
+                return 0  # nothing spilled, or another worker took the file
+            try:
+                for start in range(0, len(records), self.config.batch_size):
+                    await self._write(records[start:start + self.config.batch_size])
+            except Exception as e:
+                self._failed_batches += 1
+                logger.warning(f"Replaying spilled feedback failed, retrying later: {e}")
+                return 0
+
+            await asyncio.to_thread(replay_path.unlink, missing_ok=True)
+            self._replayed += len(records)
+            if records:
+                logger.info(f"Replayed {len(records)} spilled feedback records")
+            return len(records)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get pipeline metrics for monitoring"""
+        return {
+            "pending": len(self._queue),
+            "spilling": len(self._overflow),
+            "submitted": self._submitted,
+            "written": self._written,
+            "spilled": self._spilled,
+            "replayed": self._replayed,
+            "rejected": self._rejected,
+            "failed_batches": self._failed_batches,
+            "redis": self._redis_available(),
+        }
+
+    # ===========================================
+    # INTERNALS
+    # ===========================================
+
+    def _replay_path(self) -> Path:
+        return self.spill_path.with_name(self.spill_path.name + ".replay")
+
+    def _has_spill(self) -> bool:
+        return self.spill_path.exists() or self._replay_path().exists()
+
+    def _redis_available(self) -> bool:
+        return self.redis_service is not None and self.redis_service.is_connected()
+
+    async def _write(self, records: List[Dict[str, Any]]) -> None:
+        """Write records in one Redis pipeline"""
+        async with self.redis_service.pipeline() as pipe:
+            for record in records:
+                pipe.set(self.key(record["session_id"]), record, ttl=self.config.ttl)
+
+    def _start_task(self, coro) -> Optional[asyncio.Task]:
+        try:
+            return asyncio.get_running_loop().create_task(coro)
+        except RuntimeError:
+            coro.close()
+            return None  # No running loop - written by stop()/flush()
+
+    async def _spill(self, records: List[Dict[str, Any]]) -> bool:
+        """Append records to the spill file (in a worker thread)"""
+        try:
+            async with self._spill_lock:
+                await asyncio.to_thread(self._append_spill, records)
+        except OSError as e:
+            self._rejected += len(records)
+            logger.error(f"Feedback spill to {self.spill_path} failed, {len(records)} records lost: {e}")
+            return False
+        self._spilled += len(records)
+        return True
+
+    def _append_spill(self, records: List[Dict[str, Any]]) -> None:
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+
+    async def _spill_overflow(self) -> None:
+        """Spill the records submitted while the queue was full"""
+        try:
+            while self._overflow:
+                records, self._overflow = self._overflow, []
+                await self._spill(records)
+        finally:
+            self._spilling = None
+
+    def _take_spill(self, replay_path: Path) -> List[Dict[str, Any]]:
+        """Move the spill file aside (unless a failed replay left one) and read it"""
+        if not replay_path.exists():
+            os.replace(self.spill_path, replay_path)
+        return self._read_spill(replay_path)
+
+    def _read_spill(self, path: Path) -> List[Dict[str, Any]]:
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # e.g. a line cut off by a crash during the append
+                    logger.warning(f"Skipping corrupt line {number} of {path}")
+        return records
+
+    async def _flush_early(self) -> None:
+        try:
+            while len(self._queue) >= self.config.batch_size:
+                await self.flush()
+        finally:
+            self._flushing = None
+
+    async def _run(self) -> None:
+        """Background loop writing at the configured interval"""
+        while True:
+            await asyncio.sleep(self.config.flush_interval)
+            try:
+                while self._queue:
+                    await self.flush()
+                if self._overflow and self._spilling is None:
+                    await self._spill_overflow()
+                if self._redis_available() and self._has_spill():
+                    await self.replay_spill()
+            except Exception as e:
+                logger.error(f"Unexpected error in feedback writer loop: {e}")
+
+
+# Global instance for easy access
+_feedback_pipeline: Optional[FeedbackPipeline] = None
+
+
+def get_feedback_pipeline() -> FeedbackPipeline:
+    """Get the global FeedbackPipeline (without Redis until init_feedback_pipeline)"""
+    global _feedback_pipeline
+    if _feedback_pipeline is None:
+        _feedback_pipeline = FeedbackPipeline()
+    return _feedback_pipeline
+
+
+def init_feedback_pipeline(
+    redis_service: Any = None,
+    config: Optional[FeedbackPipelineConfig] = None
+) -> FeedbackPipeline:
+    """Replace the global FeedbackPipeline, e.g. once a Redis connection is available"""
+    global _feedback_pipeline
+    previous = _feedback_pipeline
+    _feedback_pipeline = FeedbackPipeline(redis_service, config)
+    if previous is not None and previous._queue:
+        # Records submitted before startup move to the configured pipeline
+        _feedback_pipeline._queue.extend(previous._queue)
+        previous._queue.clear()
+    return _feedback_pipeline
@@ -0,0 +1,325 @@
+# src/v2/core/flow_definition.py
+"""
+Declarative flow definitions for the V2 FlowEngine.
+
+The FSM is described in a JSON (or YAML, if PyYAML is installed) file that
+lists states and transitions and references handlers by name:
+
+    {
+      "version": 1,
+      "start_state": "greeting",
+      "states": ["greeting", "wait_for_symptom", ...],
+      "transitions": [
+        {"from": "feedback_q1", "event": "feedback_answer", "to": "feedback_q2",
+         "handler": "feedback_step", "params": {"next_question": 2}},
+        {"from": "*", "event": "restart_command", "to": "wait_for_symptom",
+         "handler": "restart_command"}
+      ]
+    }
+
+- ``from`` is a state, a list of states or ``"*"`` (all declared states)
+- ``params`` are merged into the handler context before the handler runs
+- ``redirects`` lists states a handler may switch to instead of ``to``
+  (handlers returning ``(FlowStep, messages)``); used for graph analysis
+- ``terminal_states`` may list states that intentionally have no exits
+
+Loading a definition parses, resolves and validates the complete graph
+before anything is returned, so a broken file never replaces a working FSM.
+"""
+
+import os
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from src.models.flow_models import FlowStep
+from src.core.exceptions import V2ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEFINITION_PATH = Path(__file__).with_name("flow_definition.json")
+SUPPORTED_VERSIONS = (1,)
+
+
+def get_definition_path() -> Path:
+    """Flow definition path (FLOW_DEFINITION_PATH overrides the bundled file)"""
+    return Path(os.getenv("FLOW_DEFINITION_PATH") or DEFAULT_DEFINITION_PATH)
+
+
+@dataclass(frozen=True)
+class TransitionSpec:
+    """One transition as declared in the definition"""
+    from_state: FlowStep
+    event: str
+    to_state: FlowStep
+    handler: Optional[str] = None
+    params: Tuple[Tuple[str, Any], ...] = ()
+    redirects: Tuple[FlowStep, ...] = ()
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class FlowDefinition:
+    """Parsed and validated flow definition"""
+    name: str
+    version: int
+    start_state: FlowStep
+    states: Tuple[FlowStep, ...]
+    transitions: Tuple[TransitionSpec, ...]
+    terminal_states: Tuple[FlowStep, ...] = ()
+    source: Optional[str] = None
+    warnings: Tuple[str, ...] = field(default=(), compare=False)
+
+
+def _read_file(path: Path) -> Dict[str, Any]:
+    """Read a JSON or YAML definition file"""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise V2ConfigurationError(
+                "YAML flow definitions require PyYAML (pip install pyyaml)",
+                component="flow_definition"
+            )
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def load_flow_definition(
+    path: Optional[Union[str, Path]] = None,
+    event_names: Optional[Set[str]] = None,
+    handler_exists: Optional[Callable[[str], bool]] = None
+) -> FlowDefinition:
+    """
+    Load, parse and validate a flow definition file.
+
+    Args:
+        path: Definition file (defaults to get_definition_path())
+        event_names: Valid event values (FlowEvent values)
+        handler_exists: Predicate telling whether a handler name resolves
+
+    Returns:
+        Validated FlowDefinition
+
+    Raises:
+        V2ConfigurationError: If the file cannot be read or the graph is invalid
+    """
+    path = Path(path) if path else get_definition_path()
+    try:
+        raw = _read_file(path)
+    except V2ConfigurationError:
+        raise
+    except Exception as e:
+        raise V2ConfigurationError(
+            f"Cannot read flow definition {path}: {e}",
+            component="flow_definition"
+        ) from e
+
+    return parse_flow_definition(raw, event_names, handler_exists, source=str(path))
+
+
+def parse_flow_definition(
+    raw: Dict[str, Any],
+    event_names: Optional[Set[str]] = None,
+    handler_exists: Optional[Callable[[str], bool]] = None,
+    source: Optional[str] = None
+) -> FlowDefinition:
+    """
+    Parse and validate a flow definition from its dict form.
+
+    All problems are collected and reported together.
+
+    Raises:
+        V2ConfigurationError: If the definition is invalid
+    """
+    errors: List[str] = []
+
+    def state(value: Any, where: str) -> Optional[FlowStep]:
+        try:
+            return FlowStep(value)
+        except ValueError:
+            errors.append(f"{where}: unknown state '{value}'")
+            return None
+
+    def listed(container: Dict[str, Any], key: str, where: str) -> List[Any]:
+        # A wrong type is one more error, not a TypeError halfway through
+        if key not in container:
+            return []
+        value = container[key]
+        if not isinstance(value, list):
+            errors.append(f"{where} must be a list, not {type(value).__name__}")
+            return []
+        return value
+
+    if not isinstance(raw, dict):
+        raise V2ConfigurationError("Flow definition must be a mapping", component="flow_definition")
+
+    version = raw.get("version", 1)
+    if version not in SUPPORTED_VERSIONS:
+        errors.append(f"Unsupported definition version {version}")
+
+    states = tuple(s for s in (state(v, "states") for v in listed(raw, "states", "states")) if s)
+    if not states:
+        errors.append("No states declared")
+    declared = set(states)
+
+    start_state = state(raw.get("start_state"), "start_state")
+    if start_state and start_state not in declared:
+        errors.append(f"start_state '{start_state.value}' is not a declared state")
+
+    terminal_states = tuple(
+        s for s in (state(v, "terminal_states") for v in listed(raw, "terminal_states", "terminal_states")) if s
+    )
+
+    specs: List[TransitionSpec] = []
+    seen: Dict[Tuple[FlowStep, str], int] = {}
+
+    for index, entry in enumerate(listed(raw, "transitions", "transitions")):
+        where = f"transitions[{index}]"
+        if not isinstance(entry, dict):
+            errors.append(f"{where} must be a mapping, not {type(entry).__name__}")
+            continue
+        missing = [key for key in ("from", "event", "to") if key not in entry]
+        if missing:
+            errors.append(f"{where}: missing {', '.join(missing)}")
+            continue
+
+        sources = entry["from"]
+        if sources == "*":
+            from_states = list(states)
+        else:
+            sources = sources if isinstance(sources, list) else [sources]
+            from_states = [s for s in (state(v, f"{where}.from") for v in sources) if s]
+
+        event = entry["event"]
+        if not isinstance(event, str):
+            errors.append(f"{where}: event must be a string, not {type(event).__name__}")
+            continue
+        if event_names is not None and event not in event_names:
+            errors.append(f"{where}: unknown event '{event}'")
+
+        to_state = state(entry["to"], f"{where}.to")
+        redirects = tuple(
+            s for s in (state(v, f"{where}.redirects") for v in listed(entry, "redirects", f"{where}.redirects")) if s
+        )
+
+        handler = entry.get("handler")
+        if handler is not None and not isinstance(handler, str):
+            errors.append(f"{where}: handler must be a string, not {type(handler).__name__}")
+            handler = None
+        elif handler is not None and handler_exists is not None and not handler_exists(handler):
+            errors.append(f"{where}: unknown handler '{handler}'")
+
+        params = entry.get("params", {})
+        if not isinstance(params, dict):
+            errors.append(f"{where}: params must be a mapping")
+            params = {}
+
+        for target in (to_state, *redirects):
+            if target and target not in declared:
+                errors.append(f"{where}: target '{target.value}' is not a declared state")
+
+        for from_state in from_states:
+            if from_state not in declared:
+                errors.append(f"{where}: source '{from_state.value}' is not a declared state")
+            key = (from_state, event)
+            if key in seen:
+                errors.append(
+                    f"{where}: duplicate transition {from_state.value} + {event} "
+                    f"(already defined by transitions[{seen[key]}])"
+                )
+                continue
+            seen[key] = index
+
+            if to_state:
+                specs.append(TransitionSpec(
+                    from_state=from_state,
+                    event=event,
+                    to_state=to_state,
+                    handler=handler,
+                    params=tuple(sorted(params.items())),
+                    redirects=redirects,
+                    description=str(entry.get("description", "")).replace("{from}", from_state.value)
+                ))
+
+    warnings: List[str] = []
+    if not errors:
+        errors.extend(_analyze_graph(start_state, states, specs, set(terminal_states), warnings))
+
+    if errors:
+        raise V2ConfigurationError(
+            f"Invalid flow definition{f' {source}' if source else ''}: {len(errors)} error(s)",
+            component="flow_definition",
+            details={"errors": errors}
+        )
+
+    for warning in warnings:
+        logger.warning(f"Flow definition: {warning}")
+
+    return FlowDefinition(
+        name=raw.get("name", "flow"),
+        version=version,
+        start_state=start_state,
+        states=states,
+        transitions=tuple(specs),
+        terminal_states=terminal_states,
+        source=source,
+        warnings=tuple(warnings)
+    )
+
+
+def _analyze_graph(
+    start_state: FlowStep,
+    states: Tuple[FlowStep, ...],
+    specs: List[TransitionSpec],
+    terminal_states: Set[FlowStep],
+    warnings: List[str]
+) -> List[str]:
+    """
+    Check reachability, dead ends and traps of the state graph.
+
+    Edges include handler redirects, so states only entered through a
+    redirect still count as reachable.
+    """
+    errors = []
+    edges: Dict[FlowStep, Set[FlowStep]] = {s: set() for s in states}
+    reverse: Dict[FlowStep, Set[FlowStep]] = {s: set() for s in states}
+    for spec in specs:
+        for target in (spec.to_state, *spec.redirects):
+            edges[spec.from_state].add(target)
+            reverse[target].add(spec.from_state)
+
+    def closure(origin: FlowStep, graph: Dict[FlowStep, Set[FlowStep]]) -> Set[FlowStep]:
+        seen = {origin}
+        queue = deque([origin])
+        while queue:
+            for nxt in graph[queue.popleft()]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        return seen
+
+    reachable = closure(start_state, edges)
+    unreachable = [s.value for s in states if s not in reachable]
+    if unreachable:
+        errors.append(f"Unreachable states: {unreachable}")
+
+    dead_ends = [s.value for s in states if not edges[s] and s not in terminal_states]
+    if dead_ends:
+        errors.append(f"States without outgoing transitions: {dead_ends}")
+
+    # States from which the conversation can never get back to the start
+    returning = closure(start_state, reverse)
+    traps = [s.value for s in states if s in reachable and s not in returning and s not in terminal_states]
+    if traps:
+        warnings.append(f"States that cannot lead back to '{start_state.value}': {traps}")
+
+    missing_handlers = [f"{s.from_state.value} + {s.event}" for s in specs if not s.handler]
+    if missing_handlers:
+        warnings.append(f"Transitions without handlers: {missing_handlers}")
+
+    return errors
@@ -6,16 +6,25 @@ This replaces the hardcoded flow logic from V1 with a proper finite state machin
 that uses V2 services and agents through clean handlers.
 """
 
-from typing import Dict, List, Optional, Any, Callable, Awaitable
+from typing import Dict, List, Optional, Any, Callable, Awaitable, Iterator, Tuple, Union
+from contextlib import contextmanager
 from enum import Enum
 from dataclasses import dataclass
+from pathlib import Path
 import logging
+import os
+import time
 
 from src.models.flow_models import FlowStep
 from src.models.session_state import SessionState
 from src.agents.base_agent import V2AgentMessage
-from src.core.exceptions import V2FlowError, V2ValidationError
+from src.core.exceptions import V2FlowError, V2ValidationError, V2ConfigurationError
+from src.core.flow_definition import FlowDefinition, load_flow_definition, get_definition_path
 from src.core.flow_handlers import FlowHandlers
+from src.core.intent_classifier import Intent, get_intent_classifier
+from src.core.tracing import get_tracer
+from src.core.event_log import get_event_log
+from src.core.analytics import get_analytics
 
 logger = logging.getLogger(__name__)
 
@@ -62,197 +71,312 @@ class Transition:
     description: str = ""
 
 
+def _handler_name(handler: Callable) -> str:
+    """Readable handler name for traces"""
+    return getattr(handler, "__name__", None) or type(handler).__name__
+
+
+def _with_params(handler: TransitionHandler, params: Dict[str, Any]) -> TransitionHandler:
+    """Wrap a handler so the definition params are merged into its context"""
+    async def handler_with_params(session: SessionState, user_input: str, context: Dict[str, Any]):
+        context.update(params)
+        return await handler(session, user_input, context)
+    handler_with_params.__name__ = _handler_name(handler)
+    return handler_with_params
+
+
+def _mtime(path: Optional[Union[str, Path]]) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime if path else None
+    except OSError:
+        return None
+
+
+# Dense ordinals for the transition table
+_STATE_ORDINALS: Dict[FlowStep, int] = {state: i for i, state in enumerate(FlowStep)}
+_EVENT_ORDINALS: Dict[FlowEvent, int] = {event: i for i, event in enumerate(FlowEvent)}
+_EVENT_COUNT = len(_EVENT_ORDINALS)
+
+
+class CompiledTransitions:
+    """
+    Immutable, precompiled form of the FSM.
+
+    Transitions are stored in a dense table indexed by
+    ``state_ordinal * event_count + event_ordinal``; per-state transition and
+    event tuples, the summary and the validation result are computed once.
+    A FlowEngine swaps the whole object in a single assignment, so readers
+    never observe a partially built FSM.
+    """
+
+    __slots__ = ("table", "transitions", "_by_state", "_valid_events", "summary", "issues")
+
+    def __init__(self, transitions: List[Transition]):
+        table: List[Optional[Transition]] = [None] * (len(_STATE_ORDINALS) * _EVENT_COUNT)
+        by_state: List[List[Transition]] = [[] for _ in _STATE_ORDINALS]
+
+        for transition in transitions:
+            state_ordinal = _STATE_ORDINALS[transition.from_state]
+            index = state_ordinal * _EVENT_COUNT + _EVENT_ORDINALS[transition.event]
+
+            # Handle multiple transitions for same state/event (last one wins)
+            if table[index] is not None:
+                logger.warning(
+                    f"Multiple transitions for {transition.from_state.value} + {transition.event.value}. "
+                    f"Using conditions to resolve."
+                )
+            table[index] = transition
+            by_state[state_ordinal].append(transition)
+
+        self.table: Tuple[Optional[Transition], ...] = tuple(table)
+        self.transitions: Tuple[Transition, ...] = tuple(transitions)
+        self._by_state: Tuple[Tuple[Transition, ...], ...] = tuple(tuple(t) for t in by_state)
+        self._valid_events: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(t.event.value for t in state_transitions) for state_transitions in self._by_state
+        )
+        self.summary: Dict[str, Any] = self._build_summary()
+        self.issues: Tuple[str, ...] = tuple(self._validate())
+
+    def lookup(self, state: FlowStep, event: FlowEvent) -> Optional[Transition]:
+        """Transition for (state, event), or None if not defined"""
+        return self.table[_STATE_ORDINALS[state] * _EVENT_COUNT + _EVENT_ORDINALS[event]]
+
+    def from_state(self, state: FlowStep) -> Tuple[Transition, ...]:
+        """All transitions leaving a state"""
+        return self._by_state[_STATE_ORDINALS[state]]
+
+    def valid_events(self, state: FlowStep) -> Tuple[str, ...]:
+        """Values of all events accepted in a state"""
+        return self._valid_events[_STATE_ORDINALS[state]]
+
+    def as_map(self) -> Dict[tuple, Transition]:
+        """Sparse {(state, event): Transition} view of the table"""
+        return {(t.from_state, t.event): t for t in self.table if t is not None}
+
+    def _build_summary(self) -> Dict[str, Any]:
+        states = list(dict.fromkeys(
+            [t.from_state for t in self.transitions] + [t.to_state for t in self.transitions]
+        ))
+        events = list(dict.fromkeys(t.event for t in self.transitions))
+
+        return {
+            "total_states": len(states),
+            "total_events": len(events),
+            "total_transitions": len(self.transitions),
+            "states": tuple(s.value for s in states),
+            "events": tuple(e.value for e in events),
+            "transitions": tuple(
+                {
+                    "from": t.from_state.value,
+                    "event": t.event.value,
+                    "to": t.to_state.value,
+                    "description": t.description,
+                    "has_handler": t.handler is not None
+                }
+                for t in self.transitions
+            )
+        }
+
+    def _validate(self) -> List[str]:
+        issues = []
+
+        # Check for unreachable states
+        reachable_states = {FlowStep.GREETING}  # Start state
+        for transition in self.transitions:
+            if transition.from_state in reachable_states:
+                reachable_states.add(transition.to_state)
+
+        all_states = set([t.from_state for t in self.transitions] + [t.to_state for t in self.transitions])
+        unreachable = all_states - reachable_states
+
+        if unreachable:
+            issues.append(f"Unreachable states: {[s.value for s in unreachable]}")
+
+        # Check for missing handlers
+        transitions_without_handlers = [t for t in self.transitions if not t.handler]
+        if transitions_without_handlers:
+            issues.append(f"Transitions without handlers: {len(transitions_without_handlers)}")
+
+        return issues
+
+
 class FlowEngine:
     """
     Complete FSM-based flow engine with V2 integration.
     
     This engine:
-    1. Defines all valid state transitions explicitly
+    1. Loads all valid state transitions from a declarative flow definition
     2. Processes events and triggers appropriate transitions
     3. Uses FlowHandlers for business logic
     4. Coordinates V2 agents and services
     """
     
-    def __init__(self, flow_handlers: Optional[FlowHandlers] = None):
+    def __init__(
+        self,
+        flow_handlers: Optional[FlowHandlers] = None,
+        definition_path: Optional[Union[str, Path]] = None
+    ):
         """
         Initialize flow engine with handlers.
         
         Args:
             flow_handlers: Handler instance for business logic
+            definition_path: Flow definition file (defaults to FLOW_DEFINITION_PATH
+                or the bundled src/core/flow_definition.json)
+        
+        Raises:
+            V2ConfigurationError: If the flow definition is invalid
         """
         self.logger = logging.getLogger(__name__)
         
         # Initialize handlers
         self.handlers = flow_handlers or FlowHandlers()
         
+        # Shared with ValidationService so both classify replies identically
+        self.intent_classifier = get_intent_classifier()
+        
+        # Records transition/handler spans of the current turn
+        self.tracer = get_tracer()
+        
+        # Append-only log of all transitions (no-op unless EVENT_LOG_BACKEND is set)
+        self.event_log = get_event_log()
+        
         # Store all defined transitions
         self.transitions: List[Transition] = []
         
         # Quick lookup: {(state, event): Transition}
         self._transition_map: Dict[tuple, Transition] = {}
         
+        # Declarative source of the transitions (see flow_definition.py)
+        self.definition_path = Path(definition_path) if definition_path else get_definition_path()
+        self.definition: Optional[FlowDefinition] = None
+        self._definition_mtime: Optional[float] = None
+        
         # Initialize all transitions with handlers
         self._setup_transitions()
         
-        # Build lookup map
+        # Compile the dense transition table
         self._build_transition_map()
         
         logger.info("V2 FlowEngine initialized with complete handler integration")
     
     def _setup_transitions(self):
-        """Define all state transitions with their corresponding handlers"""
-        
-        # ===========================================
-        # GREETING TRANSITIONS
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.GREETING,
-            event=FlowEvent.START_SESSION,
-            to_state=FlowStep.WAIT_FOR_SYMPTOM,
-            handler=self.handlers.handle_greeting,
-            description="Initial greeting -> wait for symptom description"
-        )
-        
-        # ===========================================
-        # SYMPTOM INPUT TRANSITIONS  
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.WAIT_FOR_SYMPTOM,
-            event=FlowEvent.USER_INPUT,
-            to_state=FlowStep.WAIT_FOR_CONFIRMATION,
-            handler=self._handle_symptom_wrapper,
-            description="Process symptom input and determine if match found"
-        )
-        
-        # ===========================================
-        # CONFIRMATION TRANSITIONS
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.WAIT_FOR_CONFIRMATION,
-            event=FlowEvent.USER_INPUT,
-            to_state=FlowStep.WAIT_FOR_CONTEXT,
-            handler=self.handlers.handle_confirmation,
-            description="Process confirmation response"
-        )
-        
-        # ===========================================
-        # CONTEXT INPUT TRANSITIONS
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.WAIT_FOR_CONTEXT,
-            event=FlowEvent.USER_INPUT,
-            to_state=FlowStep.ASK_FOR_EXERCISE,
-            handler=self.handlers.handle_context_input,
-            description="Process context and provide instinct analysis"
-        )
-        
-        # ===========================================
-        # EXERCISE OFFER TRANSITIONS
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.ASK_FOR_EXERCISE,
-            event=FlowEvent.YES_RESPONSE,
-            to_state=FlowStep.END_OR_RESTART,
-            handler=self.handlers.handle_exercise_request,
-            description="User wants exercise -> provide exercise and offer restart"
-        )
-        
-        self.add_transition(
-            from_state=FlowStep.ASK_FOR_EXERCISE,
-            event=FlowEvent.NO_RESPONSE,
-            to_state=FlowStep.FEEDBACK_Q1,
-            handler=self._handle_exercise_declined,
-            description="User doesn't want exercise -> start feedback"
-        )
-        
-        # ===========================================
-        # END/RESTART TRANSITIONS
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.END_OR_RESTART,
-            event=FlowEvent.YES_RESPONSE,
-            to_state=FlowStep.WAIT_FOR_SYMPTOM,
-            handler=self._handle_restart_yes,
-            description="User wants another behavior -> restart conversation"
-        )
-        
-        self.add_transition(
-            from_state=FlowStep.END_OR_RESTART,
-            event=FlowEvent.NO_RESPONSE,
-            to_state=FlowStep.FEEDBACK_Q1,
-            handler=self._handle_restart_no,
-            description="User wants to end -> start feedback collection"
-        )
-        
-        # ===========================================
-        # FEEDBACK SEQUENCE TRANSITIONS
-        # ===========================================
-        
-        self.add_transition(
-            from_state=FlowStep.FEEDBACK_Q1,
-            event=FlowEvent.FEEDBACK_ANSWER,
-            to_state=FlowStep.FEEDBACK_Q2,
-            handler=self._handle_feedback_q1,
-            description="First feedback answer -> second question"
-        )
-        
-        self.add_transition(
-            from_state=FlowStep.FEEDBACK_Q2,
-            event=FlowEvent.FEEDBACK_ANSWER,
-            to_state=FlowStep.FEEDBACK_Q3,
-            handler=self._handle_feedback_q2,
-            description="Second feedback answer -> third question"
-        )
+        """Define all state transitions from the declarative flow definition"""
+        definition = self._load_definition()
+        for transition in self._transitions_from(definition):
+            self.transitions.append(transition)
+        self._activate_definition(definition)
+    
+    # ===========================================
+    # DECLARATIVE FLOW DEFINITION
+    # ===========================================
+    
+    def _engine_handlers(self) -> Dict[str, TransitionHandler]:
+        """Handlers implemented by the engine itself, by definition name"""
+        return {
+            "symptom_input": self._handle_symptom_wrapper,
+            "confirmation_yes": self._handle_confirmation_yes,
+            "confirmation_no": self._handle_confirmation_no,
+            "restart_yes": self._handle_restart_yes,
+            "restart_command": self._handle_restart_command,
+            "feedback_step": self._handle_feedback_step,
+        }
+    
+    def _resolve_handler(self, name: str) -> Optional[TransitionHandler]:
+        """
+        Resolve a handler name from the flow definition.
         
-        self.add_transition(
-            from_state=FlowStep.FEEDBACK_Q3,
-            event=FlowEvent.FEEDBACK_ANSWER,
-            to_state=FlowStep.FEEDBACK_Q4,
-            handler=self._handle_feedback_q3,
-            description="Third feedback answer -> fourth question"
+        Engine handlers take precedence; otherwise the name must be a public
+        method of the FlowHandlers instance.
+        """
+        handler = self._engine_handlers().get(name)
+        if handler is None and not name.startswith("_"):
+            handler = getattr(self.handlers, name, None)
+        return handler if callable(handler) else None
+    
+    def _load_definition(self, path: Optional[Union[str, Path]] = None) -> FlowDefinition:
+        """Load and validate a flow definition (raises V2ConfigurationError)"""
+        return load_flow_definition(
+            path or self.definition_path,
+            event_names={event.value for event in FlowEvent},
+            handler_exists=lambda name: self._resolve_handler(name) is not None
         )
+    
+    def _transitions_from(self, definition: FlowDefinition) -> List[Transition]:
+        """Build Transition objects with resolved handlers from a definition"""
+        transitions = []
+        for spec in definition.transitions:
+            handler = self._resolve_handler(spec.handler) if spec.handler else None
+            if handler is not None and spec.params:
+                handler = _with_params(handler, dict(spec.params))
+            transitions.append(Transition(
+                from_state=spec.from_state,
+                event=FlowEvent(spec.event),
+                to_state=spec.to_state,
+                handler=handler,
+                description=spec.description
+            ))
+        return transitions
+    
+    def _activate_definition(self, definition: FlowDefinition) -> None:
+        self.definition = definition
+        self._definition_mtime = _mtime(definition.source)
+    
+    def reload(self, path: Optional[Union[str, Path]] = None) -> FlowDefinition:
+        """
+        Load a flow definition and atomically replace the running FSM.
         
-        self.add_transition(
-            from_state=FlowStep.FEEDBACK_Q4,
-            event=FlowEvent.FEEDBACK_ANSWER,
-            to_state=FlowStep.FEEDBACK_Q5,
-            handler=self._handle_feedback_q4,
-            description="Fourth feedback answer -> fifth question"
-        )
+        The new definition is parsed, validated and compiled completely
+        before anything is swapped, so a broken file leaves the current
+        FSM untouched. Turns already in progress finish on the transition
+        they looked up.
         
-        self.add_transition(
-            from_state=FlowStep.FEEDBACK_Q5,
-            event=FlowEvent.FEEDBACK_COMPLETE,
-            to_state=FlowStep.GREETING,
-            handler=self.handlers.handle_feedback_completion,
-            description="Final feedback answer -> thank user and restart"
+        Args:
+            path: Definition file (defaults to the current definition path)
+            
+        Returns:
+            The activated FlowDefinition
+            
+        Raises:
+            V2ConfigurationError: If the definition is invalid
+        """
+        if path is not None:
+            path = Path(path)
+        definition = self._load_definition(path)
+        transitions = self._transitions_from(definition)
+        compiled = CompiledTransitions(transitions)
+        
+        self.transitions = transitions
+        self._transition_map = compiled.as_map()
+        self._fsm = compiled
+        if path is not None:
+            self.definition_path = path
+        self._activate_definition(definition)
+        
+        logger.info(
+            f"Flow definition '{definition.name}' loaded from {definition.source} "
+            f"({len(transitions)} transitions)"
         )
+        return definition
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the flow definition if its file was modified.
         
-        # ===========================================
-        # UNIVERSAL RESTART TRANSITIONS
-        # ===========================================
-        
-        restart_states = [
-            FlowStep.GREETING, FlowStep.WAIT_FOR_SYMPTOM, FlowStep.WAIT_FOR_CONFIRMATION,
-            FlowStep.WAIT_FOR_CONTEXT, FlowStep.ASK_FOR_EXERCISE, FlowStep.END_OR_RESTART,
-            FlowStep.FEEDBACK_Q1, FlowStep.FEEDBACK_Q2, FlowStep.FEEDBACK_Q3, 
-            FlowStep.FEEDBACK_Q4, FlowStep.FEEDBACK_Q5
-        ]
-        
-        for state in restart_states:
-            self.add_transition(
-                from_state=state,
-                event=FlowEvent.RESTART_COMMAND,
-                to_state=FlowStep.WAIT_FOR_SYMPTOM,
-                handler=self._handle_restart_command,
-                description=f"Restart command from {state.value} -> new conversation"
-            )
+        Returns:
+            True if a new definition was activated
+        """
+        mtime = _mtime(self.definition_path)
+        if mtime is None or mtime == self._definition_mtime:
+            return False
+        try:
+            self.reload()
+        except V2ConfigurationError as e:
+            # Remember the broken version so it is not reported on every poll
+            self._definition_mtime = mtime
+            logger.error(f"Flow definition reload rejected: {e.message} {e.details.get('errors', '')}")
+            return False
+        return True
     
     # ===========================================
     # HANDLER WRAPPERS
@@ -341,17 +465,6 @@ class FlowEngine:
         return await self.handlers.dog_agent.respond(agent_context)
     
     
-    async def _handle_exercise_declined(
-        self, 
-        session: SessionState, 
-        user_input: str, 
-        context: Dict[str, Any]
-    ) -> List[V2AgentMessage]:
-        """Handle user declining exercise - start feedback."""
-        return await self.handlers.handle_feedback_question(
-            session, user_input, {'question_number': 1}
-        )
-    
     async def _handle_restart_yes(
         self, 
         session: SessionState, 
@@ -372,17 +485,6 @@ class FlowEngine:
         
         return await self.handlers.dog_agent.respond(agent_context)
     
-    async def _handle_restart_no(
-        self, 
-        session: SessionState, 
-        user_input: str, 
-        context: Dict[str, Any]
-    ) -> List[V2AgentMessage]:
-        """Handle user not wanting to restart - go to feedback."""
-        return await self.handlers.handle_feedback_question(
-            session, user_input, {'question_number': 1}
-        )
-    
     async def _handle_restart_command(
         self, 
         session: SessionState, 
@@ -405,26 +507,17 @@ class FlowEngine:
         
         return await self.handlers.dog_agent.respond(agent_context)
     
-    # Feedback handlers
-    async def _handle_feedback_q1(self, session: SessionState, user_input: str, context: Dict[str, Any]) -> List[V2AgentMessage]:
-        """Handle feedback Q1 -> Q2"""
-        await self.handlers.handle_feedback_answer(session, user_input, context)
-        return await self.handlers.handle_feedback_question(session, "", {'question_number': 2})
-    
-    async def _handle_feedback_q2(self, session: SessionState, user_input: str, context: Dict[str, Any]) -> List[V2AgentMessage]:
-        """Handle feedback Q2 -> Q3"""
-        await self.handlers.handle_feedback_answer(session, user_input, context)
-        return await self.handlers.handle_feedback_question(session, "", {'question_number': 3})
-    
-    async def _handle_feedback_q3(self, session: SessionState, user_input: str, context: Dict[str, Any]) -> List[V2AgentMessage]:
-        """Handle feedback Q3 -> Q4"""
-        await self.handlers.handle_feedback_answer(session, user_input, context)
-        return await self.handlers.handle_feedback_question(session, "", {'question_number': 4})
-    
-    async def _handle_feedback_q4(self, session: SessionState, user_input: str, context: Dict[str, Any]) -> List[V2AgentMessage]:
-        """Handle feedback Q4 -> Q5"""
+    async def _handle_feedback_step(
+        self, 
+        session: SessionState, 
+        user_input: str, 
+        context: Dict[str, Any]
+    ) -> List[V2AgentMessage]:
+        """Store a feedback answer and ask the question given by 'next_question'."""
         await self.handlers.handle_feedback_answer(session, user_input, context)
-        return await self.handlers.handle_feedback_question(session, "", {'question_number': 5})
+        return await self.handlers.handle_feedback_question(
+            session, "", {'question_number': context['next_question']}
+        )
     
     # ===========================================
     # CORE FSM METHODS
@@ -451,24 +544,19 @@ class FlowEngine:
         self.transitions.append(transition)
     
     def _build_transition_map(self):
-        """Build fast lookup map for transitions"""
-        self._transition_map.clear()
+        """
+        Compile the transitions into the dense lookup table.
         
-        for transition in self.transitions:
-            key = (transition.from_state, transition.event)
-            
-            # Handle multiple transitions for same state/event (conditions will resolve)
-            if key in self._transition_map:
-                self.logger.warning(
-                    f"Multiple transitions for {transition.from_state.value} + {transition.event.value}. "
-                    f"Using conditions to resolve."
-                )
-            
-            self._transition_map[key] = transition
+        Must be called again after add_transition() for the new transition
+        to take effect.
+        """
+        compiled = CompiledTransitions(self.transitions)
+        self._transition_map = compiled.as_map()
+        self._fsm = compiled
     
-    def get_valid_transitions(self, current_state: FlowStep) -> List[Transition]:
+    def get_valid_transitions(self, current_state: FlowStep) -> Tuple[Transition, ...]:
         """Get all valid transitions from current state"""
-        return [t for t in self.transitions if t.from_state == current_state]
+        return self._fsm.from_state(current_state)
     
     def can_transition(
         self, 
@@ -479,13 +567,11 @@ class FlowEngine:
         context: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Check if a transition is valid"""
-        key = (current_state, event)
+        transition = self._fsm.lookup(current_state, event)
         
-        if key not in self._transition_map:
+        if transition is None:
             return False
         
-        transition = self._transition_map[key]
-        
         # Check condition if present
         if transition.condition:
             return transition.condition(session, user_input, context or {})
@@ -514,29 +600,83 @@ class FlowEngine:
         Raises:
             V2FlowError: If transition is invalid or fails
         """
+        with self.track_transition(session, event, user_input, tracer=self.tracer, event_log=self.event_log):
+            new_state, messages = await self._process_event(session, event, user_input, context or {})
+        return new_state, messages
+    
+    @staticmethod
+    @contextmanager
+    def track_transition(
+        session: SessionState,
+        event: FlowEvent,
+        user_input: str = "",
+        tracer: Optional[Any] = None,
+        event_log: Optional[Any] = None,
+        **attributes: Any
+    ) -> Iterator[None]:
+        """
+        Trace span, analytics step and event log entry of one transition.
+        
+        Wraps the code that moves session.current_step; nothing is recorded
+        if it raises. A static method, so the orchestrator can apply the
+        precomputed greeting before the engine is created.
+        
+        Args:
+            session: Session whose current_step the wrapped code updates
+            event: Event that triggered the transition
+            user_input: User's input (for the event log)
+            tracer: Tracer for the span (defaults to the global tracer)
+            event_log: Event log (defaults to the global event log)
+            **attributes: Additional span attributes
+        """
+        tracer = tracer if tracer is not None else get_tracer()
+        event_log = event_log if event_log is not None else get_event_log()
+        from_state = session.current_step
+        started = time.time()
+        start = time.perf_counter()
+        with tracer.span("transition", from_state=from_state.value, event=event.value, **attributes) as span:
+            yield
+            if span is not None:
+                span.set_attribute("to_state", session.current_step.value)
+        
+        to_state = session.current_step
+        get_analytics().record_step(session.session_id, to_state)
+        if event_log.enabled:
+            event_log.record(
+                session, from_state, event, user_input, to_state,
+                started, (time.perf_counter() - start) * 1000
+            )
+    
+    async def _process_event(
+        self,
+        session: SessionState,
+        event: FlowEvent,
+        user_input: str,
+        context: Dict[str, Any]
+    ) -> tuple[FlowStep, List[V2AgentMessage]]:
+        """Look up and execute the transition for an event (see process_event)"""
         current_state = session.current_step
-        context = context or {}
         
         self.logger.info(f"Processing event {event.value} from state {current_state.value}")
         
-        # Check if transition is valid
-        if not self.can_transition(current_state, event, session, user_input, context):
-            valid_events = [t.event.value for t in self.get_valid_transitions(current_state)]
+        # Look up and check the transition
+        transition = self._fsm.lookup(current_state, event)
+        if transition is None or (
+            transition.condition and not transition.condition(session, user_input, context)
+        ):
+            valid_events = list(self._fsm.valid_events(current_state))
             logger.warning(f"Invalid transition: {current_state.value} + {event.value}. Valid events: {valid_events}")
             raise V2FlowError(
                 current_state=current_state.value,
                 message=f"Invalid transition: {current_state.value} + {event.value}. Valid events: {valid_events}"
             )
         
-        # Get the transition
-        key = (current_state, event)
-        transition = self._transition_map[key]
-        
         try:
             # Execute transition handler if present
             messages = []
             if transition.handler:
-                result = await transition.handler(session, user_input, context)
+                with self.tracer.span("handler", handler=_handler_name(transition.handler)):
+                    result = await transition.handler(session, user_input, context)
                 
                 # Handle different return types
                 if isinstance(result, tuple) and len(result) == 2:
@@ -600,10 +740,10 @@ class FlowEngine:
         Returns:
             Classified FlowEvent
         """
-        user_input = user_input.strip().lower()
+        intent = self.intent_classifier.classify(user_input)
         
         # Universal restart commands
-        if user_input in ["neu", "restart", "von vorne"]:
+        if intent == Intent.RESTART:
             return FlowEvent.RESTART_COMMAND
         
         # State-specific classification
@@ -617,9 +757,9 @@ class FlowEngine:
             
         elif current_state in [FlowStep.ASK_FOR_EXERCISE, FlowStep.END_OR_RESTART]:
             # Yes/No responses
-            if "ja" in user_input:
+            if intent == Intent.YES:
                 return FlowEvent.YES_RESPONSE
-            elif "nein" in user_input:
+            elif intent == Intent.NO:
                 return FlowEvent.NO_RESPONSE
             else:
                 return FlowEvent.USER_INPUT  # Will trigger "please say yes or no"
@@ -640,50 +780,12 @@ class FlowEngine:
             return FlowEvent.USER_INPUT
     
     def get_flow_summary(self) -> Dict[str, Any]:
-        """Get summary of the FSM for debugging/monitoring"""
-        states = list(set([t.from_state for t in self.transitions] + [t.to_state for t in self.transitions]))
-        events = list(set([t.event for t in self.transitions]))
-        
-        return {
-            "total_states": len(states),
-            "total_events": len(events),
-            "total_transitions": len(self.transitions),
-            "states": [s.value for s in states],
-            "events": [e.value for e in events],
-            "transitions": [
-                {
-                    "from": t.from_state.value,
-                    "event": t.event.value,
-                    "to": t.to_state.value,
-                    "description": t.description,
-                    "has_handler": t.handler is not None
-                }
-                for t in self.transitions
-            ]
-        }
+        """Get summary of the FSM for debugging/monitoring (precomputed)"""
+        return dict(self._fsm.summary)
     
     def validate_fsm(self) -> List[str]:
-        """Validate the FSM for common issues"""
-        issues = []
-        
-        # Check for unreachable states
-        reachable_states = {FlowStep.GREETING}  # Start state
-        for transition in self.transitions:
-            if transition.from_state in reachable_states:
-                reachable_states.add(transition.to_state)
-        
-        all_states = set([t.from_state for t in self.transitions] + [t.to_state for t in self.transitions])
-        unreachable = all_states - reachable_states
-        
-        if unreachable:
-            issues.append(f"Unreachable states: {[s.value for s in unreachable]}")
-        
-        # Check for missing handlers
-        transitions_without_handlers = [t for t in self.transitions if not t.handler]
-        if transitions_without_handlers:
-            issues.append(f"Transitions without handlers: {len(transitions_without_handlers)}")
-        
-        return issues
+        """Validate the FSM for common issues (checked once at compile time)"""
+        return list(self._fsm.issues)
 
 
 # Create singleton instance
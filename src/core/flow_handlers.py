@@ -19,8 +19,12 @@ from src.services.gpt_service import GPTService
 from src.services.weaviate_service import WeaviateService
 from src.services.redis_service import RedisService
 from src.services.validation_service import ValidationService
-from src.core.prompt_manager import PromptManager, PromptType
+from src.core.prompt_manager import PromptManager, PromptType, get_prompt_manager
+from src.core.token_budget import get_token_budget
+from src.core.feedback_pipeline import FeedbackPipeline, get_feedback_pipeline
+from src.core.analytics import get_analytics
 from src.core.exceptions import V2FlowError, V2ValidationError
+from src.core.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +45,8 @@ class FlowHandlers:
         weaviate_service: Optional[WeaviateService] = None,
         redis_service: Optional[RedisService] = None,
         prompt_manager: Optional[PromptManager] = None,
-        validation_service: Optional[ValidationService] = None
+        validation_service: Optional[ValidationService] = None,
+        feedback_pipeline: Optional[FeedbackPipeline] = None
     ):
         """
         Initialize flow handlers with V2 services and agents.
@@ -51,15 +56,20 @@ class FlowHandlers:
             companion_agent: Companion agent for feedback messages
             gpt_service: GPT service for text generation
             weaviate_service: Vector search service
-            redis_service: Caching and feedback storage
+            redis_service: Caching
             prompt_manager: Centralized prompt management
+            feedback_pipeline: Background feedback storage (defaults to the global pipeline)
         """
         # Initialize services
-        self.prompt_manager = prompt_manager or PromptManager()
+        self.prompt_manager = prompt_manager or get_prompt_manager()
         self.gpt_service = gpt_service or GPTService()
         self.weaviate_service = weaviate_service or WeaviateService()
         self.redis_service = redis_service or RedisService()
         self.validation_service = validation_service or ValidationService()
+        self.feedback_pipeline = feedback_pipeline or get_feedback_pipeline()
+        
+        # Handlers annotate the current turn trace (match quality etc.)
+        self.tracer = get_tracer()
         
         # Initialize agents with services
         self.dog_agent = dog_agent or DogAgent(
@@ -160,19 +170,21 @@ class FlowHandlers:
                 # Use schnelldiagnose (quick diagnosis) from the matched symptom
                 match_data = results[0]['properties'].get('schnelldiagnose', '')
                 
-                # Store match distance in the field
-                # TODO: Add match_distance to SessionState if needed
-                # session.match_distance = results[0]['metadata'].get('distance')
+                # Store match distance for the confirmation statistics
+                session.match_distance = results[0]['metadata'].get('distance')
                 
                 logger.info(f"Good match found with distance {results[0]['metadata'].get('distance')}")
+                self.tracer.set_attribute("match_distance", results[0]['metadata'].get('distance'))
             else:
                 match_found = False
                 match_data = None
                 logger.info("No good match found (distance too high or no results)")
+            
+            get_analytics().record_search(results[0]['metadata'].get('distance') if results else None, match_found)
                 
         except Exception as e:
             logger.error(f"Error in symptom search: {e}", exc_info=True)
-            print(f"DEBUG: Weaviate error caught, will show technical error")
+            logger.debug("Weaviate error caught, will show technical error")
             
             # Return technical error
             messages = await self.dog_agent.respond(AgentContext(
@@ -211,7 +223,7 @@ class FlowHandlers:
         else:
             # No match found - ask to try again
             logger.info("Symptom not found, staying in WAIT_FOR_SYMPTOM")
-            print(f"DEBUG: Showing no-match error message")
+            logger.debug("Showing no-match error message")
             messages = await self.dog_agent.respond(AgentContext(
                 session_id=session.session_id,
                 user_input=user_input,
@@ -241,12 +253,14 @@ class FlowHandlers:
         
         # Get response type from validation
         response_type = validation_result.details.get("response_type")
+        self.tracer.set_attribute("response_type", response_type)
         
         # Get match distance from V2 SessionState field
         match_distance = session.match_distance if session.match_distance is not None else 'unknown'
         
         if response_type == "yes":
             logger.info(f"Match confirmation - Symptom: '{session.active_symptom}', Confirmed: yes, Distance: {match_distance}")
+            get_analytics().record_confirmation(True, session.match_distance)
             
             # Transition to context gathering
             messages = await self.dog_agent.respond(AgentContext(
@@ -260,6 +274,7 @@ class FlowHandlers:
             
         elif response_type == "no":
             logger.info(f"Match confirmation - Symptom: '{session.active_symptom}', Confirmed: no, Distance: {match_distance}")
+            get_analytics().record_confirmation(False, session.match_distance)
             
             # User said no - restart the conversation completely
             # Clear ALL session data for a true fresh start
@@ -318,7 +333,7 @@ class FlowHandlers:
             
             # Perform instinct analysis
             analysis_data = await self._analyze_instincts(symptom, user_input)
-            print(f"DEBUG: Analysis data: {analysis_data}")
+            logger.debug("Analysis data: %s", analysis_data)
 
             
             # Generate diagnosis from dog perspective
@@ -333,9 +348,10 @@ class FlowHandlers:
             )
             
             messages = await self.dog_agent.respond(agent_context)
-            print(f"DEBUG: Diagnosis messages: {len(messages)}")
-            for i, msg in enumerate(messages):
-                print(f"DEBUG: Message {i}: type={msg.message_type}, text={msg.text[:50]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Diagnosis messages: %d", len(messages))
+                for i, msg in enumerate(messages):
+                    logger.debug("Message %d: type=%s, text=%.50s...", i, msg.message_type, msg.text)
 
             
             # Add exercise offer question
@@ -346,16 +362,16 @@ class FlowHandlers:
             )
             
             exercise_messages = await self.dog_agent.respond(exercise_context)
-            print(f"DEBUG: Exercise messages: {len(exercise_messages)}")
-            for i, msg in enumerate(exercise_messages):
-                print(f"DEBUG: Exercise msg {i}: type={msg.message_type}, text={msg.text[:50]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exercise messages: %d", len(exercise_messages))
+                for i, msg in enumerate(exercise_messages):
+                    logger.debug("Exercise msg %d: type=%s, text=%.50s...", i, msg.message_type, msg.text)
             messages.extend(exercise_messages)
             
             return messages
             
         except Exception as e:
-            logger.error(f"Error in context input handler: {e}")
-            print(f"DEBUG: Full error in context handler: {e}")
+            logger.error(f"Error in context input handler: {e}", exc_info=True)
             
             # Fallback to basic response
             agent_context = AgentContext(
@@ -389,7 +405,7 @@ class FlowHandlers:
         try:
             # Search for relevant exercise
             exercise_data = await self._find_exercise(session.active_symptom)
-            print(f"DEBUG: Found exercise data: {exercise_data[:100]}...")
+            logger.debug("Found exercise data: %.100s...", exercise_data)
             
             # Generate exercise response
             agent_context = AgentContext(
@@ -403,7 +419,7 @@ class FlowHandlers:
             )
             
             messages = await self.dog_agent.respond(agent_context)
-            print(f"DEBUG: Exercise response messages: {len(messages)}")
+            logger.debug("Exercise response messages: %d", len(messages))
             
             # Add restart question
             restart_context = AgentContext(
@@ -618,12 +634,14 @@ class FlowHandlers:
                     elif 'sexual' in text.lower():
                         instinct_descriptions['sexual'] = text
                 
-                # GPT analysis
+                # GPT analysis (user input capped to its token budget)
+                budget = get_token_budget()
+                prompt_params = budget.fit(PromptType.INSTINCT_ANALYSIS, {"symptom": symptom, "context": context})
                 analysis_prompt = self.prompt_manager.get_prompt(
                     PromptType.INSTINCT_ANALYSIS,  
-                    symptom=symptom,
-                    context=context
+                    **prompt_params
                 )
+                analysis_prompt = budget.finish(PromptType.INSTINCT_ANALYSIS, analysis_prompt, prompt_params)
                 
                 gpt_response = await self.gpt_service.complete(analysis_prompt)
                 
@@ -663,7 +681,7 @@ class FlowHandlers:
             Exercise description string
         """
         try:
-            print(f"DEBUG _find_exercise: Searching for symptom: {symptom}")
+            logger.debug("_find_exercise: Searching for symptom: %s", symptom)
             # Search exercise database
             exercise_results = await self.weaviate_service.search(
                 collection="Erziehung",
@@ -671,16 +689,16 @@ class FlowHandlers:
                 limit=3
             )
             
-            print(f"DEBUG: Found {len(exercise_results) if exercise_results else 0} exercise results")
+            logger.debug("Found %d exercise results", len(exercise_results) if exercise_results else 0)
             
             if exercise_results and len(exercise_results) > 0:
                 # Return best matching exercise
                 best_exercise = exercise_results[0]
-                print(f"DEBUG: Best exercise result: {best_exercise}")
+                logger.debug("Best exercise result: %s", best_exercise)
 
                 text = best_exercise.get('properties', {}).get('anleitung', 'Keine spezifische Übung gefunden.')
 
-                print(f"DEBUG: Exercise text: {text[:100]}...")
+                logger.debug("Exercise text: %.100s...", text)
                 return text
             
             # Fallback exercise
@@ -692,13 +710,13 @@ class FlowHandlers:
     
     async def _save_feedback(self, session: SessionState) -> bool:
         """
-        Save feedback to storage.
+        Hand feedback to the background pipeline (the turn never waits on storage).
         
         Args:
             session: Session with feedback data
             
         Returns:
-            True if saved successfully, False otherwise
+            True if the feedback was accepted for storage, False otherwise
         """
         try:
             # Get feedback from the session's feedback list
@@ -711,19 +729,15 @@ class FlowHandlers:
             feedback_data = {
                 'session_id': session.session_id,
                 'symptom': getattr(session, 'active_symptom', ''),
-                'responses': feedback_list,
+                'responses': list(feedback_list),
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
             
-            # Save to Redis
-            if self.redis_service:
-                self.redis_service.set(
-                    f"feedback:{session.session_id}",
-                    feedback_data,
-                    expire=7776000  # 90 days
-                )
+            # Queued here, written to Redis in batches by the pipeline
+            if not self.feedback_pipeline.submit(feedback_data):
+                return False
             
-            logger.info(f"Feedback saved for session {session.session_id}")
+            logger.info(f"Feedback accepted for session {session.session_id}")
             return True
             
         except Exception as e:
@@ -0,0 +1,107 @@
+# src/v2/core/intent_classifier.py
+"""
+Compiled intent classifier for short user replies.
+
+Yes/no detection and restart commands are derived from the pattern lists in
+src.prompts.common_prompts and compiled once into:
+
+- a single regex alternation with word boundaries for yes/no phrases
+  (longest phrases first, so "nein danke" wins over "nein"), and
+- a frozen set of restart commands that must match the whole reply.
+
+One search over the input decides the intent: the leftmost phrase wins, so
+"ja, nicht schlecht" is a yes and "nein, ja nicht" is a no. Word boundaries
+keep "noch" from counting as "no" and "Jaguar" from counting as "ja".
+"""
+
+import re
+from enum import Enum
+from typing import Iterable, Optional
+
+from src.prompts.common_prompts import YES_PATTERNS, NO_PATTERNS, RESTART_COMMANDS
+
+# Characters ignored around a reply when matching restart commands
+_STRIP_CHARS = " \t\r\n.,;:!?\"'()"
+
+
+class Intent(str, Enum):
+    """Intent of a short user reply"""
+    YES = "yes"
+    NO = "no"
+    RESTART = "restart"
+    NONE = "none"
+
+
+# Resolved once; enum attribute access is comparatively slow on the hot path
+_NONE = Intent.NONE
+_GROUP_INTENTS = {"yes": Intent.YES, "no": Intent.NO}
+
+
+def normalize_reply(text: str) -> str:
+    """Lowercase, collapse whitespace and strip surrounding punctuation"""
+    return " ".join(text.lower().split()).strip(_STRIP_CHARS)
+
+
+def _alternation(patterns: Iterable[str]) -> str:
+    """Regex alternation of phrases, longest first, whitespace-tolerant"""
+    phrases = sorted({normalize_reply(p) for p in patterns if p.strip()}, key=len, reverse=True)
+    return "|".join(r"\s+".join(re.escape(word) for word in phrase.split()) for phrase in phrases)
+
+
+class IntentClassifier:
+    """
+    Classifies replies into yes / no / restart in a single pass.
+
+    Usage:
+        classifier = get_intent_classifier()
+        classifier.classify("Ja, gerne!")   # Intent.YES
+    """
+
+    def __init__(
+        self,
+        yes_patterns: Iterable[str] = YES_PATTERNS,
+        no_patterns: Iterable[str] = NO_PATTERNS,
+        restart_commands: Iterable[str] = RESTART_COMMANDS
+    ):
+        self._pattern = re.compile(
+            rf"\b(?:(?P<no>{_alternation(no_patterns)})|(?P<yes>{_alternation(yes_patterns)}))\b"
+        )
+        self._restart_commands = frozenset(normalize_reply(c) for c in restart_commands)
+
+    def classify(self, text: str) -> Intent:
+        """
+        Classify a reply.
+
+        Restart commands only count if they are the whole reply, so that a
+        symptom like "Der Hund ist neu bei uns" is not taken as a restart.
+        """
+        normalized = normalize_reply(text)
+        if normalized in self._restart_commands:
+            return Intent.RESTART
+        return self._match(normalized)
+
+    def classify_yes_no(self, text: str) -> Intent:
+        """Classify a reply as YES, NO or NONE (restart commands are ignored)"""
+        return self._match(normalize_reply(text))
+
+    def is_restart(self, text: str) -> bool:
+        """Check if the whole reply is a restart command"""
+        return normalize_reply(text) in self._restart_commands
+
+    def _match(self, normalized: str) -> Intent:
+        match = self._pattern.search(normalized)
+        if match is None:
+            return _NONE
+        return _GROUP_INTENTS[match.lastgroup]
+
+
+# Global instance for easy access
+_intent_classifier: Optional[IntentClassifier] = None
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Get the shared IntentClassifier instance"""
+    global _intent_classifier
+    if _intent_classifier is None:
+        _intent_classifier = IntentClassifier()
+    return _intent_classifier
@@ -1,47 +1,212 @@
 # src/v2/core/logging_config.py
-"""Logging configuration for V2 - copied from V1 to remove dependency"""
+"""
+Logging configuration for V2 - copied from V1 to remove dependency.
+
+Log calls on the event loop only put the record on an in-memory queue. A
+QueueListener thread formats the records and writes them to the console and
+the rotating log file, so disk I/O never sits on the request path:
+
+- Messages with str/number arguments are formatted in the listener thread.
+  Any other argument (dicts, lists, objects) may change after the call, so
+  such messages are rendered on the calling thread before queueing, and
+  non-scalar ``extra=`` values are queued as their str(). Guard expensive
+  debug calls with ``logger.isEnabledFor(logging.DEBUG)``.
+- The listener runs in this process and shares the GIL with the event loop.
+  Queueing takes file I/O and most formatting off the request path, but the
+  total CPU per turn is about a quarter to a third higher than writing
+  synchronously
+  (queue hand-off, thread switches); see benchmarks/bench_logging.py. Use
+  LOG_LEVEL=INFO or DEBUG sampling to cut the total.
+- LOG_FORMAT=json (default) writes one JSON object per line with time,
+  level, logger, message, exception and any ``extra=`` fields, encoded with
+  orjson at about the cost of the text format; LOG_FORMAT=text keeps the
+  plain format.
+- LOG_DEBUG_SAMPLE_RATE (0-1, default 1) keeps only that share of DEBUG
+  records; the rest are dropped before they are queued.
+- LOG_QUEUE_SIZE bounds the queue. If the listener cannot keep up, new
+  records are dropped and counted instead of blocking the event loop.
+"""
 
 import os
+import time
+import queue
+import atexit
+import random
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Dict, Optional
 
+import orjson
 
-def setup_logging():
-    """Konfiguriert das Logging-System"""
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+# Attributes every LogRecord has; everything else was passed with extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "taskName"
+}
+
+# Values that cannot change between the log call and the listener thread
+_SCALARS = (str, int, float, bool, type(None))
+
+_queue_handler: Optional["LazyQueueHandler"] = None
+_listener: Optional["_QueueListener"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def __init__(self):
+        super().__init__()
+        self._second = -1
+        self._second_text = ""
+
+    def _timestamp(self, created: float) -> str:
+        # ISO 8601 in UTC with milliseconds; the date part changes once per second
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_text}.{int((created - second) * 1000):03d}+00:00"
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Queues records unformatted, with DEBUG sampling and a non-blocking put.
+
+    The standard QueueHandler formats the message before queueing it (so
+    records can be pickled); this queue never leaves the process, so a
+    record whose arguments are all str/number values is handed over as it
+    is and formatted by the listener thread. Records with other arguments
+    are rendered here, because the request may mutate them before the
+    listener gets to the record; non-scalar extra= values become their str().
+    """
+
+    def __init__(self, log_queue: queue.Queue, debug_sample_rate: float = 1.0):
+        super().__init__(log_queue)
+        self.debug_sample_rate = debug_sample_rate
+        self.sampled_out = 0
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if (
+            record.levelno <= logging.DEBUG
+            and self.debug_sample_rate < 1.0
+            and random.random() >= self.debug_sample_rate
+        ):
+            self.sampled_out += 1
+            return
+        _render_mutable(record)
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _render_mutable(record: logging.LogRecord) -> None:
+    """Render everything that could change before the listener formats the record"""
+    args = record.args
+    if (
+        type(record.msg) is not str
+        or args and (type(args) is not tuple or any(type(arg) not in _SCALARS for arg in args))
+    ):
+        record.msg = record.getMessage()
+        record.args = None
+    for key in record.__dict__.keys() - _RECORD_ATTRS:
+        value = record.__dict__[key]
+        if type(value) not in _SCALARS:
+            record.__dict__[key] = str(value)
+
+
+class _QueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room instead of failing when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+
+def _create_handlers(root_logger: logging.Logger) -> list:
+    """Console and file handlers that run in the listener thread"""
     log_dir = Path(os.getenv("LOG_DIR", "logs"))
 
     # Sicherstellen, dass der Log-Ordner existiert (auch wenn er schon da ist)
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    # Root-Logger konfigurieren
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-
     # Formatter erstellen
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if os.getenv("LOG_FORMAT", "json").lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+    handlers = []
 
-    # Console-Handler (einmalig anhängen)
-    if not any(isinstance(h, logging.StreamHandler) for h in root_logger.handlers):
+    # Console-Handler (nur wenn nicht schon einer am Root-Logger hängt)
+    if not any(
+        isinstance(h, logging.StreamHandler) and not isinstance(h, logging.FileHandler)
+        for h in root_logger.handlers
+    ):
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # File-Handler (rotierend, max. 5 MB pro Datei, max. 5 Dateien)
-    log_file = log_dir / 'wuffchat.log'
-    if not any(isinstance(h, RotatingFileHandler) and h.baseFilename == str(log_file) for h in root_logger.handlers):
-        file_handler = RotatingFileHandler(
-            filename=str(log_file),
-            maxBytes=5 * 1024 * 1024,  # 5 MB
-            backupCount=5,
-            encoding='utf-8'
+    file_handler = RotatingFileHandler(
+        filename=str(log_dir / 'wuffchat.log'),
+        maxBytes=5 * 1024 * 1024,  # 5 MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(formatter)
+    handlers.append(file_handler)
+
+    return handlers
+
+
+def _start_listener(handlers: list) -> None:
+    global _listener
+    _listener = _QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def setup_logging():
+    """Konfiguriert das Logging-System"""
+    global _queue_handler
+
+    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+
+    # Root-Logger konfigurieren
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+
+    # Queue und Listener-Thread (einmalig pro Prozess)
+    if _queue_handler is None:
+        handlers = _create_handlers(root_logger)
+        _queue_handler = LazyQueueHandler(
+            queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000"))),
+            debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
         )
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(_queue_handler)
+        _start_listener(handlers)
+        atexit.register(stop_logging)
 
     # Spezielle Logger-Konfigurationen
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -49,4 +214,42 @@ def setup_logging():
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
 
-    return root_logger
\ No newline at end of file
+    return root_logger
+
+
+def stop_logging() -> None:
+    """Write all queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def restart_logging_after_fork() -> None:
+    """
+    Give a forked worker its own queue and listener thread.
+
+    Threads do not survive fork(), and the inherited queue may have been
+    locked by the master's listener at the time of the fork.
+    """
+    if _queue_handler is None or _listener is None:
+        return
+    handlers = _listener.handlers
+    _queue_handler.queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _start_listener(handlers)
+
+
+def get_logging_metrics() -> Dict[str, Any]:
+    """Queue depth and dropped records of this process"""
+    if _queue_handler is None:
+        return {"active": False}
+    return {
+        "active": _listener is not None,
+        "queued": _queue_handler.queue.qsize(),
+        "max_queued": _queue_handler.queue.maxsize,
+        "debug_sample_rate": _queue_handler.debug_sample_rate,
+        "sampled_out": _queue_handler.sampled_out,
+        "dropped": _queue_handler.dropped,
+    }
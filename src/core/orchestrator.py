@@ -6,22 +6,30 @@ This replaces the V1 flow_orchestrator.py with a clean, FSM-based approach
 that coordinates the flow engine, services, and agents.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
-from src.models.flow_models import FlowStep
+from src.models.flow_models import FlowStep, AgentMessage
 from src.models.session_state import SessionState, SessionStore
 from src.agents.base_agent import V2AgentMessage
+from src.agents.dog_agent import DogAgent
 from src.core.flow_engine import FlowEngine, FlowEvent, create_flow_engine
 from src.core.flow_handlers import FlowHandlers
-from src.core.exceptions import V2FlowError, V2ValidationError
+from src.core.flow_definition import load_flow_definition
+from src.core.exceptions import V2FlowError, V2ValidationError, SessionUnavailableError
 from src.services.gpt_service import GPTService
 from src.services.weaviate_service import WeaviateService  
 from src.services.redis_service import RedisService
-from src.core.prompt_manager import PromptManager
+from src.core.prompt_manager import PromptType, get_prompt_manager, get_prompt_registry
+from src.core.session_persistence import SessionWriteBehind
+from src.core.tracing import get_tracer, set_attribute
+from src.core.experiments import get_experiments
 
 logger = logging.getLogger(__name__)
 
+# Flow definition handler whose messages only depend on the prompts
+GREETING_HANDLER = "handle_greeting"
+
 
 class V2Orchestrator:
     """
@@ -39,7 +47,8 @@ class V2Orchestrator:
         self,
         session_store: Optional[SessionStore] = None,
         flow_engine: Optional[FlowEngine] = None,
-        enable_logging: bool = True
+        enable_logging: bool = True,
+        session_writer: Optional[SessionWriteBehind] = None
     ):
         """
         Initialize V2 orchestrator.
@@ -48,8 +57,17 @@ class V2Orchestrator:
             session_store: Session management (uses existing V1 for compatibility)
             flow_engine: FSM engine (creates new if not provided)
             enable_logging: Enable detailed logging
+            session_writer: Optional write-behind persistence for sessions
         """
         self.session_store = session_store or SessionStore()
+        self.session_writer = session_writer
+        self.tracer = get_tracer()
+        self.experiments = get_experiments()
+        
+        # Precomputed greeting turn: (prompt registry, flow definition, greeting)
+        self._greeting: Optional[Tuple[Any, Any, Any]] = None
+        # Injected engines (tests, tools) always run the greeting through the FSM
+        self._owns_flow_engine = flow_engine is None
         
         # Initialize V2 components
         if flow_engine:
@@ -85,7 +103,7 @@ class V2Orchestrator:
         
         try:
             # Initialize services
-            self.prompt_manager = PromptManager()
+            self.prompt_manager = get_prompt_manager()
             self.gpt_service = GPTService()
             self.weaviate_service = WeaviateService()
             self.redis_service = RedisService()
@@ -108,7 +126,12 @@ class V2Orchestrator:
             logger.error(f"Failed to initialize V2 services: {e}")
             raise
     
-    async def handle_message(self, session_id: str, user_input: str) -> List[Dict[str, Any]]:
+    async def handle_message(
+        self,
+        session_id: str,
+        user_input: str,
+        session: Optional[SessionState] = None
+    ) -> List[Dict[str, Any]]:
         """
         Main entry point for handling user messages.
         
@@ -117,10 +140,21 @@ class V2Orchestrator:
         Args:
             session_id: Session identifier
             user_input: User's message text
+            session: Session already loaded for this turn (loaded from the store if omitted)
             
         Returns:
             List of message dictionaries compatible with V1 format
         """
+        with self.tracer.turn(session_id, kind="message"), self.experiments.turn(session_id):
+            return await self._handle_message(session_id, user_input, session)
+    
+    async def _handle_message(
+        self,
+        session_id: str,
+        user_input: str,
+        session: Optional[SessionState] = None
+    ) -> List[Dict[str, Any]]:
+        """Process one user message (runs inside the turn trace)"""
         try:
             # Ensure services are initialized before processing
             await self._ensure_services_initialized()
@@ -129,12 +163,13 @@ class V2Orchestrator:
                 logger.info(f"V2 handling message for session {session_id}: '{user_input[:50]}...'")
             
             # Get or create session
-            session = self.session_store.get_or_create(session_id)
+            if session is None:
+                with self.tracer.span("session.load"):
+                    session = await self.session_store.load(session_id)
             
             # Add user message to session history if not empty
             if user_input.strip():
                 # Convert V2AgentMessage to V1 format for session storage
-                from src.models.flow_models import AgentMessage
                 user_message = AgentMessage(sender="user", text=user_input.strip())
                 session.messages.append(user_message)
             
@@ -142,7 +177,10 @@ class V2Orchestrator:
             current_state = session.current_step
             
             # Classify user input to determine event
-            event = self.flow_engine.classify_user_input(user_input, current_state)
+            with self.tracer.span("classify"):
+                event = self.flow_engine.classify_user_input(user_input, current_state)
+            set_attribute("from_state", current_state.value)
+            set_attribute("event", event.value)
             
             if self.enable_logging:
                 logger.info(f"Classified input as event: {event.value} in state: {current_state.value}")
@@ -155,23 +193,12 @@ class V2Orchestrator:
                 context={}
             )
             
-            # Convert V2AgentMessage list to V1-compatible format
-            response_messages = []
-            for v2_msg in v2_messages:
-                # Convert to V1 AgentMessage format for compatibility
-                v1_message = AgentMessage(
-                    sender=v2_msg.sender,
-                    text=v2_msg.text
-                )
-                session.messages.append(v1_message)
-                
-                # Convert to dict format for API response
-                response_messages.append({
-                    "sender": v2_msg.sender,
-                    "text": v2_msg.text,
-                    "message_type": v2_msg.message_type,
-                    "metadata": v2_msg.metadata
-                })
+            set_attribute("to_state", new_state.value)
+            self.experiments.observe_state(session_id, new_state)
+            
+            # Store in session history and convert to the response format
+            with self.tracer.span("convert_messages", count=len(v2_messages)):
+                response_messages = self._record_messages(session, v2_messages)
             
             if self.enable_logging:
                 logger.info(f"State transition: {current_state.value} -> {new_state.value}")
@@ -184,15 +211,7 @@ class V2Orchestrator:
             # Check if the error contains messages from handlers
             if hasattr(e, 'messages') and e.messages:
                 # Return the specific error messages from the handler
-                return [
-                    {
-                        "sender": msg.sender,
-                        "text": msg.text,
-                        "message_type": msg.message_type,
-                        "metadata": msg.metadata
-                    }
-                    for msg in e.messages
-                ]
+                return [msg.to_dict() for msg in e.messages]
             # For flow errors without messages, return a more specific error
             return self._create_error_response(
                 "Ich habe deine Eingabe nicht verstanden. Kannst du es anders formulieren?",
@@ -211,50 +230,60 @@ class V2Orchestrator:
                 "Es ist ein unerwarteter Fehler aufgetreten. Bitte versuche es später noch einmal.",
                 session_id
             )
+        
+        finally:
+            if session is not None:
+                await self._persist_session(session)
     
-    async def start_conversation(self, session_id: str) -> List[Dict[str, Any]]:
+    async def start_conversation(
+        self,
+        session_id: str,
+        session: Optional[SessionState] = None
+    ) -> List[Dict[str, Any]]:
         """
         Start a new conversation.
         
         Args:
             session_id: Session identifier
+            session: Session just created for this conversation (not loaded from the store)
             
         Returns:
             List of greeting messages
         """
+        with self.tracer.turn(session_id, kind="start"), self.experiments.turn(session_id):
+            return await self._start_conversation(session_id, session)
+    
+    async def _start_conversation(
+        self,
+        session_id: str,
+        session: Optional[SessionState] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate the greeting (runs inside the turn trace)"""
         try:
-            # Ensure services are initialized before processing
-            await self._ensure_services_initialized()
-            
             logger.info(f"Starting new V2 conversation for session {session_id}")
             
             # Get or create session
-            session = self.session_store.get_or_create(session_id)
+            if session is None:
+                with self.tracer.span("session.load"):
+                    session = await self.session_store.load(session_id)
             session.current_step = FlowStep.GREETING
             
-            # Process greeting event
-            new_state, v2_messages = await self.flow_engine.process_event(
-                session=session,
-                event=FlowEvent.START_SESSION,
-                user_input="",
-                context={}
-            )
+            # Process greeting event; the precomputed greeting needs neither
+            # the services nor the FSM
+            greeting = self._static_greeting()
+            if greeting is not None:
+                new_state, v2_messages = self._greeting_turn(session, *greeting)
+            else:
+                await self._ensure_services_initialized()
+                new_state, v2_messages = await self.flow_engine.process_event(
+                    session=session,
+                    event=FlowEvent.START_SESSION,
+                    user_input="",
+                    context={}
+                )
             
-            # Convert to response format
-            response_messages = []
-            for v2_msg in v2_messages:
-                # Store in session
-                from src.models.flow_models import AgentMessage
-                v1_message = AgentMessage(sender=v2_msg.sender, text=v2_msg.text)
-                session.messages.append(v1_message)
-                
-                # Add to response
-                response_messages.append({
-                    "sender": v2_msg.sender,
-                    "text": v2_msg.text,
-                    "message_type": v2_msg.message_type,
-                    "metadata": v2_msg.metadata
-                })
+            # Store in session history and convert to the response format
+            response_messages = self._record_messages(session, v2_messages)
             
             logger.info(f"Started conversation with {len(response_messages)} greeting messages")
             return response_messages
@@ -265,6 +294,97 @@ class V2Orchestrator:
                 "Entschuldige, ich habe Probleme beim Starten. Bitte versuche es noch einmal.",
                 session_id
             )
+        
+        finally:
+            if session is not None:
+                await self._persist_session(session)
+    
+    def prepare_greeting(self) -> bool:
+        """
+        Precompute the greeting turn of /flow_intro (call at startup).
+        
+        Returns:
+            True if new conversations start without the FSM and lazy services
+        """
+        return self._static_greeting() is not None
+    
+    def _static_greeting(self) -> Optional[Tuple[FlowStep, Tuple[V2AgentMessage, ...]]]:
+        """
+        Target state and messages of the greeting turn, or None to run it through the FSM.
+        
+        The greeting only depends on the prompts and the flow definition, so it
+        is built once and rebuilt after either of them was hot-reloaded.
+        """
+        if not self._owns_flow_engine:
+            return None
+        registry = get_prompt_registry()
+        definition = self.flow_engine.definition if self.flow_engine is not None else None
+        cached = self._greeting
+        if cached is not None and cached[0] is registry and cached[1] is definition:
+            return cached[2]
+        
+        try:
+            greeting = self._build_greeting(definition)
+        except Exception as e:
+            logger.warning(f"Greeting not precomputed, using the flow engine: {e}")
+            greeting = None
+        self._greeting = (registry, definition, greeting)
+        return greeting
+    
+    def _build_greeting(self, definition: Any) -> Optional[Tuple[FlowStep, Tuple[V2AgentMessage, ...]]]:
+        # Sessions in a greeting experiment get their own variant
+        greeting_keys = (PromptType.DOG_GREETING.value, PromptType.DOG_GREETING_FOLLOWUP.value)
+        if any(key in self.experiments.experiments for key in greeting_keys):
+            return None
+        
+        # Before the lazy initialization the engine has not loaded the definition yet
+        definition = definition or load_flow_definition()
+        transition = next(
+            (
+                t for t in definition.transitions
+                if t.from_state == FlowStep.GREETING and t.event == FlowEvent.START_SESSION.value
+            ),
+            None
+        )
+        if transition is None or transition.handler != GREETING_HANDLER or transition.params:
+            return None
+        
+        messages = tuple(DogAgent().greeting_messages())
+        logger.info(f"Greeting precomputed: {len(messages)} messages -> {transition.to_state.value}")
+        return transition.to_state, messages
+    
+    def _greeting_turn(
+        self,
+        session: SessionState,
+        to_state: FlowStep,
+        messages: Tuple[V2AgentMessage, ...]
+    ) -> Tuple[FlowStep, List[V2AgentMessage]]:
+        """Apply the precomputed greeting like FlowEngine.process_event (session is in GREETING)"""
+        with FlowEngine.track_transition(session, FlowEvent.START_SESSION, tracer=self.tracer, precomputed=True):
+            session.current_step = to_state
+        return to_state, list(messages)
+    
+    async def _persist_session(self, session: SessionState) -> None:
+        """
+        Hand the session over to persistence after a turn.
+        
+        Shared stores write through immediately; otherwise the write-behind
+        flusher (if configured) picks up the changes on its next flush.
+        
+        Raises:
+            SessionUnavailableError: If a shared store could not write the
+                session (the turn must not be answered as saved)
+        """
+        try:
+            with self.tracer.span("session.save"):
+                await self.session_store.save(session)
+        except Exception as e:
+            if isinstance(e, SessionUnavailableError) and self.session_store.write_through:
+                raise
+            logger.error(f"Failed to persist session {session.session_id}: {e}")
+        
+        if self.session_writer and not self.session_store.write_through:
+            self.session_writer.mark_dirty(session)
     
     def get_session_info(self, session_id: str) -> Dict[str, Any]:
         """
@@ -294,6 +414,14 @@ class V2Orchestrator:
         transitions = self.flow_engine.get_valid_transitions(current_state)
         return [t.event for t in transitions]
     
+    def _record_messages(self, session: SessionState, v2_messages: List[V2AgentMessage]) -> List[Dict[str, Any]]:
+        """Append agent messages to the session history and return them in API format"""
+        response_messages = []
+        for v2_msg in v2_messages:
+            session.messages.append(AgentMessage(sender=v2_msg.sender, text=v2_msg.text))
+            response_messages.append(v2_msg.to_dict())
+        return response_messages
+    
     def _create_error_response(self, error_message: str, session_id: str) -> List[Dict[str, Any]]:
         """
         Create standardized error response.
@@ -366,15 +494,7 @@ class V2Orchestrator:
             v2_messages = await dog_agent.respond(agent_context)
             
             # Convert to API format
-            return [
-                {
-                    "sender": msg.sender,
-                    "text": msg.text,
-                    "message_type": msg.message_type,
-                    "metadata": msg.metadata
-                }
-                for msg in v2_messages
-            ]
+            return [msg.to_dict() for msg in v2_messages]
             
         except Exception as e:
             logger.error(f"Error generating validation error response: {e}")
@@ -490,6 +610,37 @@ class V2Orchestrator:
         except Exception as e:
             return {"error": str(e)}
 
+    def reload_flow_definition(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Hot-reload the flow definition of the running flow engine.
+
+        Args:
+            force: Reload even if the definition file is unchanged
+
+        Returns:
+            Dict with reload status
+
+        Raises:
+            V2ConfigurationError: If a forced reload finds an invalid definition
+        """
+        if self.flow_engine is None:
+            # Not initialized yet - the engine will load the current file
+            return {"reloaded": False, "reason": "flow engine not initialized"}
+
+        if force:
+            self.flow_engine.reload()
+            reloaded = True
+        else:
+            reloaded = self.flow_engine.reload_if_changed()
+
+        definition = self.flow_engine.definition
+        return {
+            "reloaded": reloaded,
+            "definition": definition.name if definition else None,
+            "source": definition.source if definition else None,
+            "total_transitions": len(self.flow_engine.transitions)
+        }
+
 
 # Global orchestrator instance for easy access
 _orchestrator: Optional[V2Orchestrator] = None
@@ -525,18 +676,24 @@ async def handle_message(session_id: str, user_input: str) -> List[Dict[str, Any
     return await orchestrator.handle_message(session_id, user_input)
 
 
-def init_orchestrator(session_store: SessionStore) -> V2Orchestrator:
+def init_orchestrator(
+    session_store: SessionStore,
+    session_writer: Optional[SessionWriteBehind] = None
+) -> V2Orchestrator:
     """
     V1-compatible init_orchestrator function.
     
     Args:
         session_store: Session store instance
+        session_writer: Optional write-behind persistence for sessions
         
     Returns:
         V2Orchestrator instance
     """
     global _orchestrator
     _orchestrator = V2Orchestrator(session_store=session_store)
+    if session_writer is not None:
+        _orchestrator.session_writer = session_writer
     return _orchestrator
 
 
@@ -10,14 +10,19 @@ manageable system that supports:
 - A/B testing capability
 - Easy fine-tuning
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet, Union, Mapping
 from enum import Enum
 from pathlib import Path
+from types import MappingProxyType
+import os
 import json
+import hashlib
 import logging
-from string import Template
-from dataclasses import dataclass
+import sys
+from string import Formatter, Template
+from dataclasses import dataclass, field
 from src.core.exceptions import PromptError
+from src.core.experiments import CONTROL, get_experiments, split_variant, with_variants
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +85,94 @@ class PromptType(str, Enum):
     COMBINED_INSTINCT = "query.combined_instinct"
     INSTINCT_ANALYSIS = "query.instinct_analysis"
 
+
+# PromptType members by key, so enum lookups hit the compiled table directly
+_PROMPT_TYPES: Dict[str, PromptType] = {prompt_type.value: prompt_type for prompt_type in PromptType}
+
+
+class CompiledPrompt:
+    """
+    Pre-parsed renderer for a prompt template.
+
+    The template is split into (literal, field) segments once, so rendering
+    is a single join. Templates without placeholders are kept as one
+    interned string. Templates using format specs, conversions or
+    attribute/index fields fall back to str.format.
+    """
+
+    __slots__ = ("key", "template", "required", "constant", "_segments")
+
+    def __init__(self, key: str, template: str, variables: List[str]):
+        self.key = key
+        self.template = template
+        self.constant: Optional[str] = None
+        self._segments: Optional[Tuple[Tuple[str, Optional[str]], ...]] = None
+
+        try:
+            parsed = list(Formatter().parse(template))
+        except ValueError as e:
+            # Not a valid format string: constant prompts are returned as-is,
+            # others fail with a PromptError when rendered
+            logger.warning(f"Prompt {key} is not a valid format string: {e}")
+            self.required = frozenset(variables)
+            if not variables:
+                self.constant = sys.intern(template)
+            return
+
+        fields = [name for _, name, _, _ in parsed if name is not None]
+        roots = (_field_root(name) for name in fields)
+        self.required: FrozenSet[str] = frozenset(variables).union(
+            root for root in roots if root.isidentifier()
+        )
+
+        if not fields and not self.required:
+            self.constant = sys.intern("".join(literal for literal, _, _, _ in parsed))
+        elif all(name.isidentifier() and not spec and conversion is None
+                 for _, name, spec, conversion in parsed if name is not None):
+            self._segments = tuple((literal, name) for literal, name, _, _ in parsed)
+
+    def render(self, kwargs: Dict[str, Any]) -> str:
+        """Render the template with the given variables"""
+        if self.constant is not None:
+            return self.constant
+
+        if not self.required.issubset(kwargs):
+            missing = self.required.difference(kwargs)
+            raise PromptError(
+                prompt_type=self.key,
+                message=f"Missing required variables: {missing}",
+                details={"missing_variables": list(missing)}
+            )
+
+        if self._segments is None:
+            try:
+                return self.template.format(**kwargs)
+            except (KeyError, IndexError, AttributeError, ValueError) as e:
+                raise PromptError(
+                    prompt_type=self.key,
+                    message=f"Error formatting prompt: {e}",
+                    details={"error": str(e)}
+                )
+
+        parts = []
+        for literal, name in self._segments:
+            parts.append(literal)
+            if name is not None:
+                value = kwargs[name]
+                parts.append(value if type(value) is str else format(value))
+        return "".join(parts)
+
+
+def template_version(template: str) -> str:
+    """Content hash of a template, used as Prompt.version"""
+    return hashlib.blake2b(template.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _field_root(name: str) -> str:
+    """Variable name of a field such as ``user.name`` or ``items[0]``"""
+    return name.replace("[", ".").split(".", 1)[0]
+
+
 @dataclass
 class Prompt:
     """Represents a single prompt template"""
@@ -88,12 +181,16 @@ class Prompt:
     category: PromptCategory
     description: str = ""
     variables: List[str] = None
-    version: str = "1.0"
+    # Changes exactly when the template changes - use it in cache keys
+    version: Optional[str] = None
+    _compiled: Optional[CompiledPrompt] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.variables is None:
             # Extract variables from template
             self.variables = self._extract_variables()
+        if self.version is None:
+            self.version = template_version(self.template)
     
     def _extract_variables(self) -> List[str]:
         """Extract variable names from template"""
@@ -102,6 +199,12 @@ class Prompt:
         pattern = r'\{(\w+)\}'
         return list(set(re.findall(pattern, self.template)))
     
+    def compile(self) -> CompiledPrompt:
+        """Pre-parse the template (cached until the template changes)"""
+        if self._compiled is None or self._compiled.template is not self.template:
+            self._compiled = CompiledPrompt(self.key, self.template, self.variables)
+        return self._compiled
+    
     def format(self, **kwargs) -> str:
         """
         Format the prompt with provided variables.
@@ -115,23 +218,7 @@ class Prompt:
         Raises:
             PromptError: If required variables are missing
         """
-        # Check for missing variables
-        missing = set(self.variables) - set(kwargs.keys())
-        if missing:
-            raise PromptError(
-                prompt_type=self.key,
-                message=f"Missing required variables: {missing}",
-                details={"missing_variables": list(missing)}
-            )
-        
-        try:
-            return self.template.format(**kwargs)
-        except KeyError as e:
-            raise PromptError(
-                prompt_type=self.key,
-                message=f"Error formatting prompt: {e}",
-                details={"error": str(e)}
-            )
+        return self.compile().render(kwargs)
 
 
 class PromptManager:
@@ -146,10 +233,30 @@ class PromptManager:
     - Enables A/B testing
     """
     
-    def __init__(self):
+    def __init__(self, registry: Optional["PromptRegistry"] = None):
         self.prompts: Dict[str, Prompt] = {}
         self.variants: Dict[str, List[Prompt]] = {}  # For A/B testing
+        # Compiled renderers by key and by PromptType member
+        self._renderers: Dict[Union[str, PromptType], CompiledPrompt] = {}
         self._loaded = False
+        # True while the tables are the read-only views of a shared registry
+        self._shared = False
+        self.registry: Optional["PromptRegistry"] = None
+        if registry is not None:
+            self._attach(registry)
+    
+    def _attach(self, registry: "PromptRegistry") -> None:
+        """Use the tables of a shared registry (copied on the first add_prompt)"""
+        self.registry = registry
+        self.prompts = registry.prompts
+        self.variants = registry.variants
+        self._renderers = registry.renderers
+        experiments = get_experiments()
+        if experiments.enabled:
+            # Experiment prompts render the variant assigned to the session
+            self._renderers = with_variants(registry, experiments)
+        self._shared = True
+        self._loaded = True
     
     def get_prompt(self, prompt_type, **kwargs) -> str:
         """
@@ -162,7 +269,11 @@ class PromptManager:
         Returns:
             Formatted prompt string
         """
-        # Convert PromptType enum to string key
+        renderer = self._renderers.get(prompt_type)
+        if renderer is not None:
+            return renderer.render(kwargs)
+        
+        # Not loaded yet or unknown prompt: resolve the key and take the slow path
         key = prompt_type.value if hasattr(prompt_type, 'value') else str(prompt_type)
         return self.get(key, **kwargs)
         
@@ -180,14 +291,11 @@ class PromptManager:
         if prompts_dir is None:
             prompts_dir = Path(__file__).parent.parent / "prompts"
         
-        logger.info(f"Loading prompts from {prompts_dir}")
-        
-        # For now, we'll define prompts in code
-        # Later, these can be loaded from JSON/YAML files
-        self._define_prompts()
-        
-        self._loaded = True
-        logger.info(f"Loaded {len(self.prompts)} prompts")
+        # Prompts come from the configured prompt pack (PROMPT_PACK_DIR) or
+        # from the prompt modules, built once per process (see
+        # get_prompt_registry); every manager shares that registry
+        self._attach(get_prompt_registry())
+        logger.debug(f"Using {len(self.prompts)} prompts from the shared registry")
     
     def _define_prompts(self):
         """Load all prompts from the prompt files"""
@@ -198,7 +306,8 @@ class PromptManager:
             query_prompts,
             companion_prompts,
             validation_prompts,
-            common_prompts
+            common_prompts,
+            variant_prompts
         )
         
         # Helper to register prompts from module attributes
@@ -239,14 +348,14 @@ class PromptManager:
             key="generation.instinct_diagnosis",
             template=generation_prompts.INSTINCT_DIAGNOSIS_TEMPLATE,
             category=PromptCategory.DOG,
-            variables=["symptom", "jagd", "rudel", "territorial", "sexual"]
+            variables=["symptom", "context", "jagd", "rudel", "territorial", "sexual"]
         ))
         
         self.add_prompt(Prompt(
             key="generation.exercise",
             template=generation_prompts.EXERCISE_TEMPLATE,
             category=PromptCategory.DOG,
-            variables=["symptom", "match"]
+            variables=["symptom", "instinct", "exercise_from_weaviate"]
         ))
         
         # Query prompts
@@ -291,19 +400,55 @@ class PromptManager:
             category=PromptCategory.QUERY,
             variables=["symptom", "context"]
         ))
+        
+        # A/B variants of the prompts above
+        for key, variants in variant_prompts.PROMPT_VARIANTS.items():
+            control = self.prompts[key]
+            for variant, template in variants.items():
+                prompt = Prompt(
+                    key=f"{key}@{variant}",
+                    template=template,
+                    category=control.category,
+                    description=f"Variant '{variant}' of {key}"
+                )
+                extra = prompt.compile().required - control.compile().required
+                if extra:
+                    # Callers only pass the variables of the control prompt
+                    raise PromptError(
+                        prompt_type=prompt.key,
+                        message=f"Variant needs variables the control prompt does not: {sorted(extra)}"
+                    )
+                self.add_prompt(prompt)
     
     def add_prompt(self, prompt: Prompt):
         """Add a prompt to the manager"""
+        if self._shared:
+            # Never modify the shared registry, only this manager's copy
+            self.prompts = dict(self.prompts)
+            self.variants = {key: list(prompts) for key, prompts in self.variants.items()}
+            self._renderers = dict(self._renderers)
+            self._shared = False
+        
         if prompt.key in self.prompts:
             logger.warning(f"Overwriting existing prompt: {prompt.key}")
         
         self.prompts[prompt.key] = prompt
         
-        # Also add to variants for potential A/B testing
-        base_key = prompt.key.rsplit(".", 1)[0]
-        if base_key not in self.variants:
-            self.variants[base_key] = []
-        self.variants[base_key].append(prompt)
+        # Compile once here instead of on every render
+        renderer = prompt.compile()
+        self._renderers[prompt.key] = renderer
+        if prompt.key in _PROMPT_TYPES:
+            self._renderers[_PROMPT_TYPES[prompt.key]] = renderer
+        
+        # Group A/B variants ("<key>@<variant>") with their control "<key>",
+        # the control always first
+        base_key, variant = split_variant(prompt.key)
+        group = self.variants.setdefault(base_key, [])
+        group[:] = [p for p in group if p.key != prompt.key]
+        if variant is None:
+            group.insert(0, prompt)
+        else:
+            group.append(prompt)
     
     def get(self, key: str, **kwargs) -> str:
         """
@@ -319,23 +464,32 @@ class PromptManager:
         Raises:
             PromptError: If prompt not found or formatting fails
         """
-        if not self._loaded:
-            self.load_prompts()
-        
-        if key not in self.prompts:
+        renderer = self._renderers.get(key)
+        if renderer is None:
+            if not self._loaded:
+                self.load_prompts()
+                return self.get(key, **kwargs)
             raise PromptError(
                 prompt_type=key,
                 message=f"Prompt not found: {key}",
                 details={"available_keys": list(self.prompts.keys())}
             )
         
-        prompt = self.prompts[key]
-        
-        # If no variables needed, return template as-is
-        if not prompt.variables and not kwargs:
-            return prompt.template
+        return renderer.render(kwargs)
+    
+    def prompt_version(self, prompt_type) -> str:
+        """
+        Template version of a prompt, for cache keys of generated responses.
         
-        return prompt.format(**kwargs)
+        Args:
+            prompt_type: PromptType enum value or string key
+        """
+        if not self._loaded:
+            self.load_prompts()
+        key = prompt_type.value if hasattr(prompt_type, 'value') else str(prompt_type)
+        if key not in self.prompts:
+            raise PromptError(prompt_type=key, message=f"Prompt not found: {key}")
+        return self.prompts[key].version
     
     def get_variant(self, key: str, variant: int = 0, **kwargs) -> str:
         """
@@ -389,7 +543,7 @@ class PromptManager:
         """
         if key not in self.prompts:
             raise PromptError(
-                prompt_type=self.key,
+                prompt_type=key,
                 message=f"Prompt not found: {key}"
             )
         
@@ -404,14 +558,127 @@ class PromptManager:
         }
 
 
-# Global instance for easy access
+@dataclass(frozen=True)
+class PromptRegistry:
+    """Read-only prompt tables, built once per process and shared by all managers"""
+    prompts: Mapping[str, Prompt]
+    variants: Mapping[str, Tuple[Prompt, ...]]
+    renderers: Mapping[Union[str, PromptType], CompiledPrompt]
+    locale: str = "de"
+    version: Optional[str] = None  # Prompt pack version, None for the prompts defined in code
+    source: Optional[str] = None  # Prompt pack file
+    mtime: float = 0.0
+    prompt_versions: Mapping[str, str] = field(default_factory=dict)  # key -> template version
+
+
+def build_prompt_registry() -> PromptRegistry:
+    """Import the prompt modules, compile all templates and freeze the tables"""
+    prompts_dir = Path(__file__).parent.parent / "prompts"
+    logger.info(f"Loading prompts from {prompts_dir}")
+    
+    builder = PromptManager()
+    builder._define_prompts()
+    registry = PromptRegistry(
+        prompts=MappingProxyType(builder.prompts),
+        variants=MappingProxyType({key: tuple(prompts) for key, prompts in builder.variants.items()}),
+        renderers=MappingProxyType(builder._renderers),
+        prompt_versions=MappingProxyType({key: prompt.version for key, prompt in builder.prompts.items()})
+    )
+    logger.info(f"Loaded {len(registry.prompts)} prompts")
+    return registry
+
+
+def _load_configured_registry() -> PromptRegistry:
+    """Registry from the configured prompt pack, or from the prompts defined in code"""
+    # The pack reader (and its mmap/struct machinery) is only imported when packs are used
+    if not os.getenv("PROMPT_PACK_DIR"):
+        return build_prompt_registry()
+    
+    from src.core.prompt_pack import get_prompt_pack_config, resolve_pack_path, load_pack_registry
+    
+    config = get_prompt_pack_config()
+    
+    try:
+        return load_pack_registry(resolve_pack_path(config))
+    except (PromptError, OSError) as e:
+        # A missing or broken pack must never prevent startup
+        logger.error(f"Prompt pack unavailable, using built-in prompts: {e}")
+        return build_prompt_registry()
+
+
+# Global instances for easy access
+_prompt_registry: Optional[PromptRegistry] = None
 _prompt_manager = None
 
 
+def get_prompt_registry() -> PromptRegistry:
+    """Get the process-wide prompt registry"""
+    global _prompt_registry
+    if _prompt_registry is None:
+        _prompt_registry = _load_configured_registry()
+    return _prompt_registry
+
+
+def reload_prompts(version: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    Hot-reload the prompt pack.
+    
+    Switches to the requested version (default: the configured or newest
+    one) if it differs from the active pack or its file changed. The new
+    registry replaces the shared one in a single step; the global manager
+    is re-attached, so the next render uses the new prompts.
+    
+    Args:
+        version: Pack version to switch to
+        force: Reload even if the pack file is unchanged
+        
+    Returns:
+        Dict with reload status and the keys whose template changed
+        
+    Raises:
+        PromptError: If the requested pack does not exist or is invalid
+    """
+    global _prompt_registry
+    if not os.getenv("PROMPT_PACK_DIR"):
+        return {"reloaded": False, "reason": "PROMPT_PACK_DIR not set"}
+    
+    from src.core.prompt_pack import get_prompt_pack_config, resolve_pack_path, load_pack_registry
+    
+    config = get_prompt_pack_config()
+    
+    current = get_prompt_registry()
+    path = resolve_pack_path(config, version)
+    if not force and str(path) == current.source and path.stat().st_mtime == current.mtime:
+        return {"reloaded": False, "locale": current.locale, "version": current.version}
+    
+    registry = load_pack_registry(path)
+    changed = sorted(
+        key for key, prompt_version in registry.prompt_versions.items()
+        if current.prompt_versions.get(key) != prompt_version
+    )
+    removed = sorted(set(current.prompt_versions) - set(registry.prompt_versions))
+    
+    _prompt_registry = registry
+    if _prompt_manager is not None:
+        _prompt_manager._attach(registry)
+    
+    logger.info(
+        f"Prompts reloaded: {current.version or 'built-in'} -> {registry.version} "
+        f"({len(changed)} changed, {len(removed)} removed)"
+    )
+    return {
+        "reloaded": True,
+        "locale": registry.locale,
+        "version": registry.version,
+        "previous_version": current.version,
+        "changed": changed,
+        "removed": removed
+    }
+
+
 def get_prompt_manager() -> PromptManager:
     """Get the global PromptManager instance"""
     global _prompt_manager
     if _prompt_manager is None:
-        _prompt_manager = PromptManager()
-        _prompt_manager.load_prompts()
+        _prompt_manager = PromptManager(get_prompt_registry())
     return _prompt_manager
\ No newline at end of file
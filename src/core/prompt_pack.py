@@ -0,0 +1,460 @@
+# src/v2/core/prompt_pack.py
+"""
+File-based prompt packs.
+
+A prompt pack holds all prompts of one locale in one version, one file per
+(locale, version) under ``PROMPT_PACK_DIR/<locale>/<version>.wcp``. Packs
+are built from the prompts defined in src/prompts with
+
+    python -m src.core.prompt_pack build --locale de --version 2024.06
+
+and loaded instead of the code-defined prompts when PROMPT_PACK_DIR is set.
+The file is memory-mapped; a prompt is decoded only when it is first used.
+
+File layout (little endian):
+
+    header   magic(8) | format(u16) | reserved(u16) | count(u32)
+             | meta_offset(u64) | meta_length(u32) | meta_crc32(u32)
+             | index_offset(u64) | index_length(u64) | index_crc32(u32)
+    meta     JSON: locale, version, created_at and per key the category
+             and the template version
+    records  one JSON-encoded prompt per key
+    index    count fixed-size entries, sorted by key hash:
+             key_hash(u64) | offset(u64) | length(u32) | crc32(u32)
+
+Each prompt's ``version`` is a hash of its template (see
+prompt_manager.template_version), so caches keyed by it are invalidated
+only for prompts whose template actually changed between packs.
+"""
+
+import os
+import re
+import mmap
+import json
+import time
+import zlib
+import struct
+import hashlib
+import logging
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from src.core.exceptions import PromptError
+from src.core.experiments import split_variant
+from src.core.prompt_manager import CompiledPrompt, Prompt, PromptCategory, PromptRegistry, PromptType
+
+logger = logging.getLogger(__name__)
+
+PACK_MAGIC = b"WCPROMPT"
+PACK_FORMAT = 1
+PACK_SUFFIX = ".wcp"
+
+_HEADER = struct.Struct("<8sHHIQIIQQI")
+_ENTRY = struct.Struct("<QQII")
+
+# Index entry: (key_hash, offset, length, crc32)
+IndexEntry = Tuple[int, int, int, int]
+
+
+@dataclass
+class PromptPackConfig:
+    """Where prompt packs are loaded from"""
+    directory: Optional[Path] = None  # None: use the prompts defined in code
+    locale: str = "de"
+    version: Optional[str] = None  # None: newest version of the locale
+
+
+def get_prompt_pack_config() -> PromptPackConfig:
+    """
+    Get the prompt pack configuration from the environment.
+
+    PROMPT_PACK_DIR enables prompt packs, PROMPT_LOCALE selects the locale
+    (default "de") and PROMPT_PACK_VERSION pins a version (default: newest).
+    """
+    directory = os.getenv("PROMPT_PACK_DIR", "")
+    return PromptPackConfig(
+        directory=Path(directory) if directory else None,
+        locale=os.getenv("PROMPT_LOCALE", "de"),
+        version=os.getenv("PROMPT_PACK_VERSION") or None
+    )
+
+
+def prompt_key_hash(key: str) -> int:
+    """64-bit key hash used to index prompts in a pack"""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _version_sort_key(version: str) -> List[Union[int, str]]:
+    """Sort "2024.10" after "2024.9" (numeric parts compare as numbers)"""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)]
+
+
+def pack_path(directory: Union[str, Path], locale: str, version: str) -> Path:
+    return Path(directory) / locale / f"{version}{PACK_SUFFIX}"
+
+
+def list_pack_versions(directory: Union[str, Path], locale: str) -> List[str]:
+    """Available versions of a locale, oldest first"""
+    locale_dir = Path(directory) / locale
+    if not locale_dir.is_dir():
+        return []
+    versions = [path.stem for path in locale_dir.glob(f"*{PACK_SUFFIX}")]
+    return sorted(versions, key=_version_sort_key)
+
+
+def resolve_pack_path(config: PromptPackConfig, version: Optional[str] = None) -> Path:
+    """
+    Path of the pack to load: the requested or configured version, else the newest.
+
+    Raises:
+        PromptError: If no matching pack exists
+    """
+    version = version or config.version
+    if version is None:
+        versions = list_pack_versions(config.directory, config.locale)
+        if not versions:
+            raise PromptError(
+                f"No prompt packs for locale '{config.locale}' in {config.directory}",
+                details={"locale": config.locale}
+            )
+        version = versions[-1]
+
+    path = pack_path(config.directory, config.locale, version)
+    if not path.exists():
+        raise PromptError(
+            f"Prompt pack not found: {path}",
+            details={"locale": config.locale, "version": version}
+        )
+    return path
+
+
+class PromptPack:
+    """
+    Read-only, memory-mapped view of a prompt pack file.
+
+    Opening a pack validates the header, the metadata and the index
+    checksum. Prompts are decoded (and checksum-verified) on first access.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open and validate a prompt pack.
+
+        Raises:
+            PromptError: If the file is not a valid prompt pack
+        """
+        self.path = Path(path)
+        self.mtime = self.path.stat().st_mtime
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise PromptError(f"Prompt pack is empty: {self.path}")
+
+        try:
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        """Validate magic, format, metadata and index checksum"""
+        if len(self._mmap) < _HEADER.size:
+            raise PromptError(f"Prompt pack truncated: {self.path}")
+
+        (magic, pack_format, _, count, meta_offset, meta_length, meta_crc,
+         index_offset, index_length, index_crc) = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != PACK_MAGIC:
+            raise PromptError(f"Not a prompt pack: {self.path}")
+        if pack_format != PACK_FORMAT:
+            raise PromptError(
+                f"Unsupported prompt pack format {pack_format} (expected {PACK_FORMAT})",
+                details={"format": pack_format}
+            )
+        if (meta_offset + meta_length > len(self._mmap)
+                or index_length != count * _ENTRY.size
+                or index_offset + index_length > len(self._mmap)):
+            raise PromptError(f"Prompt pack sections out of bounds: {self.path}")
+
+        meta_bytes = self._mmap[meta_offset:meta_offset + meta_length]
+        if zlib.crc32(meta_bytes) != meta_crc:
+            raise PromptError(f"Prompt pack metadata checksum mismatch: {self.path}")
+        if zlib.crc32(self._mmap[index_offset:index_offset + index_length]) != index_crc:
+            raise PromptError(f"Prompt pack index checksum mismatch: {self.path}")
+
+        meta = json.loads(meta_bytes)
+        self.locale: str = meta["locale"]
+        self.version: str = meta["version"]
+        self.created_at: float = meta.get("created_at", 0.0)
+        # key -> {"category": ..., "version": ...}
+        self.entries: Dict[str, Dict[str, str]] = meta["prompts"]
+        self.count = count
+        self._index_offset = index_offset
+
+    def _entry_at(self, position: int) -> IndexEntry:
+        return _ENTRY.unpack_from(self._mmap, self._index_offset + position * _ENTRY.size)
+
+    def entry(self, key: str) -> Optional[IndexEntry]:
+        """Find the index entry of a prompt (binary search over the mapped index)"""
+        key_hash = prompt_key_hash(key)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            entry = self._entry_at(mid)
+            if entry[0] < key_hash:
+                low = mid + 1
+            elif entry[0] > key_hash:
+                high = mid
+            else:
+                return entry
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def load(self, key: str) -> Prompt:
+        """
+        Decode one prompt.
+
+        Raises:
+            KeyError: If the pack has no prompt with this key
+            PromptError: If the record is corrupt
+        """
+        entry = self.entry(key) if key in self.entries else None
+        if entry is None:
+            raise KeyError(key)
+
+        _, offset, length, crc = entry
+        data = self._mmap[offset:offset + length]
+        if zlib.crc32(data) != crc:
+            raise PromptError(f"Prompt pack record checksum mismatch: {key}", prompt_type=key)
+
+        record = json.loads(data)
+        if record["key"] != key:
+            # 64-bit hash collision
+            raise KeyError(key)
+        return Prompt(
+            key=key,
+            template=record["template"],
+            category=PromptCategory(record["category"]),
+            description=record.get("description", ""),
+            variables=record.get("variables"),
+            version=record["version"]
+        )
+
+    def close(self) -> None:
+        """Release the memory map and file handle"""
+        try:
+            self._mmap.close()
+        finally:
+            self._file.close()
+
+
+def write_prompt_pack(
+    prompts: Mapping[str, Prompt],
+    path: Union[str, Path],
+    locale: str,
+    version: str
+) -> int:
+    """
+    Write prompts to a pack file (temporary file + atomic rename).
+
+    Returns:
+        Number of prompts written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    meta_bytes = json.dumps({
+        "locale": locale,
+        "version": version,
+        "created_at": time.time(),
+        "prompts": {
+            key: {"category": prompt.category.value, "version": prompt.version}
+            for key, prompt in prompts.items()
+        }
+    }, ensure_ascii=False).encode("utf-8")
+
+    entries = {}
+    with open(tmp_path, "wb") as f:
+        f.write(b"\x00" * _HEADER.size)
+        meta_offset = _HEADER.size
+        f.write(meta_bytes)
+        offset = meta_offset + len(meta_bytes)
+
+        for key, prompt in prompts.items():
+            data = json.dumps({
+                "key": key,
+                "template": prompt.template,
+                "category": prompt.category.value,
+                "description": prompt.description,
+                "variables": prompt.variables,
+                "version": prompt.version
+            }, ensure_ascii=False).encode("utf-8")
+            key_hash = prompt_key_hash(key)
+            if key_hash in entries:
+                raise PromptError(f"Prompt key hash collision: {key}", prompt_type=key)
+            f.write(data)
+            entries[key_hash] = (key_hash, offset, len(data), zlib.crc32(data))
+            offset += len(data)
+
+        index_bytes = b"".join(_ENTRY.pack(*entries[h]) for h in sorted(entries))
+        f.write(index_bytes)
+
+        f.seek(0)
+        f.write(_HEADER.pack(
+            PACK_MAGIC,
+            PACK_FORMAT,
+            0,
+            len(entries),
+            meta_offset,
+            len(meta_bytes),
+            zlib.crc32(meta_bytes),
+            offset,
+            len(index_bytes),
+            zlib.crc32(index_bytes)
+        ))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    logger.info(f"Prompt pack written: {len(entries)} prompts -> {path}")
+    return len(entries)
+
+
+# ===========================================
+# LAZY REGISTRY TABLES
+# ===========================================
+
+class _PackPrompts(Mapping):
+    """Prompts of a pack, decoded on first access"""
+
+    def __init__(self, pack: PromptPack):
+        self._pack = pack
+        self._decoded: Dict[str, Prompt] = {}
+
+    def __getitem__(self, key: str) -> Prompt:
+        prompt = self._decoded.get(key)
+        if prompt is None:
+            prompt = self._decoded[key] = self._pack.load(key)
+        return prompt
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._pack.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return self._pack.keys()
+
+    def __len__(self) -> int:
+        return self._pack.count
+
+
+class _PackRenderers(Mapping):
+    """Compiled renderers by key and PromptType, compiled on first access"""
+
+    def __init__(self, prompts: _PackPrompts):
+        self._prompts = prompts
+        self._compiled: Dict[Union[str, PromptType], CompiledPrompt] = {}
+
+    def __getitem__(self, key: Union[str, PromptType]) -> CompiledPrompt:
+        renderer = self._compiled.get(key)
+        if renderer is None:
+            name = key.value if isinstance(key, PromptType) else key
+            renderer = self._compiled[key] = self._prompts[name].compile()
+        return renderer
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._prompts)
+
+    def __len__(self) -> int:
+        return len(self._prompts)
+
+
+class _PackVariants(Mapping):
+    """A/B variants grouped with their control prompt, decoded on access"""
+
+    def __init__(self, prompts: _PackPrompts):
+        self._prompts = prompts
+        self._groups: Dict[str, List[str]] = {}
+        for key in prompts:
+            base_key, variant = split_variant(key)
+            group = self._groups.setdefault(base_key, [])
+            if variant is None:
+                group.insert(0, key)
+            else:
+                group.append(key)
+
+    def __getitem__(self, base_key: str) -> Tuple[Prompt, ...]:
+        return tuple(self._prompts[key] for key in self._groups[base_key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+
+def load_pack_registry(path: Union[str, Path]) -> PromptRegistry:
+    """Open a pack and expose it as a lazily decoded prompt registry"""
+    pack = PromptPack(path)
+    prompts = _PackPrompts(pack)
+    logger.info(f"Prompt pack loaded: {pack.locale}/{pack.version} ({pack.count} prompts, lazy decode)")
+    return PromptRegistry(
+        prompts=prompts,
+        variants=_PackVariants(prompts),
+        renderers=_PackRenderers(prompts),
+        locale=pack.locale,
+        version=pack.version,
+        source=str(pack.path),
+        mtime=pack.mtime,
+        prompt_versions={key: entry["version"] for key, entry in pack.entries.items()}
+    )
+
+
+# ===========================================
+# CLI
+# ===========================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build and inspect prompt packs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Write the prompts defined in src/prompts to a pack")
+    build.add_argument("--dir", type=Path, default=Path(os.getenv("PROMPT_PACK_DIR") or "data/prompts"))
+    build.add_argument("--locale", default="de")
+    build.add_argument("--version", required=True)
+
+    info = commands.add_parser("info", help="Show the prompts of a pack")
+    info.add_argument("path", type=Path)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        from src.core.prompt_manager import build_prompt_registry
+        registry = build_prompt_registry()
+        path = pack_path(args.dir, args.locale, args.version)
+        count = write_prompt_pack(registry.prompts, path, args.locale, args.version)
+        print(f"{count} prompts -> {path}")
+        return
+
+    pack = PromptPack(args.path)
+    try:
+        print(f"{pack.locale}/{pack.version}: {pack.count} prompts\n")
+        for key in sorted(pack.entries):
+            entry = pack.entries[key]
+            print(f"{key:<48} {entry['category']:<12} {entry['version']}")
+    finally:
+        pack.close()
+
+
+if __name__ == "__main__":
+    main()
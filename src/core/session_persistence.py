@@ -0,0 +1,458 @@
+# src/v2/core/session_persistence.py
+"""
+Write-behind session persistence for WuffChat V2.
+
+Instead of writing the whole SessionState after every turn, the orchestrator
+marks sessions as dirty and this flusher periodically pushes only the changed
+fields to Redis:
+
+- One hash per session (``session:{id}``) with one JSON-encoded field per
+  SessionState attribute (HSET only for changed fields)
+- One list per session (``session:{id}:messages``) that receives new messages
+  via RPUSH
+- Changes of all sessions are coalesced into a single pipeline per flush
+"""
+
+import os
+import json
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set
+
+from src.models.session_state import SessionState, SessionStore
+from src.services.redis_service import RedisPipeline, RedisService
+from src.core.exceptions import SessionUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Container fields that are mutated in place (append/clear) and therefore
+# never pass through SessionState.__setattr__. They are compared against the
+# last written encoding instead.
+IN_PLACE_FIELDS = ("agent_status", "symptoms", "feedback")
+
+# Messages are stored in their own list, not in the session hash
+MESSAGES_FIELD = "messages"
+
+
+@dataclass
+class WriteBehindConfig:
+    """Configuration for the session write-behind flusher"""
+    flush_interval: float = 1.0
+    session_ttl: Optional[int] = 86400  # 24 hours
+    key_prefix: str = "session"
+
+
+@dataclass
+class _PendingWrite:
+    """Changes taken from one session for the current flush"""
+    session: SessionState
+    fields: Dict[str, str]
+    messages: List[str]
+    rewrite_messages: bool
+    dirty_fields: Set[str]
+    previous_message_count: int
+    previous_encodings: Dict[str, str]
+
+
+class SessionWriteBehind:
+    """
+    Coalescing write-behind flusher for session state.
+
+    Usage:
+        writer = SessionWriteBehind(redis_service)
+        await writer.start()
+        ...
+        writer.mark_dirty(session)   # after every turn, no I/O
+        ...
+        await writer.stop()          # final flush on shutdown
+    """
+
+    def __init__(
+        self,
+        redis_service: RedisService,
+        config: Optional[WriteBehindConfig] = None
+    ):
+        """
+        Initialize the flusher.
+
+        Args:
+            redis_service: Initialized Redis service used for the pipelines
+            config: Flusher configuration. If not provided, uses environment variables.
+        """
+        if config is None:
+            config = WriteBehindConfig(
+                flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", "1.0")),
+                session_ttl=int(os.getenv("SESSION_TTL", "86400")) or None
+            )
+
+        self.redis_service = redis_service
+        self.config = config
+
+        # Sessions with unflushed changes: {session_id: SessionState}
+        self._pending: Dict[str, SessionState] = {}
+        # Last written encoding of in-place container fields per session
+        self._written: Dict[str, Dict[str, str]] = {}
+        # Sessions whose message list must be rewritten completely
+        self._force_rewrite: Set[str] = set()
+
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self._flush_count = 0
+        self._sessions_written = 0
+        self._fields_written = 0
+        self._messages_written = 0
+        self._failed_flushes = 0
+
+    # ===========================================
+    # KEYS
+    # ===========================================
+
+    def session_key(self, session_id: str) -> str:
+        """Redis hash key holding the session fields"""
+        return f"{self.config.key_prefix}:{session_id}"
+
+    def messages_key(self, session_id: str) -> str:
+        """Redis list key holding the session messages"""
+        return f"{self.config.key_prefix}:{session_id}:messages"
+
+    # ===========================================
+    # PUBLIC API
+    # ===========================================
+
+    def mark_dirty(self, session: SessionState) -> None:
+        """
+        Register a session for the next flush.
+
+        This is cheap and never performs I/O; multiple calls for the same
+        session between two flushes are coalesced.
+        """
+        self._pending[session.session_id] = session
+
+    def forget(self, session_id: str) -> None:
+        """Drop pending changes and cached encodings for a session"""
+        self._pending.pop(session_id, None)
+        self._written.pop(session_id, None)
+        self._force_rewrite.discard(session_id)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of sessions waiting for the next flush"""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Start the background flush loop"""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Session write-behind started (interval: {self.config.flush_interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the background loop and flush all remaining changes"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        written = await self.flush()
+        logger.info(f"Session write-behind stopped (final flush: {written} sessions)")
+
+    async def flush(self) -> int:
+        """
+        Flush all pending session changes in a single pipeline.
+
+        Returns:
+            Number of sessions written
+        """
+        async with self._lock:
+            if not self._pending or not self.redis_service.is_connected():
+                # Nothing to do, or keep changes pending until Redis is available
+                return 0
+
+            pending, self._pending = self._pending, {}
+            return await self._write(list(pending.values()))
+
+    async def flush_session(self, session: SessionState) -> bool:
+        """
+        Write the changes of a single session immediately (write-through).
+
+        Used when other processes must see the state right after the turn.
+
+        Returns:
+            True if the session is persisted
+        """
+        async with self._lock:
+            self._pending.pop(session.session_id, None)
+            if not self.redis_service.is_connected():
+                self._pending[session.session_id] = session
+                return False
+            await self._write([session])
+            return session.session_id not in self._pending
+
+    async def load_session(self, session_id: str) -> Optional[SessionState]:
+        """
+        Load a session previously written by this flusher.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The stored session, or None if Redis has no (readable) state for it
+
+        Raises:
+            SessionUnavailableError: If Redis is unavailable or the circuit is open
+        """
+        if not self.redis_service.is_connected():
+            raise SessionUnavailableError("Redis is not available", session_id=session_id)
+
+        try:
+            async with self.redis_service.pipeline() as pipe:
+                pipe.hgetall(self.session_key(session_id), deserialize_json=False)
+                pipe.lrange(self.messages_key(session_id), deserialize_json=False)
+            fields, messages = pipe.results
+        except Exception as e:
+            logger.warning(f"Failed to load session {session_id}: {e}")
+            raise SessionUnavailableError(f"Failed to load session: {e}", session_id=session_id) from e
+
+        if not fields:
+            return None
+
+        try:
+            data = {name: json.loads(value) for name, value in fields.items()}
+            data["session_id"] = session_id
+            data[MESSAGES_FIELD] = [json.loads(m) for m in messages]
+            session = SessionState.model_validate(data)
+        except Exception as e:
+            logger.error(f"Stored session {session_id} could not be decoded: {e}")
+            return None
+
+        # The loaded state is exactly what is stored
+        session.take_dirty_fields()
+        session.mark_messages_flushed(len(session.messages))
+        self._written[session_id] = {
+            name: fields[name] for name in IN_PLACE_FIELDS if name in fields
+        }
+        return session
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get flusher metrics for monitoring"""
+        return {
+            "pending_sessions": len(self._pending),
+            "flushes": self._flush_count,
+            "failed_flushes": self._failed_flushes,
+            "sessions_written": self._sessions_written,
+            "fields_written": self._fields_written,
+            "messages_written": self._messages_written,
+        }
+
+    # ===========================================
+    # INTERNALS
+    # ===========================================
+
+    async def _write(self, sessions: List[SessionState]) -> int:
+        """Write the changes of the given sessions in one pipeline"""
+        writes = [w for w in (self._take_changes(s) for s in sessions) if w]
+        if not writes:
+            return 0
+
+        try:
+            async with self.redis_service.pipeline() as pipe:
+                for write in writes:
+                    self._queue_write(pipe, write)
+        except Exception as e:
+            self._failed_flushes += 1
+            logger.error(f"Session flush failed for {len(writes)} sessions: {e}")
+            for write in writes:
+                self._restore_changes(write)
+            return 0
+
+        self._flush_count += 1
+        self._sessions_written += len(writes)
+        for write in writes:
+            self._fields_written += len(write.fields)
+            self._messages_written += len(write.messages)
+
+        logger.debug(f"Flushed {len(writes)} sessions")
+        return len(writes)
+
+    async def _run(self) -> None:
+        """Background loop flushing at the configured interval"""
+        while True:
+            await asyncio.sleep(self.config.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Unexpected error in session flush loop: {e}")
+
+    def _take_changes(self, session: SessionState) -> Optional[_PendingWrite]:
+        """Collect the changes of a session and reset its dirty state"""
+        session_id = session.session_id
+        written = self._written.setdefault(session_id, {})
+        previous_encodings = dict(written)
+
+        dirty = session.take_dirty_fields()
+        dirty.discard(MESSAGES_FIELD)
+        candidates = dirty | set(IN_PLACE_FIELDS)
+
+        fields: Dict[str, str] = {}
+        data = session.model_dump(mode="json", include=candidates)
+        for name in candidates:
+            encoded = json.dumps(data[name], ensure_ascii=False)
+            if name in dirty or written.get(name) != encoded:
+                fields[name] = encoded
+                written[name] = encoded
+
+        previous_count = session._flushed_message_count
+        rewrite = session.messages_rewritten() or session_id in self._force_rewrite
+        self._force_rewrite.discard(session_id)
+        new_messages = session.messages if rewrite else session.pending_messages()
+        messages = [
+            json.dumps(m.model_dump(mode="json"), ensure_ascii=False)
+            for m in new_messages
+        ]
+        session.mark_messages_flushed(len(session.messages))
+
+        if not fields and not messages and not rewrite:
+            return None
+
+        return _PendingWrite(
+            session=session,
+            fields=fields,
+            messages=messages,
+            rewrite_messages=rewrite,
+            dirty_fields=dirty,
+            previous_message_count=previous_count,
+            previous_encodings=previous_encodings
+        )
+
+    def _queue_write(self, pipe: RedisPipeline, write: _PendingWrite) -> None:
+        """Queue the Redis commands for one session on the pipeline"""
+        session_id = write.session.session_id
+        hash_key = self.session_key(session_id)
+        list_key = self.messages_key(session_id)
+
+        if write.fields:
+            pipe.hset(hash_key, mapping=write.fields)
+        if write.rewrite_messages:
+            pipe.delete(list_key)
+        if write.messages:
+            pipe.rpush(list_key, *write.messages)
+        if self.config.session_ttl:
+            pipe.expire(hash_key, self.config.session_ttl)
+            pipe.expire(list_key, self.config.session_ttl)
+
+    def _restore_changes(self, write: _PendingWrite) -> None:
+        """Put changes back after a failed flush so the next flush retries them"""
+        session = write.session
+        session.mark_dirty(*write.dirty_fields)
+        self._written[session.session_id] = write.previous_encodings
+
+        if write.rewrite_messages:
+            # The list in Redis is still stale - rewrite it completely next time
+            self._force_rewrite.add(session.session_id)
+            session.mark_messages_flushed(0)
+        else:
+            session.mark_messages_flushed(write.previous_message_count)
+
+        self._pending.setdefault(session.session_id, session)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store shared by all worker processes.
+
+    Every turn loads the session from Redis and writes its changes back
+    immediately, so consecutive requests of one conversation may be served
+    by different workers. A new session is only created when Redis answers
+    that none is stored; while Redis is unavailable, load() raises
+    SessionUnavailableError instead of continuing from a stale local copy.
+
+    The local ``sessions`` dict only keeps the sessions last seen by this
+    process for monitoring (least recently used first out, at most
+    ``max_cached_sessions``); it is never used to serve a turn.
+    """
+
+    write_through = True
+
+    def __init__(self, writer: SessionWriteBehind, max_cached_sessions: Optional[int] = None):
+        super().__init__()
+        self.writer = writer
+        self.sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        if max_cached_sessions is None:
+            max_cached_sessions = int(os.getenv("SESSION_CACHE_SIZE", "1000"))
+        self.max_cached_sessions = max_cached_sessions
+
+    def _remember(self, session: SessionState) -> None:
+        """Keep a session in the bounded local cache"""
+        self.sessions[session.session_id] = session
+        self.sessions.move_to_end(session.session_id)
+        while len(self.sessions) > self.max_cached_sessions:
+            self.sessions.popitem(last=False)
+
+    def create_session(self) -> SessionState:
+        session = super().create_session()
+        self._remember(session)
+        return session
+
+    def get_or_create(self, session_id: str) -> SessionState:
+        session = super().get_or_create(session_id)
+        self._remember(session)
+        return session
+
+    async def load(self, session_id: str) -> SessionState:
+        session = await self.writer.load_session(session_id)
+        if session is None:
+            # Not stored in Redis: start a new conversation, never a stale cached one
+            self.sessions.pop(session_id, None)
+            return self.get_or_create(session_id)
+        self._remember(session)
+        return session
+
+    async def save(self, session: SessionState) -> None:
+        """
+        Write the session through to Redis.
+
+        Raises:
+            SessionUnavailableError: If the session could not be written; it
+                stays pending in the writer, but other workers would load
+                the previous state
+        """
+        if not await self.writer.flush_session(session):
+            raise SessionUnavailableError("Failed to write session", session_id=session.session_id)
+
+
+async def create_session_writer(
+    redis_service: Optional[RedisService] = None,
+    config: Optional[WriteBehindConfig] = None
+) -> Optional[SessionWriteBehind]:
+    """
+    Create and start a session write-behind flusher if Redis is available.
+
+    Args:
+        redis_service: Redis service (creates one from env vars if not provided)
+        config: Flusher configuration
+
+    Returns:
+        Started SessionWriteBehind, or None if Redis is not configured/connected
+    """
+    redis_service = redis_service or RedisService()
+    if not redis_service.config.url:
+        logger.info("Session write-behind disabled - no Redis configured")
+        return None
+
+    await redis_service.initialize()
+    if not redis_service.is_enabled():
+        logger.warning("Session write-behind disabled - Redis not connected")
+        return None
+    if not redis_service.is_connected():
+        logger.warning("Redis not reachable yet - session changes are kept until it reconnects")
+
+    writer = SessionWriteBehind(redis_service, config)
+    await writer.start()
+    return writer
@@ -0,0 +1,319 @@
+# src/v2/core/session_snapshot.py
+"""
+Warm-restart snapshots of the in-memory session store.
+
+On shutdown all sessions are written to a local binary file; on startup the
+file is memory-mapped and sessions are decoded lazily on first access, so
+startup time does not grow with the number of stored sessions.
+
+File layout (little endian):
+
+    header   magic(8) | version(u16) | reserved(u16) | count(u32)
+             | index_offset(u64) | index_length(u64) | index_crc32(u32)
+    records  one JSON-encoded SessionState per session
+    index    count fixed-size entries, sorted by key hash:
+             key_hash(u64) | offset(u64) | length(u32) | crc32(u32) | saved_at(f64)
+
+The header checksum covers the index; every record carries its own CRC32
+that is verified when the record is decoded. Lookups binary-search the
+memory-mapped index, so nothing is parsed up front.
+"""
+
+import os
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Set, Tuple, Union
+
+from src.models.session_state import SessionState, SessionStore
+from src.core.exceptions import SessionError
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"WCSNAP\x00\x00"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIQQI")
+_ENTRY = struct.Struct("<QQIId")
+
+# Index entry: (key_hash, offset, length, crc32, saved_at)
+IndexEntry = Tuple[int, int, int, int, float]
+
+
+def get_snapshot_path() -> Optional[Path]:
+    """
+    Get the snapshot file path from the environment.
+
+    SESSION_SNAPSHOT_PATH overrides the default location; an empty value
+    disables snapshotting. With more than one worker process
+    (WEB_CONCURRENCY > 1) snapshots are disabled as well: every worker holds
+    different sessions and would overwrite the others' file on shutdown.
+    """
+    path = os.getenv("SESSION_SNAPSHOT_PATH", "data/session_snapshot.bin")
+    if not path:
+        return None
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        logger.warning(f"Session snapshots disabled: {workers} workers would share {path}")
+        return None
+    return Path(path)
+
+
+def session_key_hash(session_id: str) -> int:
+    """64-bit key hash used to index sessions in a snapshot"""
+    digest = hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class SessionSnapshot:
+    """
+    Read-only, memory-mapped view of a session snapshot file.
+
+    Opening a snapshot only validates the header and the index checksum.
+    Each session is decoded (and checksum-verified) only when it is requested.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open and validate a snapshot file.
+
+        Args:
+            path: Snapshot file path
+
+        Raises:
+            SessionError: If the file is not a valid snapshot
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SessionError(f"Snapshot file is empty: {self.path}")
+
+        try:
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+        # Key hashes of sessions already restored into the store
+        self._consumed: Set[int] = set()
+
+    def _read_header(self) -> None:
+        """Validate magic, version and index checksum"""
+        if len(self._mmap) < _HEADER.size:
+            raise SessionError(f"Snapshot file truncated: {self.path}")
+
+        magic, version, _, count, index_offset, index_length, index_crc = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != SNAPSHOT_MAGIC:
+            raise SessionError(f"Not a session snapshot: {self.path}")
+        if version != SNAPSHOT_VERSION:
+            raise SessionError(
+                f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION})",
+                details={"version": version}
+            )
+        if index_length != count * _ENTRY.size or index_offset + index_length > len(self._mmap):
+            raise SessionError(f"Snapshot index out of bounds: {self.path}")
+        if zlib.crc32(self._mmap[index_offset:index_offset + index_length]) != index_crc:
+            raise SessionError(f"Snapshot index checksum mismatch: {self.path}")
+
+        self.version = version
+        self.count = count
+        self._index_offset = index_offset
+
+    def _entry_at(self, position: int) -> IndexEntry:
+        return _ENTRY.unpack_from(self._mmap, self._index_offset + position * _ENTRY.size)
+
+    def entry(self, session_id: str) -> Optional[IndexEntry]:
+        """Find the index entry of a session (binary search, no allocation of the index)"""
+        key_hash = session_key_hash(session_id)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            entry = self._entry_at(mid)
+            if entry[0] < key_hash:
+                low = mid + 1
+            elif entry[0] > key_hash:
+                high = mid
+            else:
+                return entry
+        return None
+
+    def __contains__(self, session_id: str) -> bool:
+        entry = self.entry(session_id)
+        return entry is not None and entry[0] not in self._consumed
+
+    def remaining(self) -> int:
+        """Number of sessions not yet restored into the store"""
+        return self.count - len(self._consumed)
+
+    def _read_record(self, entry: IndexEntry) -> Optional[bytes]:
+        """Read a record and verify its checksum"""
+        _, offset, length, crc, _ = entry
+        data = self._mmap[offset:offset + length]
+        if zlib.crc32(data) != crc:
+            return None
+        return data
+
+    def load(self, session_id: str) -> Optional[SessionState]:
+        """
+        Decode a session from the snapshot.
+
+        Returns:
+            The restored session, or None if not present or corrupt
+        """
+        entry = self.entry(session_id)
+        if entry is None or entry[0] in self._consumed:
+            return None
+        self._consumed.add(entry[0])
+
+        data = self._read_record(entry)
+        if data is None:
+            logger.warning(f"Snapshot record checksum mismatch for session {session_id} - skipped")
+            return None
+
+        try:
+            session = SessionState.model_validate_json(data)
+        except Exception as e:
+            logger.warning(f"Could not decode snapshot session {session_id}: {e}")
+            return None
+
+        if session.session_id != session_id:
+            # 64-bit hash collision - treat as unknown session
+            return None
+
+        # Restored state is already persisted wherever it came from
+        session.take_dirty_fields()
+        session.mark_messages_flushed(len(session.messages))
+        return session
+
+    def unconsumed(self) -> Iterator[Tuple[int, bytes, float]]:
+        """Yield (key_hash, raw record, saved_at) of sessions never restored"""
+        for position in range(self.count):
+            entry = self._entry_at(position)
+            if entry[0] in self._consumed:
+                continue
+            data = self._read_record(entry)
+            if data is not None:
+                yield entry[0], data, entry[4]
+
+    def close(self) -> None:
+        """Release the memory map and file handle"""
+        try:
+            self._mmap.close()
+        finally:
+            self._file.close()
+
+
+def write_snapshot(
+    store: SessionStore,
+    path: Union[str, Path],
+    max_age: Optional[float] = None
+) -> int:
+    """
+    Write all sessions of a store to a snapshot file.
+
+    Sessions that were restored from a previous snapshot but never accessed
+    are copied over as raw records without decoding them. The file is written
+    to a unique temporary file in the same directory and atomically renamed.
+
+    Args:
+        store: Session store to snapshot
+        path: Target file path
+        max_age: Drop carried-over sessions older than this many seconds
+
+    Returns:
+        Number of sessions written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+
+    now = time.time()
+    previous = store.snapshot
+    entries = {}
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\x00" * _HEADER.size)
+            offset = _HEADER.size
+
+            def append(key_hash: int, data: bytes, saved_at: float) -> None:
+                nonlocal offset
+                f.write(data)
+                entries[key_hash] = (key_hash, offset, len(data), zlib.crc32(data), saved_at)
+                offset += len(data)
+
+            for session_id, session in store.sessions.items():
+                append(session_key_hash(session_id), session.model_dump_json().encode("utf-8"), now)
+
+            if previous is not None:
+                for key_hash, data, saved_at in previous.unconsumed():
+                    if key_hash in entries:
+                        continue
+                    if max_age is not None and now - saved_at > max_age:
+                        continue
+                    append(key_hash, data, saved_at)
+
+            index_bytes = b"".join(_ENTRY.pack(*entries[h]) for h in sorted(entries))
+            f.write(index_bytes)
+
+            f.seek(0)
+            f.write(_HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                0,
+                len(entries),
+                offset,
+                len(index_bytes),
+                zlib.crc32(index_bytes)
+            ))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_name, path)
+    except BaseException:
+        # Never leave a partial temp file behind
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    logger.info(f"Session snapshot written: {len(entries)} sessions -> {path}")
+    return len(entries)
+
+
+def restore_snapshot(store: SessionStore, path: Union[str, Path]) -> int:
+    """
+    Attach a snapshot file to a store for lazy restoring.
+
+    Invalid or unreadable snapshots are logged and ignored so that a broken
+    file never prevents startup.
+
+    Args:
+        store: Session store to restore into
+        path: Snapshot file path
+
+    Returns:
+        Number of sessions available in the snapshot
+    """
+    path = Path(path)
+    if not path.exists():
+        logger.info(f"No session snapshot found at {path}")
+        return 0
+
+    try:
+        snapshot = SessionSnapshot(path)
+    except (SessionError, OSError) as e:
+        logger.warning(f"Ignoring session snapshot: {e}")
+        return 0
+
+    store.attach_snapshot(snapshot)
+    logger.info(f"Session snapshot attached: {snapshot.count} sessions (lazy restore)")
+    return snapshot.count
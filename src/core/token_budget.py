@@ -0,0 +1,327 @@
+# src/v2/core/token_budget.py
+"""
+Token budgeting for prompts sent to GPT.
+
+Sits between PromptManager and GPTService: before a prompt is rendered for
+a GPT call, every variable slot is capped to its token budget; afterwards
+long values that the template expanded more than once are kept at their
+first occurrence only, and the token count is recorded per prompt key.
+
+Tokens are counted locally: with tiktoken when it is installed, otherwise
+with an approximation of BPE word pieces (about one token per four letters
+of a word, one per punctuation mark) that is close enough for budgeting.
+Loading a tiktoken encoding reads (or downloads) its BPE ranks, so the
+tokenizer is built once per process at startup - in the gunicorn master
+before the fork, or in a thread from the lifespan hook - and never on the
+event loop during a request.
+
+Configuration:
+    PROMPT_SLOT_BUDGETS        JSON, slot name -> max tokens, merged over the defaults
+    PROMPT_SLOT_DEFAULT_TOKENS budget of slots without an explicit budget (default 400)
+    PROMPT_DEDUPE_MIN_CHARS    repeated values from this length on are expanded once (default 100)
+"""
+
+import os
+import re
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.exceptions import V2ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+# Budgets of the slots used in src/prompts: user input is short, database
+# texts get the most room, the four instinct descriptions share one budget
+DEFAULT_SLOT_BUDGETS: Dict[str, int] = {
+    "symptom": 200,
+    "context": 200,
+    "text": 200,
+    "query": 200,
+    "instinct": 50,
+    "match": 600,
+    "exercise_from_weaviate": 600,
+    "jagd": 150,
+    "rudel": 150,
+    "territorial": 150,
+    "sexual": 150,
+    "primary_description": 200,
+}
+
+# Replaces later occurrences of a long repeated value
+REPEATED_VALUE_REFERENCE = "(siehe oben)"
+TRUNCATION_MARKER = " …"
+
+_PIECES = re.compile(r"\s*(?:\w+|[^\w\s])")
+_SENTENCE_END = re.compile(r"[.!?:](?=\s)")
+
+
+class ApproximateTokenizer:
+    """Counts BPE-like word pieces without a vocabulary"""
+
+    name = "approximate"
+
+    @staticmethod
+    def _cost(piece: str) -> int:
+        word = piece.lstrip()
+        if not word[0].isalnum() and word[0] != "_":
+            return 1
+        return 1 + (len(word) - 1) // 4
+
+    def count(self, text: str) -> int:
+        return sum(self._cost(piece) for piece in _PIECES.findall(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of whole pieces within max_tokens"""
+        tokens = 0
+        for match in _PIECES.finditer(text):
+            tokens += self._cost(match.group())
+            if tokens > max_tokens:
+                return text[:match.start()]
+        return text
+
+
+class TiktokenTokenizer:
+    """Exact token counts for OpenAI models"""
+
+    def __init__(self, model: str):
+        import tiktoken
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.name = f"tiktoken:{self.encoding.name}"
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+def create_tokenizer(model: Optional[str] = None):
+    """tiktoken for the configured GPT model if available, else the approximation"""
+    model = model or os.getenv("GPT_MODEL", "gpt-3.5-turbo")
+    try:
+        return TiktokenTokenizer(model)
+    except ImportError:
+        logger.debug("tiktoken not installed, using approximate token counts")
+    except Exception as e:
+        # e.g. encoding files not cached and no network access
+        logger.warning(f"tiktoken unavailable ({e}), using approximate token counts")
+    return ApproximateTokenizer()
+
+
+@dataclass
+class TokenBudgetConfig:
+    """Token budgets of prompt variable slots"""
+    slot_budgets: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_SLOT_BUDGETS))
+    default_slot_tokens: int = 400
+    dedupe_min_chars: int = 100
+
+
+def get_token_budget_config() -> TokenBudgetConfig:
+    """Get the token budget configuration from the environment"""
+    slot_budgets = dict(DEFAULT_SLOT_BUDGETS)
+    raw = os.getenv("PROMPT_SLOT_BUDGETS", "").strip()
+    if raw:
+        try:
+            overrides = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise V2ConfigurationError(f"PROMPT_SLOT_BUDGETS is not valid JSON: {e}", component="token_budget")
+        if not isinstance(overrides, dict) or not all(
+            isinstance(value, int) and value > 0 for value in overrides.values()
+        ):
+            raise V2ConfigurationError(
+                "PROMPT_SLOT_BUDGETS must map slot names to positive token counts",
+                component="token_budget"
+            )
+        slot_budgets.update(overrides)
+    return TokenBudgetConfig(
+        slot_budgets=slot_budgets,
+        default_slot_tokens=int(os.getenv("PROMPT_SLOT_DEFAULT_TOKENS", "400")),
+        dedupe_min_chars=int(os.getenv("PROMPT_DEDUPE_MIN_CHARS", "100"))
+    )
+
+
+@dataclass
+class PromptTokenStats:
+    """Rendered token counts of one prompt key"""
+    renders: int = 0
+    tokens_total: int = 0
+    tokens_max: int = 0
+    tokens_last: int = 0
+    truncated_slots: int = 0
+    tokens_cut: int = 0
+    deduplicated: int = 0
+
+    def truncate(self, slots: int, tokens_cut: int) -> None:
+        self.truncated_slots += slots
+        self.tokens_cut += tokens_cut
+
+    def add(self, tokens: int, deduplicated: int) -> None:
+        self.renders += 1
+        self.tokens_total += tokens
+        self.tokens_max = max(self.tokens_max, tokens)
+        self.tokens_last = tokens
+        self.deduplicated += deduplicated
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "renders": self.renders,
+            "tokens_avg": round(self.tokens_total / self.renders, 1) if self.renders else 0.0,
+            "tokens_max": self.tokens_max,
+            "tokens_last": self.tokens_last,
+            "truncated_slots": self.truncated_slots,
+            "tokens_cut": self.tokens_cut,
+            "deduplicated": self.deduplicated,
+        }
+
+
+class TokenBudget:
+    """
+    Fits prompt variables into the slot budgets and records token counts.
+
+    Usage:
+        budget = get_token_budget()
+        kwargs = budget.fit(key, kwargs)
+        prompt = budget.finish(key, prompt_manager.get_prompt(key, **kwargs), kwargs)
+    """
+
+    def __init__(self, config: Optional[TokenBudgetConfig] = None, tokenizer=None):
+        self.config = config or get_token_budget_config()
+        self.tokenizer = tokenizer or get_tokenizer()
+        self.stats: Dict[str, PromptTokenStats] = {}
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        return self.tokenizer.count(text)
+
+    def cap(self, slot: str, value: str) -> Tuple[str, int]:
+        """
+        Cap a slot value to its budget.
+
+        Cuts at the last sentence end within the budget if that keeps at
+        least two thirds of it, otherwise at a word boundary.
+
+        Returns:
+            (value, number of tokens cut)
+        """
+        budget = self.config.slot_budgets.get(slot, self.config.default_slot_tokens)
+        tokens = self.tokenizer.count(value)
+        if tokens <= budget:
+            return value, 0
+
+        cut = self.tokenizer.truncate(value, budget - 1)  # room for the marker
+        sentence_ends = [match.end() for match in _SENTENCE_END.finditer(cut + " ")]
+        if sentence_ends and sentence_ends[-1] >= len(cut) * 2 // 3:
+            cut = cut[:sentence_ends[-1]]
+        else:
+            cut = cut.rstrip() + TRUNCATION_MARKER
+        return cut, tokens - self.tokenizer.count(cut)
+
+    def fit(self, key, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cap the string variables of a prompt to their slot budgets.
+
+        Args:
+            key: PromptType or prompt key, for the statistics
+            kwargs: Variables for formatting
+
+        Returns:
+            Variables to render the prompt with
+        """
+        capped = dict(kwargs)
+        truncated = tokens_cut = 0
+        for slot, value in kwargs.items():
+            if type(value) is str and value:
+                capped[slot], cut = self.cap(slot, value)
+                if cut:
+                    truncated += 1
+                    tokens_cut += cut
+        if truncated:
+            self._stats(key).truncate(truncated, tokens_cut)
+            logger.debug(f"Prompt {key}: {truncated} slot(s) truncated by {tokens_cut} tokens")
+        return capped
+
+    def finish(self, key, text: str, kwargs: Dict[str, Any]) -> str:
+        """
+        Deduplicate repeated expansions in a rendered prompt and record its size.
+
+        A long value that the template expands more than once is kept at its
+        first occurrence; later occurrences become a reference to it.
+
+        Args:
+            key: PromptType or prompt key, for the statistics
+            text: Prompt rendered with the variables returned by fit()
+            kwargs: Those variables
+
+        Returns:
+            The prompt to send
+        """
+        if type(text) is not str:
+            return text
+
+        deduplicated = 0
+        for value in kwargs.values():
+            if type(value) is not str or len(value) < self.config.dedupe_min_chars:
+                continue
+            first = text.find(value)
+            if first < 0:
+                continue
+            rest = first + len(value)
+            if text.find(value, rest) >= 0:
+                text = text[:rest] + text[rest:].replace(value, REPEATED_VALUE_REFERENCE)
+                deduplicated += 1
+
+        self._stats(key).add(self.tokenizer.count(text), deduplicated)
+        return text
+
+    def _stats(self, key) -> PromptTokenStats:
+        key = key.value if hasattr(key, "value") else str(key)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = PromptTokenStats()
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Rendered token counts per prompt key"""
+        return {
+            "tokenizer": self.tokenizer.name,
+            "prompts": {key: stats.summary() for key, stats in sorted(self.stats.items())},
+        }
+
+
+# Global instances
+_tokenizer = None
+_token_budget: Optional[TokenBudget] = None
+
+
+def get_tokenizer():
+    """Get the process-wide tokenizer (read-only, shared by forked workers)"""
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = create_tokenizer()
+    return _tokenizer
+
+
+def get_token_budget() -> TokenBudget:
+    """Get the process-wide token budget"""
+    global _token_budget
+    if _token_budget is None:
+        try:
+            _token_budget = TokenBudget()
+        except V2ConfigurationError as e:
+            logger.error(f"Invalid token budget configuration, using defaults: {e}")
+            _token_budget = TokenBudget(TokenBudgetConfig())
+    return _token_budget
+
+
+async def warm_token_budget() -> TokenBudget:
+    """Build the token budget and its tokenizer in a thread (call at startup)"""
+    return await asyncio.to_thread(get_token_budget)
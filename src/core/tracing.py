@@ -0,0 +1,474 @@
+# src/v2/core/tracing.py
+"""
+Per-turn tracing for WuffChat V2.
+
+Every conversation turn records a tree of timed spans:
+
+    turn
+    ├── session.load
+    ├── classify
+    ├── transition            (from_state, event, to_state)
+    │   └── handler           (handler name)
+    │       └── agent.respond (agent, message_type)
+    │           └── gpt.complete / weaviate.search / redis.*
+    ├── convert_messages
+    └── session.save
+
+The current span is tracked in a context variable, so nested calls attach
+their spans automatically without passing anything around. Outside of a
+turn all span helpers are no-ops.
+
+Finished turns are kept in a bounded in-memory ring buffer per session
+(served by ``/v2/debug/trace/{session_id}``) and handed to registered
+hooks, e.g. the OTLP/JSON file exporter.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import random
+import logging
+import functools
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "wuffchat-v2"
+INSTRUMENTATION_SCOPE = "src.core.tracing"
+
+# Queue marker telling the export thread to stop
+_STOP = object()
+
+
+@dataclass
+class TracingConfig:
+    """Configuration for turn tracing"""
+    enabled: bool = True
+    turns_per_session: int = 20
+    max_sessions: int = 1000
+    export_path: Optional[str] = None  # OTLP/JSON lines file
+
+
+@dataclass
+class Span:
+    """A timed operation within a turn"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = 0  # Unix epoch nanoseconds
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+    children: List["Span"] = field(default_factory=list)
+    _perf_start: int = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def walk(self) -> Iterator["Span"]:
+        """This span and all descendants, depth first"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested representation for the debug endpoint"""
+        data = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+        if self.error:
+            data["error"] = self.error
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+@dataclass
+class TurnTrace:
+    """All spans of one conversation turn"""
+    session_id: str
+    root: Span
+
+    @property
+    def trace_id(self) -> str:
+        return self.root.trace_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "session_id": self.session_id,
+            "start_time_unix_nano": self.root.start_ns,
+            "duration_ms": round(self.root.duration_ms, 3),
+            "root": self.root.to_dict(),
+        }
+
+    def to_otel(self) -> Dict[str, Any]:
+        """OTLP/JSON ``ExportTraceServiceRequest`` for this turn"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otel_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": INSTRUMENTATION_SCOPE},
+                    "spans": [_otel_span(span, self.session_id) for span in self.root.walk()],
+                }],
+            }]
+        }
+
+
+def _otel_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otel_attribute(key: str, value: Any) -> Dict[str, Any]:
+    return {"key": key, "value": _otel_value(value)}
+
+
+def _otel_span(span: Span, session_id: str) -> Dict[str, Any]:
+    attributes = [_otel_attribute(k, v) for k, v in span.attributes.items()]
+    if span.parent_id is None:
+        attributes.append(_otel_attribute("session.id", session_id))
+
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": attributes,
+        "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+# ===========================================
+# SPAN API
+# ===========================================
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("wuffchat_current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """The innermost active span, or None outside of a turn"""
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Set an attribute on the current span (no-op outside of a turn)"""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
+
+
+def _new_span(name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> Span:
+    return Span(
+        name=name,
+        trace_id=trace_id,
+        span_id=f"{random.getrandbits(64):016x}",
+        parent_id=parent_id,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+        _perf_start=time.perf_counter_ns(),
+    )
+
+
+class _ActiveSpan:
+    """Context manager making a span current for the duration of a block"""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self.span
+        if exc_type is not None:
+            span.status = "error"
+            span.error = f"{exc_type.__name__}: {exc}"
+        span.end_ns = span.start_ns + (time.perf_counter_ns() - span._perf_start)
+        _current_span.reset(self._token)
+        return False
+
+
+class _NoSpan:
+    """Shared no-op context manager used outside of a turn"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes: Any):
+    """
+    Record a child span of the current span.
+
+    Usable as ``with span("name", key=value) as s:``. Yields None (and
+    records nothing) when called outside of a turn.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NO_SPAN
+
+    child = _new_span(name, parent.trace_id, parent.span_id, attributes)
+    parent.children.append(child)
+    return _ActiveSpan(child)
+
+
+def traced(name: str, attributes: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable:
+    """
+    Decorator recording a span around an async function or method.
+
+    Args:
+        name: Span name, e.g. "gpt.complete"
+        attributes: Optional callable receiving the call arguments and
+            returning span attributes
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            attrs = attributes(*args, **kwargs) if attributes else {}
+            with span(name, **attrs):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ===========================================
+# TURN BUFFER AND TRACER
+# ===========================================
+
+class TraceBuffer:
+    """Bounded ring buffer of the latest turns per session"""
+
+    def __init__(self, turns_per_session: int = 20, max_sessions: int = 1000):
+        self.turns_per_session = turns_per_session
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Deque[TurnTrace]]" = OrderedDict()
+
+    def add(self, trace: TurnTrace) -> None:
+        turns = self._sessions.get(trace.session_id)
+        if turns is None:
+            turns = self._sessions[trace.session_id] = deque(maxlen=self.turns_per_session)
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(trace.session_id)
+        turns.append(trace)
+
+    def get(self, session_id: str, limit: Optional[int] = None) -> List[TurnTrace]:
+        """Latest turns of a session, oldest first"""
+        turns = list(self._sessions.get(session_id, ()))
+        return turns[-limit:] if limit else turns
+
+    def __len__(self) -> int:
+        return sum(len(turns) for turns in self._sessions.values())
+
+
+class OtlpJsonFileExporter:
+    """
+    Trace hook appending each turn as one OTLP/JSON line to a file.
+
+    The hook only queues the finished turn. A writer thread keeps the file
+    open, serializes whatever has queued up and appends it in one write, so
+    no file I/O runs on the event loop. If the writer falls behind, turns
+    are dropped (and counted) instead of blocking the request.
+    """
+
+    def __init__(self, path: str, max_queued: int = 10000):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.exported = 0
+        self.dropped = 0
+        atexit.register(self.close)
+
+    def __call__(self, trace: TurnTrace) -> None:
+        if self._pid != os.getpid():
+            # Started lazily, and again in every forked worker
+            self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._thread = threading.Thread(target=self._run, args=(self._queue,), name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def _run(self, traces: "queue.Queue[Any]") -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                batch = [traces.get()]
+                while True:
+                    try:
+                        batch.append(traces.get_nowait())
+                    except queue.Empty:
+                        break
+
+                lines = [
+                    json.dumps(trace.to_otel(), ensure_ascii=False) + "\n"
+                    for trace in batch if trace is not _STOP
+                ]
+                try:
+                    f.writelines(lines)
+                    f.flush()
+                    self.exported += len(lines)
+                except OSError as e:
+                    logger.warning(f"Trace export to {self.path} failed: {e}")
+                if len(lines) < len(batch):
+                    return
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write all queued turns and stop the writer thread"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+
+
+TraceHook = Callable[[TurnTrace], None]
+
+
+class Tracer:
+    """
+    Records turn traces and dispatches them to the buffer and hooks.
+
+    Usage:
+        tracer = get_tracer()
+        with tracer.turn(session_id, kind="message"):
+            with tracer.span("classify"):
+                ...
+    """
+
+    def __init__(self, config: Optional[TracingConfig] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            config: Tracing configuration. If not provided, uses environment variables.
+        """
+        if config is None:
+            config = TracingConfig(
+                enabled=os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes"),
+                turns_per_session=int(os.getenv("TRACE_TURNS_PER_SESSION", "20")),
+                max_sessions=int(os.getenv("TRACE_MAX_SESSIONS", "1000")),
+                export_path=os.getenv("TRACE_EXPORT_PATH") or None
+            )
+
+        self.config = config
+        self.buffer = TraceBuffer(config.turns_per_session, config.max_sessions)
+        self._hooks: List[TraceHook] = []
+
+        if config.export_path:
+            self.add_hook(OtlpJsonFileExporter(config.export_path))
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def add_hook(self, hook: TraceHook) -> None:
+        """Register a callable invoked with every finished turn"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: TraceHook) -> None:
+        self._hooks.remove(hook)
+
+    @contextmanager
+    def turn(self, session_id: str, name: str = "turn", **attributes: Any) -> Iterator[Optional[Span]]:
+        """Record a turn as the root span of a new trace"""
+        if not self.config.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        if parent is not None:
+            # Nested turn (e.g. greeting inside a request) - record as child
+            with span(name, **attributes) as child:
+                yield child
+            return
+
+        root = _new_span(name, f"{random.getrandbits(128):032x}", None, attributes)
+        try:
+            with _ActiveSpan(root):
+                yield root
+        finally:
+            self._finish(TurnTrace(session_id=session_id, root=root))
+
+    def span(self, name: str, **attributes: Any):
+        """Record a child span of the current span (see module-level span())"""
+        return span(name, **attributes)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the current span (see module-level set_attribute())"""
+        set_attribute(key, value)
+
+    def recent(self, session_id: str, limit: Optional[int] = None) -> List[TurnTrace]:
+        """Latest recorded turns of a session"""
+        return self.buffer.get(session_id, limit)
+
+    def _finish(self, trace: TurnTrace) -> None:
+        self.buffer.add(trace)
+        for hook in self._hooks:
+            try:
+                hook(trace)
+            except Exception as e:
+                logger.warning(f"Trace hook {hook!r} failed: {e}")
+
+
+# Global instance for easy access
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the global Tracer instance"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
@@ -0,0 +1,56 @@
+# src/v2/core/worker_lifecycle.py
+"""
+Process lifecycle hooks for multi-worker serving.
+
+The application module is imported once in the gunicorn master (preload) and
+the workers are forked from it. Everything that is immutable after import -
+prompts, FSM definition, compiled models - is shared copy-on-write between
+the workers. Per-process state (the orchestrator and its service clients,
+which hold sockets and event-loop bound objects) must never cross a fork and
+is dropped here so that every worker builds its own on first use.
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def warm_shared_state() -> None:
+    """
+    Build read-only state in the master before the workers are forked.
+
+    Everything created here is inherited by all workers without being
+    rebuilt or copied per process.
+    """
+    from src.core.prompt_manager import get_prompt_manager
+    from src.core.token_budget import get_tokenizer
+
+    get_prompt_manager()
+    get_tokenizer()
+    logger.info("Shared state warmed in master process")
+
+
+def reset_after_fork() -> None:
+    """Drop per-process singletons inherited from the master"""
+    from src.core.logging_config import restart_logging_after_fork
+    import src.core.orchestrator as orchestrator_module
+    import src.services.redis_service as redis_module
+    import src.core.event_log as event_log_module
+    import src.core.experiments as experiments_module
+    import src.core.token_budget as token_budget_module
+    import src.core.feedback_pipeline as feedback_pipeline_module
+    import src.core.analytics as analytics_module
+
+    orchestrator_module._orchestrator = None
+    redis_module._singleton_instance = None
+    event_log_module._event_log = None
+    # Experiment counters are per worker; assignments are hash-based and survive
+    experiments_module._experiments = None
+    # Token statistics are per worker; the tokenizer itself stays shared
+    token_budget_module._token_budget = None
+    feedback_pipeline_module._feedback_pipeline = None
+    analytics_module._analytics = None
+    # The master's log listener thread does not exist in the worker
+    restart_logging_after_fork()
+    logger.debug(f"Per-process state reset in worker {os.getpid()}")
@@ -6,38 +6,171 @@ This provides the exact same API as V1 but uses the V2 flow engine internally.
 Frontend compatibility is maintained through the same endpoints and response formats.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+import orjson
+from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 
 # V2 imports - the key difference from V1
 from src.core.orchestrator import V2Orchestrator, init_orchestrator
 from src.models.session_state import SessionStore
-from src.models.flow_models import FlowStep
 from src.core.logging_config import setup_logging
+from src.core.session_persistence import create_session_writer, RedisSessionStore
+from src.core.session_snapshot import get_snapshot_path, restore_snapshot, write_snapshot
+from src.core.tracing import get_tracer
+from src.core.exceptions import V2ConfigurationError, SessionUnavailableError
+from src.core.event_log import init_event_log
+from src.core.feedback_pipeline import init_feedback_pipeline
+from src.core.analytics import init_analytics
+from src.core.token_budget import warm_token_budget
+from src.services.redis_service import RedisService
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for the conversation endpoints, encoded with orjson.
+    
+    The endpoints return it directly, so FastAPI skips validating and
+    re-encoding the payload through the response model (which stays for
+    the OpenAPI schema).
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _describe_persistence(session_writer) -> str:
+    """Human-readable description of the active session persistence"""
+    if session_store.write_through:
+        return "shared (Redis, write-through)"
+    if session_writer:
+        return "write-behind (Redis)"
+    return "in-memory only"
+
+
+async def _watch_flow_definition(interval: float) -> None:
+    """Poll the flow definition file and hot-reload it when it changes"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = orchestrator.reload_flow_definition()
+            if result["reloaded"]:
+                logger.info(f"Flow definition reloaded: {result['total_transitions']} transitions")
+        except Exception as e:
+            logger.error(f"Flow definition watcher failed: {e}")
+
+
+async def _watch_prompt_pack(interval: float) -> None:
+    """Poll the prompt pack directory and hot-reload a new or changed pack"""
+    from src.core.prompt_manager import reload_prompts
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = reload_prompts()
+            if result["reloaded"]:
+                logger.info(f"Prompt pack {result['version']} active: {len(result['changed'])} prompts changed")
+        except Exception as e:
+            logger.error(f"Prompt pack watcher failed: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """FastAPI lifespan event handler for startup/shutdown"""
-    global orchestrator
+    global orchestrator, session_store
     
     # Startup
     logger.info("=" * 60)
     logger.info("🚀 WuffChat V2 API Starting...")
     logger.info("=" * 60)
     
+    # Write-behind session persistence (only if Redis is configured)
+    try:
+        session_writer = await create_session_writer()
+    except Exception as e:
+        logger.warning(f"Session persistence unavailable: {e}")
+        session_writer = None
+    
+    # Multi-worker mode: sessions must be shared through Redis
+    if os.getenv("SESSION_STORE", "memory").lower() == "redis":
+        if session_writer:
+            session_store = RedisSessionStore(session_writer)
+        else:
+            logger.error("SESSION_STORE=redis requires Redis - falling back to in-memory sessions")
+    
+    # Warm restart: attach the last session snapshot (sessions decode lazily)
+    snapshot_path = get_snapshot_path() if not session_store.write_through else None
+    if snapshot_path:
+        restore_snapshot(session_store, snapshot_path)
+    
+    # Append-only conversation event log (EVENT_LOG_BACKEND=file|redis)
+    event_log_redis = None
+    owns_event_log_redis = False
+    if os.getenv("EVENT_LOG_BACKEND", "none").lower() == "redis":
+        if session_writer:
+            event_log_redis = session_writer.redis_service
+        else:
+            event_log_redis = RedisService()
+            await event_log_redis.initialize()
+            owns_event_log_redis = True
+    event_log = init_event_log(redis_service=event_log_redis)
+    await event_log.start()
+    
+    # Feedback is written in the background (spill file while Redis is down)
+    feedback_redis = session_writer.redis_service if session_writer else event_log_redis
+    owns_feedback_redis = False
+    if feedback_redis is None:
+        feedback_redis = RedisService()
+        try:
+            await feedback_redis.initialize()
+        except Exception as e:
+            logger.warning(f"Feedback storage without Redis: {e}")
+        owns_feedback_redis = True
+    feedback_pipeline = init_feedback_pipeline(redis_service=feedback_redis)
+    await feedback_pipeline.start()
+    
+    # Traffic counters in per-minute Redis buckets (in-process without Redis)
+    analytics = init_analytics(redis_service=feedback_redis)
+    await analytics.start()
+    
     # Initialize orchestrator with lazy loading to avoid blocking health checks
-    orchestrator = init_orchestrator(session_store)
+    orchestrator = init_orchestrator(session_store, session_writer=session_writer)
+    
+    # Load the tokenizer now (in a thread) instead of on the first GPT call
+    token_budget = await warm_token_budget()
+    
+    # /flow_intro serves a precomputed greeting without waiting for the services
+    static_greeting = orchestrator.prepare_greeting()
     
     # Log configuration
     logger.info("📋 Configuration:")
-    logger.info(f"  - Session Store: {len(session_store.sessions)} active sessions")
+    logger.info(f"  - Session Store: {session_store.session_count()} sessions")
+    logger.info(f"  - Session Persistence: {_describe_persistence(session_writer)}")
+    logger.info(f"  - Event Log: {event_log.config.backend if event_log.enabled else 'disabled'}")
+    logger.info(f"  - Feedback Storage: {'Redis' if feedback_redis.is_connected() else 'spill file only'}")
     logger.info(f"  - V2 Orchestrator: Initialized (services lazy-loaded)")
+    logger.info(f"  - Greeting: {'precomputed' if static_greeting else 'flow engine'}")
+    logger.info(f"  - Tokenizer: {token_budget.tokenizer.name}")
     logger.info("  - Services: Will initialize on first use")
     
+    # Hot reload of the declarative flow definition (0 disables polling)
+    reload_interval = float(os.getenv("FLOW_RELOAD_INTERVAL", "0"))
+    flow_watcher = asyncio.create_task(_watch_flow_definition(reload_interval)) if reload_interval > 0 else None
+    logger.info(f"  - Flow Reload: {f'every {reload_interval}s' if flow_watcher else 'disabled'}")
+    
+    # Hot reload of prompt packs (only with PROMPT_PACK_DIR, 0 disables polling)
+    prompt_interval = float(os.getenv("PROMPT_RELOAD_INTERVAL", "0"))
+    prompt_watcher = None
+    if prompt_interval > 0 and os.getenv("PROMPT_PACK_DIR"):
+        prompt_watcher = asyncio.create_task(_watch_prompt_pack(prompt_interval))
+    logger.info(f"  - Prompt Reload: {f'every {prompt_interval}s' if prompt_watcher else 'disabled'}")
+    
     logger.info("=" * 60)
     logger.info("✅ V2 API Ready!")
     logger.info("=" * 60)
@@ -46,7 +179,41 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 WuffChat V2 API Shutting down...")
-    # Add any cleanup code here if needed
+    
+    if flow_watcher:
+        flow_watcher.cancel()
+    if prompt_watcher:
+        prompt_watcher.cancel()
+    
+    # Write queued feedback, counters and buffered conversation events
+    await feedback_pipeline.stop()
+    await analytics.stop()
+    if owns_feedback_redis:
+        await feedback_redis.shutdown()
+    await event_log.stop()
+    if owns_event_log_redis:
+        await event_log_redis.shutdown()
+    
+    # Flush all pending session changes before the process exits
+    if session_writer:
+        await session_writer.stop()
+        await session_writer.redis_service.shutdown()
+    
+    # Snapshot sessions so the next process can resume the conversations
+    if snapshot_path:
+        try:
+            write_snapshot(
+                session_store,
+                snapshot_path,
+                max_age=float(os.getenv("SESSION_SNAPSHOT_MAX_AGE", "604800"))
+            )
+        except Exception as e:
+            logger.error(f"Failed to write session snapshot: {e}")
+        finally:
+            if session_store.snapshot is not None:
+                session_store.snapshot.close()
+                session_store.snapshot = None
+    
     logger.info("👋 Goodbye!")
 
 # Initialize FastAPI app with lifespan
@@ -82,6 +249,9 @@ session_store = SessionStore()
 # Initialize V2 orchestrator
 orchestrator = None
 
+# Answer while a shared session store cannot load or write the session
+SESSION_UNAVAILABLE_DETAIL = "Sitzung ist vorübergehend nicht verfügbar. Bitte versuche es gleich noch einmal."
+
 # API Models - same as V1 for compatibility
 class IntroResponse(BaseModel):
     session_id: str
@@ -99,7 +269,7 @@ def read_root():
     return {"status": "ok", "version": "2.0.0", "service": "wuffchat-v2"}
 
 
-@app.post("/flow_intro", response_model=IntroResponse)
+@app.post("/flow_intro", response_model=IntroResponse, response_class=FastJSONResponse)
 async def flow_intro():
     """
     Start a new conversation - V2 implementation.
@@ -108,26 +278,32 @@ async def flow_intro():
     Response format is identical to V1 for frontend compatibility.
     """
     try:
-        # Create new session
+        # Create new session (starts at GREETING; no store lookup needed)
         session = session_store.create_session()
-        session.current_step = FlowStep.GREETING
         
-        logger.info(f"[V2] Neue Session erstellt: ID={session.session_id}, Step={session.current_step}")
+        logger.info("[V2] Neue Session erstellt: ID=%s, Step=%s", session.session_id, session.current_step)
         
-        # Start conversation using V2 orchestrator
-        messages = await orchestrator.start_conversation(session.session_id)
+        # Start conversation using V2 orchestrator (precomputed greeting if possible)
+        messages = await orchestrator.start_conversation(session.session_id, session=session)
         
         # Debug output
-        logger.debug(f"[V2] Intro-Nachrichten: {len(messages)} messages generated")
-        for msg in messages:
-            logger.debug(f"  - {msg['sender']}: {msg['text'][:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[V2] Intro-Nachrichten: %d messages generated", len(messages))
+            for msg in messages:
+                logger.debug("  - %s: %.50s...", msg['sender'], msg['text'])
         
         # Return V1-compatible response
-        return {
+        return FastJSONResponse({
             "session_id": session.session_id,
             "messages": messages  # Already in correct format from V2
-        }
+        })
         
+    except SessionUnavailableError as e:
+        logger.error(f"[V2] Neue Session nicht gespeichert: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=SESSION_UNAVAILABLE_DETAIL
+        )
     except Exception as e:
         logger.error(f"[V2] Error in flow_intro: {e}", exc_info=True)
         raise HTTPException(
@@ -136,7 +312,7 @@ async def flow_intro():
         )
 
 
-@app.post("/flow_step")
+@app.post("/flow_step", response_class=FastJSONResponse)
 async def flow_step(req: MessageRequest):
     """
     Process a conversation step - V2 implementation.
@@ -145,34 +321,37 @@ async def flow_step(req: MessageRequest):
     Response format is identical to V1 for frontend compatibility.
     """
     try:
-        # Verify session exists
-        session = session_store.get_or_create(req.session_id)
-        if not session:
-            logger.warning(f"[V2] Session nicht gefunden: {req.session_id}")
-            raise HTTPException(status_code=404, detail="Session not found")
+        # Load the session once for the whole turn (shared stores: from Redis)
+        session = await session_store.load(req.session_id)
         
         # Debug output before processing
-        logger.info(f"[V2] Verarbeite Nachricht - Session ID: {session.session_id}, Step: {session.current_step}")
-        logger.debug(f"[V2] Benutzer-Nachricht: {req.message}")
+        logger.info("[V2] Verarbeite Nachricht - Session ID: %s, Step: %s", session.session_id, session.current_step)
+        logger.debug("[V2] Benutzer-Nachricht: %s", req.message)
         
-        # Process message using V2 orchestrator
-        messages = await orchestrator.handle_message(req.session_id, req.message)
-        
-        # Get updated session state
-        session = session_store.get_or_create(req.session_id)
+        # Process message using V2 orchestrator (updates the session in place
+        # and writes it through to shared stores)
+        messages = await orchestrator.handle_message(req.session_id, req.message, session=session)
         
         # Debug output after processing
-        logger.info(f"[V2] Nachricht verarbeitet - Session ID: {session.session_id}, neuer Step: {session.current_step}")
-        logger.debug(f"[V2] Antwort-Nachrichten: {len(messages)} messages")
-        for msg in messages:
-            logger.debug(f"  - {msg['sender']}: {msg['text'][:50]}...")
+        logger.info("[V2] Nachricht verarbeitet - Session ID: %s, neuer Step: %s", session.session_id, session.current_step)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[V2] Antwort-Nachrichten: %d messages", len(messages))
+            for msg in messages:
+                logger.debug("  - %s: %.50s...", msg['sender'], msg['text'])
         
         # Return V1-compatible response
-        return {
+        return FastJSONResponse({
             "session_id": session.session_id,
             "messages": messages  # Already in correct format from V2
-        }
+        })
         
+    except SessionUnavailableError as e:
+        # Shared store unreachable while loading or saving: the state is unknown
+        logger.error(f"[V2] Session {req.session_id} nicht verfügbar: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=SESSION_UNAVAILABLE_DETAIL
+        )
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -203,6 +382,23 @@ async def v2_health_check():
         }
 
 
+@app.get("/v2/stats")
+async def get_stats(minutes: int = 60):
+    """
+    Traffic aggregates of the last `minutes` minutes, all workers.
+    
+    Entries per FlowStep, unique sessions, symptom match rate,
+    confirmation rate and distance histograms - from the per-minute
+    counters, without scanning logs. Without Redis, or while it cannot be
+    read, only this worker's counts are reported (source "local").
+    """
+    from src.core.analytics import get_analytics
+    
+    if minutes < 1:
+        raise HTTPException(status_code=400, detail="minutes muss mindestens 1 sein")
+    return await get_analytics().get_stats(minutes)
+
+
 @app.get("/v2/session/{session_id}")
 async def get_session_info(session_id: str):
     """
@@ -237,6 +433,143 @@ async def get_flow_debug_info():
             status_code=500,
             detail=f"Fehler beim Abrufen der Flow-Debug-Informationen: {str(e)}"
         )
+
+
+@app.post("/v2/debug/flow/reload")
+async def reload_flow_definition(x_reload_token: Optional[str] = Header(default=None)):
+    """
+    Reload the flow definition of this worker without a restart.
+    
+    Requires FLOW_RELOAD_TOKEN to be set and sent as X-Reload-Token. An
+    invalid definition is rejected and the running FSM stays active.
+    """
+    token = os.getenv("FLOW_RELOAD_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Flow-Reload ist deaktiviert (FLOW_RELOAD_TOKEN fehlt)")
+    if x_reload_token != token:
+        raise HTTPException(status_code=403, detail="Ungültiger Reload-Token")
+    
+    try:
+        return orchestrator.reload_flow_definition(force=True)
+    except V2ConfigurationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": e.message, "errors": e.details.get("errors", [])}
+        )
+
+
+@app.post("/v2/debug/prompts/reload")
+async def reload_prompt_pack(version: Optional[str] = None, x_reload_token: Optional[str] = Header(default=None)):
+    """
+    Switch this worker to another prompt pack version without a restart.
+    
+    Uses the same X-Reload-Token as the flow reload. Without a version the
+    configured (or newest) pack is reloaded.
+    """
+    from src.core.prompt_manager import reload_prompts
+    from src.core.exceptions import PromptError
+    
+    token = os.getenv("FLOW_RELOAD_TOKEN")
+    if not token:
+        raise HTTPException(status_code=404, detail="Reload ist deaktiviert (FLOW_RELOAD_TOKEN fehlt)")
+    if x_reload_token != token:
+        raise HTTPException(status_code=403, detail="Ungültiger Reload-Token")
+    
+    try:
+        return reload_prompts(version=version, force=True)
+    except PromptError as e:
+        raise HTTPException(status_code=422, detail={"message": e.message, **e.details})
+
+
+@app.get("/v2/debug/experiments")
+async def get_experiment_stats():
+    """
+    Per-variant counters of the running prompt experiments (this worker only).
+    
+    Compare completion_rate against latency and token usage per variant.
+    """
+    from src.core.experiments import get_experiments
+    
+    experiments = get_experiments()
+    return {"enabled": experiments.enabled, "experiments": experiments.get_stats()}
+
+
+@app.get("/v2/debug/prompts/tokens")
+async def get_prompt_token_stats():
+    """
+    Rendered token counts per prompt key (this worker only).
+    
+    Also shows how often slot values were truncated to their budget and
+    how often repeated values were expanded only once.
+    """
+    from src.core.token_budget import get_token_budget
+    
+    return get_token_budget().get_stats()
+
+
+@app.get("/v2/debug/feedback")
+async def get_feedback_pipeline_stats():
+    """
+    Counters of the background feedback writer (this worker only).
+    
+    "spilled" records are in the local spill file and are moved to Redis
+    once it is reachable again.
+    """
+    from src.core.feedback_pipeline import get_feedback_pipeline
+    
+    return get_feedback_pipeline().get_metrics()
+
+
+@app.get("/v2/debug/logging")
+async def get_logging_stats():
+    """
+    Log queue depth and dropped records (this worker only).
+    
+    "sampled_out" are DEBUG records skipped by LOG_DEBUG_SAMPLE_RATE,
+    "dropped" are records lost because the log queue was full.
+    """
+    from src.core.logging_config import get_logging_metrics
+    
+    return get_logging_metrics()
+
+
+@app.get("/v2/debug/redis/near-cache")
+async def get_redis_near_cache_stats():
+    """
+    Near cache hit rate and invalidation lag (this worker only).
+    
+    One entry per RedisService with REDIS_NEAR_CACHE enabled. The lag is
+    the time from a write in another worker until this worker evicted the
+    key (includes clock skew between hosts).
+    """
+    from src.services.redis_near_cache import get_near_cache_stats
+    
+    return {"caches": get_near_cache_stats()}
+
+
+@app.get("/v2/debug/trace/{session_id}")
+async def get_session_traces(session_id: str, limit: int = 10, format: str = "tree"):
+    """
+    Get the span trees of the latest turns of a session.
+    
+    Shows where the time of each turn went (classification, transition,
+    handler, agent, GPT/Weaviate/Redis calls). With format=otel the turns
+    are returned as OTLP/JSON export requests.
+    """
+    tracer = get_tracer()
+    if not tracer.enabled:
+        raise HTTPException(status_code=404, detail="Tracing ist deaktiviert (TRACING_ENABLED=false)")
+    
+    turns = tracer.recent(session_id, limit=max(1, limit))
+    if format == "otel":
+        return {"session_id": session_id, "turns": [turn.to_otel() for turn in turns]}
+    
+    return {
+        "session_id": session_id,
+        "turn_count": len(turns),
+        "turns": [turn.to_dict() for turn in turns]
+    }
+
     
 @app.get("/v2/debug/prompts")
 async def get_prompt_debug_info():
@@ -271,7 +604,12 @@ async def get_prompt_debug_info():
             "total_prompts": len(pm.prompts),
             "prompts_by_category": prompts_by_category,
             "greeting_debug": greeting_debug,
-            "all_dog_prompts": [k for k in pm.prompts.keys() if k.startswith("dog.")]
+            "all_dog_prompts": [k for k in pm.prompts.keys() if k.startswith("dog.")],
+            "prompt_pack": {
+                "locale": pm.registry.locale,
+                "version": pm.registry.version,
+                "source": pm.registry.source
+            } if pm.registry else None
         }
     except Exception as e:
         logger.error(f"[V2] Error getting prompt debug info: {e}")
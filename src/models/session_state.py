@@ -1,8 +1,8 @@
 # src/v2/models/session_state.py
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from uuid import uuid4
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from src.models.flow_models import FlowStep, AgentMessage
 
 
@@ -22,6 +22,9 @@ class SessionState(BaseModel):
     """
     Speichert den Zustand einer aktiven Sitzung – inkl. Agentenzustand, aktivem Symptom
     und Detailinformationen pro Symptom (z.B. gestellte Rückfragen, Antworten, Diagnose).
+
+    Zuweisungen an Felder werden als "dirty" markiert, damit ein Write-Behind-Flusher
+    nur geänderte Felder und neue Nachrichten persistieren muss.
     """
     session_id: str = Field(default_factory=lambda: str(uuid4()))
     agent_status: Dict[str, AgentStatus] = Field(default_factory=dict)
@@ -33,14 +36,80 @@ class SessionState(BaseModel):
     feedback: List[str] = Field(default_factory=list)
     messages: List[AgentMessage] = Field(default_factory=list)
     match_distance: Optional[float] = None
+    # Laufende Nummer des letzten Events im Gesprächs-Log (siehe src.core.event_log)
+    event_seq: int = 0
+
+    # Dirty-Tracking (nicht Teil des Modells / der Serialisierung)
+    _dirty_fields: Set[str] = PrivateAttr(default_factory=set)
+    _flushed_message_count: int = PrivateAttr(default=0)
+    _last_flushed_message: Optional[AgentMessage] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dirty_fields.add(name)
+
+    def mark_dirty(self, *fields: str) -> None:
+        """Markiert Felder explizit als geändert (z.B. nach In-Place-Mutation)."""
+        self._dirty_fields.update(fields)
+
+    def take_dirty_fields(self) -> Set[str]:
+        """Gibt die geänderten Felder zurück und setzt die Markierung zurück."""
+        dirty, self._dirty_fields = self._dirty_fields, set()
+        return dirty
+
+    def messages_rewritten(self) -> bool:
+        """
+        True, wenn die Nachrichtenliste seit dem letzten Flush nicht nur erweitert,
+        sondern geleert oder ersetzt wurde.
+        """
+        count = self._flushed_message_count
+        if count == 0:
+            return False
+        if len(self.messages) < count:
+            return True
+        return self.messages[count - 1] is not self._last_flushed_message
+
+    def pending_messages(self) -> List[AgentMessage]:
+        """Nachrichten, die seit dem letzten Flush angehängt wurden."""
+        return self.messages[self._flushed_message_count:]
+
+    def mark_messages_flushed(self, count: int) -> None:
+        """Setzt die Flush-Markierung auf die ersten ``count`` Nachrichten."""
+        self._flushed_message_count = count
+        self._last_flushed_message = self.messages[count - 1] if count else None
 
 
 class SessionStore:
     """
     Einfache In-Memory-Verwaltung mehrerer Sitzungen (z. B. pro Nutzer).
+
+    Optional kann ein Snapshot (siehe src.core.session_snapshot) angehängt werden;
+    Sitzungen daraus werden erst beim ersten Zugriff dekodiert.
     """
+    # True, wenn save() sofort persistiert (geteilter Store über mehrere Prozesse)
+    write_through = False
+
     def __init__(self):
         self.sessions: Dict[str, SessionState] = {}
+        self.snapshot = None
+
+    def attach_snapshot(self, snapshot) -> None:
+        """Hängt einen Snapshot für die verzögerte Wiederherstellung an."""
+        self.snapshot = snapshot
+
+    def session_count(self) -> int:
+        """Anzahl aktiver plus noch nicht wiederhergestellter Sitzungen."""
+        pending = self.snapshot.remaining() if self.snapshot is not None else 0
+        return len(self.sessions) + pending
+
+    def _restore(self, session_id: str) -> Optional[SessionState]:
+        if self.snapshot is None or session_id not in self.snapshot:
+            return None
+        session = self.snapshot.load(session_id)
+        if session is not None:
+            self.sessions[session_id] = session
+        return session
 
     def create_session(self) -> SessionState:
         session = SessionState()
@@ -49,12 +118,23 @@ class SessionStore:
 
     def get_or_create(self, session_id: str) -> SessionState:
         if session_id not in self.sessions:
+            restored = self._restore(session_id)
+            if restored is not None:
+                return restored
             session = SessionState()
             session.session_id = session_id  # Use the provided session_id
             self.sessions[session_id] = session
             return session
         return self.sessions[session_id]
 
+    async def load(self, session_id: str) -> SessionState:
+        """Lädt eine Sitzung für einen Gesprächsschritt (hier: aus dem Speicher)."""
+        return self.get_or_create(session_id)
+
+    async def save(self, session: SessionState) -> None:
+        """Persistiert eine Sitzung nach einem Gesprächsschritt (hier: nichts zu tun)."""
+        pass
+
 
 # Globale Session-Verwaltung aktivieren (z. B. Zugriff über sessions["debug"])
 sessions = SessionStore()
@@ -8,6 +8,7 @@ from . import generation_prompts
 from . import query_prompts
 from . import validation_prompts
 from . import common_prompts
+from . import variant_prompts
 
 __all__ = [
     'dog_prompts',
@@ -15,5 +16,6 @@ __all__ = [
     'generation_prompts',
     'query_prompts',
     'validation_prompts',
-    'common_prompts'
+    'common_prompts',
+    'variant_prompts'
 ]
\ No newline at end of file
@@ -26,7 +26,8 @@ YES_PATTERNS = [
     "jup",
     "jawohl",
     "auf jeden fall",
-    "sehr gerne"
+    "sehr gerne",
+    "yes"
 ]
 
 # Patterns to detect negative responses
@@ -42,7 +43,8 @@ NO_PATTERNS = [
     "nö",
     "lass mal",
     "kein interesse",
-    "vielleicht später"
+    "vielleicht später",
+    "no"
 ]
 
 # ============================================================================
@@ -88,18 +90,18 @@ CHECKMARK_EMOJI = "✅"
 
 def is_yes_response(text: str) -> bool:
     """Check if text contains a positive response."""
-    text_lower = text.lower().strip()
-    return any(pattern in text_lower for pattern in YES_PATTERNS)
+    from src.core.intent_classifier import get_intent_classifier, Intent
+    return get_intent_classifier().classify_yes_no(text) == Intent.YES
 
 def is_no_response(text: str) -> bool:
     """Check if text contains a negative response."""
-    text_lower = text.lower().strip()
-    return any(pattern in text_lower for pattern in NO_PATTERNS)
+    from src.core.intent_classifier import get_intent_classifier, Intent
+    return get_intent_classifier().classify_yes_no(text) == Intent.NO
 
 def is_restart_command(text: str) -> bool:
-    """Check if text contains a restart command."""
-    text_lower = text.lower().strip()
-    return any(command in text_lower for command in RESTART_COMMANDS)
+    """Check if text is a restart command."""
+    from src.core.intent_classifier import get_intent_classifier
+    return get_intent_classifier().is_restart(text)
 
 def normalize_user_input(text: str) -> str:
     """Normalize user input for consistent processing."""
@@ -19,10 +19,10 @@ Hier ist die Beschreibung aus der Datenbank:
 {match}
 
 AUFGABE: Gib die obige Beschreibung aus der Hundeperspektive wieder. 
-- Verwende hauptsächlich den Inhalt von {match}
+- Verwende hauptsächlich den Inhalt der Beschreibung oben
 - Passe nur minimal an: Ich-Form, einfache Sprache
 - Füge NICHTS Neues hinzu, bleibe bei den Fakten aus der Datenbank
-- Strukturiere: Erst allgemeiner Eindruck, dann Details aus {match}
+- Strukturiere: Erst allgemeiner Eindruck, dann Details aus der Beschreibung
 
 3-5 Sätze. Keine Fantasie, nur die Inhalte aus der Datenbank umformulieren.
 """
@@ -44,7 +44,7 @@ Sexual: {sexual}
 
 AUFGABE: Erkläre aus Hundesicht, welcher Instinkt hier aktiv ist.
 - Nutze NUR die Inhalte aus den Weaviate-Beschreibungen oben
-- Identifiziere den passenden Instinkt basierend auf {symptom} und {context}
+- Identifiziere den passenden Instinkt basierend auf Verhalten und Kontext
 - Formuliere in Ich-Form um: "Bei mir ist das so, wenn..."
 - Verwende die konkreten Beispiele aus den Instinktbeschreibungen
 - KEINE eigenen Interpretationen hinzufügen
@@ -70,7 +70,7 @@ Identifizierter Instinkt: {instinct}
 {exercise_from_weaviate}
 
 AUFGABE: Gib die Übung aus Weaviate wieder.
-- Verwende NUR den Inhalt von {exercise_from_weaviate}
+- Verwende NUR den Inhalt der Übung oben
 - Formatiere für bessere Lesbarkeit (Nummerierung, Absätze)
 - KEINE eigenen Übungen erfinden
 - KEINE Hundeperspektive - dies sind Anweisungen für den Menschen
@@ -0,0 +1,35 @@
+# src/v2/prompts/variant_prompts.py
+"""
+A/B variants of prompts for WuffChat V2.
+
+Each variant is registered as "<prompt key>@<variant>" and only used while
+an experiment for the prompt is configured (PROMPT_EXPERIMENTS, see
+src/core/experiments.py). Variants may only use the variables of the
+prompt they replace.
+"""
+
+# ============================================================================
+# DOG PERSPECTIVE GENERATION
+# ============================================================================
+
+# Shorter instruction with the database text only once - fewer prompt tokens
+DOG_PERSPECTIVE_SHORT_TEMPLATE = """
+Verhalten: '{symptom}'
+
+Beschreibung aus der Datenbank:
+{match}
+
+Gib diese Beschreibung in 3-5 Sätzen aus meiner Sicht als Hund wieder: Ich-Form,
+einfache Sprache, nur die Fakten aus der Beschreibung, nichts hinzufügen.
+"""
+
+# ============================================================================
+# VARIANT REGISTRY
+# ============================================================================
+
+# Prompt key -> {variant name: template}
+PROMPT_VARIANTS = {
+    "generation.dog_perspective": {
+        "short": DOG_PERSPECTIVE_SHORT_TEMPLATE,
+    },
+}
@@ -10,6 +10,7 @@ Clean, async-only wrapper around OpenAI API with:
 - Testable design
 """
 import os
+import time
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 import logging
@@ -17,6 +18,8 @@ from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
 from src.core.service_base import BaseService, ServiceConfig
+from src.core.tracing import traced
+from src.core.experiments import record_generation
 from src.core.exceptions import (
     GPTServiceError, 
     ConfigurationError,
@@ -86,6 +89,9 @@ class GPTService(BaseService[GPTConfig]):
             max_retries=self.config.max_retries
         )
     
+    @traced("gpt.complete", lambda self, *args, **kwargs: {
+        "model": kwargs.get("model") or self.config.model
+    })
     async def complete(
         self,
         prompt: str,
@@ -142,7 +148,9 @@ class GPTService(BaseService[GPTConfig]):
         try:
             self.logger.debug(f"Generating completion with model {params['model']}")
             
+            started = time.perf_counter()
             response: ChatCompletion = await self.client.chat.completions.create(**params)
+            self._record_usage(response, (time.perf_counter() - started) * 1000)
             
             if not response.choices:
                 raise GPTServiceError(
@@ -173,6 +181,18 @@ class GPTService(BaseService[GPTConfig]):
                 original_error=e
             )
     
+    @staticmethod
+    def _record_usage(response: ChatCompletion, latency_ms: float) -> None:
+        """Report latency and token usage to running prompt experiments"""
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0)
+        completion_tokens = getattr(usage, "completion_tokens", 0)
+        record_generation(
+            latency_ms,
+            prompt_tokens if isinstance(prompt_tokens, int) else 0,
+            completion_tokens if isinstance(completion_tokens, int) else 0
+        )
+    
     async def complete_structured(
         self,
         prompt: str,
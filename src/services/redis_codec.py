@@ -0,0 +1,207 @@
+# src/v2/services/redis_codec.py
+"""
+Value codecs for RedisService.
+
+A codec turns the non-string values of get/set/mget/mset into what is
+stored in Redis and back:
+
+- json:    stdlib JSON text without a tag - the format every stored value
+           had before codecs existed (default)
+- orjson:  the same JSON, written and parsed by orjson
+- msgpack: MessagePack, smaller and faster for large session objects
+
+Every value written by orjson or msgpack starts with a format tag byte, and
+values of at least ``compress_threshold`` bytes are zstd compressed (the
+tag then has the compression bit set). Decoding looks at the tag, not at
+the configured codec, so untagged JSON written by older workers - or by a
+worker with another codec - stays readable and a codec can be switched
+at any time. Only the libraries of the formats actually read are needed.
+
+Tagged values are binary. The Redis client keeps ``decode_responses`` and
+always decodes with ``surrogateescape`` - whatever codec the process
+writes with - which turns any byte sequence into a string and back
+without loss (see ``RedisCodec.binary``).
+
+Configuration:
+    REDIS_CODEC               json | orjson | msgpack (default json)
+    REDIS_COMPRESS_THRESHOLD  zstd-compress values from this size in bytes (default 0 = never)
+"""
+
+import os
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.core.exceptions import V2ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+# Format tags: control characters no stored JSON value or text starts with
+TAG_JSON = 0x01
+TAG_MSGPACK = 0x02
+FLAG_ZSTD = 0x80
+
+CODECS = ("json", "orjson", "msgpack")
+
+_TAGS = {TAG_JSON, TAG_MSGPACK, TAG_JSON | FLAG_ZSTD, TAG_MSGPACK | FLAG_ZSTD}
+# First character of a tagged value read with surrogateescape (bytes >= 0x80 become U+DC80...)
+_TAG_CHARS = frozenset(chr(tag) if tag < 0x80 else chr(0xDC00 + tag) for tag in _TAGS)
+_JSON_TAG_CHAR = chr(TAG_JSON)
+_ZSTD_LEVEL = 3
+
+
+def _require(module: str, purpose: str):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise V2ConfigurationError(f"{purpose} requires {module} (pip install {module})", component="redis_codec")
+
+
+def _orjson_functions() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    orjson = _require("orjson", "The orjson Redis codec")
+    option = orjson.OPT_NON_STR_KEYS
+    return (lambda value: orjson.dumps(value, option=option)), orjson.loads
+
+
+def _json_functions() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    """orjson when installed, else stdlib json (for reading tagged JSON)"""
+    try:
+        return _orjson_functions()
+    except V2ConfigurationError:
+        return (lambda value: json.dumps(value, ensure_ascii=False).encode("utf-8")), json.loads
+
+
+def _msgpack_functions() -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    msgpack = _require("msgpack", "The msgpack Redis codec")
+    return (
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+    )
+
+
+class RedisCodec:
+    """
+    Encodes values for Redis and decodes stored values of any format.
+
+    Usage:
+        codec = RedisCodec("msgpack", compress_threshold=4096)
+        stored = codec.encode({"a": 1})
+        codec.decode(stored)
+    """
+
+    def __init__(self, name: str = "json", compress_threshold: int = 0):
+        """
+        Initialize the codec.
+
+        Args:
+            name: json, orjson or msgpack
+            compress_threshold: zstd-compress encoded values from this size
+                in bytes, 0 disables compression (only for orjson/msgpack)
+
+        Raises:
+            V2ConfigurationError: If the codec is unknown or its library is missing
+        """
+        if name not in CODECS:
+            raise V2ConfigurationError(
+                f"Unknown Redis codec '{name}', expected one of: {', '.join(CODECS)}",
+                component="redis_codec"
+            )
+        if compress_threshold and name == "json":
+            raise V2ConfigurationError(
+                "REDIS_COMPRESS_THRESHOLD needs a tagged codec (REDIS_CODEC=orjson or msgpack)",
+                component="redis_codec"
+            )
+
+        self.name = name
+        self.compress_threshold = compress_threshold
+        self._dumps: Optional[Callable[[Any], bytes]] = None
+        self._tag = 0
+        if name == "orjson":
+            self._dumps = _orjson_functions()[0]
+            self._tag = TAG_JSON
+        elif name == "msgpack":
+            self._dumps = _msgpack_functions()[0]
+            self._tag = TAG_MSGPACK
+
+        self._compressor = None
+        if compress_threshold:
+            zstandard = _require("zstandard", "REDIS_COMPRESS_THRESHOLD")
+            self._compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+
+        # Decoders by format tag, created when a format is first read
+        self._loads: Dict[int, Callable[[bytes], Any]] = {}
+        self._decompressor = None
+
+    @property
+    def binary(self) -> bool:
+        """Whether values are written tagged, i.e. as bytes that need not be UTF-8"""
+        return self._dumps is not None
+
+    def encode(self, value: Any) -> Union[str, bytes]:
+        """
+        Encode a non-string value for storage.
+
+        Strings and bytes are stored unchanged, like before codecs existed.
+        """
+        if isinstance(value, (str, bytes)):
+            return value
+        if self._dumps is None:
+            return json.dumps(value)
+
+        tag = self._tag
+        data = self._dumps(value)
+        if self._compressor is not None and len(data) >= self.compress_threshold:
+            data = self._compressor.compress(data)
+            tag |= FLAG_ZSTD
+        return bytes((tag,)) + data
+
+    def decode(self, value: Any) -> Any:
+        """
+        Decode a stored value of any format.
+
+        Tagged values are decoded by their tag; untagged values are parsed
+        as JSON if possible and otherwise returned unchanged (plain strings).
+        """
+        if isinstance(value, str):
+            if value and value[0] in _TAG_CHARS:
+                if value[0] == _JSON_TAG_CHAR:
+                    # Uncompressed JSON is valid UTF-8: parse the str as it is
+                    return self._loader(TAG_JSON)(value[1:])
+                return self._decode_tagged(value.encode("utf-8", "surrogateescape"))
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return value
+        if isinstance(value, bytes) and value:
+            if value[0] in _TAGS:
+                return self._decode_tagged(value)
+            try:
+                return json.loads(value)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return value
+        return value
+
+    def _decode_tagged(self, data: bytes) -> Any:
+        tag = data[0]
+        payload = data[1:]
+        if tag & FLAG_ZSTD:
+            if self._decompressor is None:
+                self._decompressor = _require("zstandard", "Reading compressed Redis values").ZstdDecompressor()
+            payload = self._decompressor.decompressobj().decompress(payload)
+            tag &= ~FLAG_ZSTD
+
+        return self._loader(tag)(payload)
+
+    def _loader(self, tag: int) -> Callable[[Any], Any]:
+        loads = self._loads.get(tag)
+        if loads is None:
+            loads = self._loads[tag] = (_json_functions() if tag == TAG_JSON else _msgpack_functions())[1]
+        return loads
+
+
+def get_redis_codec() -> RedisCodec:
+    """Create the codec configured by REDIS_CODEC and REDIS_COMPRESS_THRESHOLD"""
+    return RedisCodec(
+        os.getenv("REDIS_CODEC", "json").strip().lower() or "json",
+        int(os.getenv("REDIS_COMPRESS_THRESHOLD", "0"))
+    )
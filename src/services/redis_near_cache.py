@@ -0,0 +1,276 @@
+# src/v2/services/redis_near_cache.py
+"""
+Near cache for hot Redis keys.
+
+Keeps recently read string values in process memory so repeated reads of
+the same keys within a turn (and across turns) skip the round trip:
+
+- A bounded LRU of the raw stored values; every hit is decoded again, so
+  callers never share (and mutate) a cached object.
+- Entries live at most ``ttl`` seconds, which bounds staleness for writes
+  that do not go through RedisService (expiry, other tools).
+- Writes through RedisService evict the key locally and PUBLISH it on an
+  invalidation channel that every worker subscribes to, so the other
+  workers evict it as well.
+- While the subscription is down the cache is bypassed and cleared, so a
+  worker never serves values it might have missed invalidations for.
+- A read that raced with an invalidation is not cached.
+
+RESP3 client-side caching (CLIENT TRACKING) would make the server send the
+invalidations, but redis.asyncio does not support it, so this is the
+pub/sub variant of the same protocol.
+
+Configuration (see RedisConfig):
+    REDIS_NEAR_CACHE           1 to enable (default off)
+    REDIS_NEAR_CACHE_SIZE      max cached keys per worker (default 1024)
+    REDIS_NEAR_CACHE_TTL       seconds an entry may be served (default 5)
+    REDIS_NEAR_CACHE_PREFIXES  comma-separated key prefixes to cache (default all keys)
+"""
+
+import json
+import time
+import uuid
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "wuffchat:near-cache:invalidate"
+RESUBSCRIBE_DELAY = 1.0
+
+# Returned by NearCache.get() on a miss (None is a valid cached value)
+MISS = object()
+
+# Live caches of this process, for the debug endpoint
+_caches: "weakref.WeakSet[NearCache]" = weakref.WeakSet()
+
+
+class NearCache:
+    """
+    Process-local LRU of Redis values, kept coherent by pub/sub invalidation.
+
+    Usage:
+        cache = NearCache(max_entries=1024, ttl=5.0)
+        await cache.start(client)
+        value = cache.get(key)
+        if value is MISS:
+            epoch = cache.epoch
+            value = await client.get(key)
+            cache.put(key, value, epoch)
+        ...
+        await cache.invalidate(client, [key])    # after a write
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 5.0,
+        prefixes: Tuple[str, ...] = (),
+        channel: str = DEFAULT_CHANNEL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefixes = tuple(prefixes)
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = False
+
+        # Incremented by every invalidation; a read started before an
+        # invalidation must not populate the cache
+        self.epoch = 0
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._local_invalidations = 0
+        self._remote_invalidations = 0
+        self._remote_messages = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._lag_last = 0.0
+        self._publish_failures = 0
+
+        _caches.add(self)
+
+    # ===========================================
+    # READS
+    # ===========================================
+
+    def cacheable(self, key: str) -> bool:
+        return self._subscribed and (not self.prefixes or key.startswith(self.prefixes))
+
+    def get(self, key: str) -> Any:
+        """Raw cached value of key, or MISS"""
+        if not self.cacheable(key):
+            return MISS
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return MISS
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any, epoch: int) -> None:
+        """
+        Cache a raw value read from Redis.
+
+        Args:
+            key: Redis key
+            value: Value as returned by the client (None for a missing key)
+            epoch: ``self.epoch`` from before the read was sent
+        """
+        if epoch != self.epoch or not self.cacheable(key):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    # ===========================================
+    # INVALIDATION
+    # ===========================================
+
+    def evict(self, keys: Iterable[str]) -> None:
+        """Drop keys from this worker's cache"""
+        self.epoch += 1
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+
+    async def invalidate(self, client: Any, keys: List[str]) -> None:
+        """
+        Evict keys written by this worker here and in all other workers.
+
+        Args:
+            client: Redis client to publish with
+            keys: Keys that were written
+        """
+        keys = [key for key in keys if not self.prefixes or key.startswith(self.prefixes)]
+        if not keys:
+            return
+        self.evict(keys)
+        self._local_invalidations += len(keys)
+        message = json.dumps({"origin": self.origin, "ts": time.time(), "keys": keys})
+        try:
+            await client.publish(self.channel, message)
+        except Exception as e:
+            # Other workers may now serve the old value until their entry expires
+            self._publish_failures += 1
+            logger.warning(f"Near cache invalidation of {len(keys)} keys not published: {e}")
+
+    def _on_message(self, data: Any) -> None:
+        try:
+            message = json.loads(data)
+            keys = message["keys"]
+        except (TypeError, ValueError, KeyError):
+            logger.warning(f"Ignoring malformed near cache invalidation: {data!r:.100}")
+            return
+        if message.get("origin") == self.origin:
+            return  # evicted when it was written
+        self.evict(keys)
+        self._remote_invalidations += len(keys)
+        self._remote_messages += 1
+        lag = max(0.0, time.time() - message.get("ts", time.time()))
+        self._lag_total += lag
+        self._lag_last = lag
+        self._lag_max = max(self._lag_max, lag)
+
+    # ===========================================
+    # SUBSCRIPTION
+    # ===========================================
+
+    async def start(self, client: Any) -> None:
+        """Subscribe to invalidations; the cache serves reads once subscribed"""
+        if self._task is not None:
+            return
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._subscribed = True
+        self._task = asyncio.create_task(self._listen())
+        logger.info(f"Near cache enabled ({self.max_entries} keys, ttl {self.ttl}s)")
+
+    async def stop(self) -> None:
+        """Unsubscribe and drop all entries"""
+        self._subscribed = False
+        self.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing near cache subscription: {e}")
+            self._pubsub = None
+
+    async def _listen(self) -> None:
+        """Apply invalidations of other workers; bypass the cache while disconnected"""
+        while True:
+            try:
+                if not self._subscribed:
+                    await self._pubsub.subscribe(self.channel)
+                    self.clear()  # reads sent during the outage may be stale
+                    self._subscribed = True
+                    logger.info("Near cache resubscribed to invalidations")
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is not None and message.get("type") == "message":
+                    self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._subscribed:
+                    logger.warning(f"Near cache lost its invalidation subscription, bypassing cache: {e}")
+                self._subscribed = False
+                self.clear()
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    # ===========================================
+    # METRICS
+    # ===========================================
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit rate and invalidation lag for monitoring"""
+        reads = self._hits + self._misses
+        return {
+            "active": self._subscribed,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / reads, 4) if reads else 0.0,
+            "evictions": self._evictions,
+            "local_invalidations": self._local_invalidations,
+            "remote_invalidations": self._remote_invalidations,
+            "publish_failures": self._publish_failures,
+            "invalidation_lag_ms": {
+                "avg": round(self._lag_total / self._remote_messages * 1000, 2)
+                if self._remote_messages else 0.0,
+                "max": round(self._lag_max * 1000, 2),
+                "last": round(self._lag_last * 1000, 2),
+            },
+        }
+
+
+def get_near_cache_stats() -> List[Dict[str, Any]]:
+    """Metrics of every near cache of this process"""
+    return [cache.get_metrics() for cache in list(_caches)]
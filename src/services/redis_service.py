@@ -4,19 +4,29 @@ Redis Service for WuffChat V2.
 
 Clean, async-only wrapper around Redis with:
 - Flexible configuration for multiple Redis providers
-- Automatic JSON serialization/deserialization
+- Automatic serialization/deserialization (JSON, orjson or msgpack, see redis_codec)
 - TTL support
+- Non-blocking key iteration (SCAN instead of KEYS)
+- Pipelines and MULTI/EXEC transactions (one round trip for many commands)
+- Optional near cache for hot keys (see redis_near_cache)
 - Proper error handling
+- Circuit breaker with background reconnection (fail fast while Redis is down)
 - Health checks
 """
 import os
 import json
+import asyncio
 import redis.asyncio as redis
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, AsyncIterator, Tuple, Callable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 import logging
 
 from src.core.service_base import BaseService, ServiceConfig
+from src.core.tracing import traced
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+from src.services.redis_codec import RedisCodec
+from src.services.redis_near_cache import MISS, NearCache
 from src.core.exceptions import (
     RedisServiceError,
     ConfigurationError,
@@ -32,9 +42,196 @@ class RedisConfig(ServiceConfig):
     url: Optional[str] = None
     decode_responses: bool = True
     socket_timeout: float = 5.0
-    max_connections: int = 10
+    max_connections: int = 10  # connection pool size per process
+    pool_timeout: float = 2.0  # seconds to wait for a free pooled connection
     retry_on_timeout: bool = True
     health_check_interval: int = 30
+    scan_count: int = 500  # COUNT hint per SCAN call (keys examined, not returned)
+    codec: str = "json"  # json | orjson | msgpack
+    compress_threshold: int = 0  # zstd-compress values from this size (bytes), 0 = never
+    near_cache: bool = False  # serve hot GETs from process memory
+    near_cache_size: int = 1024
+    near_cache_ttl: float = 5.0
+    near_cache_prefixes: Tuple[str, ...] = ()  # empty = all keys
+    breaker_failures: int = 5  # consecutive connection failures that open the circuit
+    breaker_reset_timeout: float = 5.0  # seconds until the first reconnection attempt
+    breaker_max_reset_timeout: float = 60.0  # backoff cap between reconnection attempts
+
+
+# Failures that say nothing about the connection (e.g. WRONGTYPE) do not count
+_CONNECTION_ERRORS = (redis.ConnectionError, redis.TimeoutError, asyncio.TimeoutError, OSError)
+
+# Seconds between reconnection checks while a trial call is in flight
+RECONNECT_POLL_INTERVAL = 0.1
+
+
+def _decode_json(value: Any) -> Any:
+    """JSON-decode a stored string, or return it unchanged if it is not JSON"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return value
+
+
+def _encode_json(value: Any) -> Any:
+    """Serialize non-string values as JSON"""
+    return value if isinstance(value, (str, bytes)) else json.dumps(value)
+
+
+def _raw(value: Any) -> Any:
+    return value
+
+
+_JSON_CODEC = RedisCodec()
+
+
+class RedisPipeline:
+    """
+    Typed Redis commands queued for one round trip.
+    
+    Every command method queues the command and returns the index of its
+    result in ``results``, which is filled by execute(). Values are
+    (de)serialized like in the RedisService methods of the same name: string
+    values with the service's codec, hash fields and list items as JSON.
+    
+    Usage:
+        async with redis_service.pipeline() as pipe:
+            pipe.set("a", {"x": 1}, ttl=60)
+            count = pipe.incr("counter")
+        pipe.results[count]
+    """
+    
+    def __init__(self, pipe: Any, transaction: bool = False, codec: Optional[RedisCodec] = None):
+        self._pipe = pipe
+        self.transaction = transaction
+        self.codec = codec or _JSON_CODEC
+        self._decoders: List[Callable[[Any], Any]] = []
+        self.results: List[Any] = []
+        self.written: List[str] = []  # string keys changed, for near cache invalidation
+    
+    def __len__(self) -> int:
+        return len(self._decoders)
+    
+    def _queue(self, decoder: Callable[[Any], Any] = _raw) -> int:
+        self._decoders.append(decoder)
+        return len(self._decoders) - 1
+    
+    # === Strings ===
+    
+    def get(self, key: str, deserialize_json: bool = True) -> int:
+        self._pipe.get(key)
+        return self._queue(self.codec.decode if deserialize_json else _raw)
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, serialize_json: bool = True) -> int:
+        self._pipe.set(key, self.codec.encode(value) if serialize_json else value, ex=ttl or None)
+        self.written.append(key)
+        return self._queue()
+    
+    def mget(self, keys: List[str]) -> int:
+        self._pipe.mget(keys)
+        decode = self.codec.decode
+        return self._queue(lambda values: [None if v is None else decode(v) for v in values])
+    
+    def mset(self, mapping: Dict[str, Any]) -> int:
+        self._pipe.mset({key: self.codec.encode(value) for key, value in mapping.items()})
+        self.written.extend(mapping)
+        return self._queue()
+    
+    def incr(self, key: str, amount: int = 1) -> int:
+        self._pipe.incrby(key, amount)
+        self.written.append(key)
+        return self._queue()
+    
+    # === Keys ===
+    
+    def delete(self, *keys: str) -> int:
+        self._pipe.delete(*keys)
+        self.written.extend(keys)
+        return self._queue()
+    
+    def unlink(self, *keys: str) -> int:
+        self._pipe.unlink(*keys)
+        self.written.extend(keys)
+        return self._queue()
+    
+    def exists(self, *keys: str) -> int:
+        self._pipe.exists(*keys)
+        return self._queue()
+    
+    def expire(self, key: str, seconds: int) -> int:
+        self._pipe.expire(key, seconds)
+        return self._queue()
+    
+    def ttl(self, key: str) -> int:
+        self._pipe.ttl(key)
+        return self._queue()
+    
+    # === Hashes, HyperLogLogs, lists, streams ===
+    
+    def hset(self, key: str, mapping: Dict[str, Any]) -> int:
+        self._pipe.hset(key, mapping={field: _encode_json(value) for field, value in mapping.items()})
+        return self._queue()
+    
+    def hgetall(self, key: str, deserialize_json: bool = True) -> int:
+        self._pipe.hgetall(key)
+        if deserialize_json:
+            return self._queue(lambda fields: {name: _decode_json(value) for name, value in fields.items()})
+        return self._queue()
+    
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        self._pipe.hincrby(key, field, amount)
+        return self._queue()
+    
+    def pfadd(self, key: str, *values: str) -> int:
+        self._pipe.pfadd(key, *values)
+        return self._queue()
+    
+    def pfcount(self, *keys: str) -> int:
+        self._pipe.pfcount(*keys)
+        return self._queue()
+    
+    def rpush(self, key: str, *values: Any) -> int:
+        self._pipe.rpush(key, *(_encode_json(value) for value in values))
+        return self._queue()
+    
+    def lrange(self, key: str, start: int = 0, end: int = -1, deserialize_json: bool = True) -> int:
+        self._pipe.lrange(key, start, end)
+        if deserialize_json:
+            return self._queue(lambda values: [_decode_json(value) for value in values])
+        return self._queue()
+    
+    def xadd(self, stream: str, fields: Dict[str, Any], maxlen: Optional[int] = None) -> int:
+        self._pipe.xadd(stream, fields, maxlen=maxlen, approximate=True)
+        return self._queue()
+    
+    # === Execution ===
+    
+    @traced("redis.pipeline", lambda self: {"commands": len(self), "transaction": self.transaction})
+    async def execute(self) -> List[Any]:
+        """
+        Send all queued commands in one round trip.
+        
+        Returns:
+            Decoded results, in the order the commands were queued
+            
+        Raises:
+            RedisServiceError: If the round trip or a command fails
+        """
+        if not self._decoders:
+            return []
+        try:
+            raw = await self._pipe.execute()
+        except Exception as e:
+            raise RedisServiceError(
+                message=f"Redis pipeline of {len(self)} commands failed: {e}",
+                operation="multi/exec" if self.transaction else "pipeline"
+            ) from e
+        finally:
+            decoders, self._decoders = self._decoders, []
+        self.results = [decode(value) for decode, value in zip(decoders, raw)]
+        return self.results
 
 
 class RedisService(BaseService[RedisConfig]):
@@ -42,7 +239,7 @@ class RedisService(BaseService[RedisConfig]):
     Async-only Redis service for caching and storage.
     
     Provides a clean interface for Redis operations with automatic
-    JSON serialization and proper error handling.
+    serialization (see RedisCodec) and proper error handling.
     """
     
     def __init__(self, config: Optional[RedisConfig] = None):
@@ -59,11 +256,44 @@ class RedisService(BaseService[RedisConfig]):
             config = RedisConfig(
                 url=self._get_redis_url(),
                 decode_responses=True,
-                socket_timeout=5.0
+                socket_timeout=5.0,
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "10")),
+                pool_timeout=float(os.getenv("REDIS_POOL_TIMEOUT", "2.0")),
+                scan_count=int(os.getenv("REDIS_SCAN_COUNT", "500")),
+                codec=os.getenv("REDIS_CODEC", "json").strip().lower() or "json",
+                compress_threshold=int(os.getenv("REDIS_COMPRESS_THRESHOLD", "0")),
+                near_cache=os.getenv("REDIS_NEAR_CACHE", "0").lower() in ("1", "true", "yes"),
+                near_cache_size=int(os.getenv("REDIS_NEAR_CACHE_SIZE", "1024")),
+                near_cache_ttl=float(os.getenv("REDIS_NEAR_CACHE_TTL", "5")),
+                near_cache_prefixes=tuple(
+                    prefix.strip() for prefix in os.getenv("REDIS_NEAR_CACHE_PREFIXES", "").split(",") if prefix.strip()
+                ),
+                breaker_failures=int(os.getenv("REDIS_BREAKER_FAILURES", "5")),
+                breaker_reset_timeout=float(os.getenv("REDIS_BREAKER_RESET_TIMEOUT", "5.0")),
+                breaker_max_reset_timeout=float(os.getenv("REDIS_BREAKER_MAX_RESET_TIMEOUT", "60.0"))
             )
         
         super().__init__(config, logger)
         self._url_source = None  # Track which env var was used
+        self.codec = self._create_codec()
+        self.near_cache: Optional[NearCache] = None
+        if config.near_cache:
+            self.near_cache = NearCache(config.near_cache_size, config.near_cache_ttl, config.near_cache_prefixes)
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=config.breaker_failures,
+            reset_timeout=config.breaker_reset_timeout,
+            max_reset_timeout=config.breaker_max_reset_timeout
+        )
+        self._reconnect_task: Optional[asyncio.Task] = None
+    
+    def _create_codec(self) -> RedisCodec:
+        """Codec for values; falls back to JSON, which every worker can read"""
+        try:
+            return RedisCodec(self.config.codec, self.config.compress_threshold)
+        except ConfigurationError as e:
+            self.logger.error(f"Invalid Redis codec configuration, using json: {e}")
+            return _JSON_CODEC
     
     def _get_redis_url(self) -> Optional[str]:
         """
@@ -105,30 +335,89 @@ class RedisService(BaseService[RedisConfig]):
             return None
         
         try:
-            # Create async Redis client
-            client = redis.from_url(
+            # Pool of at most max_connections; callers wait up to pool_timeout
+            # for a free connection instead of failing. Values tagged by any
+            # worker's codec may be binary, even if this one writes JSON:
+            # surrogateescape decodes any bytes to str without loss
+            pool = redis.BlockingConnectionPool.from_url(
                 self.config.url,
+                max_connections=self.config.max_connections,
+                timeout=self.config.pool_timeout,
                 decode_responses=self.config.decode_responses,
+                encoding_errors="surrogateescape",
                 socket_timeout=self.config.socket_timeout,
-                max_connections=self.config.max_connections,
+                socket_connect_timeout=self.config.socket_timeout,
                 retry_on_timeout=self.config.retry_on_timeout,
                 health_check_interval=self.config.health_check_interval
             )
-            
+            client = redis.Redis.from_pool(pool)
+        except Exception as e:
+            self.logger.error(f"Invalid Redis configuration, Redis disabled: {e}")
+            return None
+        
+        try:
             # Test connection
             await client.ping()
             self.logger.info("Redis connection successful")
-            
-            return client
-            
+            await self._start_near_cache(client)
         except Exception as e:
-            error_msg = f"Failed to connect to Redis: {str(e)}"
-            self.logger.error(error_msg)
-            
-            # Don't fail initialization - Redis is optional
-            self.logger.warning("Redis functionality disabled due to connection error")
-            return None
+            # Don't fail initialization - Redis is optional. Calls fail fast
+            # until the background reconnection reaches Redis
+            self.logger.error(f"Failed to connect to Redis, reconnecting in the background: {e}")
+            self.breaker.trip(e)
+            self._start_reconnect(client)
+        
+        return client
+    
+    async def _start_near_cache(self, client: redis.Redis) -> None:
+        if self.near_cache is None:
+            return
+        try:
+            await self.near_cache.start(client)
+        except Exception as e:
+            # Without invalidations the cache stays bypassed
+            self.logger.warning(f"Near cache disabled, subscribing to invalidations failed: {e}")
     
+    # === Circuit breaker ===
+    
+    def _usable(self) -> bool:
+        """Whether a command may be sent now (False: fail fast)"""
+        return self._client is not None and self.breaker.allow()
+    
+    def _succeeded(self) -> None:
+        self.breaker.record_success()
+    
+    def _failed(self, error: BaseException) -> None:
+        """Count a connection failure; open circuits reconnect in the background"""
+        if not isinstance(error, _CONNECTION_ERRORS):
+            # Redis answered - the connection is fine
+            self.breaker.record_success()
+            return
+        self.breaker.record_failure(error)
+        if self.breaker.state is CircuitState.OPEN:
+            self._start_reconnect(self._client)
+    
+    def _start_reconnect(self, client: Optional[redis.Redis]) -> None:
+        if client is None or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = asyncio.create_task(self._reconnect(client))
+    
+    async def _reconnect(self, client: redis.Redis) -> None:
+        """Probe Redis with PING whenever the circuit lets a trial call through"""
+        while self.breaker.state is not CircuitState.CLOSED:
+            # retry_in() is 0 while another trial call is still in flight
+            await asyncio.sleep(max(self.breaker.retry_in(), RECONNECT_POLL_INTERVAL))
+            if not self.breaker.allow():
+                continue
+            try:
+                await client.ping()
+            except Exception as e:
+                self.breaker.record_failure(e)
+                continue
+            self.breaker.record_success()
+            await self._start_near_cache(client)
+    
+    @traced("redis.get")
     async def get(
         self, 
         key: str, 
@@ -141,34 +430,32 @@ class RedisService(BaseService[RedisConfig]):
         Args:
             key: The key to retrieve
             default: Default value if key doesn't exist
-            deserialize_json: Whether to deserialize JSON strings
+            deserialize_json: Whether to deserialize stored values
             
         Returns:
             The stored value or default
         """
-        if not self._client:
+        if not self._usable():
             return default
         
         try:
-            value = await self._client.get(key)
+            value = await self._read(key)
             
             if value is None:
                 return default
             
-            # Try to deserialize JSON if requested
-            if deserialize_json and isinstance(value, str):
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    # Not JSON, return as string
-                    pass
+            # Deserialize if requested (plain strings are returned as they are)
+            if deserialize_json:
+                return self.codec.decode(value)
             
             return value
             
         except Exception as e:
+            self._failed(e)
             self.logger.warning(f"Redis get failed for key '{key}': {e}")
             return default
     
+    @traced("redis.set")
     async def set(
         self,
         key: str,
@@ -183,18 +470,18 @@ class RedisService(BaseService[RedisConfig]):
             key: The key to set
             value: The value to store
             ttl: Time to live in seconds
-            serialize_json: Whether to serialize non-string values as JSON
+            serialize_json: Whether to serialize non-string values with the codec
             
         Returns:
             True if successful, False otherwise
         """
-        if not self._client:
+        if not self._usable():
             return False
         
         try:
             # Serialize value if needed
-            if serialize_json and not isinstance(value, (str, bytes)):
-                value = json.dumps(value)
+            if serialize_json:
+                value = self.codec.encode(value)
             
             # Set with optional TTL
             if ttl:
@@ -202,12 +489,16 @@ class RedisService(BaseService[RedisConfig]):
             else:
                 await self._client.set(key, value)
             
+            self._succeeded()
+            await self._invalidate([key])
             return True
             
         except Exception as e:
+            self._failed(e)
             self.logger.error(f"Redis set failed for key '{key}': {e}")
             return False
     
+    @traced("redis.delete")
     async def delete(self, *keys: str) -> int:
         """
         Delete one or more keys.
@@ -218,12 +509,16 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             Number of keys deleted
         """
-        if not self._client or not keys:
+        if not keys or not self._usable():
             return 0
         
         try:
-            return await self._client.delete(*keys)
+            deleted = await self._client.delete(*keys)
+            self._succeeded()
+            await self._invalidate(keys)
+            return deleted
         except Exception as e:
+            self._failed(e)
             self.logger.error(f"Redis delete failed: {e}")
             return 0
     
@@ -237,12 +532,15 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             Number of keys that exist
         """
-        if not self._client or not keys:
+        if not keys or not self._usable():
             return 0
         
         try:
-            return await self._client.exists(*keys)
+            count = await self._client.exists(*keys)
+            self._succeeded()
+            return count
         except Exception as e:
+            self._failed(e)
             self.logger.warning(f"Redis exists check failed: {e}")
             return 0
     
@@ -250,22 +548,167 @@ class RedisService(BaseService[RedisConfig]):
         """
         Get keys matching pattern.
         
+        Uses SCAN, so the server is never blocked, but the result is held in
+        memory - prefer scan_iter() for large keyspaces.
+        
         Args:
             pattern: Pattern to match (default: "*" for all)
             
         Returns:
             List of matching keys
         """
-        if not self._client:
+        try:
+            return [key async for key in self.scan_iter(pattern)]
+        except RedisServiceError as e:
+            self.logger.warning(f"Redis keys failed: {e}")
             return []
+    
+    async def scan_iter(
+        self,
+        pattern: str = "*",
+        count: Optional[int] = None,
+        type_: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Iterate over keys matching pattern with SCAN.
+        
+        Every SCAN call examines about `count` keys, so the server stays
+        responsive and only one batch is held in memory. A key may be
+        returned more than once if the keyspace is rehashed meanwhile.
+        
+        Args:
+            pattern: Pattern to match (default: "*" for all)
+            count: COUNT hint per call (default: config.scan_count)
+            type_: Only keys of this Redis type (e.g. "string", "hash")
+            
+        Yields:
+            Matching keys
+            
+        Raises:
+            RedisServiceError: If a SCAN call fails midway
+        """
+        async for batch in self.scan_batches(pattern, count, type_):
+            for key in batch:
+                yield key
+    
+    async def scan_batches(
+        self,
+        pattern: str = "*",
+        count: Optional[int] = None,
+        type_: Optional[str] = None
+    ) -> AsyncIterator[List[str]]:
+        """
+        Iterate over keys matching pattern, one list per SCAN call.
+        
+        Batches may be empty (SCAN examined keys but none matched) - those
+        are skipped.
+        
+        Raises:
+            RedisServiceError: If a SCAN call fails midway
+        """
+        if not self._client:
+            return
+        
+        count = count or self.config.scan_count
+        cursor = 0
+        while True:
+            if not self.breaker.allow():
+                raise RedisServiceError(
+                    message=f"SCAN for pattern '{pattern}' rejected, Redis circuit is open",
+                    operation="scan",
+                    details={"pattern": pattern, "cursor": cursor}
+                )
+            try:
+                cursor, keys = await self._client.scan(cursor=cursor, match=pattern, count=count, _type=type_)
+                self._succeeded()
+            except Exception as e:
+                self._failed(e)
+                # A partial iteration must not look like a complete one
+                raise RedisServiceError(
+                    message=f"SCAN failed for pattern '{pattern}': {e}",
+                    operation="scan",
+                    details={"pattern": pattern, "cursor": cursor}
+                )
+            if keys:
+                yield [k.decode() if isinstance(k, bytes) else k for k in keys]
+            if not cursor:
+                return
+    
+    async def mget_iter(
+        self,
+        pattern: str,
+        count: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Iterate over the values of all keys matching pattern.
+        
+        One MGET per SCAN batch. Keys that expired between SCAN and MGET are
+        skipped; values are decoded like in get().
+        
+        Args:
+            pattern: Pattern to match, e.g. "feedback:*"
+            count: COUNT hint per SCAN call
+            
+        Yields:
+            (key, value) pairs
+            
+        Raises:
+            RedisServiceError: If a SCAN or MGET call fails midway
+        """
+        async for batch in self.scan_batches(pattern, count):
+            try:
+                values = await self._client.mget(batch)
+                self._succeeded()
+            except Exception as e:
+                self._failed(e)
+                raise RedisServiceError(
+                    message=f"MGET failed for {len(batch)} keys matching '{pattern}': {e}",
+                    operation="mget",
+                    details={"pattern": pattern}
+                )
+            for key, value in zip(batch, values):
+                if value is not None:
+                    yield key, self.codec.decode(value)
+    
+    @traced("redis.unlink")
+    async def unlink(self, *keys: str) -> int:
+        """
+        Delete keys without blocking the server (memory is freed in the background).
+        
+        Args:
+            *keys: Keys to delete
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not keys or not self._usable():
+            return 0
         
         try:
-            keys = await self._client.keys(pattern)
-            # Convert bytes to strings if needed
-            return [k.decode() if isinstance(k, bytes) else k for k in keys]
+            deleted = await self._client.unlink(*keys)
+            self._succeeded()
+            await self._invalidate(keys)
+            return deleted
         except Exception as e:
-            self.logger.warning(f"Redis keys failed: {e}")
-            return []
+            self._failed(e)
+            self.logger.error(f"Redis unlink failed: {e}")
+            return 0
+    
+    async def unlink_matching(self, pattern: str, count: Optional[int] = None) -> int:
+        """
+        Delete all keys matching pattern, one UNLINK per SCAN batch.
+        
+        Args:
+            pattern: Pattern to match, e.g. "feedback:*"
+            count: COUNT hint per SCAN call
+            
+        Returns:
+            Number of keys deleted
+        """
+        deleted = 0
+        async for batch in self.scan_batches(pattern, count):
+            deleted += await self.unlink(*batch)
+        return deleted
     
     async def expire(self, key: str, seconds: int) -> bool:
         """
@@ -278,12 +721,15 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             True if expiration was set
         """
-        if not self._client:
+        if not self._usable():
             return False
         
         try:
-            return await self._client.expire(key, seconds)
+            result = await self._client.expire(key, seconds)
+            self._succeeded()
+            return result
         except Exception as e:
+            self._failed(e)
             self.logger.error(f"Redis expire failed for key '{key}': {e}")
             return False
     
@@ -297,15 +743,19 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             TTL in seconds, -1 if no TTL, -2 if key doesn't exist
         """
-        if not self._client:
+        if not self._usable():
             return -2
         
         try:
-            return await self._client.ttl(key)
+            ttl = await self._client.ttl(key)
+            self._succeeded()
+            return ttl
         except Exception as e:
+            self._failed(e)
             self.logger.warning(f"Redis ttl failed for key '{key}': {e}")
             return -2
     
+    @traced("redis.mget")
     async def mget(self, keys: List[str]) -> List[Any]:
         """
         Get multiple values at once.
@@ -316,28 +766,18 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             List of values (None for missing keys)
         """
-        if not self._client or not keys:
+        if not keys or not self._usable():
             return [None] * len(keys)
         
         try:
-            values = await self._client.mget(keys)
-            # Try to deserialize JSON values
-            result = []
-            for value in values:
-                if value is None:
-                    result.append(None)
-                elif isinstance(value, str):
-                    try:
-                        result.append(json.loads(value))
-                    except json.JSONDecodeError:
-                        result.append(value)
-                else:
-                    result.append(value)
-            return result
+            values = await self._read_many(keys)
+            return [None if value is None else self.codec.decode(value) for value in values]
         except Exception as e:
+            self._failed(e)
             self.logger.warning(f"Redis mget failed: {e}")
             return [None] * len(keys)
     
+    @traced("redis.mset")
     async def mset(self, mapping: Dict[str, Any]) -> bool:
         """
         Set multiple values at once.
@@ -348,24 +788,20 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             True if successful
         """
-        if not self._client or not mapping:
+        if not mapping or not self._usable():
             return False
         
         try:
-            # Serialize values
-            serialized = {}
-            for key, value in mapping.items():
-                if not isinstance(value, (str, bytes)):
-                    serialized[key] = json.dumps(value)
-                else:
-                    serialized[key] = value
-            
-            await self._client.mset(serialized)
+            await self._client.mset({key: self.codec.encode(value) for key, value in mapping.items()})
+            self._succeeded()
+            await self._invalidate(list(mapping))
             return True
         except Exception as e:
+            self._failed(e)
             self.logger.error(f"Redis mset failed: {e}")
             return False
     
+    @traced("redis.incr")
     async def incr(self, key: str, amount: int = 1) -> Optional[int]:
         """
         Increment a counter.
@@ -377,15 +813,120 @@ class RedisService(BaseService[RedisConfig]):
         Returns:
             New value or None on error
         """
-        if not self._client:
+        if not self._usable():
             return None
         
         try:
-            return await self._client.incrby(key, amount)
+            value = await self._client.incrby(key, amount)
+            self._succeeded()
+            await self._invalidate([key])
+            return value
         except Exception as e:
+            self._failed(e)
             self.logger.error(f"Redis incr failed for key '{key}': {e}")
             return None
     
+    # === Near cache ===
+    
+    async def _read(self, key: str) -> Any:
+        """
+        GET, served from the near cache if enabled.
+        
+        Only a round trip counts as a success for the circuit breaker; a
+        cache hit hands the trial call back.
+        """
+        cache = self.near_cache
+        if cache is None:
+            value = await self._client.get(key)
+            self._succeeded()
+            return value
+        value = cache.get(key)
+        if value is MISS:
+            epoch = cache.epoch
+            value = await self._client.get(key)
+            self._succeeded()
+            cache.put(key, value, epoch)
+        else:
+            self.breaker.release()  # nothing was sent
+        return value
+    
+    async def _read_many(self, keys: List[str]) -> List[Any]:
+        """MGET, fetching only the keys the near cache does not have (see _read)"""
+        cache = self.near_cache
+        if cache is None:
+            values = await self._client.mget(keys)
+            self._succeeded()
+            return values
+        values = [cache.get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is MISS]
+        if not missing:
+            self.breaker.release()  # nothing was sent
+            return values
+        epoch = cache.epoch
+        fetched = await self._client.mget([keys[i] for i in missing])
+        self._succeeded()
+        for i, value in zip(missing, fetched):
+            values[i] = value
+            cache.put(keys[i], value, epoch)
+        return values
+    
+    async def _invalidate(self, keys) -> None:
+        """Evict written keys from the near caches of all workers"""
+        if self.near_cache is not None and keys:
+            await self.near_cache.invalidate(self._client, list(keys))
+    
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[RedisPipeline]:
+        """
+        Queue commands and send them in one round trip when the block exits.
+        
+        Nothing is sent if the block raises. Results are available in
+        ``pipe.results`` after the block.
+        
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC (all or nothing)
+            
+        Raises:
+            RedisServiceError: If Redis is not connected, the circuit is open
+                or the pipeline fails
+        """
+        await self.ensure_initialized()
+        if not self._usable():
+            raise RedisServiceError(
+                message="Redis is not connected" if not self._client else "Redis circuit is open",
+                operation="multi/exec" if transaction else "pipeline"
+            )
+        
+        pipe = RedisPipeline(self._client.pipeline(transaction=transaction), transaction, self.codec)
+        try:
+            yield pipe
+        except BaseException:
+            self.breaker.release()  # nothing was sent
+            raise
+        if not len(pipe):
+            self.breaker.release()  # nothing queued, no round trip
+            return
+        try:
+            await pipe.execute()
+        except RedisServiceError as e:
+            self._failed(e.__cause__ or e)
+            raise
+        self._succeeded()
+        await self._invalidate(pipe.written)
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[RedisPipeline]:
+        """
+        MULTI/EXEC transaction: the queued commands are applied atomically.
+        
+        Usage:
+            async with redis_service.transaction() as tx:
+                tx.set("a", 1)
+                tx.incr("b")
+        """
+        async with self.pipeline(transaction=True) as pipe:
+            yield pipe
+    
     async def health_check(self) -> Dict[str, Any]:
         """
         Check Redis service health.
@@ -413,6 +954,18 @@ class RedisService(BaseService[RedisConfig]):
                     }
                 }
             
+            if self.breaker.state is not CircuitState.CLOSED:
+                # Don't wait for a timeout - the reconnection loop probes Redis
+                return {
+                    "healthy": False,
+                    "status": "circuit_open",
+                    "details": {
+                        "url_source": self._url_source,
+                        "circuit": self.breaker.get_metrics(),
+                        "pool": self._pool_metrics()
+                    }
+                }
+            
             # Ping Redis
             await self._client.ping()
             
@@ -426,31 +979,61 @@ class RedisService(BaseService[RedisConfig]):
                     "url_source": self._url_source,
                     "redis_version": info.get("redis_version", "unknown"),
                     "connected_clients": info.get("connected_clients", 0),
-                    "used_memory_human": info.get("used_memory_human", "unknown")
+                    "used_memory_human": info.get("used_memory_human", "unknown"),
+                    "circuit": self.breaker.get_metrics(),
+                    "pool": self._pool_metrics()
                 }
             }
             
         except Exception as e:
+            self._failed(e)
             return {
                 "healthy": False,
                 "status": "error",
                 "details": {
                     "url_source": self._url_source,
-                    "error": str(e)
+                    "error": str(e),
+                    "circuit": self.breaker.get_metrics()
                 }
             }
     
     async def _cleanup(self) -> None:
         """Clean up Redis connection"""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self.near_cache is not None:
+            await self.near_cache.stop()
         if self._client:
             try:
                 await self._client.close()
             except Exception as e:
                 self.logger.warning(f"Error closing Redis client: {e}")
     
-    def is_connected(self) -> bool:
-        """Check if Redis is connected and available"""
+    def get_metrics(self) -> Dict[str, Any]:
+        """Service metrics: circuit breaker, connection pool and near cache (if enabled)"""
+        metrics = super().get_metrics()
+        metrics["circuit"] = self.breaker.get_metrics()
+        metrics["pool"] = self._pool_metrics()
+        if self.near_cache is not None:
+            metrics["near_cache"] = self.near_cache.get_metrics()
+        return metrics
+    
+    def _pool_metrics(self) -> Dict[str, Any]:
+        pool = getattr(self._client, "connection_pool", None)
+        in_use = getattr(pool, "_in_use_connections", None)
+        return {
+            "max_connections": self.config.max_connections,
+            "in_use": len(in_use) if isinstance(in_use, (set, list, dict)) else None,
+        }
+    
+    def is_enabled(self) -> bool:
+        """Check if Redis is configured and a client exists (it may be unreachable right now)"""
         return self._client is not None
+    
+    def is_connected(self) -> bool:
+        """Check if Redis is connected and available (False while the circuit is open)"""
+        return self._client is not None and self.breaker.state is not CircuitState.OPEN
 
 
 # Factory function for convenience
@@ -11,6 +11,8 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass
 import logging
 
+from src.core.intent_classifier import IntentClassifier, Intent, get_intent_classifier
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,8 +33,9 @@ class ValidationService:
     logic separate from flow control and message formatting.
     """
     
-    def __init__(self):
+    def __init__(self, intent_classifier: Optional[IntentClassifier] = None):
         self.logger = logger
+        self.intent_classifier = intent_classifier or get_intent_classifier()
         
     async def validate_symptom_input(self, user_input: str) -> ValidationResult:
         """
@@ -99,17 +102,17 @@ class ValidationService:
         Returns:
             ValidationResult with validation outcome and classification
         """
-        normalized_input = user_input.lower().strip()
+        intent = self.intent_classifier.classify_yes_no(user_input)
         
         # Check for yes responses
-        if "ja" in normalized_input or "yes" in normalized_input:
+        if intent == Intent.YES:
             return ValidationResult(
                 valid=True,
                 details={"response_type": "yes"}
             )
         
         # Check for no responses  
-        if "nein" in normalized_input or "no" in normalized_input:
+        if intent == Intent.NO:
             return ValidationResult(
                 valid=True,
                 details={"response_type": "no"}
@@ -19,6 +19,7 @@ from weaviate.classes.init import Auth, AdditionalConfig, Timeout
 from weaviate.classes.query import MetadataQuery
 
 from src.core.service_base import BaseService, ServiceConfig
+from src.core.tracing import traced
 from src.core.exceptions import (
     V2ServiceError,
     ConfigurationError,
@@ -123,6 +124,9 @@ class WeaviateService(BaseService[WeaviateConfig]):
                 {"url": self.config.url, "error": str(e)}
             )
     
+    @traced("weaviate.search", lambda self, *args, **kwargs: {
+        "collection": kwargs.get("collection", args[0] if args else None)
+    })
     async def search(
         self,
         collection: str,
@@ -14,6 +14,7 @@ from src.models.flow_models import FlowStep
 from src.models.session_state import SessionState, SessionStore
 from src.agents.base_agent import AgentContext, MessageType, V2AgentMessage
 from src.core.flow_engine import FlowEvent
+from src.services.redis_service import RedisConfig, RedisService
 
 
 @pytest.fixture
@@ -376,6 +377,40 @@ def sample_analysis_data():
     }
 
 
+@pytest.fixture
+def redis_with_pipeline():
+    """Factory for a connected RedisService whose client hands out the given mock pipeline"""
+    def factory(pipe: Mock) -> RedisService:
+        service = RedisService(RedisConfig(url="redis://test:6379/0"))
+        service._client = Mock()
+        service._client.pipeline.return_value = pipe
+        service._initialized = True
+        return service
+    return factory
+
+
+@pytest.fixture
+def mock_pipeline():
+    """Mock Redis pipeline recording queued commands"""
+    pipe = Mock()
+    pipe.execute = AsyncMock(return_value=[])
+    return pipe
+
+
+@pytest.fixture
+def mock_redis(mock_pipeline, redis_with_pipeline):
+    """RedisService whose client records the pipelined commands"""
+    return redis_with_pipeline(mock_pipeline)
+
+
+@pytest.fixture
+def mock_feedback_pipeline():
+    """Mock FeedbackPipeline that accepts every record"""
+    mock = Mock()
+    mock.submit = Mock(return_value=True)
+    return mock
+
+
 @pytest.fixture
 def mock_services_bundle(
     mock_gpt_service, 
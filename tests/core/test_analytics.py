@@ -0,0 +1,171 @@
+# tests/v2/core/test_analytics.py
+"""
+Tests for the per-minute analytics counters.
+"""
+
+import pytest
+
+import src.core.analytics as analytics_module
+from src.core.analytics import AnalyticsConfig, AnalyticsCounters, distance_bucket, init_analytics
+from src.models.flow_models import FlowStep
+
+
+@pytest.fixture
+def config():
+    return AnalyticsConfig(flush_interval=0.01, retention=3600)
+
+
+def _record_turns(analytics: AnalyticsCounters) -> None:
+    analytics.record_step("s1", FlowStep.WAIT_FOR_SYMPTOM)
+    analytics.record_step("s1", FlowStep.WAIT_FOR_CONFIRMATION)
+    analytics.record_step("s2", FlowStep.WAIT_FOR_SYMPTOM)
+    analytics.record_search(0.42, matched=True)
+    analytics.record_search(0.75, matched=False)
+    analytics.record_search(None, matched=False)
+    analytics.record_confirmation(True, 0.42)
+
+
+@pytest.mark.unit
+class TestAnalyticsCounters:
+    """Test recording, flushing and aggregation"""
+
+    def test_distance_buckets(self):
+        assert distance_bucket(0.0) == "0.0-0.1"
+        assert distance_bucket(0.42) == "0.4-0.5"
+        assert distance_bucket(0.3) == "0.3-0.4"
+        assert distance_bucket(1.4) == "1.0+"
+
+    def test_recording_never_writes(self, mock_redis, config):
+        analytics = AnalyticsCounters(mock_redis, config)
+        _record_turns(analytics)
+        mock_redis.client.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_transaction(self, mock_redis, mock_pipeline, config):
+        analytics = AnalyticsCounters(mock_redis, config)
+        _record_turns(analytics)
+
+        assert await analytics.flush() == 1
+        mock_redis.client.pipeline.assert_called_once_with(transaction=True)
+        increments = {call.args[1]: call.args[2] for call in mock_pipeline.hincrby.call_args_list}
+        assert increments["step:wait_for_symptom"] == 2
+        assert increments["search:no_match"] == 2
+        assert increments["search_distance:0.4-0.5"] == 1
+        assert increments["confirm:yes"] == 1
+        assert set(mock_pipeline.pfadd.call_args.args[1:]) == {"s1", "s2"}
+        assert all(call.args[1] == 3600 for call in mock_pipeline.expire.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self, mock_redis, mock_pipeline, config):
+        analytics = AnalyticsCounters(mock_redis, config)
+        analytics.record_search(0.1, matched=True)
+        mock_pipeline.execute.side_effect = ConnectionError("down")
+
+        assert await analytics.flush() == 0
+        mock_pipeline.execute.side_effect = None
+        assert await analytics.flush() == 1
+        assert analytics.get_metrics()["failed_flushes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_keeps_counts_pending(self, mock_redis, mock_pipeline, config):
+        analytics = AnalyticsCounters(mock_redis, config)
+        analytics.record_search(0.1, matched=True)
+        mock_redis.breaker.trip(ConnectionError("down"))
+
+        assert await analytics.flush() == 0
+        assert analytics._local == {}
+        mock_redis.client.pipeline.assert_not_called()
+
+        mock_redis.breaker.record_success()
+        assert await analytics.flush() == 1
+        increments = {call.args[1]: call.args[2] for call in mock_pipeline.hincrby.call_args_list}
+        assert increments["search:match"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_buckets_are_bounded_while_unreachable(self, mock_redis, monkeypatch):
+        analytics = AnalyticsCounters(mock_redis, AnalyticsConfig(local_retention=120, local_max_sessions=3))
+        mock_redis.breaker.trip(ConnectionError("down"))
+        monkeypatch.setattr(analytics_module.time, "time", lambda: 600.0)
+        analytics.record_step("old", FlowStep.GREETING)
+        await analytics.flush()
+
+        monkeypatch.setattr(analytics_module.time, "time", lambda: 6000.0)
+        for i in range(5):
+            analytics.record_step(f"s{i}", FlowStep.GREETING)
+        await analytics.flush()
+
+        assert list(analytics._pending) == [100]
+        assert len(analytics._pending[100].sessions) == 3
+        assert analytics._pending[100].counts["step:greeting"] == 5
+
+    @pytest.mark.asyncio
+    async def test_local_buckets_are_bounded(self, monkeypatch):
+        analytics = AnalyticsCounters(None, AnalyticsConfig(local_retention=120, local_max_sessions=3))
+        monkeypatch.setattr(analytics_module.time, "time", lambda: 600.0)
+        analytics.record_step("old", FlowStep.GREETING)
+        await analytics.flush()
+
+        monkeypatch.setattr(analytics_module.time, "time", lambda: 6000.0)
+        for i in range(5):
+            analytics.record_step(f"s{i}", FlowStep.GREETING)
+        await analytics.flush()
+
+        assert list(analytics._local) == [100]
+        assert len(analytics._local[100].sessions) == 3
+        assert analytics._local[100].counts["step:greeting"] == 5
+
+    @pytest.mark.asyncio
+    async def test_stats_from_redis(self, mock_redis, mock_pipeline, config):
+        analytics = AnalyticsCounters(mock_redis, config)
+        analytics.record_search(0.2, matched=True)  # pending, not yet flushed
+        mock_pipeline.execute.return_value = [
+            {"step:greeting": "3", "search:match": "1", "search:no_match": "2"}, {}, 7
+        ]
+
+        stats = await analytics.get_stats(minutes=2)
+
+        assert stats["source"] == "redis"
+        assert stats["unique_sessions"] == 7
+        assert stats["steps"] == {"greeting": 3}
+        assert stats["symptom_search"]["searches"] == 4
+        assert stats["symptom_search"]["match_rate"] == 0.5
+        assert len(stats["per_minute"]) == 2
+        mock_pipeline.pfcount.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stats_fall_back_to_local_counts(self, mock_redis, mock_pipeline, config):
+        analytics = AnalyticsCounters(mock_redis, config)
+        analytics.record_search(0.2, matched=True)
+        mock_pipeline.execute.side_effect = ConnectionError("down")
+
+        stats = await analytics.get_stats(minutes=2)
+
+        assert stats["source"] == "local"
+        assert stats["symptom_search"]["matches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stats_without_redis(self, config):
+        analytics = AnalyticsCounters(None, config)
+        _record_turns(analytics)
+        await analytics.flush()
+
+        stats = await analytics.get_stats()
+        assert stats["source"] == "local"
+        assert stats["unique_sessions"] == 2
+        assert stats["steps"] == {"wait_for_confirmation": 1, "wait_for_symptom": 2}
+        assert stats["symptom_search"]["distance_histogram"] == {"0.4-0.5": 1, "0.7-0.8": 1}
+        assert stats["confirmation"] == {
+            "yes": 1, "no": 0, "confirm_rate": 1.0, "distance_histogram": {"0.4-0.5": 1}
+        }
+
+    def test_disabled(self):
+        analytics = AnalyticsCounters(None, AnalyticsConfig(enabled=False))
+        _record_turns(analytics)
+        assert analytics.get_metrics()["pending_minutes"] == 0
+
+    def test_init_keeps_early_counts(self, monkeypatch, config):
+        monkeypatch.setattr(analytics_module, "_analytics", AnalyticsCounters(None, config))
+        analytics_module._analytics.record_step("s1", FlowStep.GREETING)
+
+        analytics = init_analytics(None, config)
+        assert analytics.get_metrics()["pending_minutes"] == 1
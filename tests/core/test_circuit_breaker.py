@@ -0,0 +1,61 @@
+# tests/v2/core/test_circuit_breaker.py
+"""
+Tests for the closed/open/half-open circuit breaker.
+"""
+
+import pytest
+
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=0.0, max_reset_timeout=4.0)
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Test state transitions and backoff"""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60.0)
+        breaker.record_failure("timeout")
+        breaker.record_failure("timeout")
+        breaker.record_success()
+        breaker.record_failure("timeout")
+        breaker.record_failure("timeout")
+        assert breaker.state is CircuitState.CLOSED
+
+        breaker.record_failure("timeout")
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow()
+        assert breaker.get_metrics()["rejected_calls"] == 1
+        assert breaker.retry_in() > 59
+
+    def test_half_open_allows_one_trial(self, breaker):
+        breaker.trip("refused")
+        assert breaker.state is CircuitState.HALF_OPEN  # reset timeout 0
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.release()
+        assert breaker.allow()
+
+    def test_trial_success_closes(self, breaker):
+        breaker.trip("refused")
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.get_metrics()["consecutive_failures"] == 0
+
+    def test_trial_failure_reopens_with_backoff(self):
+        breaker = CircuitBreaker("test", reset_timeout=1.0, max_reset_timeout=3.0)
+        breaker.trip("refused")
+        breaker._open_until = 0.0
+        for expected in (2.0, 3.0, 3.0):
+            assert breaker.allow()
+            breaker.record_failure("refused")
+            assert breaker.state is CircuitState.OPEN
+            assert breaker._current_timeout == expected
+            breaker._open_until = 0.0
+        assert breaker.get_metrics()["opened"] == 4
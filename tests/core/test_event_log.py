@@ -0,0 +1,215 @@
+# tests/v2/core/test_event_log.py
+"""
+Tests for the conversation event log and its replay.
+"""
+
+import threading
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState
+from src.core.flow_engine import FlowEngine, FlowEvent
+from src.core.flow_definition import load_flow_definition
+from src.core.event_log import (
+    ConversationEvent, EventLog, EventLogConfig, SegmentWriter,
+    hash_input, list_segments, read_segments, read_stream
+)
+from src.core.event_replay import FlowReplayer, rebuild_session, rebuild_sessions
+
+
+def _event(session_id="s1", seq=1, from_state="greeting", event="start_session", to_state="wait_for_symptom"):
+    return ConversationEvent(session_id, seq, from_state, event, hash_input("x"), to_state, 1700000000.5, 1.25)
+
+
+@pytest.fixture
+def file_log(tmp_path):
+    return EventLog(EventLogConfig(backend="file", directory=str(tmp_path)))
+
+
+@pytest.mark.unit
+class TestSegments:
+    """Test the segment file format"""
+
+    def test_roundtrip(self, tmp_path):
+        writer = SegmentWriter(tmp_path, events=("start_session", "user_input"))
+        events = [_event(), _event("sitzung-ä", 7, "wait_for_symptom", "user_input", "wait_for_confirmation")]
+        writer.write(events)
+        writer.close()
+
+        assert list(read_segments(tmp_path)) == events
+
+    def test_unknown_event_starts_new_segment(self, tmp_path):
+        writer = SegmentWriter(tmp_path, events=("start_session",))
+        writer.write([_event()])
+        writer.write([_event(seq=2, from_state="wait_for_symptom", event="user_input")])
+        writer.close()
+
+        assert len(list_segments(tmp_path)) == 2
+        assert [e.event for e in read_segments(tmp_path)] == ["start_session", "user_input"]
+
+    def test_rotation(self, tmp_path):
+        writer = SegmentWriter(tmp_path, segment_bytes=200, events=("start_session",))
+        writer.write([_event(seq=i) for i in range(1, 11)])
+        writer.close()
+
+        assert len(list_segments(tmp_path)) > 1
+        assert [e.seq for e in read_segments(tmp_path)] == list(range(1, 11))
+
+    def test_truncated_record_ignored(self, tmp_path):
+        writer = SegmentWriter(tmp_path, events=("start_session",))
+        writer.write([_event(seq=1), _event(seq=2)])
+        writer.close()
+        with open(writer.path, "r+b") as f:
+            f.truncate(writer.path.stat().st_size - 3)
+
+        assert [e.seq for e in read_segments(writer.path)] == [1]
+
+    def test_stream_fields_roundtrip(self):
+        event = _event()
+        assert ConversationEvent.from_fields(event.to_fields()) == event
+
+
+@pytest.mark.unit
+class TestEventLog:
+    """Test recording and flushing"""
+
+    @pytest.mark.asyncio
+    async def test_flow_engine_records_transitions(self, file_log, tmp_path):
+        handlers = Mock()
+        handlers.handle_greeting = AsyncMock(return_value=[])
+        engine = FlowEngine(handlers)
+        engine.event_log = file_log
+        session = SessionState()
+
+        await engine.process_event(session, FlowEvent.START_SESSION, "hallo", {})
+        await file_log.stop()
+
+        events = list(read_segments(tmp_path))
+        assert len(events) == 1
+        assert events[0].session_id == session.session_id
+        assert events[0].seq == session.event_seq == 1
+        assert (events[0].from_state, events[0].event, events[0].to_state) == (
+            "greeting", "start_session", "wait_for_symptom"
+        )
+        assert events[0].input_hash == hash_input("hallo")
+        assert events[0].duration_ms >= 0
+
+    @pytest.mark.asyncio
+    async def test_segments_written_off_the_event_loop(self, file_log, monkeypatch):
+        threads = []
+        write = SegmentWriter.write
+
+        def recording_write(writer, events):
+            threads.append(threading.get_ident())
+            return write(writer, events)
+
+        monkeypatch.setattr(SegmentWriter, "write", recording_write)
+        file_log.record(SessionState(), FlowStep.GREETING, FlowEvent.START_SESSION, "", FlowStep.WAIT_FOR_SYMPTOM, 1.0, 2.0)
+
+        assert await file_log.flush() == 1
+        assert threads and threads[0] != threading.get_ident()
+        await file_log.stop()
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("EVENT_LOG_BACKEND", raising=False)
+        event_log = EventLog()
+        session = SessionState()
+
+        event_log.record(session, FlowStep.GREETING, FlowEvent.START_SESSION, "", FlowStep.WAIT_FOR_SYMPTOM, 0.0, 0.0)
+
+        assert not event_log.enabled
+        assert event_log.pending_count == 0
+        assert session.event_seq == 0
+
+    def test_redis_backend_requires_connection(self):
+        event_log = EventLog(EventLogConfig(backend="redis"), redis_service=None)
+        assert not event_log.enabled
+
+    @pytest.mark.asyncio
+    async def test_redis_stream_flush(self, redis_with_pipeline):
+        pipe = Mock()
+        pipe.execute = AsyncMock(return_value=[b"1-0"])
+        redis_service = redis_with_pipeline(pipe)
+        event_log = EventLog(EventLogConfig(backend="redis", stream="events", stream_maxlen=100), redis_service)
+        session = SessionState()
+
+        event_log.record(session, FlowStep.GREETING, FlowEvent.START_SESSION, "", FlowStep.WAIT_FOR_SYMPTOM, 1.0, 2.0)
+        assert await event_log.flush() == 1
+
+        pipe.xadd.assert_called_once()
+        args, kwargs = pipe.xadd.call_args
+        assert args[0] == "events"
+        assert args[1]["sid"] == session.session_id
+        assert kwargs == {"maxlen": 100, "approximate": True}
+
+    @pytest.mark.asyncio
+    async def test_read_stream_in_batches(self):
+        events = [_event(seq=seq) for seq in range(1, 6)]
+        entries = [(f"{seq}-0", event.to_fields()) for seq, event in enumerate(events, 1)]
+        redis_service = Mock()
+        redis_service.client.xrange = AsyncMock(side_effect=[entries[:2], entries[2:4], entries[4:]])
+
+        batches = [batch async for batch in read_stream(redis_service, "events", batch_size=2)]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [event for batch in batches for event in batch] == events
+        assert redis_service.client.xrange.call_args.kwargs["min"] == "(4-0"
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_events(self, redis_with_pipeline):
+        pipe = Mock()
+        pipe.execute = AsyncMock(side_effect=ConnectionError("down"))
+        redis_service = redis_with_pipeline(pipe)
+        event_log = EventLog(EventLogConfig(backend="redis"), redis_service)
+
+        event_log.record(SessionState(), FlowStep.GREETING, FlowEvent.START_SESSION, "", FlowStep.WAIT_FOR_SYMPTOM, 1.0, 2.0)
+
+        assert await event_log.flush() == 0
+        assert event_log.pending_count == 1
+        assert event_log.get_metrics()["failed_flushes"] == 1
+
+
+@pytest.mark.unit
+class TestReplay:
+    """Test session rebuilding and replay against a definition"""
+
+    def test_rebuild_session(self):
+        events = [
+            _event("a", 1),
+            _event("b", 1),
+            _event("a", 2, "wait_for_symptom", "user_input", "wait_for_confirmation"),
+        ]
+
+        session = rebuild_session(events, "a")
+
+        assert session.current_step == FlowStep.WAIT_FOR_CONFIRMATION
+        assert session.event_seq == 2
+        assert rebuild_session(events, "unknown") is None
+        assert {sid: s.current_step for sid, s in rebuild_sessions(events).items()} == {
+            "a": FlowStep.WAIT_FOR_CONFIRMATION,
+            "b": FlowStep.WAIT_FOR_SYMPTOM,
+        }
+
+    def test_replay_classifies_events(self):
+        replayer = FlowReplayer(load_flow_definition())
+        events = [
+            _event("a", 1),
+            # Symptom not found: handler stays in state
+            _event("a", 2, "wait_for_symptom", "user_input", "wait_for_symptom"),
+            _event("a", 3, "wait_for_symptom", "user_input", "wait_for_confirmation"),
+            # Confirmation "no": declared redirect
+            _event("a", 4, "wait_for_confirmation", "user_input", "wait_for_symptom"),
+            # Not allowed by the definition
+            _event("a", 5, "wait_for_symptom", "user_input", "feedback_q1"),
+            # Seq gap and unknown transition
+            _event("a", 9, "feedback_q1", "yes_response", "feedback_q2"),
+        ]
+
+        report = replayer.replay(events)
+
+        assert (report.events, report.sessions) == (6, 1)
+        assert (report.matched, report.stayed, report.redirected, report.invalid) == (2, 1, 1, 2)
+        assert report.gaps == 1
+        assert not report.compatible
+        assert "no transition feedback_q1 + yes_response" in report.samples[1]
@@ -0,0 +1,158 @@
+# tests/v2/core/test_experiments.py
+"""
+Tests for A/B prompt variant assignment and per-variant metrics.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+import src.core.experiments as experiments_module
+from src.core.exceptions import V2ConfigurationError
+from src.core.experiments import Experiment, ExperimentEngine, parse_experiments, record_generation
+from src.core.prompt_manager import PromptManager, PromptType, build_prompt_registry
+from src.models.flow_models import FlowStep
+from src.services.gpt_service import GPTService
+
+KEY = "generation.dog_perspective"
+VARS = {"symptom": "Bellen", "match": "Territorialverhalten"}
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return build_prompt_registry()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Global engine with a 50/50 experiment on the dog perspective prompt"""
+    experiment_engine = ExperimentEngine({KEY: Experiment(KEY, {"control": 50, "short": 50})})
+    monkeypatch.setattr(experiments_module, "_experiments", experiment_engine)
+    return experiment_engine
+
+
+def _session_for(engine: ExperimentEngine, variant: str) -> str:
+    return next(f"s{i}" for i in range(1000) if engine.experiments[KEY].assign(f"s{i}") == variant)
+
+
+@pytest.mark.unit
+class TestAssignment:
+    """Test deterministic bucketing"""
+
+    def test_assignment_is_sticky(self):
+        experiment = Experiment(KEY, {"control": 1, "short": 1})
+        assert all(experiment.assign(f"s{i}") == experiment.assign(f"s{i}") for i in range(100))
+
+    def test_assignment_follows_weights(self):
+        experiment = Experiment(KEY, {"control": 80, "short": 20})
+        assigned = [experiment.assign(f"session-{i}") for i in range(5000)]
+        assert 0.17 < assigned.count("short") / len(assigned) < 0.23
+
+    def test_salt_reshuffles(self):
+        plain = Experiment(KEY, {"control": 1, "short": 1})
+        salted = Experiment(KEY, {"control": 1, "short": 1}, salt="round-2")
+        assert any(plain.assign(f"s{i}") != salted.assign(f"s{i}") for i in range(100))
+
+    def test_parse(self):
+        experiments = parse_experiments('{"generation.dog_perspective": {"control": 3, "short": 1, "salt": "x"}}')
+        assert experiments[KEY].weights == {"control": 3, "short": 1}
+        assert experiments[KEY].salt == "x"
+        assert parse_experiments("") == {}
+        with pytest.raises(V2ConfigurationError):
+            parse_experiments('{"generation.dog_perspective": {"control": 0}}')
+        with pytest.raises(V2ConfigurationError):
+            parse_experiments("not json")
+
+
+@pytest.mark.unit
+class TestVariantRendering:
+    """Test that PromptManager renders the assigned variant"""
+
+    def test_variants_are_grouped_with_their_control(self, registry):
+        assert [p.key for p in registry.variants[KEY]] == [KEY, f"{KEY}@short"]
+        assert [p.key for p in registry.variants["dog.greeting"]] == ["dog.greeting"]
+
+    def test_control_outside_of_turn(self, engine, registry):
+        manager = PromptManager(registry)
+        assert manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS) == registry.renderers[KEY].render(VARS)
+
+    def test_session_gets_its_variant(self, engine, registry):
+        manager = PromptManager(registry)
+        short = registry.renderers[f"{KEY}@short"].render(VARS)
+        control = registry.renderers[KEY].render(VARS)
+
+        with engine.turn(_session_for(engine, "short")):
+            assert manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS) == short
+            assert manager.get(KEY, **VARS) == short
+        with engine.turn(_session_for(engine, "control")):
+            assert manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS) == control
+
+    def test_other_prompts_are_unaffected(self, engine, registry):
+        manager = PromptManager(registry)
+        assert manager._renderers.get(PromptType.DOG_GREETING) is registry.renderers[PromptType.DOG_GREETING]
+
+
+@pytest.mark.unit
+class TestVariantMetrics:
+    """Test exposure, GPT usage and completion counters"""
+
+    def test_generation_is_attributed_to_rendered_variant(self, engine, registry):
+        manager = PromptManager(registry)
+        session_id = _session_for(engine, "short")
+
+        with engine.turn(session_id):
+            record_generation(100.0, 10, 5)  # before the variant prompt: not attributed
+            manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS)
+            record_generation(200.0, 120, 40)
+        record_generation(300.0, 1, 1)  # outside of a turn
+
+        stats = engine.get_stats()[KEY]["variants"]["short"]
+        assert stats["sessions"] == 1
+        assert stats["generations"] == 1
+        assert stats["latency_ms_avg"] == 200.0
+        assert stats["prompt_tokens_avg"] == 120.0
+        assert engine.get_stats()[KEY]["variants"]["control"]["generations"] == 0
+
+    def test_gpt_usage_is_reported(self, engine, registry):
+        manager = PromptManager(registry)
+        response = Mock()
+        response.usage.prompt_tokens = 80
+        response.usage.completion_tokens = 30
+
+        with engine.turn(_session_for(engine, "control")):
+            manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS)
+            GPTService._record_usage(response, 42.0)
+
+        stats = engine.get_stats()[KEY]["variants"]["control"]
+        assert (stats["generations"], stats["prompt_tokens_avg"], stats["completion_tokens_avg"]) == (1, 80.0, 30.0)
+
+    def test_completion_rate(self, engine, registry):
+        manager = PromptManager(registry)
+        sessions = [f"s{i}" for i in range(20)]
+        for session_id in sessions:
+            with engine.turn(session_id):
+                manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS)
+                manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS)
+        for session_id in sessions[:10]:
+            engine.observe_state(session_id, FlowStep.WAIT_FOR_CONTEXT)
+            engine.observe_state(session_id, FlowStep.END_OR_RESTART)
+
+        variants = engine.get_stats()[KEY]["variants"]
+        assert sum(v["sessions"] for v in variants.values()) == 20
+        assert sum(v["renders"] for v in variants.values()) == 40
+        assert sum(v["completions"] for v in variants.values()) == 10
+
+    def test_unknown_variant_is_dropped(self, monkeypatch, registry):
+        engine = ExperimentEngine({KEY: Experiment(KEY, {"control": 1, "missing": 1})})
+        monkeypatch.setattr(experiments_module, "_experiments", engine)
+        manager = PromptManager(registry)
+
+        for i in range(20):
+            with engine.turn(f"s{i}"):
+                manager.get_prompt(PromptType.DOG_PERSPECTIVE, **VARS)
+
+        variants = engine.get_stats()[KEY]["variants"]
+        assert variants["control"]["sessions"] == 20
+        assert variants["missing"]["sessions"] == 0
+        # The configuration stays intact for registries that provide the variant
+        assert engine.experiments[KEY].weights == {"control": 1, "missing": 1}
+        assert set(engine.stats[KEY]) == {"control", "missing"}
@@ -0,0 +1,140 @@
+# tests/v2/core/test_feedback_pipeline.py
+"""
+Tests for the batched feedback ingestion pipeline.
+"""
+
+import json
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from src.core.feedback_pipeline import FeedbackPipeline, FeedbackPipelineConfig
+
+
+def _record(session_id="s1"):
+    return {"session_id": session_id, "symptom": "bellt", "responses": ["ja"], "timestamp": "2024-01-01T00:00:00+00:00"}
+
+
+@pytest.fixture
+def config(tmp_path):
+    return FeedbackPipelineConfig(
+        ttl=60, batch_size=3, flush_interval=0.01, max_pending=5,
+        spill_path=str(tmp_path / "spill.jsonl")
+    )
+
+
+def _spilled(config):
+    with open(config.spill_path, encoding="utf-8") as f:
+        return [json.loads(line)["session_id"] for line in f]
+
+
+@pytest.mark.unit
+class TestFeedbackPipeline:
+    """Test queueing, batching and spilling"""
+
+    def test_submit_never_writes(self, mock_redis, config):
+        pipeline = FeedbackPipeline(mock_redis, config)
+        assert pipeline.submit(_record()) is True
+        assert pipeline.pending_count == 1
+        mock_redis.client.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_pipeline_per_batch(self, mock_redis, mock_pipeline, config):
+        pipeline = FeedbackPipeline(mock_redis, config)
+        for i in range(2):
+            pipeline.submit(_record(f"s{i}"))
+
+        assert await pipeline.flush() == 2
+        assert mock_pipeline.execute.await_count == 1
+        keys = [call.args[0] for call in mock_pipeline.set.call_args_list]
+        assert keys == ["feedback:s0", "feedback:s1"]
+        assert mock_pipeline.set.call_args.kwargs["ex"] == 60
+        assert json.loads(mock_pipeline.set.call_args.args[1])["session_id"] == "s1"
+        assert pipeline.get_metrics()["written"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_written_early(self, mock_redis, mock_pipeline, config):
+        pipeline = FeedbackPipeline(mock_redis, config)
+        for i in range(3):
+            pipeline.submit(_record(f"s{i}"))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert pipeline.pending_count == 0
+        assert mock_pipeline.set.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_background_writer(self, mock_redis, mock_pipeline, config):
+        pipeline = FeedbackPipeline(mock_redis, config)
+        await pipeline.start()
+        pipeline.submit(_record())
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+
+        mock_pipeline.set.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_spills_in_the_background(self, mock_redis, config):
+        pipeline = FeedbackPipeline(mock_redis, config)
+        pipeline._flushing = Mock()  # keep the queue full
+        for i in range(7):
+            assert pipeline.submit(_record(f"s{i}")) is True
+
+        assert pipeline.pending_count == 5
+        assert pipeline.get_metrics()["spilling"] == 2
+        assert not pipeline.spill_path.exists()  # submit() only hands over
+
+        await pipeline._spilling
+        assert _spilled(config) == ["s5", "s6"]
+        assert pipeline.get_metrics()["spilled"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_spills(self, mock_redis, mock_pipeline, config):
+        mock_pipeline.execute.side_effect = ConnectionError("Redis weg")
+        pipeline = FeedbackPipeline(mock_redis, config)
+        pipeline.submit(_record("s1"))
+
+        assert await pipeline.flush() == 1
+        assert _spilled(config) == ["s1"]
+        assert pipeline.get_metrics()["failed_batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_without_redis_stop_spills_everything(self, config):
+        pipeline = FeedbackPipeline(None, config)
+        for i in range(4):
+            pipeline.submit(_record(f"s{i}"))
+        await pipeline.stop()
+
+        assert _spilled(config) == ["s0", "s1", "s2", "s3"]
+
+    @pytest.mark.asyncio
+    async def test_spill_is_replayed_when_redis_is_back(self, mock_redis, mock_pipeline, config):
+        offline = FeedbackPipeline(None, config)
+        for i in range(4):
+            offline.submit(_record(f"s{i}"))
+        await offline.stop()
+        with open(config.spill_path, "a", encoding="utf-8") as f:
+            f.write('{"session_id": "cut off')
+
+        pipeline = FeedbackPipeline(mock_redis, config)
+        await pipeline.start()
+        await pipeline.stop()
+
+        keys = [call.args[0] for call in mock_pipeline.set.call_args_list]
+        assert keys == ["feedback:s0", "feedback:s1", "feedback:s2", "feedback:s3"]
+        assert mock_pipeline.execute.await_count == 2  # batches of 3
+        assert pipeline.get_metrics()["replayed"] == 4
+        assert not pipeline._has_spill()
+
+    @pytest.mark.asyncio
+    async def test_failed_replay_keeps_records(self, mock_redis, mock_pipeline, config):
+        await FeedbackPipeline(None, config)._spill([_record("s1")])
+        mock_pipeline.execute.side_effect = ConnectionError("Redis weg")
+        pipeline = FeedbackPipeline(mock_redis, config)
+
+        assert await pipeline.replay_spill() == 0
+        assert pipeline._has_spill()
+
+        mock_pipeline.execute.side_effect = None
+        assert await pipeline.replay_spill() == 1
+        assert not pipeline._has_spill()
@@ -0,0 +1,222 @@
+# tests/v2/core/test_flow_definition.py
+"""
+Tests for declarative flow definitions and FlowEngine hot reload.
+"""
+
+import json
+import os
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState
+from src.core.flow_engine import FlowEngine, FlowEvent
+from src.core.flow_definition import DEFAULT_DEFINITION_PATH, load_flow_definition, parse_flow_definition
+from src.core.exceptions import V2ConfigurationError
+
+
+EVENTS = {event.value for event in FlowEvent}
+
+
+def _bundled() -> dict:
+    with open(DEFAULT_DEFINITION_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _errors(raw: dict, **kwargs) -> list:
+    with pytest.raises(V2ConfigurationError) as exc_info:
+        parse_flow_definition(raw, EVENTS, **kwargs)
+    return exc_info.value.details["errors"]
+
+
+@pytest.fixture
+def definition_file(tmp_path):
+    path = tmp_path / "flow.json"
+    path.write_text(json.dumps(_bundled()), encoding="utf-8")
+    return path
+
+
+@pytest.mark.unit
+class TestFlowDefinition:
+    """Test parsing and graph validation"""
+
+    def test_bundled_definition_is_valid(self):
+        definition = load_flow_definition(event_names=EVENTS)
+
+        assert definition.start_state == FlowStep.GREETING
+        assert len(definition.states) == 11
+        assert definition.warnings == ()
+        # "*" expands the restart command to every state
+        restarts = [t for t in definition.transitions if t.event == "restart_command"]
+        assert {t.from_state for t in restarts} == set(definition.states)
+        assert restarts[0].description == "Restart command from greeting -> new conversation"
+
+    def test_unknown_state_and_event(self):
+        raw = _bundled()
+        raw["transitions"][0]["to"] = "nowhere"
+        raw["transitions"][1]["event"] = "teleport"
+
+        errors = _errors(raw)
+
+        assert any("unknown state 'nowhere'" in e for e in errors)
+        assert any("unknown event 'teleport'" in e for e in errors)
+
+    def test_unknown_handler(self):
+        errors = _errors(_bundled(), handler_exists=lambda name: name != "feedback_step")
+        assert len([e for e in errors if "unknown handler 'feedback_step'" in e]) == 4
+
+    def test_duplicate_transition(self):
+        raw = _bundled()
+        raw["transitions"].append(dict(raw["transitions"][0]))
+        assert any("duplicate transition greeting + start_session" in e for e in _errors(raw))
+
+    @pytest.mark.parametrize("key, value", [("states", 5), ("transitions", None), ("terminal_states", "end")])
+    def test_wrong_type_is_reported(self, key, value):
+        raw = _bundled()
+        raw[key] = value
+        assert f"{key} must be a list, not {type(value).__name__}" in _errors(raw)
+
+    def test_malformed_transition_is_reported(self):
+        raw = _bundled()
+        raw["transitions"].append(5)
+        raw["transitions"][0]["event"] = ["start_session"]
+
+        errors = _errors(raw)
+
+        assert f"transitions[{len(raw['transitions']) - 1}] must be a mapping, not int" in errors
+        assert "transitions[0]: event must be a string, not list" in errors
+
+    def test_unreachable_state(self):
+        raw = _bundled()
+        raw["transitions"] = [t for t in raw["transitions"] if t["to"] != "feedback_q3"]
+        assert any("Unreachable states: ['feedback_q3'" in e for e in _errors(raw))
+
+    def test_dead_end_state(self):
+        raw = _bundled()
+        raw["transitions"] = [
+            t for t in raw["transitions"] if t["from"] != "feedback_q5" and t["from"] != "*"
+        ]
+        assert any("without outgoing transitions: ['feedback_q5']" in e for e in _errors(raw))
+
+        raw["terminal_states"] = ["feedback_q5"]
+        assert parse_flow_definition(raw, EVENTS).terminal_states == (FlowStep.FEEDBACK_Q5,)
+
+    def test_redirect_counts_as_reachable(self):
+        raw = {
+            "start_state": "greeting",
+            "states": ["greeting", "wait_for_confirmation", "wait_for_symptom"],
+            "transitions": [
+                {"from": "greeting", "event": "start_session", "to": "wait_for_confirmation",
+                 "handler": "h", "redirects": ["wait_for_symptom"]},
+                {"from": "*", "event": "restart_command", "to": "greeting", "handler": "h"},
+            ],
+        }
+        assert len(parse_flow_definition(raw, EVENTS).transitions) == 4
+
+        del raw["transitions"][0]["redirects"]
+        assert any("Unreachable states: ['wait_for_symptom']" in e for e in _errors(raw))
+
+    def test_yaml_definition(self, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "flow.yaml"
+        path.write_text(yaml.safe_dump(_bundled()), encoding="utf-8")
+
+        definition = load_flow_definition(path, EVENTS)
+
+        assert definition.source == str(path)
+        assert len(definition.transitions) == 24
+
+    def test_unreadable_file(self, tmp_path):
+        with pytest.raises(V2ConfigurationError):
+            load_flow_definition(tmp_path / "missing.json", EVENTS)
+
+
+@pytest.mark.unit
+class TestFlowEngineDefinition:
+    """Test the engine built from a definition and hot reload"""
+
+    @pytest.mark.asyncio
+    async def test_feedback_step_params(self):
+        handlers = Mock()
+        handlers.handle_feedback_answer = AsyncMock()
+        handlers.handle_feedback_question = AsyncMock(return_value=[])
+        engine = FlowEngine(handlers)
+        session = SessionState()
+        session.current_step = FlowStep.FEEDBACK_Q3
+
+        new_state, _ = await engine.process_event(session, FlowEvent.FEEDBACK_ANSWER, "gut", {})
+
+        assert new_state == FlowStep.FEEDBACK_Q4
+        handlers.handle_feedback_answer.assert_awaited_once()
+        handlers.handle_feedback_question.assert_awaited_once_with(session, "", {"question_number": 4})
+
+    @pytest.mark.asyncio
+    async def test_params_merged_into_context(self):
+        handlers = Mock()
+        handlers.handle_feedback_question = AsyncMock(return_value=[])
+        engine = FlowEngine(handlers)
+        session = SessionState()
+        session.current_step = FlowStep.ASK_FOR_EXERCISE
+
+        await engine.process_event(session, FlowEvent.NO_RESPONSE, "nein", {})
+
+        context = handlers.handle_feedback_question.await_args.args[2]
+        assert context["question_number"] == 1
+
+    def test_invalid_definition_rejected_at_startup(self, definition_file):
+        raw = _bundled()
+        raw["transitions"][0]["handler"] = "_private_helper"
+        definition_file.write_text(json.dumps(raw), encoding="utf-8")
+
+        with pytest.raises(V2ConfigurationError):
+            FlowEngine(Mock(), definition_path=definition_file)
+
+    def test_reload_swaps_fsm(self, definition_file):
+        engine = FlowEngine(Mock(), definition_path=definition_file)
+        old_fsm = engine._fsm
+
+        raw = _bundled()
+        raw["transitions"][6]["to"] = "wait_for_context"  # end_or_restart + yes
+        definition_file.write_text(json.dumps(raw), encoding="utf-8")
+        engine.reload()
+
+        assert engine._fsm is not old_fsm
+        transition = engine._fsm.lookup(FlowStep.END_OR_RESTART, FlowEvent.YES_RESPONSE)
+        assert transition.to_state == FlowStep.WAIT_FOR_CONTEXT
+        assert engine._transition_map[(FlowStep.END_OR_RESTART, FlowEvent.YES_RESPONSE)] is transition
+
+    def test_failed_reload_keeps_fsm(self, definition_file):
+        engine = FlowEngine(Mock(), definition_path=definition_file)
+        old_fsm, old_transitions = engine._fsm, engine.transitions
+
+        raw = _bundled()
+        raw["transitions"][0]["to"] = "nowhere"
+        definition_file.write_text(json.dumps(raw), encoding="utf-8")
+
+        with pytest.raises(V2ConfigurationError):
+            engine.reload()
+        assert engine._fsm is old_fsm
+        assert engine.transitions is old_transitions
+
+    def test_reload_if_changed(self, definition_file):
+        engine = FlowEngine(Mock(), definition_path=definition_file)
+        assert engine.reload_if_changed() is False
+
+        raw = _bundled()
+        raw["transitions"][0]["to"] = "nowhere"
+        definition_file.write_text(json.dumps(raw), encoding="utf-8")
+        stat = definition_file.stat()
+        os.utime(definition_file, (stat.st_atime, stat.st_mtime + 10))
+        old_fsm = engine._fsm
+
+        # Broken file: rejected once, FSM unchanged
+        assert engine.reload_if_changed() is False
+        assert engine._fsm is old_fsm
+        assert engine.reload_if_changed() is False
+
+        definition_file.write_text(json.dumps(_bundled()), encoding="utf-8")
+        os.utime(definition_file, (stat.st_atime, stat.st_mtime + 20))
+
+        assert engine.reload_if_changed() is True
+        assert engine._fsm is not old_fsm
@@ -599,6 +599,43 @@ class TestFSMValidation:
             transition = engine._transition_map[key]
             assert transition.handler == custom_handler
             assert transition.description == "Custom test transition"
+    
+    def test_compiled_table_matches_transitions(self, mock_services_bundle):
+        """Test dense table lookups agree with the defined transitions"""
+        with patch('src.core.flow_handlers.FlowHandlers'):
+            engine = FlowEngine()
+            
+            for state in FlowStep:
+                for event in FlowEvent:
+                    expected = engine._transition_map.get((state, event))
+                    assert engine._fsm.lookup(state, event) is expected
+            
+            events = engine._fsm.valid_events(FlowStep.ASK_FOR_EXERCISE)
+            assert set(events) == {"yes_response", "no_response", "restart_command"}
+            
+            # Precomputed lookups are shared, not rebuilt per call
+            assert engine.get_valid_transitions(FlowStep.GREETING) is engine.get_valid_transitions(FlowStep.GREETING)
+    
+    def test_rebuild_swaps_compiled_table(self, mock_services_bundle):
+        """Test recompiling replaces the table without touching the old one"""
+        with patch('src.core.flow_handlers.FlowHandlers'):
+            engine = FlowEngine()
+            old_fsm = engine._fsm
+            
+            engine.add_transition(
+                from_state=FlowStep.GREETING,
+                event=FlowEvent.USER_INPUT,
+                to_state=FlowStep.WAIT_FOR_SYMPTOM,
+                handler=AsyncMock()
+            )
+            assert engine._fsm.lookup(FlowStep.GREETING, FlowEvent.USER_INPUT) is None
+            
+            engine._build_transition_map()
+            
+            assert engine._fsm is not old_fsm
+            assert old_fsm.lookup(FlowStep.GREETING, FlowEvent.USER_INPUT) is None
+            assert engine._fsm.lookup(FlowStep.GREETING, FlowEvent.USER_INPUT) is not None
+            assert engine.get_flow_summary()["total_transitions"] == len(engine.transitions)
 
 
 # ===========================================
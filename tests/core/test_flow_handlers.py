@@ -360,7 +360,7 @@ class TestFeedbackHandlers:
         assert call_args.metadata['response_mode'] == 'acknowledgment'
     
     @pytest.mark.asyncio
-    async def test_feedback_completion_with_save(self, sample_session, mock_companion_agent, mock_services_bundle):
+    async def test_feedback_completion_with_save(self, sample_session, mock_companion_agent, mock_services_bundle, mock_feedback_pipeline):
         """Test feedback completion with successful save"""
         # Setup session with existing feedback
         sample_session.feedback = ["Antwort 1", "Antwort 2", "Antwort 3", "Antwort 4"]
@@ -368,7 +368,8 @@ class TestFeedbackHandlers:
         
         handlers = FlowHandlers(
             companion_agent=mock_companion_agent,
-            redis_service=mock_services_bundle['redis_service']
+            redis_service=mock_services_bundle['redis_service'],
+            feedback_pipeline=mock_feedback_pipeline
         )
         
         # Execute
@@ -382,20 +383,13 @@ class TestFeedbackHandlers:
         assert len(sample_session.feedback) == 5
         assert sample_session.feedback[-1] == "finale@email.com"
         
-        # Verify save attempt
-        mock_services_bundle['redis_service'].set.assert_called_once()
+        # Verify the record was handed to the pipeline (written in the background)
+        mock_feedback_pipeline.submit.assert_called_once()
+        mock_services_bundle['redis_service'].set.assert_not_called()
+        assert mock_companion_agent.respond.call_args[0][0].metadata['save_success'] is True
         
         # Check save data structure
-        save_args = mock_services_bundle['redis_service'].set.call_args
-        # Handle both positional and keyword arguments
-        if save_args[0]:  # Positional args
-            key = save_args[0][0]
-            data = save_args[0][1]
-        else:  # Keyword args
-            key = save_args[1]['key']
-            data = save_args[1]['value']
-        
-        assert key.startswith("feedback:")
+        data = mock_feedback_pipeline.submit.call_args[0][0]
         assert data['session_id'] == sample_session.session_id
         assert data['symptom'] == "test symptom"
         assert len(data['responses']) == 5
@@ -453,11 +447,12 @@ class TestServiceIntegration:
         mock_services_bundle['prompt_manager'].get_prompt.assert_called()
     
     @pytest.mark.asyncio
-    async def test_complete_feedback_flow(self, sample_session, mock_services_bundle, mock_agents_bundle):
+    async def test_complete_feedback_flow(self, sample_session, mock_services_bundle, mock_agents_bundle, mock_feedback_pipeline):
         """Test complete feedback collection flow"""
         handlers = FlowHandlers(
             companion_agent=mock_agents_bundle['companion_agent'],
-            redis_service=mock_services_bundle['redis_service']
+            redis_service=mock_services_bundle['redis_service'],
+            feedback_pipeline=mock_feedback_pipeline
         )
         
         # Simulate feedback sequence
@@ -486,7 +481,7 @@ class TestServiceIntegration:
         assert len(sample_session.feedback) == 5
         
         # Verify save was attempted
-        mock_services_bundle['redis_service'].set.assert_called_once()
+        mock_feedback_pipeline.submit.assert_called_once()
 
 
 # ===========================================
@@ -554,42 +549,34 @@ class TestBusinessLogic:
         assert len(exercise) > 20
     
     @pytest.mark.asyncio
-    async def test_feedback_save_logic(self, sample_session, mock_services_bundle):
+    async def test_feedback_save_logic(self, sample_session, mock_services_bundle, mock_feedback_pipeline):
         """Test feedback saving business logic"""
         # Setup session with feedback
         sample_session.feedback = ["Antwort 1", "Antwort 2", "Antwort 3"]
         sample_session.active_symptom = "test verhalten"
         
-        handlers = FlowHandlers(**mock_services_bundle)
+        handlers = FlowHandlers(**mock_services_bundle, feedback_pipeline=mock_feedback_pipeline)
         
         # Execute save
         success = await handlers._save_feedback(sample_session)
         
         # Verify
         assert success is True
-        
-        # Check Redis call
-        mock_services_bundle['redis_service'].set.assert_called_once()
-        save_args = mock_services_bundle['redis_service'].set.call_args
-        
-        # Handle both positional and keyword arguments
-        if save_args[0]:  # Positional args
-            if len(save_args[0]) >= 3:
-                key, data, expire = save_args[0][0], save_args[0][1], save_args[0][2]
-            else:
-                key, data = save_args[0][0], save_args[0][1]
-                expire = save_args[1].get('expire', None)
-        else:  # Keyword args
-            key = save_args[1]['key']
-            data = save_args[1]['value']
-            expire = save_args[1].get('expire', None)
+        mock_feedback_pipeline.submit.assert_called_once()
+        data = mock_feedback_pipeline.submit.call_args[0][0]
         
         # Verify data structure
-        assert key == f"feedback:{sample_session.session_id}"
         assert data['session_id'] == sample_session.session_id
         assert data['symptom'] == "test verhalten"
         assert data['responses'] == ["Antwort 1", "Antwort 2", "Antwort 3"]
-        assert expire == 7776000  # 90 days
+        
+        # The queued record does not change with the session
+        sample_session.feedback.append("Antwort 4")
+        assert len(data['responses']) == 3
+        
+        # A record the pipeline cannot accept is reported as not saved
+        mock_feedback_pipeline.submit.return_value = False
+        assert await handlers._save_feedback(sample_session) is False
     
     def test_gpt_response_parsing(self, mock_services_bundle):
         """Test GPT response parsing utilities"""
@@ -0,0 +1,65 @@
+# tests/v2/core/test_intent_classifier.py
+"""
+Tests for the compiled intent classifier.
+"""
+
+import pytest
+
+from src.core.intent_classifier import IntentClassifier, Intent, get_intent_classifier
+from src.services.validation_service import ValidationService
+from src.prompts.common_prompts import is_yes_response, is_no_response, is_restart_command
+
+
+@pytest.fixture
+def classifier():
+    return IntentClassifier()
+
+
+@pytest.mark.unit
+class TestIntentClassifier:
+    """Test yes/no/restart classification"""
+
+    @pytest.mark.parametrize("reply", ["ja", "Ja, gerne!", "klar", "auf jeden Fall", "okay", "yes"])
+    def test_yes(self, classifier, reply):
+        assert classifier.classify(reply) == Intent.YES
+
+    @pytest.mark.parametrize("reply", ["nein", "Nein danke.", "nö", "lieber nicht", "auf keinen Fall", "no"])
+    def test_no(self, classifier, reply):
+        assert classifier.classify(reply) == Intent.NO
+
+    @pytest.mark.parametrize("reply", ["neu", "NEU!", "von  vorne", "Neustart", "nochmal"])
+    def test_restart(self, classifier, reply):
+        assert classifier.classify(reply) == Intent.RESTART
+
+    @pytest.mark.parametrize("reply", [
+        "noch eine frage",            # "no" inside a word
+        "wir haben einen jaguar",     # "ja" inside a word
+        "der hund ist neu bei uns",   # restart word inside a sentence
+        "vielleicht",
+        "",
+    ])
+    def test_no_intent(self, classifier, reply):
+        assert classifier.classify(reply) == Intent.NONE
+
+    def test_leftmost_phrase_wins(self, classifier):
+        assert classifier.classify("ja, nicht schlecht") == Intent.YES
+        assert classifier.classify("nein, ja nicht noch eine Übung") == Intent.NO
+
+    def test_classify_yes_no_ignores_restart(self, classifier):
+        assert classifier.classify_yes_no("neu") == Intent.NONE
+
+    def test_custom_patterns(self):
+        classifier = IntentClassifier(yes_patterns=["jep"], no_patterns=["nope"], restart_commands=["start"])
+        assert classifier.classify("jep") == Intent.YES
+        assert classifier.classify("ja") == Intent.NONE
+        assert classifier.classify("Start!") == Intent.RESTART
+
+    def test_shared_instance(self):
+        assert get_intent_classifier() is get_intent_classifier()
+        assert ValidationService().intent_classifier is get_intent_classifier()
+
+    def test_common_prompt_helpers_use_classifier(self):
+        assert is_yes_response("Gerne!")
+        assert is_no_response("noch nicht")
+        assert is_restart_command("von vorn")
+        assert not is_restart_command("mein hund ist neu")
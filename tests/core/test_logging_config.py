@@ -0,0 +1,106 @@
+# tests/v2/core/test_logging_config.py
+"""
+Tests for the queue-based logging pipeline.
+"""
+
+import sys
+import json
+import queue
+import logging
+import pytest
+
+import src.core.logging_config as logging_module
+from src.core.logging_config import JsonFormatter, LazyQueueHandler, get_logging_metrics
+
+
+def _record(level=logging.INFO, msg="Session %s erstellt", args=("s1",), **extra):
+    record = logging.LogRecord("src.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+class TestJsonFormatter:
+    """Test structured records"""
+
+    def test_fields_and_extra(self):
+        entry = json.loads(JsonFormatter().format(_record(session_id="s1")))
+
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "src.test"
+        assert entry["message"] == "Session s1 erstellt"
+        assert entry["session_id"] == "s1"
+        assert entry["ts"].endswith("+00:00")
+
+    def test_timestamp(self):
+        record = _record()
+        record.created = 1760848496.25
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["ts"] == "2025-10-19T04:34:56.250+00:00"
+
+    def test_exception(self):
+        try:
+            raise ValueError("kaputt")
+        except ValueError:
+            record = logging.LogRecord("src.test", logging.ERROR, __file__, 1, "Fehler", (), sys.exc_info())
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert "ValueError: kaputt" in entry["exception"]
+
+
+@pytest.mark.unit
+class TestLazyQueueHandler:
+    """Test queueing, sampling and overflow"""
+
+    def test_records_are_queued_unformatted(self):
+        handler = LazyQueueHandler(queue.Queue())
+        record = _record()
+        handler.handle(record)
+
+        queued = handler.queue.get_nowait()
+        assert queued is record
+        assert queued.args == ("s1",)
+
+    def test_mutable_arguments_are_rendered_on_queueing(self):
+        handler = LazyQueueHandler(queue.Queue())
+        analysis = {"instinct": "jagd"}
+        handler.handle(_record(msg="Analyse: %s, %s", args=(analysis, "s1"), context=["klingel"]))
+        analysis["instinct"] = "territorial"
+
+        queued = handler.queue.get_nowait()
+        assert queued.getMessage() == "Analyse: {'instinct': 'jagd'}, s1"
+        assert queued.args is None
+        assert queued.context == "['klingel']"
+
+    def test_debug_sampling(self):
+        handler = LazyQueueHandler(queue.Queue(), debug_sample_rate=0.0)
+        handler.handle(_record(level=logging.DEBUG))
+        handler.handle(_record(level=logging.INFO))
+
+        assert handler.queue.qsize() == 1
+        assert handler.sampled_out == 1
+
+    def test_full_queue_drops(self):
+        handler = LazyQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(_record())
+        handler.handle(_record())
+
+        assert handler.dropped == 1
+
+    def test_metrics(self, monkeypatch):
+        monkeypatch.setattr(logging_module, "_queue_handler", LazyQueueHandler(queue.Queue(maxsize=5)))
+        monkeypatch.setattr(logging_module, "_listener", None)
+
+        metrics = get_logging_metrics()
+        assert metrics["active"] is False
+        assert metrics["max_queued"] == 5
+
+    def test_stop_closes_handlers(self, monkeypatch, tmp_path):
+        handler = logging.FileHandler(tmp_path / "wuffchat.log")
+        monkeypatch.setattr(logging_module, "_queue_handler", LazyQueueHandler(queue.Queue()))
+        monkeypatch.setattr(logging_module, "_listener", None)
+        logging_module._start_listener([handler])
+
+        logging_module.stop_logging()
+        assert handler.stream is None
@@ -14,6 +14,7 @@ from src.agents.base_agent import V2AgentMessage, MessageType
 from src.core.orchestrator import V2Orchestrator, get_orchestrator, handle_message, init_orchestrator
 from src.core.flow_engine import FlowEngine, FlowEvent
 from src.core.exceptions import V2FlowError, V2ValidationError
+from src.core.experiments import Experiment, ExperimentEngine
 
 
 # ===========================================
@@ -100,6 +101,41 @@ class TestOrchestratorCore:
         assert messages[0]["message_type"] == "greeting"
         assert "metadata" in messages[0]
     
+    @pytest.mark.asyncio
+    async def test_start_conversation_uses_precomputed_greeting(self, sample_session_store):
+        """Test that /flow_intro needs neither the services nor the FSM"""
+        orchestrator = V2Orchestrator(session_store=sample_session_store)
+        assert orchestrator.prepare_greeting()
+        session = sample_session_store.create_session()
+        
+        messages = await orchestrator.start_conversation(session.session_id, session=session)
+        
+        assert [msg["message_type"] for msg in messages] == ["greeting", "question"]
+        assert session.current_step == FlowStep.WAIT_FOR_SYMPTOM
+        assert [msg.text for msg in session.messages] == [msg["text"] for msg in messages]
+        assert not orchestrator._services_initialized
+    
+    @pytest.mark.asyncio
+    async def test_precomputed_greeting_metadata_is_not_shared(self, sample_session_store):
+        """Test that one response cannot change the cached greeting"""
+        orchestrator = V2Orchestrator(session_store=sample_session_store)
+        first = sample_session_store.create_session()
+        messages = await orchestrator.start_conversation(first.session_id, session=first)
+        messages[0]["metadata"]["experiment"] = "kurz"
+        
+        second = sample_session_store.create_session()
+        messages = await orchestrator.start_conversation(second.session_id, session=second)
+        assert "experiment" not in messages[0]["metadata"]
+    
+    def test_greeting_experiment_disables_precomputed_greeting(self, sample_session_store):
+        """Test that sessions in a greeting experiment get their variant"""
+        orchestrator = V2Orchestrator(session_store=sample_session_store)
+        orchestrator.experiments = ExperimentEngine({
+            "dog.greeting": Experiment("dog.greeting", {"control": 50, "kurz": 50})
+        })
+        
+        assert not orchestrator.prepare_greeting()
+    
     def test_get_session_info(self, sample_session_store):
         """Test session information retrieval"""
         # Setup session with data
@@ -430,6 +466,27 @@ class TestV1Compatibility:
         assert message["metadata"]["test_key"] == "test_value"
         assert message["metadata"]["score"] == 0.9
 
+    @pytest.mark.asyncio
+    async def test_messages_are_stored_in_session_history(self, sample_session_store):
+        """Test that the history gets the same messages as the response"""
+        mock_engine = AsyncMock(spec=FlowEngine)
+        mock_engine.classify_user_input.return_value = FlowEvent.USER_INPUT
+        mock_engine.process_event.return_value = (
+            FlowStep.WAIT_FOR_CONFIRMATION,
+            [V2AgentMessage(sender="dog", text="Wuff!", message_type="response")]
+        )
+
+        orchestrator = V2Orchestrator(session_store=sample_session_store, flow_engine=mock_engine)
+        result = await orchestrator.handle_message("history-test", "Mein Hund bellt")
+
+        session = sample_session_store.get_or_create("history-test")
+        history = session.model_dump()["messages"]
+        assert history[-2:] == [
+            {"sender": "user", "text": "Mein Hund bellt"},
+            {"sender": "dog", "text": "Wuff!"}
+        ]
+        assert result == [{"sender": "dog", "text": "Wuff!", "message_type": "response", "metadata": {}}]
+
 
 # ===========================================
 # HEALTH CHECKS & MONITORING
@@ -0,0 +1,126 @@
+# tests/v2/core/test_prompt_manager.py
+"""
+Tests for PromptManager: compiled rendering and the shared prompt registry.
+"""
+
+import pytest
+
+from src.core.exceptions import PromptError
+from src.core.prompt_manager import (
+    CompiledPrompt, Prompt, PromptCategory, PromptManager, PromptType,
+    get_prompt_manager, get_prompt_registry
+)
+
+
+@pytest.fixture(scope="module")
+def manager():
+    prompt_manager = PromptManager()
+    prompt_manager.load_prompts()
+    return prompt_manager
+
+
+@pytest.mark.unit
+class TestCompiledPrompt:
+    """Test the pre-parsed renderer"""
+
+    def test_constant_prompt_is_interned(self):
+        renderer = CompiledPrompt("test.constant", "Wuff! " + "Hallo", [])
+        assert renderer.constant == "Wuff! Hallo"
+        assert renderer.render({}) is renderer.render({"unused": 1})
+
+    def test_renders_variables(self):
+        renderer = CompiledPrompt("test.vars", "Ich bin {name}, {age} Jahre alt, {name}!", ["name", "age"])
+        assert renderer.required == frozenset({"name", "age"})
+        assert renderer.render({"name": "Bello", "age": 3, "extra": "x"}) == "Ich bin Bello, 3 Jahre alt, Bello!"
+
+    def test_escaped_braces(self):
+        renderer = CompiledPrompt("test.json", 'Antworte als {{"instinct": "{instinct}"}}', ["instinct"])
+        assert renderer.render({"instinct": "jagd"}) == 'Antworte als {"instinct": "jagd"}'
+
+    def test_missing_variables_raise(self):
+        renderer = CompiledPrompt("test.vars", "Hallo {name}", ["name"])
+        with pytest.raises(PromptError) as exc_info:
+            renderer.render({})
+        assert exc_info.value.details["missing_variables"] == ["name"]
+
+    def test_template_fields_are_required_even_if_not_declared(self):
+        renderer = CompiledPrompt("test.vars", "{symptom} und {context}", ["symptom"])
+        assert renderer.required == frozenset({"symptom", "context"})
+
+    def test_format_spec_falls_back_to_str_format(self):
+        renderer = CompiledPrompt("test.spec", "Score: {score:.1f} von {user.name}", [])
+        assert renderer.required == frozenset({"score", "user"})
+        with pytest.raises(PromptError):
+            renderer.render({"score": 1.25, "user": object()})
+        assert renderer.render({"score": 1.25, "user": type("User", (), {"name": "Anna"})}) == "Score: 1.2 von Anna"
+
+    def test_invalid_template_without_variables_is_returned_as_is(self):
+        renderer = CompiledPrompt("test.invalid", "Klammer { offen", [])
+        assert renderer.render({}) == "Klammer { offen"
+
+    def test_prompt_recompiles_after_template_change(self):
+        prompt = Prompt(key="test.change", template="Hallo {name}", category=PromptCategory.COMMON)
+        assert prompt.format(name="Bello") == "Hallo Bello"
+        prompt.template = "Tschüss {name}"
+        assert prompt.format(name="Bello") == "Tschüss Bello"
+
+
+@pytest.mark.unit
+class TestPromptManagerRendering:
+    """Test that compiled rendering matches str.format for all prompts"""
+
+    def test_all_prompts_render_like_str_format(self, manager):
+        for key, prompt in manager.prompts.items():
+            kwargs = {name: f"<{name}>" for name in prompt.compile().required}
+            assert manager.get(key, **kwargs) == prompt.template.format(**kwargs), key
+
+    def test_get_prompt_with_enum_and_string(self, manager):
+        expected = manager.get(PromptType.DOG_GREETING.value)
+        assert manager.get_prompt(PromptType.DOG_GREETING) == expected
+        assert manager.get_prompt("dog.greeting") == expected
+
+    def test_get_prompt_with_variables(self, manager):
+        text = manager.get_prompt(PromptType.DOG_PERSPECTIVE, symptom="Bellen", match="Jagdtrieb")
+        assert "Bellen" in text and "Jagdtrieb" in text
+
+    def test_unknown_prompt_raises(self, manager):
+        with pytest.raises(PromptError):
+            manager.get_prompt(PromptType.DOG_DIAGNOSIS)
+        with pytest.raises(PromptError):
+            manager.get("does.not.exist")
+
+    def test_get_loads_prompts_lazily(self):
+        lazy_manager = PromptManager()
+        assert lazy_manager.get_prompt(PromptType.DOG_GREETING)
+        assert lazy_manager._loaded
+
+
+@pytest.mark.unit
+class TestPromptRegistry:
+    """Test the process-wide shared prompt registry"""
+
+    def test_managers_share_the_registry(self):
+        registry = get_prompt_registry()
+        first, second = PromptManager(), PromptManager()
+        first.load_prompts()
+        second.load_prompts()
+        assert first.prompts is registry.prompts
+        assert second._renderers is registry.renderers
+        assert get_prompt_manager().prompts is registry.prompts
+
+    def test_registry_is_read_only(self):
+        registry = get_prompt_registry()
+        with pytest.raises(TypeError):
+            registry.prompts["dog.greeting"] = None
+        with pytest.raises(AttributeError):
+            registry.prompts = {}
+
+    def test_add_prompt_copies_before_writing(self):
+        registry = get_prompt_registry()
+        manager = PromptManager(registry)
+        manager.add_prompt(Prompt(key="test.extra", template="Extra {name}", category=PromptCategory.COMMON))
+
+        assert manager.get("test.extra", name="Bello") == "Extra Bello"
+        assert manager.get_prompt(PromptType.DOG_GREETING) == registry.renderers["dog.greeting"].render({})
+        assert "test.extra" not in registry.prompts
+        assert "test.extra" not in registry.renderers
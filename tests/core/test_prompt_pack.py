@@ -0,0 +1,166 @@
+# tests/v2/core/test_prompt_pack.py
+"""
+Tests for file-based prompt packs and prompt hot reload.
+"""
+
+import sys
+import pytest
+
+import src.core.prompt_manager as prompt_manager_module
+from src.core.exceptions import PromptError
+from src.core.prompt_manager import (
+    Prompt, PromptCategory, PromptManager, PromptType,
+    build_prompt_registry, get_prompt_manager, get_prompt_registry, reload_prompts, template_version
+)
+from src.core.prompt_pack import (
+    PromptPack, PromptPackConfig, list_pack_versions, load_pack_registry,
+    pack_path, resolve_pack_path, write_prompt_pack
+)
+
+
+@pytest.fixture(scope="module")
+def builtin():
+    return build_prompt_registry()
+
+
+@pytest.fixture
+def pack_dir(tmp_path, builtin):
+    write_prompt_pack(builtin.prompts, pack_path(tmp_path, "de", "2024.9"), "de", "2024.9")
+    return tmp_path
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    """Fresh process-wide registry and manager for each test"""
+    monkeypatch.setattr(prompt_manager_module, "_prompt_registry", None)
+    monkeypatch.setattr(prompt_manager_module, "_prompt_manager", None)
+
+
+@pytest.mark.unit
+class TestPromptPack:
+    """Test the pack file format"""
+
+    def test_roundtrip(self, pack_dir, builtin):
+        pack = PromptPack(pack_path(pack_dir, "de", "2024.9"))
+        try:
+            assert (pack.locale, pack.version, pack.count) == ("de", "2024.9", len(builtin.prompts))
+            for key, prompt in builtin.prompts.items():
+                loaded = pack.load(key)
+                assert loaded.template == prompt.template
+                assert loaded.category == prompt.category
+                assert loaded.version == prompt.version
+            with pytest.raises(KeyError):
+                pack.load("does.not.exist")
+        finally:
+            pack.close()
+
+    def test_corrupt_index_is_rejected(self, pack_dir):
+        path = pack_path(pack_dir, "de", "2024.9")
+        data = bytearray(path.read_bytes())
+        data[-3] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with pytest.raises(PromptError):
+            PromptPack(path)
+
+    def test_not_a_pack(self, tmp_path):
+        path = tmp_path / "broken.wcp"
+        path.write_bytes(b"no prompt pack" * 10)
+        with pytest.raises(PromptError):
+            PromptPack(path)
+
+    def test_newest_version_is_resolved(self, pack_dir, builtin):
+        write_prompt_pack(builtin.prompts, pack_path(pack_dir, "de", "2024.10"), "de", "2024.10")
+        assert list_pack_versions(pack_dir, "de") == ["2024.9", "2024.10"]
+        config = PromptPackConfig(directory=pack_dir, locale="de")
+        assert resolve_pack_path(config).name == "2024.10.wcp"
+        assert resolve_pack_path(config, "2024.9").name == "2024.9.wcp"
+        with pytest.raises(PromptError):
+            resolve_pack_path(PromptPackConfig(directory=pack_dir, locale="en"))
+
+
+@pytest.mark.unit
+class TestPackRegistry:
+    """Test lazily decoded registries built from packs"""
+
+    def test_prompts_are_decoded_on_first_use(self, pack_dir, builtin):
+        registry = load_pack_registry(pack_path(pack_dir, "de", "2024.9"))
+        assert registry.prompts._decoded == {}
+        assert "dog.greeting" in registry.prompts
+        assert registry.prompts._decoded == {}
+
+        manager = PromptManager(registry)
+        assert manager.get_prompt(PromptType.DOG_GREETING) == builtin.renderers["dog.greeting"].render({})
+        assert list(registry.prompts._decoded) == ["dog.greeting"]
+        assert manager.get_prompt(
+            PromptType.DOG_PERSPECTIVE, symptom="Bellen", match="Jagd"
+        ) == builtin.renderers["generation.dog_perspective"].render({"symptom": "Bellen", "match": "Jagd"})
+
+    def test_template_versions_come_from_metadata(self, pack_dir, builtin):
+        registry = load_pack_registry(pack_path(pack_dir, "de", "2024.9"))
+        assert dict(registry.prompt_versions) == dict(builtin.prompt_versions)
+        assert registry.prompts._decoded == {}
+
+
+@pytest.mark.unit
+class TestPromptVersion:
+    """Test that Prompt.version tracks the template content"""
+
+    def test_version_is_template_hash(self):
+        prompt = Prompt(key="test.a", template="Hallo {name}", category=PromptCategory.COMMON)
+        same = Prompt(key="test.b", template="Hallo {name}", category=PromptCategory.DOG)
+        other = Prompt(key="test.a", template="Hallo {name}!", category=PromptCategory.COMMON)
+        assert prompt.version == same.version == template_version("Hallo {name}")
+        assert prompt.version != other.version
+
+    def test_manager_exposes_version(self):
+        manager = PromptManager(get_prompt_registry())
+        assert manager.prompt_version(PromptType.DOG_GREETING) == manager.prompts["dog.greeting"].version
+        with pytest.raises(PromptError):
+            manager.prompt_version("does.not.exist")
+
+
+@pytest.mark.unit
+class TestPromptReload:
+    """Test configuration and hot reload of prompt packs"""
+
+    def test_without_pack_dir_uses_builtin_prompts(self, monkeypatch, isolated_registry):
+        monkeypatch.delenv("PROMPT_PACK_DIR", raising=False)
+        assert get_prompt_registry().source is None
+        assert reload_prompts()["reloaded"] is False
+
+    def test_pack_reader_not_imported_without_pack_dir(self, monkeypatch, isolated_registry):
+        monkeypatch.delenv("PROMPT_PACK_DIR", raising=False)
+        monkeypatch.delitem(sys.modules, "src.core.prompt_pack")
+        get_prompt_registry()
+        reload_prompts()
+        assert "src.core.prompt_pack" not in sys.modules
+
+    def test_missing_pack_falls_back_to_builtin(self, monkeypatch, tmp_path, isolated_registry):
+        monkeypatch.setenv("PROMPT_PACK_DIR", str(tmp_path))
+        registry = get_prompt_registry()
+        assert registry.source is None
+        assert "dog.greeting" in registry.prompts
+
+    def test_reload_switches_version(self, monkeypatch, pack_dir, builtin, isolated_registry):
+        monkeypatch.setenv("PROMPT_PACK_DIR", str(pack_dir))
+        manager = get_prompt_manager()
+        assert manager.registry.version == "2024.9"
+        assert reload_prompts()["reloaded"] is False
+
+        prompts = dict(builtin.prompts)
+        prompts["dog.greeting"] = Prompt(key="dog.greeting", template="Wuff, neu!", category=PromptCategory.DOG)
+        write_prompt_pack(prompts, pack_path(pack_dir, "de", "2024.10"), "de", "2024.10")
+
+        result = reload_prompts()
+        assert result["reloaded"] is True
+        assert result["version"] == "2024.10"
+        assert result["changed"] == ["dog.greeting"]
+        assert manager.get_prompt(PromptType.DOG_GREETING) == "Wuff, neu!"
+
+        result = reload_prompts(version="2024.9")
+        assert result["changed"] == ["dog.greeting"]
+        assert manager.get_prompt(PromptType.DOG_GREETING) == builtin.renderers["dog.greeting"].render({})
+
+        with pytest.raises(PromptError):
+            reload_prompts(version="1999.1")
+        assert manager.registry.version == "2024.9"
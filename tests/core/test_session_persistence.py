@@ -0,0 +1,243 @@
+# tests/v2/core/test_session_persistence.py
+"""
+Tests for session dirty tracking and the write-behind flusher.
+"""
+
+import json
+import pytest
+
+from src.models.flow_models import FlowStep, AgentMessage
+from src.models.session_state import SessionState
+from src.core.session_persistence import SessionWriteBehind, WriteBehindConfig, RedisSessionStore
+from src.core.exceptions import SessionUnavailableError
+
+
+@pytest.fixture
+def writer(mock_redis):
+    """Write-behind flusher with a short TTL"""
+    return SessionWriteBehind(mock_redis, WriteBehindConfig(flush_interval=0.01, session_ttl=60))
+
+
+@pytest.mark.unit
+class TestSessionDirtyTracking:
+    """Test dirty-field tracking on SessionState"""
+
+    def test_new_session_is_clean(self):
+        session = SessionState()
+        assert session.take_dirty_fields() == set()
+
+    def test_assignment_marks_field_dirty(self):
+        session = SessionState()
+        session.current_step = FlowStep.WAIT_FOR_SYMPTOM
+        session.active_symptom = "bellt"
+
+        assert session.take_dirty_fields() == {"current_step", "active_symptom"}
+        assert session.take_dirty_fields() == set()
+
+    def test_dirty_tracking_not_serialized(self):
+        session = SessionState()
+        session.current_step = FlowStep.WAIT_FOR_SYMPTOM
+
+        assert "_dirty_fields" not in session.model_dump()
+
+    def test_pending_messages_and_rewrite_detection(self):
+        session = SessionState()
+        session.messages.append(AgentMessage(sender="dog", text="Hallo"))
+        assert len(session.pending_messages()) == 1
+
+        session.mark_messages_flushed(1)
+        assert session.pending_messages() == []
+        assert not session.messages_rewritten()
+
+        session.messages.clear()
+        session.messages.append(AgentMessage(sender="dog", text="Neu"))
+        assert session.messages_rewritten()
+
+
+@pytest.mark.unit
+class TestSessionWriteBehind:
+    """Test coalescing and pipelined flushing"""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_only_changed_fields(self, writer, mock_pipeline):
+        session = SessionState(session_id="s1")
+        session.current_step = FlowStep.WAIT_FOR_SYMPTOM
+        session.messages.append(AgentMessage(sender="dog", text="Hallo"))
+        writer.mark_dirty(session)
+
+        assert await writer.flush() == 1
+
+        mapping = mock_pipeline.hset.call_args.kwargs["mapping"]
+        assert json.loads(mapping["current_step"]) == "wait_for_symptom"
+        assert "active_symptom" not in mapping
+        mock_pipeline.rpush.assert_called_once()
+        assert mock_pipeline.rpush.call_args.args[0] == "session:s1:messages"
+        mock_pipeline.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_second_flush_only_sends_delta(self, writer, mock_pipeline):
+        session = SessionState(session_id="s1")
+        session.messages.append(AgentMessage(sender="dog", text="Hallo"))
+        writer.mark_dirty(session)
+        await writer.flush()
+        mock_pipeline.reset_mock()
+
+        session.feedback.append("Sehr hilfreich")
+        session.messages.append(AgentMessage(sender="user", text="Danke"))
+        writer.mark_dirty(session)
+        await writer.flush()
+
+        mapping = mock_pipeline.hset.call_args.kwargs["mapping"]
+        assert set(mapping) == {"feedback"}
+        pushed = mock_pipeline.rpush.call_args.args[1:]
+        assert [json.loads(m)["text"] for m in pushed] == ["Danke"]
+        mock_pipeline.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sessions_coalesced_into_one_pipeline(self, writer, mock_redis, mock_pipeline):
+        for i in range(3):
+            session = SessionState(session_id=f"s{i}")
+            session.active_symptom = "bellt"
+            writer.mark_dirty(session)
+            writer.mark_dirty(session)
+
+        assert writer.pending_count == 3
+        assert await writer.flush() == 3
+        assert mock_redis.client.pipeline.call_count == 1
+        assert mock_pipeline.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_changes(self, writer, mock_pipeline):
+        mock_pipeline.execute.side_effect = ConnectionError("down")
+        session = SessionState(session_id="s1")
+        session.active_symptom = "bellt"
+        session.messages.append(AgentMessage(sender="dog", text="Hallo"))
+        writer.mark_dirty(session)
+
+        assert await writer.flush() == 0
+        assert writer.pending_count == 1
+
+        mock_pipeline.reset_mock()
+        mock_pipeline.execute.side_effect = None
+        assert await writer.flush() == 1
+        assert "active_symptom" in mock_pipeline.hset.call_args.kwargs["mapping"]
+        mock_pipeline.rpush.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self, writer, mock_pipeline):
+        await writer.start()
+        session = SessionState(session_id="s1")
+        session.active_symptom = "bellt"
+        writer.mark_dirty(session)
+
+        await writer.stop()
+
+        assert writer.pending_count == 0
+        mock_pipeline.execute.assert_awaited()
+
+
+@pytest.mark.unit
+class TestRedisSessionStore:
+    """Test the shared store used in multi-worker mode"""
+
+    @pytest.mark.asyncio
+    async def test_load_decodes_stored_session(self, writer, mock_pipeline):
+        message = json.dumps({"sender": "dog", "text": "Hallo"})
+        mock_pipeline.execute.return_value = [
+            {"current_step": json.dumps("wait_for_symptom"), "feedback": json.dumps([])},
+            [message]
+        ]
+        store = RedisSessionStore(writer)
+
+        session = await store.load("s1")
+
+        assert session.session_id == "s1"
+        assert session.current_step == FlowStep.WAIT_FOR_SYMPTOM
+        assert [m.text for m in session.messages] == ["Hallo"]
+        assert session.take_dirty_fields() == set()
+        assert session.pending_messages() == []
+        assert store.sessions["s1"] is session
+
+    @pytest.mark.asyncio
+    async def test_load_unknown_session_creates_local(self, writer, mock_pipeline):
+        mock_pipeline.execute.return_value = [{}, []]
+        store = RedisSessionStore(writer)
+
+        session = await store.load("new")
+
+        assert session.session_id == "new"
+        assert session.current_step == FlowStep.GREETING
+
+    @pytest.mark.asyncio
+    async def test_load_unknown_session_ignores_cached_copy(self, writer, mock_pipeline):
+        store = RedisSessionStore(writer)
+        store.get_or_create("expired").current_step = FlowStep.WAIT_FOR_CONFIRMATION
+        mock_pipeline.execute.return_value = [{}, []]
+
+        session = await store.load("expired")
+
+        assert session.current_step == FlowStep.GREETING
+
+    @pytest.mark.asyncio
+    async def test_load_raises_while_redis_unavailable(self, writer, mock_redis, mock_pipeline):
+        store = RedisSessionStore(writer)
+        cached = store.get_or_create("s1")
+        mock_pipeline.execute.side_effect = ConnectionError("connection refused")
+
+        with pytest.raises(SessionUnavailableError):
+            await store.load("s1")
+
+        mock_redis.breaker.trip()
+        with pytest.raises(SessionUnavailableError):
+            await store.load("s1")
+        assert store.sessions["s1"] is cached
+
+    def test_local_cache_is_bounded(self, writer):
+        store = RedisSessionStore(writer, max_cached_sessions=2)
+        for session_id in ("a", "b", "c"):
+            store.get_or_create(session_id)
+        store.get_or_create("b")
+        store.create_session()
+
+        assert len(store.sessions) == 2
+        assert "b" in store.sessions
+
+    @pytest.mark.asyncio
+    async def test_save_writes_through(self, writer, mock_pipeline):
+        store = RedisSessionStore(writer)
+        session = store.get_or_create("s1")
+        session.active_symptom = "bellt"
+
+        await store.save(session)
+
+        mock_pipeline.execute.assert_awaited_once()
+        assert "active_symptom" in mock_pipeline.hset.call_args.kwargs["mapping"]
+        assert writer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_save_raises_while_redis_unavailable(self, writer, mock_redis):
+        store = RedisSessionStore(writer)
+        session = store.get_or_create("s1")
+        session.active_symptom = "bellt"
+        mock_redis.breaker.trip()
+
+        with pytest.raises(SessionUnavailableError):
+            await store.save(session)
+        assert writer.pending_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_write_through_answers_503(self, writer, mock_pipeline, mock_flow_engine, monkeypatch):
+        from fastapi import HTTPException
+        import src.main as main_module
+        from src.core.orchestrator import V2Orchestrator
+
+        store = RedisSessionStore(writer)
+        monkeypatch.setattr(main_module, "session_store", store)
+        monkeypatch.setattr(main_module, "orchestrator", V2Orchestrator(session_store=store, flow_engine=mock_flow_engine))
+        mock_pipeline.execute.side_effect = [[{}, []], ConnectionError("connection refused")]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await main_module.flow_step(main_module.MessageRequest(session_id="s1", message="Er bellt"))
+
+        assert exc_info.value.status_code == 503
+        assert writer.pending_count == 1
@@ -0,0 +1,133 @@
+# tests/v2/core/test_session_snapshot.py
+"""
+Tests for warm-restart session snapshots.
+"""
+
+import struct
+import pytest
+
+from src.models.flow_models import FlowStep, AgentMessage
+from src.models.session_state import SessionStore
+from src.core.session_snapshot import (
+    SessionSnapshot,
+    write_snapshot,
+    restore_snapshot,
+    get_snapshot_path,
+    SNAPSHOT_VERSION
+)
+from src.core.exceptions import SessionError
+
+
+@pytest.fixture
+def populated_store():
+    """Session store with a few conversations in progress"""
+    store = SessionStore()
+    for i in range(3):
+        session = store.get_or_create(f"session-{i}")
+        session.current_step = FlowStep.WAIT_FOR_CONFIRMATION
+        session.active_symptom = f"Symptom {i}"
+        session.messages.append(AgentMessage(sender="dog", text=f"Nachricht {i}"))
+    return store
+
+
+@pytest.mark.unit
+class TestSessionSnapshot:
+    """Test snapshot writing and lazy restoring"""
+
+    def test_roundtrip(self, populated_store, tmp_path):
+        path = tmp_path / "sessions.bin"
+        assert write_snapshot(populated_store, path) == 3
+
+        store = SessionStore()
+        assert restore_snapshot(store, path) == 3
+        assert store.sessions == {}
+        assert store.session_count() == 3
+
+        session = store.get_or_create("session-1")
+        assert session.current_step == FlowStep.WAIT_FOR_CONFIRMATION
+        assert session.active_symptom == "Symptom 1"
+        assert session.messages[0].text == "Nachricht 1"
+        assert session.take_dirty_fields() == set()
+        assert store.session_count() == 3
+        store.snapshot.close()
+
+    def test_unknown_session_created_fresh(self, populated_store, tmp_path):
+        path = tmp_path / "sessions.bin"
+        write_snapshot(populated_store, path)
+
+        store = SessionStore()
+        restore_snapshot(store, path)
+        session = store.get_or_create("unknown")
+        assert session.current_step == FlowStep.GREETING
+        store.snapshot.close()
+
+    def test_untouched_sessions_carried_over(self, populated_store, tmp_path):
+        first = tmp_path / "first.bin"
+        second = tmp_path / "second.bin"
+        write_snapshot(populated_store, first)
+
+        store = SessionStore()
+        restore_snapshot(store, first)
+        store.get_or_create("session-0").active_symptom = "geändert"
+        assert write_snapshot(store, second) == 3
+        store.snapshot.close()
+
+        restored = SessionStore()
+        restore_snapshot(restored, second)
+        assert restored.get_or_create("session-0").active_symptom == "geändert"
+        assert restored.get_or_create("session-2").active_symptom == "Symptom 2"
+        restored.snapshot.close()
+
+    def test_version_mismatch_rejected(self, populated_store, tmp_path):
+        path = tmp_path / "sessions.bin"
+        write_snapshot(populated_store, path)
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<H", data, 8, SNAPSHOT_VERSION + 1)
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SessionError):
+            SessionSnapshot(path)
+
+        store = SessionStore()
+        assert restore_snapshot(store, path) == 0
+
+    def test_corrupt_record_skipped(self, populated_store, tmp_path):
+        path = tmp_path / "sessions.bin"
+        write_snapshot(populated_store, path)
+
+        snapshot = SessionSnapshot(path)
+        _, offset, length, _, _ = snapshot.entry("session-1")
+        snapshot.close()
+
+        data = bytearray(path.read_bytes())
+        data[offset + 2] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        store = SessionStore()
+        restore_snapshot(store, path)
+        assert store.get_or_create("session-1").current_step == FlowStep.GREETING
+        assert store.get_or_create("session-2").active_symptom == "Symptom 2"
+        store.snapshot.close()
+
+    def test_temp_file_unique_and_cleaned_up(self, populated_store, tmp_path, monkeypatch):
+        path = tmp_path / "sessions.bin"
+        # A stale temp file of another process must not be touched
+        (tmp_path / "sessions.bin.tmp").write_bytes(b"other writer")
+        write_snapshot(populated_store, path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["sessions.bin", "sessions.bin.tmp"]
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("src.core.session_snapshot.os.fsync", fail)
+        with pytest.raises(OSError):
+            write_snapshot(populated_store, path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["sessions.bin", "sessions.bin.tmp"]
+
+    def test_disabled_with_multiple_workers(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SESSION_SNAPSHOT_PATH", str(tmp_path / "sessions.bin"))
+        monkeypatch.setenv("WEB_CONCURRENCY", "1")
+        assert get_snapshot_path() == tmp_path / "sessions.bin"
+
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        assert get_snapshot_path() is None
@@ -0,0 +1,147 @@
+# tests/v2/core/test_token_budget.py
+"""
+Tests for prompt token budgeting.
+"""
+
+import threading
+import pytest
+
+import src.core.token_budget as token_budget_module
+from src.core.exceptions import V2ConfigurationError
+from src.core.prompt_manager import PromptManager, PromptType, get_prompt_registry
+from src.core.token_budget import (
+    REPEATED_VALUE_REFERENCE, TRUNCATION_MARKER,
+    ApproximateTokenizer, TokenBudget, TokenBudgetConfig, get_token_budget_config, warm_token_budget
+)
+
+SENTENCE = "Der Hund bellt laut, wenn es an der Tür klingelt. "
+
+
+@pytest.fixture
+def budget():
+    config = TokenBudgetConfig(slot_budgets={"symptom": 20, "match": 60}, default_slot_tokens=40)
+    return TokenBudget(config, ApproximateTokenizer())
+
+
+@pytest.mark.unit
+class TestApproximateTokenizer:
+    """Test the vocabulary-free token estimate"""
+
+    def test_count(self):
+        tokenizer = ApproximateTokenizer()
+        assert tokenizer.count("") == 0
+        assert tokenizer.count("Hund") == 1
+        assert tokenizer.count("Territorialverhalten!") == 6
+        assert tokenizer.count(SENTENCE) == 14
+
+    def test_truncate_keeps_whole_words(self):
+        tokenizer = ApproximateTokenizer()
+        cut = tokenizer.truncate(SENTENCE * 3, 10)
+        assert tokenizer.count(cut) <= 10
+        assert SENTENCE.startswith(cut)
+        assert cut.endswith(" der")
+
+
+@pytest.mark.unit
+class TestSlotBudgets:
+    """Test capping of variable slots"""
+
+    def test_values_within_budget_are_unchanged(self, budget):
+        kwargs = {"symptom": "Bellen", "match": SENTENCE, "count": 3}
+        assert budget.fit(PromptType.DOG_PERSPECTIVE, kwargs) == kwargs
+
+    def test_long_values_are_cut_at_sentence_end(self, budget):
+        capped = budget.fit("test.prompt", {"match": SENTENCE * 10})["match"]
+        assert budget.count(capped) <= 60
+        assert capped.endswith("klingelt.")
+
+    def test_long_values_without_sentences_are_cut_at_words(self, budget):
+        capped = budget.fit("test.prompt", {"symptom": "bellt " * 100})["symptom"]
+        assert budget.count(capped) <= 20
+        assert capped.endswith(TRUNCATION_MARKER)
+
+    def test_unknown_slots_use_default_budget(self, budget):
+        capped = budget.fit("test.prompt", {"other": "wort " * 100})["other"]
+        assert 30 < budget.count(capped) <= 40
+
+    def test_truncation_is_counted(self, budget):
+        budget.fit(PromptType.DOG_PERSPECTIVE, {"symptom": "bellt " * 100})
+        stats = budget.get_stats()["prompts"]["generation.dog_perspective"]
+        assert stats["truncated_slots"] == 1
+        assert stats["tokens_cut"] > 50
+
+    def test_config_from_env(self, monkeypatch):
+        monkeypatch.setenv("PROMPT_SLOT_BUDGETS", '{"match": 300}')
+        config = get_token_budget_config()
+        assert config.slot_budgets["match"] == 300
+        assert config.slot_budgets["symptom"] == 200
+        monkeypatch.setenv("PROMPT_SLOT_BUDGETS", '{"match": 0}')
+        with pytest.raises(V2ConfigurationError):
+            get_token_budget_config()
+
+
+@pytest.mark.unit
+class TestFinish:
+    """Test deduplication and token reporting of rendered prompts"""
+
+    def test_repeated_long_value_is_expanded_once(self, budget):
+        match = SENTENCE * 3
+        text = budget.finish("test.prompt", f"A: {match}\nB: {match}\nC: {match}", {"match": match})
+        assert text.count(match) == 1
+        assert text.count(REPEATED_VALUE_REFERENCE) == 2
+        assert budget.get_stats()["prompts"]["test.prompt"]["deduplicated"] == 1
+
+    def test_short_values_are_not_deduplicated(self, budget):
+        text = budget.finish("test.prompt", "Bellen und nochmal Bellen", {"symptom": "Bellen"})
+        assert text == "Bellen und nochmal Bellen"
+
+    def test_token_count_is_recorded_per_key(self, budget):
+        manager = PromptManager(get_prompt_registry())
+        kwargs = budget.fit(PromptType.DOG_PERSPECTIVE, {"symptom": "Bellen", "match": SENTENCE * 20})
+        text = budget.finish(PromptType.DOG_PERSPECTIVE, manager.get_prompt(PromptType.DOG_PERSPECTIVE, **kwargs), kwargs)
+
+        stats = budget.get_stats()
+        assert stats["tokenizer"] == "approximate"
+        prompt_stats = stats["prompts"]["generation.dog_perspective"]
+        assert prompt_stats["renders"] == 1
+        assert prompt_stats["tokens_last"] == budget.count(text)
+        assert prompt_stats["tokens_last"] < 60 + budget.count(manager.prompts["generation.dog_perspective"].template)
+
+    def test_non_text_prompts_pass_through(self, budget):
+        prompt = object()
+        assert budget.finish("test.prompt", prompt, {}) is prompt
+        assert "test.prompt" not in budget.get_stats()["prompts"]
+
+
+@pytest.mark.unit
+class TestTokenizerStartup:
+    """The tokenizer is built once, off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_warm_builds_tokenizer_in_thread(self, monkeypatch):
+        threads = []
+
+        def create_tokenizer():
+            threads.append(threading.get_ident())
+            return ApproximateTokenizer()
+
+        monkeypatch.setattr(token_budget_module, "create_tokenizer", create_tokenizer)
+        monkeypatch.setattr(token_budget_module, "_tokenizer", None)
+        monkeypatch.setattr(token_budget_module, "_token_budget", None)
+
+        budget = await warm_token_budget()
+
+        assert threads and threads[0] != threading.get_ident()
+        # Budgets rebuilt after a fork reuse the tokenizer
+        assert TokenBudget(TokenBudgetConfig()).tokenizer is budget.tokenizer
+        assert len(threads) == 1
+
+
+@pytest.mark.unit
+def test_generation_templates_expand_slots_once():
+    """Database texts are the largest slots; templates must not repeat them"""
+    registry = get_prompt_registry()
+    for key, prompt in registry.prompts.items():
+        if key.startswith("generation."):
+            for variable in prompt.variables:
+                assert prompt.template.count("{%s}" % variable) == 1, (key, variable)
@@ -0,0 +1,163 @@
+# tests/v2/core/test_tracing.py
+"""
+Tests for per-turn tracing.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from src.core.tracing import Tracer, TracingConfig, TurnTrace, OtlpJsonFileExporter, span, traced, current_span
+from src.core.flow_engine import FlowEngine, FlowEvent
+from src.models.flow_models import FlowStep
+from src.models.session_state import SessionState
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(TracingConfig(turns_per_session=3, max_sessions=2))
+
+
+@traced("service.call", lambda value: {"value": value})
+async def _service_call(value):
+    return value * 2
+
+
+@pytest.mark.unit
+class TestTracer:
+    """Test span recording and buffering"""
+
+    def test_span_outside_turn_is_noop(self):
+        with span("orphan") as recorded:
+            assert recorded is None
+        assert current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_nested_spans_form_tree(self, tracer):
+        with tracer.turn("s1", kind="message") as root:
+            with tracer.span("transition", event="user_input"):
+                with tracer.span("handler"):
+                    assert await _service_call(2) == 4
+
+        trace = tracer.recent("s1")[0]
+        assert trace.root is root
+        transition = root.children[0]
+        handler = transition.children[0]
+        call = handler.children[0]
+        assert (transition.name, handler.name, call.name) == ("transition", "handler", "service.call")
+        assert call.attributes == {"value": 2}
+        assert call.parent_id == handler.span_id
+        assert {s.trace_id for s in root.walk()} == {root.trace_id}
+        assert root.end_ns >= call.end_ns >= call.start_ns >= root.start_ns
+
+    def test_error_marks_span(self, tracer):
+        with pytest.raises(ValueError):
+            with tracer.turn("s1"):
+                with tracer.span("handler"):
+                    raise ValueError("kaputt")
+
+        root = tracer.recent("s1")[0].root
+        assert root.status == "error"
+        assert root.children[0].error == "ValueError: kaputt"
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(TracingConfig(enabled=False))
+        with tracer.turn("s1") as root:
+            with tracer.span("handler") as child:
+                pass
+        assert root is None and child is None
+        assert tracer.recent("s1") == []
+
+    def test_hooks_receive_turns_and_failures_are_isolated(self, tracer):
+        received = []
+        tracer.add_hook(Mock(side_effect=RuntimeError("export down")))
+        tracer.add_hook(received.append)
+
+        with tracer.turn("s1"):
+            pass
+
+        assert len(received) == 1
+        assert isinstance(received[0], TurnTrace)
+
+    def test_otel_export_format(self, tracer):
+        with tracer.turn("s1"):
+            with tracer.span("classify", cached=True):
+                pass
+
+        export = tracer.recent("s1")[0].to_otel()
+        spans = export["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, child = spans
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert "parentSpanId" not in root
+        assert child["parentSpanId"] == root["spanId"]
+        assert {"key": "session.id", "value": {"stringValue": "s1"}} in root["attributes"]
+        assert child["attributes"] == [{"key": "cached", "value": {"boolValue": True}}]
+        assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+
+    def test_file_exporter_writes_in_background(self, tracer, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = OtlpJsonFileExporter(str(path))
+        tracer.add_hook(exporter)
+
+        for session_id in ("s1", "s2"):
+            with tracer.turn(session_id):
+                pass
+        assert exporter._thread.is_alive()
+        exporter.close()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2 and exporter.exported == 2
+        assert json.loads(lines[0])["resourceSpans"]
+
+
+@pytest.mark.unit
+class TestTraceBuffer:
+    """Test ring buffer bounds"""
+
+    def _trace(self, tracer, session_id):
+        with tracer.turn(session_id):
+            pass
+
+    def test_turns_per_session_bounded(self, tracer):
+        for _ in range(5):
+            self._trace(tracer, "s1")
+        assert len(tracer.recent("s1")) == 3
+        assert len(tracer.recent("s1", limit=2)) == 2
+
+    def test_least_recent_session_evicted(self, tracer):
+        self._trace(tracer, "s1")
+        self._trace(tracer, "s2")
+        self._trace(tracer, "s1")
+        self._trace(tracer, "s3")
+
+        assert tracer.recent("s2") == []
+        assert len(tracer.recent("s1")) == 2
+        assert len(tracer.recent("s3")) == 1
+
+
+@pytest.mark.unit
+class TestFlowEngineTracing:
+    """Test transition and handler spans from process_event"""
+
+    @pytest.mark.asyncio
+    async def test_process_event_records_transition(self, tracer):
+        with patch('src.core.flow_handlers.FlowHandlers'):
+            engine = FlowEngine(Mock())
+        engine.tracer = tracer
+        handler = AsyncMock(return_value=[])
+        handler.__name__ = "handle_greeting"
+        engine.add_transition(FlowStep.GREETING, FlowEvent.START_SESSION, FlowStep.WAIT_FOR_SYMPTOM, handler=handler)
+        engine._build_transition_map()
+
+        session = SessionState()
+        with tracer.turn(session.session_id):
+            await engine.process_event(session, FlowEvent.START_SESSION)
+
+        transition = tracer.recent(session.session_id)[0].root.children[0]
+        assert transition.name == "transition"
+        assert transition.attributes == {
+            "from_state": "greeting",
+            "event": "start_session",
+            "to_state": "wait_for_symptom"
+        }
+        assert transition.children[0].attributes["handler"] == "handle_greeting"
@@ -0,0 +1,159 @@
+# tests/v2/services/test_redis_codec.py
+"""
+Unit tests for the RedisService value codecs.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+import redis.asyncio as redis
+from redis._parsers.encoders import Encoder
+
+from src.services.redis_codec import RedisCodec, TAG_JSON, TAG_MSGPACK, FLAG_ZSTD
+from src.services.redis_service import RedisService, RedisConfig
+from src.core.exceptions import V2ConfigurationError
+
+SESSION = {
+    "session_id": "s1",
+    "current_state": "wait_for_confirmation",
+    "messages": [{"sender": "dog", "text": "Wuff! Ich rieche Aufregung – hör zu."}] * 5,
+    "metadata": {"counts": {"1": 2}},
+}
+
+
+def _as_read(stored) -> str:
+    """What a client with decode_responses and surrogateescape returns"""
+    return stored.decode("utf-8", "surrogateescape") if isinstance(stored, bytes) else stored
+
+
+class TestRedisCodec:
+    """Test encoding, format tags and reading old values"""
+
+    def test_json_codec_writes_untagged_json(self):
+        codec = RedisCodec("json")
+        assert codec.encode(SESSION) == json.dumps(SESSION)
+        assert not codec.binary
+
+    def test_strings_are_stored_unchanged(self):
+        codec = RedisCodec("orjson")
+        assert codec.encode("plain") == "plain"
+        assert codec.decode("plain") == "plain"
+        assert codec.decode("42") == 42
+
+    def test_orjson_roundtrip(self):
+        codec = RedisCodec("orjson")
+        stored = codec.encode(SESSION)
+
+        assert stored[0] == TAG_JSON
+        assert codec.decode(stored) == SESSION
+        assert codec.decode(_as_read(stored)) == SESSION
+
+    def test_old_json_stays_readable(self):
+        legacy = json.dumps(SESSION)
+        assert RedisCodec("orjson").decode(legacy) == SESSION
+        assert RedisCodec("json").decode(legacy.encode()) == SESSION
+
+    def test_tagged_values_are_read_by_any_codec(self):
+        stored = _as_read(RedisCodec("orjson").encode(SESSION))
+        assert RedisCodec("json").decode(stored) == SESSION
+
+    def test_msgpack_roundtrip(self):
+        pytest.importorskip("msgpack")
+        codec = RedisCodec("msgpack")
+        stored = codec.encode(SESSION)
+
+        assert stored[0] == TAG_MSGPACK
+        assert codec.decode(_as_read(stored)) == SESSION
+
+    def test_compression_over_threshold(self):
+        pytest.importorskip("zstandard")
+        codec = RedisCodec("orjson", compress_threshold=64)
+
+        small = codec.encode({"a": 1})
+        large = codec.encode(SESSION)
+        assert small[0] == TAG_JSON
+        assert large[0] == TAG_JSON | FLAG_ZSTD
+        assert len(large) < len(json.dumps(SESSION))
+        assert codec.decode(_as_read(large)) == SESSION
+
+    def test_invalid_configuration(self):
+        with pytest.raises(V2ConfigurationError):
+            RedisCodec("pickle")
+        with pytest.raises(V2ConfigurationError):
+            RedisCodec("json", compress_threshold=1024)
+
+
+class TestRedisServiceCodec:
+    """Test that RedisService (de)serializes with its codec"""
+
+    @pytest.fixture
+    def orjson_service(self):
+        service = RedisService(RedisConfig(url="redis://localhost:6379/0", codec="orjson"))
+        service._client = AsyncMock()
+        service._initialized = True
+        return service
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, orjson_service):
+        await orjson_service.set("session:s1", SESSION, ttl=60)
+        stored = orjson_service._client.setex.call_args.args[2]
+        assert stored[0] == TAG_JSON
+
+        orjson_service._client.get.return_value = _as_read(stored)
+        assert await orjson_service.get("session:s1") == SESSION
+
+    @pytest.mark.asyncio
+    async def test_mget_mixes_formats(self, orjson_service):
+        orjson_service._client.mget.return_value = [
+            _as_read(orjson_service.codec.encode({"new": True})), '{"old": true}', None
+        ]
+        assert await orjson_service.mget(["a", "b", "c"]) == [{"new": True}, {"old": True}, None]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_uses_codec(self, orjson_service):
+        pipe = Mock()
+        pipe.execute = AsyncMock(return_value=[True])
+        orjson_service._client = Mock()
+        orjson_service._client.pipeline.return_value = pipe
+
+        async with orjson_service.pipeline() as p:
+            p.set("feedback:s1", {"rating": 5})
+        assert pipe.set.call_args.args[1][0] == TAG_JSON
+
+    @pytest.fixture
+    def pool_kwargs(self, monkeypatch):
+        """Connection pool arguments of a json-codec service"""
+        captured = {}
+
+        def from_url(url, **kwargs):
+            captured.update(kwargs)
+            return Mock()
+
+        client = AsyncMock()
+        monkeypatch.setattr(redis.BlockingConnectionPool, "from_url", from_url)
+        monkeypatch.setattr(redis.Redis, "from_pool", Mock(return_value=client))
+        return captured
+
+    @pytest.mark.asyncio
+    async def test_json_service_decodes_with_surrogateescape(self, pool_kwargs):
+        service = RedisService(RedisConfig(url="redis://localhost:6379/0", codec="json"))
+        await service._initialize_client()
+        assert pool_kwargs["encoding_errors"] == "surrogateescape"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("codec, threshold, module", [("msgpack", 0, "msgpack"), ("orjson", 64, "zstandard")])
+    async def test_json_service_reads_binary_values(self, pool_kwargs, codec, threshold, module):
+        pytest.importorskip(module)
+        stored = RedisCodec(codec, compress_threshold=threshold).encode(SESSION)
+        service = RedisService(RedisConfig(url="redis://localhost:6379/0", codec="json"))
+        await service._initialize_client()
+
+        # What redis-py returns for the stored bytes with the pool's settings
+        encoder = Encoder("utf-8", pool_kwargs["encoding_errors"], pool_kwargs["decode_responses"])
+        service._client = AsyncMock()
+        service._client.get.return_value = encoder.decode(stored)
+        assert await service.get("session:s1") == SESSION
+
+    def test_invalid_codec_falls_back_to_json(self):
+        service = RedisService(RedisConfig(url="redis://localhost:6379/0", codec="pickle"))
+        assert service.codec.name == "json"
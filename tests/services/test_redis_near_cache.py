@@ -0,0 +1,146 @@
+# tests/v2/services/test_redis_near_cache.py
+"""
+Unit tests for the Redis near cache and its use in RedisService.
+"""
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.services.redis_near_cache import MISS, NearCache
+from src.services.redis_service import RedisService, RedisConfig
+
+
+@pytest.fixture
+def cache():
+    """Subscribed near cache (without a listener task)"""
+    near_cache = NearCache(max_entries=3, ttl=60.0)
+    near_cache._subscribed = True
+    return near_cache
+
+
+@pytest.fixture
+def cached_service(cache):
+    """Connected RedisService with a near cache and a mock client"""
+    service = RedisService(RedisConfig(url="redis://localhost:6379/0"))
+    service.near_cache = cache
+    service._client = AsyncMock()
+    service._client.get.return_value = '{"state": "greeting"}'
+    service._initialized = True
+    return service
+
+
+class TestNearCache:
+    """Test LRU, expiry and invalidation"""
+
+    def test_put_and_get(self, cache):
+        assert cache.get("a") is MISS
+        cache.put("a", "1", cache.epoch)
+        assert cache.get("a") == "1"
+        assert cache.get_metrics()["hit_rate"] == 0.5
+
+    def test_bounded_lru(self, cache):
+        for key in "abc":
+            cache.put(key, key, cache.epoch)
+        cache.get("a")
+        cache.put("d", "d", cache.epoch)
+
+        assert cache.get("b") is MISS
+        assert cache.get("a") == "a"
+        assert cache.get_metrics()["evictions"] == 1
+
+    def test_expired_entry_is_a_miss(self, cache):
+        cache.ttl = -1.0
+        cache.put("a", "1", cache.epoch)
+        assert cache.get("a") is MISS
+
+    def test_read_racing_an_invalidation_is_not_cached(self, cache):
+        epoch = cache.epoch
+        cache.evict(["other"])
+        cache.put("a", "old", epoch)
+        assert cache.get("a") is MISS
+
+    def test_bypassed_while_unsubscribed(self, cache):
+        cache.put("a", "1", cache.epoch)
+        cache._subscribed = False
+        assert cache.get("a") is MISS
+        cache.put("b", "2", cache.epoch)
+        assert "b" not in cache._entries
+
+    def test_prefixes(self):
+        cache = NearCache(prefixes=("session:",))
+        cache._subscribed = True
+        cache.put("feedback:s1", "x", cache.epoch)
+        cache.put("session:s1", "y", cache.epoch)
+        assert cache.get("feedback:s1") is MISS
+        assert cache.get("session:s1") == "y"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_evicts_and_publishes(self, cache):
+        client = AsyncMock()
+        cache.put("a", "1", cache.epoch)
+
+        await cache.invalidate(client, ["a"])
+
+        assert cache.get("a") is MISS
+        channel, message = client.publish.call_args.args
+        assert channel == cache.channel
+        assert json.loads(message)["keys"] == ["a"]
+
+    def test_remote_invalidation_records_lag(self, cache):
+        cache.put("a", "1", cache.epoch)
+        cache._on_message(json.dumps({"origin": "other-worker", "ts": time.time() - 0.05, "keys": ["a"]}))
+
+        assert cache.get("a") is MISS
+        metrics = cache.get_metrics()
+        assert metrics["remote_invalidations"] == 1
+        assert metrics["invalidation_lag_ms"]["max"] >= 50
+
+    def test_own_invalidations_are_ignored(self, cache):
+        cache.put("a", "1", cache.epoch)
+        cache._on_message(json.dumps({"origin": cache.origin, "ts": time.time(), "keys": ["a"]}))
+        assert cache.get("a") == "1"
+
+
+class TestRedisServiceNearCache:
+    """Test that RedisService reads through and invalidates the near cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_is_served_locally(self, cached_service):
+        first = await cached_service.get("session:s1")
+        second = await cached_service.get("session:s1")
+
+        assert first == second == {"state": "greeting"}
+        assert first is not second  # decoded per read
+        assert cached_service._client.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_set_invalidates(self, cached_service):
+        await cached_service.get("session:s1")
+        await cached_service.set("session:s1", {"state": "wait_for_symptom"})
+        await cached_service.get("session:s1")
+
+        assert cached_service._client.get.await_count == 2
+        cached_service._client.publish.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_mget_fetches_only_missing_keys(self, cached_service):
+        await cached_service.get("a")
+        cached_service._client.mget.return_value = ['"b"']
+
+        assert await cached_service.mget(["a", "b"]) == [{"state": "greeting"}, "b"]
+        cached_service._client.mget.assert_awaited_once_with(["b"])
+
+    @pytest.mark.asyncio
+    async def test_pipeline_writes_invalidate(self, cached_service, cache):
+        cache.put("a", '"1"', cache.epoch)
+        pipe = Mock()
+        pipe.execute = AsyncMock(return_value=[True, 1])
+        cached_service._client.pipeline = Mock(return_value=pipe)
+
+        async with cached_service.pipeline() as p:
+            p.set("a", 2)
+            p.incr("counter")
+
+        assert cache.get("a") is MISS
+        assert json.loads(cached_service._client.publish.call_args.args[1])["keys"] == ["a", "counter"]
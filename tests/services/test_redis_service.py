@@ -17,6 +17,8 @@ from src.services.redis_service import (
     get_redis_singleton
 )
 from src.core.exceptions import RedisServiceError
+from src.core.circuit_breaker import CircuitState
+from src.services.redis_near_cache import NearCache
 
 
 @pytest.fixture
@@ -42,6 +44,8 @@ def mock_redis_client():
     client.delete = AsyncMock(return_value=1)
     client.exists = AsyncMock(return_value=1)
     client.keys = AsyncMock(return_value=[])
+    client.scan = AsyncMock(return_value=(0, []))
+    client.unlink = AsyncMock(return_value=0)
     client.expire = AsyncMock(return_value=True)
     client.ttl = AsyncMock(return_value=3600)
     client.mget = AsyncMock(return_value=[None, None])
@@ -208,13 +212,13 @@ class TestRedisService:
         mock_redis_client.exists.assert_called_once_with("test_key")
     
     async def test_keys(self, redis_service, mock_redis_client):
-        """Test getting keys by pattern"""
-        mock_redis_client.keys.return_value = [b"key1", b"key2", "key3"]
+        """Test getting keys by pattern (via SCAN, never KEYS)"""
+        mock_redis_client.scan.side_effect = [(7, [b"key1", b"key2"]), (0, ["key3"])]
         
         result = await redis_service.keys("key*")
         
         assert result == ["key1", "key2", "key3"]
-        mock_redis_client.keys.assert_called_once_with("key*")
+        mock_redis_client.keys.assert_not_called()
     
     async def test_expire(self, redis_service, mock_redis_client):
         """Test setting expiration"""
@@ -372,4 +376,264 @@ class TestRedisServiceIntegration:
         
         # Verify deletion
         exists = await service.exists(key)
-        assert exists == 0
\ No newline at end of file
+        assert exists == 0
+
+
+@pytest.fixture
+def scan_service(mock_config, mock_redis_client):
+    """Redis service with a paged SCAN over 10 feedback keys and 2 others"""
+    service = RedisService(mock_config)
+    service._client = mock_redis_client
+    service._initialized = True
+    
+    keyspace = [f"feedback:s{i}" for i in range(10)] + ["session:a", "session:b"]
+    
+    async def scan(cursor=0, match=None, count=None, _type=None):
+        page = keyspace[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keyspace) else 0
+        prefix = match.rstrip("*")
+        return next_cursor, [key for key in page if key.startswith(prefix)]
+    
+    mock_redis_client.scan = AsyncMock(side_effect=scan)
+    mock_redis_client.mget = AsyncMock(side_effect=lambda keys: [
+        None if key == "feedback:s3" else json.dumps({"key": key}) for key in keys
+    ])
+    mock_redis_client.unlink = AsyncMock(side_effect=lambda *keys: len(keys))
+    return service
+
+
+class TestRedisScan:
+    """Test SCAN-based iteration and the batched helpers built on it"""
+    
+    @pytest.mark.asyncio
+    async def test_scan_iter_pages_through_keyspace(self, scan_service, mock_redis_client):
+        keys = [key async for key in scan_service.scan_iter("feedback:*", count=4)]
+        
+        assert keys == [f"feedback:s{i}" for i in range(10)]
+        assert mock_redis_client.scan.await_count == 3
+        assert mock_redis_client.scan.await_args.kwargs["count"] == 4
+        mock_redis_client.keys.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_scan_count_defaults_to_config(self, scan_service, mock_redis_client):
+        scan_service.config.scan_count = 5
+        batches = [batch async for batch in scan_service.scan_batches("session:*")]
+        
+        assert batches == [["session:a", "session:b"]]  # empty pages are skipped
+        assert mock_redis_client.scan.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_scan_failure_raises(self, scan_service, mock_redis_client):
+        mock_redis_client.scan = AsyncMock(side_effect=[(4, ["feedback:s0"]), ConnectionError("weg")])
+        
+        with pytest.raises(RedisServiceError):
+            [key async for key in scan_service.scan_iter("feedback:*")]
+        assert await scan_service.keys("feedback:*") == []
+    
+    @pytest.mark.asyncio
+    async def test_mget_iter_batches_values(self, scan_service, mock_redis_client):
+        pairs = [pair async for pair in scan_service.mget_iter("feedback:*", count=4)]
+        
+        assert len(pairs) == 9  # feedback:s3 expired between SCAN and MGET
+        assert pairs[0] == ("feedback:s0", {"key": "feedback:s0"})
+        assert mock_redis_client.mget.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_unlink_matching(self, scan_service, mock_redis_client):
+        deleted = await scan_service.unlink_matching("feedback:*", count=4)
+        
+        assert deleted == 10
+        assert mock_redis_client.unlink.await_count == 3
+        mock_redis_client.delete.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_without_client(self, mock_config):
+        service = RedisService(mock_config)
+        
+        assert [key async for key in service.scan_iter()] == []
+        assert await service.unlink_matching("feedback:*") == 0
+
+
+@pytest.fixture
+def pipeline_service(mock_config):
+    """Redis service whose client hands out a recording pipeline"""
+    pipe = Mock()
+    pipe.execute = AsyncMock()
+    client = Mock()
+    client.pipeline.return_value = pipe
+    service = RedisService(mock_config)
+    service._client = client
+    service._initialized = True
+    return service, client, pipe
+
+
+class TestRedisPipeline:
+    """Test typed pipelines and MULTI/EXEC transactions"""
+    
+    @pytest.mark.asyncio
+    async def test_commands_are_sent_in_one_round_trip(self, pipeline_service):
+        service, client, pipe = pipeline_service
+        pipe.execute.return_value = [True, '{"a": 1}', "text", 3, ["1", None]]
+        
+        async with service.pipeline() as p:
+            p.set("k1", {"a": 1}, ttl=60)
+            first = p.get("k1")
+            raw = p.get("k2", deserialize_json=False)
+            counter = p.incr("count", 2)
+            values = p.mget(["k3", "k4"])
+        
+        client.pipeline.assert_called_once_with(transaction=False)
+        pipe.execute.assert_awaited_once()
+        pipe.set.assert_called_once_with("k1", '{"a": 1}', ex=60)
+        pipe.incrby.assert_called_once_with("count", 2)
+        assert p.results[first] == {"a": 1}
+        assert p.results[raw] == "text"
+        assert p.results[counter] == 3
+        assert p.results[values] == [1, None]
+    
+    @pytest.mark.asyncio
+    async def test_transaction_uses_multi_exec(self, pipeline_service):
+        service, client, pipe = pipeline_service
+        pipe.execute.return_value = [1, True]
+        
+        async with service.transaction() as tx:
+            tx.hset("session:s1", {"step": "greeting", "symptoms": ["bellen"]})
+            tx.expire("session:s1", 60)
+        
+        client.pipeline.assert_called_once_with(transaction=True)
+        assert pipe.hset.call_args.kwargs["mapping"] == {"step": "greeting", "symptoms": '["bellen"]'}
+    
+    @pytest.mark.asyncio
+    async def test_nothing_is_sent_if_the_block_raises(self, pipeline_service):
+        service, client, pipe = pipeline_service
+        
+        with pytest.raises(ValueError):
+            async with service.pipeline() as p:
+                p.set("k", "v")
+                raise ValueError("abbrechen")
+        
+        pipe.execute.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_failure_raises_service_error(self, pipeline_service):
+        service, client, pipe = pipeline_service
+        pipe.execute.side_effect = ConnectionError("weg")
+        
+        with pytest.raises(RedisServiceError):
+            async with service.pipeline() as p:
+                p.set("k", "v")
+    
+    @pytest.mark.asyncio
+    async def test_requires_connection(self):
+        with patch.dict('os.environ', {}, clear=True):
+            service = RedisService()
+            with pytest.raises(RedisServiceError):
+                async with service.pipeline():
+                    pass
+
+
+@pytest.fixture
+def breaker_service():
+    """Connected RedisService with a mock client and a low failure threshold"""
+    service = RedisService(RedisConfig(url="redis://localhost:6379/0", breaker_failures=2))
+    service._client = AsyncMock()
+    service._initialized = True
+    return service
+
+
+def _half_open(service):
+    """Trip the circuit so that the next call is the trial call"""
+    service.breaker.reset_timeout = 0.0
+    service.breaker._current_timeout = 0.0
+    service.breaker.trip("weg")
+    assert service.breaker.state is CircuitState.HALF_OPEN
+
+
+class TestRedisCircuitBreaker:
+    """Test fail-fast behaviour while Redis is unreachable"""
+    
+    @pytest.mark.asyncio
+    async def test_connection_failures_open_the_circuit(self, breaker_service):
+        breaker_service._client.get.side_effect = ConnectionError("weg")
+        
+        with patch.object(breaker_service, "_start_reconnect") as start_reconnect:
+            assert await breaker_service.get("k", default="x") == "x"
+            assert breaker_service.is_connected()
+            assert await breaker_service.get("k", default="x") == "x"
+        
+        assert not breaker_service.is_connected()
+        assert breaker_service.is_enabled()
+        start_reconnect.assert_called_once()
+        
+        # Fail fast: no further calls reach the client
+        assert await breaker_service.get("k", default="x") == "x"
+        assert await breaker_service.set("k", "v") is False
+        assert breaker_service._client.get.await_count == 2
+        breaker_service._client.set.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_command_errors_do_not_count(self, breaker_service):
+        breaker_service._client.get.side_effect = Exception("WRONGTYPE")
+        
+        for _ in range(3):
+            await breaker_service.get("k")
+        
+        assert breaker_service.is_connected()
+    
+    @pytest.mark.asyncio
+    async def test_pipeline_fails_fast(self, breaker_service):
+        breaker_service.breaker.trip("weg")
+        
+        with pytest.raises(RedisServiceError):
+            async with breaker_service.pipeline():
+                pass
+        breaker_service._client.pipeline.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_reconnect_closes_the_circuit(self, breaker_service):
+        breaker_service.breaker.reset_timeout = 0.0
+        breaker_service.breaker._current_timeout = 0.0
+        breaker_service.breaker.trip("weg")
+        breaker_service._client.ping.side_effect = [ConnectionError("weg"), True]
+        
+        await breaker_service._reconnect(breaker_service._client)
+        
+        assert breaker_service.is_connected()
+        assert breaker_service._client.ping.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_near_cache_hit_is_no_trial_call(self, breaker_service):
+        cache = NearCache()
+        cache._subscribed = True
+        cache.put("k", '"v"', cache.epoch)
+        breaker_service.near_cache = cache
+        _half_open(breaker_service)
+        
+        assert await breaker_service.get("k") == "v"
+        assert await breaker_service.mget(["k"]) == ["v"]
+        
+        assert breaker_service.breaker.state is CircuitState.HALF_OPEN
+        breaker_service._client.get.assert_not_awaited()
+        # The trial call is still available for a real round trip
+        assert breaker_service.breaker.allow()
+    
+    @pytest.mark.asyncio
+    async def test_empty_pipeline_is_no_trial_call(self, breaker_service):
+        _half_open(breaker_service)
+        
+        async with breaker_service.pipeline():
+            pass
+        
+        assert breaker_service.breaker.state is CircuitState.HALF_OPEN
+        assert breaker_service.breaker.allow()
+    
+    @pytest.mark.asyncio
+    async def test_health_check_reports_open_circuit(self, breaker_service):
+        breaker_service.breaker.trip("weg")
+        
+        health = await breaker_service.health_check()
+        
+        assert health["status"] == "circuit_open"
+        assert health["details"]["circuit"]["state"] == "open"
+        breaker_service._client.ping.assert_not_awaited()
+        assert breaker_service.get_metrics()["circuit"]["state"] == "open"